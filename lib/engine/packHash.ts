@@ -38,6 +38,17 @@ export const EXCLUDED_DIRS: readonly string[] = ['integrity'];
  */
 export const EXCLUDED_FILES: readonly string[] = ['.DS_Store', 'Thumbs.db', '.gitkeep'];
 
+/**
+ * Pack-relative paths excluded from pack file enumeration.
+ * Per-run measurements written by producers (timings, span traces); they
+ * differ on every run and are never sealed (packhash.EXCLUDED_PATHS).
+ */
+export const EXCLUDED_PATHS: readonly string[] = [
+    'reports/producer.perf.json',
+    'reports/producer.trace.json',
+    'reports/producer.speedscope.json',
+];
+
 // =============================================================================
 // Core Hash Functions
 // =============================================================================
@@ -83,8 +94,9 @@ export function listPackFiles(packDir: string): string[] {
                     walkDir(fullPath);
                 }
             } else {
-                // Check excluded files
-                if (!EXCLUDED_FILES.includes(entry.name)) {
+                // Check excluded files and paths
+                if (!EXCLUDED_FILES.includes(entry.name) &&
+                    !EXCLUDED_PATHS.includes(relPath.split(path.sep).join('/'))) {
                     files.push(relPath);
                 }
             }
@@ -26,6 +26,7 @@ import {
 import { AdmissionStatus } from '../verdict/types';
 import { FailureTaxonomy } from '../verdict/taxonomy';
 import { hashFile, hashString } from './ingest';
+import { EXCLUDED_PATHS } from './packHash';
 
 // =============================================================================
 // Main Verification Function
@@ -552,6 +553,8 @@ async function checkSha256Coverage(pack: PackHandle): Promise<CheckResult> {
     const excludedFiles = new Set([
         'integrity/pack.sha256',  // Self-reference excluded
         'integrity/sha256sums.txt', // Self-reference
+        'integrity/merkle.sha256',  // Optional Merkle root over the same sums (mplp_vlab.merkle)
+        'integrity/tree.b2sums',    // Optional tree digests, bound via manifest.json (mplp_vlab.treehash)
     ]);
 
     if (!fs.existsSync(sumsPath)) {
@@ -579,9 +582,10 @@ async function checkSha256Coverage(pack: PackHandle): Promise<CheckResult> {
         }
 
         // Check coverage: all pack files must be in sha256sums
+        // (per-run reports are never sealed: EXCLUDED_PATHS)
         const uncovered: string[] = [];
         for (const file of pack.file_inventory) {
-            if (!excludedFiles.has(file) && !declaredFiles.has(file)) {
+            if (!excludedFiles.has(file) && !EXCLUDED_PATHS.includes(file) && !declaredFiles.has(file)) {
                 uncovered.push(file);
             }
         }
@@ -629,7 +633,7 @@ async function checkSha256Coverage(pack: PackHandle): Promise<CheckResult> {
             name: 'SHA256 Coverage',
             category: 'INTEGRITY',
             status: 'PASS',
-            message: `Coverage complete: ${pack.file_inventory.length - excludedFiles.size} files covered`,
+            message: `Coverage complete: ${declaredFiles.size} files covered`,
             duration_ms: Date.now() - start,
         };
     } catch (e) {
@@ -0,0 +1,85 @@
+/**
+ * Clause Aggregation
+ *
+ * Registry conversion and domain/topline aggregation shared by the
+ * semantic-invariant adjudicators (ruleset-1.2, ruleset-1.3) and
+ * differential re-adjudication (readjudicate.ts), so that a result
+ * assembled from partly reused clauses matches a full adjudication.
+ */
+
+import type { RulesetEvalResult, DomainMeta, ClauseResult as RegistryClauseResult } from './registry';
+import type { ClauseDefinition, ClauseResult } from './ruleset-1.3/types';
+
+type DomainId = ClauseDefinition['domain'];
+
+/**
+ * Convert a clause result to the registry ClauseResult format.
+ */
+export function toRegistryClause(definitions: readonly ClauseDefinition[], c: ClauseResult): RegistryClauseResult {
+    return {
+        clause_id: c.clause_id,
+        requirement_id: c.requirement_id,
+        status: c.status,
+        reason_code: c.reason_code,
+        domain_id: definitions.find(d => d.clause_id === c.clause_id)?.domain,
+        evidence_refs: c.evidence.resolved.map(r => ({
+            pointer: r.pointer,
+            resolved: r.resolved,
+            content: r.content ? { ...r.content } : undefined,
+        })),
+        notes: c.notes,
+    };
+}
+
+/**
+ * Aggregate registry clause results into domain statuses and a topline verdict.
+ */
+export function aggregateClauses(
+    rulesetId: string,
+    runId: string,
+    domainNames: Record<DomainId, string>,
+    clauses: RegistryClauseResult[]
+): RulesetEvalResult {
+    // Aggregate results by domain
+    const domainMeta: DomainMeta[] = [];
+    for (const domain of ['D1', 'D2', 'D3', 'D4'] as const) {
+        const domainClauses = clauses.filter(c => c.domain_id === domain);
+
+        const domainStatus = domainClauses.every(c => c.status === 'PASS')
+            ? 'PASS'
+            : domainClauses.some(c => c.status === 'FAIL')
+                ? 'FAIL'
+                : 'NOT_EVALUATED';
+
+        domainMeta.push({
+            domain_id: domain,
+            domain_name: domainNames[domain],
+            status: domainStatus,
+        });
+    }
+
+    // Determine topline verdict
+    const failedClauses = clauses.filter(c => c.status === 'FAIL');
+    const notEvaluatedClauses = clauses.filter(c => c.status === 'NOT_EVALUATED');
+
+    let toplineVerdict: RulesetEvalResult['topline_verdict'] = 'PASS';
+    let reasonCode: string | null = null;
+
+    if (failedClauses.length > 0) {
+        toplineVerdict = 'FAIL';
+        reasonCode = failedClauses[0].reason_code || 'CLAUSE_FAILED';
+    } else if (notEvaluatedClauses.length > 0 && clauses.filter(c => c.status === 'PASS').length === 0) {
+        toplineVerdict = 'NOT_EVALUATED';
+        reasonCode = notEvaluatedClauses[0].reason_code || 'CLAUSES_NOT_EVALUATED';
+    }
+
+    return {
+        ruleset_id: rulesetId,
+        run_id: runId,
+        evaluated_at: new Date().toISOString(),
+        topline_verdict: toplineVerdict,
+        reason_code: reasonCode,
+        domain_meta: domainMeta,
+        clauses,
+    };
+}
@@ -0,0 +1,110 @@
+/**
+ * Clause Evaluator Fingerprints
+ *
+ * Differential re-adjudication marks a clause as modified when its logic
+ * changed between two rulesets. An evaluator's own source is not enough:
+ * clauses share module-level helpers (createClauseResult,
+ * resolveEvidenceForRequirement, getFirstSemanticFields, getAllEvents, ...).
+ * A clause is therefore fingerprinted together with every top-level
+ * declaration of its clauses module that it reaches, transitively.
+ *
+ * A changed clause still leaves runs without its evidence alone if its
+ * evidence-absent branch behaves the same, so that branch is fingerprinted
+ * separately, by its outcome.
+ */
+
+import * as crypto from 'crypto';
+
+const DECLARATION =
+    /^(?:export\s+)?(?:async\s+)?(?:function\*?|const|let|var|class|type|interface|enum)\s+([A-Za-z_$][\w$]*)/;
+const IDENTIFIER = /[A-Za-z_$][\w$]*/g;
+
+/**
+ * Top-level declarations of a module source, by name.
+ * Comments are dropped so documentation edits do not count as logic changes.
+ */
+export function splitTopLevelDeclarations(source: string): Map<string, string> {
+    const stripped = source.replace(/\/\*[\s\S]*?\*\//g, '').replace(/^\s*\/\/.*$/gm, '');
+    const declarations = new Map<string, string>();
+    let name: string | null = null;
+    let body: string[] = [];
+    const flush = () => {
+        if (name) declarations.set(name, body.join('\n').trim());
+    };
+
+    for (const line of stripped.split('\n')) {
+        const match = DECLARATION.exec(line);
+        if (match || /^import\b/.test(line)) {
+            flush();
+            name = match ? match[1] : null;
+            body = [];
+        }
+        body.push(line);
+    }
+    flush();
+    return declarations;
+}
+
+function reachable(declarations: Map<string, string>, root: string): string[] {
+    const seen = new Set<string>();
+    const stack = [root];
+    while (stack.length > 0) {
+        const name = stack.pop()!;
+        if (seen.has(name)) continue;
+        seen.add(name);
+        for (const ref of declarations.get(name)!.match(IDENTIFIER) ?? []) {
+            if (declarations.has(ref) && !seen.has(ref)) stack.push(ref);
+        }
+    }
+    return [...seen].sort();
+}
+
+/**
+ * Fingerprint each evaluator (clause_id → sha256) from its clauses module source.
+ * Evaluators not found in the source (or without a source) fall back to their own text.
+ */
+export function fingerprintClauseEvaluators(
+    source: string | null,
+    evaluators: Record<string, unknown>
+): Record<string, string> {
+    const declarations = source ? splitTopLevelDeclarations(source) : new Map<string, string>();
+    const fingerprints: Record<string, string> = {};
+
+    for (const [clauseId, fn] of Object.entries(evaluators)) {
+        if (typeof fn !== 'function') {
+            fingerprints[clauseId] = 'missing';
+            continue;
+        }
+        const hash = crypto.createHash('sha256');
+        if (declarations.has(fn.name)) {
+            for (const name of reachable(declarations, fn.name)) {
+                hash.update(`${name}\0${declarations.get(name)}\n`);
+            }
+        } else {
+            hash.update(fn.toString());
+        }
+        fingerprints[clauseId] = hash.digest('hex');
+    }
+    return fingerprints;
+}
+
+/**
+ * Fingerprint each evaluator's result (clause_id → sha256) on a bundle that
+ * carries no evidence. A throwing evaluator is fingerprinted by its error.
+ */
+export function fingerprintAbsentOutcomes<B>(
+    evaluators: Record<string, (bundle: B) => unknown>,
+    emptyBundle: B
+): Record<string, string> {
+    const fingerprints: Record<string, string> = {};
+    for (const [clauseId, evaluator] of Object.entries(evaluators)) {
+        let outcome: string;
+        try {
+            outcome = JSON.stringify(evaluator(emptyBundle));
+        } catch (err) {
+            outcome = `error:${err instanceof Error ? err.message : String(err)}`;
+        }
+        fingerprints[clauseId] = crypto.createHash('sha256').update(outcome).digest('hex');
+    }
+    return fingerprints;
+}
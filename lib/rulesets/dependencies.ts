@@ -0,0 +1,155 @@
+/**
+ * Clause Dependency Map
+ *
+ * Declares, per clause, which evidence each evaluator READS:
+ * - the requirement whose evidence pointers it resolves
+ * - the event_type tokens it scans across the trace
+ *
+ * Used by differential re-adjudication (readjudicate.ts) to decide which
+ * runs a ruleset change can affect. Mirrors the reads performed in
+ * ruleset-1.2 / ruleset-1.3 clauses.ts — keep in sync when a clause
+ * starts reading new evidence.
+ */
+
+import type { RunBundle } from '../bundles/types';
+import { normalizeToken } from '../evidence/synonyms';
+
+// =============================================================================
+// Types
+// =============================================================================
+
+export interface ClauseDependency {
+    clause_id: string;
+    /** Requirement whose evidence pointers the clause resolves */
+    reads_requirement: string;
+    /** Normalized event_type substrings the clause scans (empty = pointer-only) */
+    event_tokens: readonly string[];
+}
+
+/**
+ * What a single run can offer to clause evaluators.
+ * Cheap to persist, so unaffected runs never need to be reloaded.
+ */
+export interface RunFootprint {
+    /** Requirement IDs with at least one evidence pointer */
+    requirement_ids: string[];
+    /** Distinct normalized event types present in the trace */
+    event_types: string[];
+}
+
+// =============================================================================
+// Dependency Declarations
+// =============================================================================
+
+/** Execution-like tokens scanned by the post-terminal invariants */
+const EXEC_TOKENS = ['exec', 'dispatch', 'invoke', 'run', 'tool_call'] as const;
+
+/**
+ * Dependencies for the 12 semantic-invariant clauses.
+ * Event tokens are the UNION across ruleset-1.2 and ruleset-1.3 so that a
+ * run touched by either version's scan is considered affected.
+ */
+export const CLAUSE_DEPENDENCIES: Record<string, ClauseDependency> = {
+    // D1: Budget Decision Record
+    'CL-D1-01': { clause_id: 'CL-D1-01', reads_requirement: 'RQ-D1-01', event_tokens: [] },
+    'CL-D1-02': { clause_id: 'CL-D1-02', reads_requirement: 'RQ-D1-01', event_tokens: [] },
+    'CL-D1-03': {
+        clause_id: 'CL-D1-03',
+        reads_requirement: 'RQ-D1-01',
+        event_tokens: ['gate', 'block', 'stop', 'enforcement', 'throttle'],
+    },
+
+    // D2: Terminal Lifecycle State
+    'CL-D2-01': { clause_id: 'CL-D2-01', reads_requirement: 'RQ-D2-01', event_tokens: [] },
+    'CL-D2-02': { clause_id: 'CL-D2-02', reads_requirement: 'RQ-D2-01', event_tokens: [] },
+    'CL-D2-03': { clause_id: 'CL-D2-03', reads_requirement: 'RQ-D2-01', event_tokens: EXEC_TOKENS },
+
+    // D3: Authorization Decision
+    'CL-D3-01': { clause_id: 'CL-D3-01', reads_requirement: 'RQ-D3-01', event_tokens: [] },
+    'CL-D3-02': { clause_id: 'CL-D3-02', reads_requirement: 'RQ-D3-01', event_tokens: [] },
+    'CL-D3-03': {
+        clause_id: 'CL-D3-03',
+        reads_requirement: 'RQ-D3-01',
+        event_tokens: ['confirm', 'gate', 'audit'],
+    },
+
+    // D4: Termination & Recovery
+    'CL-D4-01': { clause_id: 'CL-D4-01', reads_requirement: 'RQ-D4-01', event_tokens: [] },
+    'CL-D4-02': { clause_id: 'CL-D4-02', reads_requirement: 'RQ-D4-01', event_tokens: [] },
+    'CL-D4-03': {
+        clause_id: 'CL-D4-03',
+        reads_requirement: 'RQ-D4-01',
+        event_tokens: ['recover', 'cleanup', 'shutdown', ...EXEC_TOKENS],
+    },
+};
+
+/**
+ * Get the dependency declaration for a clause.
+ * Unknown clauses return null (callers must treat every run as affected).
+ */
+export function getClauseDependency(clauseId: string): ClauseDependency | null {
+    return CLAUSE_DEPENDENCIES[clauseId] ?? null;
+}
+
+// =============================================================================
+// Footprint & Impact
+// =============================================================================
+
+/**
+ * Compute the evidence footprint of a loaded bundle.
+ */
+export function computeRunFootprint(bundle: RunBundle): RunFootprint {
+    const requirementIds = new Set<string>();
+    for (const p of bundle.evidence_pointers?.pointers ?? []) {
+        requirementIds.add(p.requirement_id);
+    }
+
+    const eventTypes = new Set<string>();
+    for (const e of bundle.pack?.trace?.events ?? []) {
+        eventTypes.add(normalizeToken(e.event_type));
+    }
+
+    return {
+        requirement_ids: [...requirementIds].sort(),
+        event_types: [...eventTypes].sort(),
+    };
+}
+
+/**
+ * Decide whether a change to the given clause can alter this run's result.
+ *
+ * A run is affected if it carries evidence for the requirement the clause
+ * reads, or any event the clause scans. A run with neither sees only the
+ * clause's evidence-absent branch, so it is unaffected only when that branch
+ * is known to give the same result in both versions (absentUnchanged, see
+ * fingerprintAbsentOutcomes in clauseFingerprint.ts).
+ */
+export function isRunAffectedByClause(
+    footprint: RunFootprint,
+    clauseId: string,
+    absentUnchanged: ReadonlySet<string> = new Set()
+): boolean {
+    const dep = getClauseDependency(clauseId);
+    if (!dep) return true;
+
+    if (footprint.requirement_ids.includes(dep.reads_requirement)) {
+        return true;
+    }
+
+    if (dep.event_tokens.some(token => footprint.event_types.some(et => et.includes(token)))) {
+        return true;
+    }
+
+    return !absentUnchanged.has(clauseId);
+}
+
+/**
+ * Return the subset of changed clauses that can affect this run.
+ */
+export function affectedClausesForRun(
+    footprint: RunFootprint,
+    changedClauseIds: string[],
+    absentUnchanged: ReadonlySet<string> = new Set()
+): string[] {
+    return changedClauseIds.filter(id => isRunAffectedByClause(footprint, id, absentUnchanged));
+}
@@ -0,0 +1,534 @@
+/**
+ * Differential Re-adjudication
+ *
+ * Re-evaluates a run corpus under a new ruleset version at a cost
+ * proportional to what changed between versions, not to corpus size:
+ *
+ * 1. Clause delta: added / removed / modified clauses between two rulesets,
+ *    from evaluator fingerprints (the evaluator plus the clauses-module
+ *    helpers it reaches, see clauseFingerprint.ts), clause definitions and
+ *    export/ruleset-diff.
+ * 2. Impact: changed clauses → requirements/event types they read
+ *    (dependencies.ts) → runs whose persisted footprint touches them.
+ *    Runs without that evidence only see a clause's evidence-absent branch;
+ *    they are affected when that branch's outcome changed between versions.
+ * 3. Evaluation: only affected clauses are evaluated for affected runs;
+ *    every other clause result is reused from the prior ruleset's cache.
+ *
+ * Differential mode is available between rulesets that expose clause-level
+ * evaluators with the semantic-invariant aggregation contract (1.2, 1.3).
+ * Any other pair falls back to the registered adjudicator (full evaluation).
+ *
+ * Cache: data/derived/readjudication/<ruleset_id>/<run_id>.json
+ * Entries record the evaluator fingerprints they were computed with and are
+ * only reused while those still match the ruleset's clauses module.
+ */
+
+import * as fs from 'fs';
+import * as path from 'path';
+import * as crypto from 'crypto';
+import type { RunBundle } from '@/lib/bundles/types';
+import { loadRunBundle } from '@/lib/bundles/load_run_bundle';
+import {
+    getRuleset,
+    type RegisteredRuleset,
+    type RulesetEvalResult,
+    type ClauseResult as RegistryClauseResult,
+} from './registry';
+import type { ClauseDefinition, ClauseResult } from './ruleset-1.3/types';
+import { aggregateClauses, toRegistryClause } from './clauseAggregation';
+import {
+    computeRunFootprint,
+    affectedClausesForRun,
+    getClauseDependency,
+    type RunFootprint,
+} from './dependencies';
+import { fingerprintClauseEvaluators, fingerprintAbsentOutcomes } from './clauseFingerprint';
+
+const RUNS_ROOT = path.resolve(process.cwd(), 'data/runs');
+const DERIVED_ROOT = path.resolve(process.cwd(), 'data/derived/readjudication');
+const EXPORT_DIFF_ROOT = path.resolve(process.cwd(), 'export/ruleset-diff');
+const RULESETS_SOURCE_ROOT = path.resolve(process.cwd(), 'lib/rulesets');
+
+export const READJUDICATION_CACHE_VERSION = '1.1.0';
+
+// =============================================================================
+// Clause Modules (Lazy-loaded)
+// =============================================================================
+
+interface ClauseModule {
+    definitions: ClauseDefinition[];
+    evaluators: Record<string, (bundle: RunBundle) => ClauseResult>;
+    domainNames: Record<ClauseDefinition['domain'], string>;
+    isApplicable: (runId: string) => boolean;
+    /** clause_id → fingerprint of the evaluator and the module helpers it reaches */
+    fingerprints: Record<string, string>;
+    /** clause_id → fingerprint of the evaluator's result on a run with no evidence */
+    absentOutcomes: Record<string, string>;
+}
+
+function readClausesSource(id: string): string | null {
+    try {
+        return fs.readFileSync(path.join(RULESETS_SOURCE_ROOT, id, 'clauses.ts'), 'utf-8');
+    } catch {
+        return null;
+    }
+}
+
+async function importClauseModule(id: string): Promise<ClauseModule | null> {
+    // ruleset-1.2 and ruleset-1.3 adjudicators both use the 1.1 applicability SSOT
+    let modules;
+    switch (id) {
+        case 'ruleset-1.2':
+            modules = await Promise.all([
+                import('./ruleset-1.2/clauses'),
+                import('./ruleset-1.2/types'),
+                import('./ruleset-1.1/applicability'),
+            ]);
+            break;
+        case 'ruleset-1.3':
+            modules = await Promise.all([
+                import('./ruleset-1.3/clauses'),
+                import('./ruleset-1.3/types'),
+                import('./ruleset-1.1/applicability'),
+            ]);
+            break;
+        default:
+            return null;
+    }
+
+    const [clauses, types, applicability] = modules;
+    return {
+        definitions: types.CLAUSE_DEFINITIONS,
+        evaluators: clauses.CLAUSE_EVALUATORS,
+        domainNames: types.DOMAIN_NAMES,
+        isApplicable: applicability.isArbitrationPack,
+        fingerprints: fingerprintClauseEvaluators(readClausesSource(id), clauses.CLAUSE_EVALUATORS),
+        absentOutcomes: fingerprintAbsentOutcomes(clauses.CLAUSE_EVALUATORS, emptyBundle('absent-evidence')),
+    };
+}
+
+const clauseModules = new Map<string, Promise<ClauseModule | null>>();
+
+function loadClauseModule(id: string): Promise<ClauseModule | null> {
+    let loaded = clauseModules.get(id);
+    if (!loaded) {
+        loaded = importClauseModule(id);
+        clauseModules.set(id, loaded);
+    }
+    return loaded;
+}
+
+// =============================================================================
+// Clause Delta
+// =============================================================================
+
+export interface ClauseDelta {
+    from: string;
+    to: string;
+    added: string[];
+    removed: string[];
+    modified: string[];
+    /** Requirements read by added/modified clauses */
+    changed_requirements: string[];
+    /** Modified clauses whose evidence-absent outcome is identical in both versions */
+    absent_unchanged: string[];
+}
+
+function sha256(content: string | Buffer): string {
+    return crypto.createHash('sha256').update(content).digest('hex');
+}
+
+/**
+ * Read clause IDs recorded in export/ruleset-diff/<from>_to_<to>/diff.json.
+ * Entries may be plain IDs or objects carrying clause_id.
+ */
+function readExportedClauseDelta(from: string, to: string): Pick<ClauseDelta, 'added' | 'removed' | 'modified'> {
+    const empty = { added: [], removed: [], modified: [] };
+    const diffPath = path.join(EXPORT_DIFF_ROOT, `${from}_to_${to}`, 'diff.json');
+    if (!fs.existsSync(diffPath)) return empty;
+
+    try {
+        const diff = JSON.parse(fs.readFileSync(diffPath, 'utf-8'));
+        const ids = (entries: unknown): string[] =>
+            Array.isArray(entries)
+                ? entries
+                    .map(e => (typeof e === 'string' ? e : (e as { clause_id?: string })?.clause_id))
+                    .filter((e): e is string => typeof e === 'string')
+                : [];
+        return {
+            added: ids(diff.clause_delta?.added),
+            removed: ids(diff.clause_delta?.removed),
+            modified: ids(diff.clause_delta?.modified),
+        };
+    } catch {
+        return empty;
+    }
+}
+
+/**
+ * Compute the clause delta between two rulesets.
+ * Returns null if either ruleset has no clause-level evaluators.
+ */
+export async function computeClauseDelta(from: string, to: string): Promise<ClauseDelta | null> {
+    const [fromModule, toModule] = await Promise.all([loadClauseModule(from), loadClauseModule(to)]);
+    if (!fromModule || !toModule) return null;
+
+    const fromDefs = new Map(fromModule.definitions.map(d => [d.clause_id, d]));
+    const toDefs = new Map(toModule.definitions.map(d => [d.clause_id, d]));
+
+    const added = new Set<string>();
+    const removed = new Set<string>();
+    const modified = new Set<string>();
+
+    for (const id of toDefs.keys()) {
+        if (!fromDefs.has(id)) added.add(id);
+    }
+    for (const id of fromDefs.keys()) {
+        if (!toDefs.has(id)) removed.add(id);
+    }
+    for (const [id, toDef] of toDefs) {
+        const fromDef = fromDefs.get(id);
+        if (!fromDef) continue;
+        const definitionChanged = JSON.stringify(fromDef) !== JSON.stringify(toDef);
+        const logicChanged = fromModule.fingerprints[id] !== toModule.fingerprints[id];
+        if (definitionChanged || logicChanged) modified.add(id);
+    }
+
+    // Governance-recorded changes always win over detection
+    const exported = readExportedClauseDelta(from, to);
+    for (const id of exported.added) if (toDefs.has(id)) added.add(id);
+    for (const id of exported.removed) removed.add(id);
+    for (const id of exported.modified) if (toDefs.has(id) && !added.has(id)) modified.add(id);
+
+    const changedRequirements = new Set<string>();
+    for (const id of [...added, ...modified]) {
+        const dep = getClauseDependency(id);
+        changedRequirements.add(dep?.reads_requirement ?? toDefs.get(id)!.requirement_id);
+    }
+
+    return {
+        from,
+        to,
+        added: [...added].sort(),
+        removed: [...removed].sort(),
+        modified: [...modified].sort(),
+        changed_requirements: [...changedRequirements].sort(),
+        absent_unchanged: [...modified]
+            .filter(id => fromModule.absentOutcomes[id] === toModule.absentOutcomes[id])
+            .sort(),
+    };
+}
+
+// =============================================================================
+// Evaluation Cache
+// =============================================================================
+
+export interface CachedEvaluation {
+    cache_version: string;
+    ruleset_id: string;
+    run_id: string;
+    input_fingerprint: string;
+    /** Evaluator fingerprints of the ruleset's clauses module (null: no clause-level evaluators) */
+    evaluator_fingerprints: Record<string, string> | null;
+    footprint: RunFootprint | null;
+    result: RulesetEvalResult;
+}
+
+function cachePath(rulesetId: string, runId: string): string {
+    return path.join(DERIVED_ROOT, rulesetId, `${runId}.json`);
+}
+
+export function readCachedEvaluation(rulesetId: string, runId: string): CachedEvaluation | null {
+    const p = cachePath(rulesetId, runId);
+    if (!fs.existsSync(p)) return null;
+    try {
+        const entry = JSON.parse(fs.readFileSync(p, 'utf-8')) as CachedEvaluation;
+        return entry.cache_version === READJUDICATION_CACHE_VERSION ? entry : null;
+    } catch {
+        return null;
+    }
+}
+
+/**
+ * True if a cache entry was computed with the current clause evaluators.
+ * Rulesets without clause-level evaluators cannot be checked and never match.
+ */
+function evaluatorsUnchanged(entry: CachedEvaluation, module: ClauseModule | null): boolean {
+    if (!module || !entry.evaluator_fingerprints) return false;
+    const recorded = entry.evaluator_fingerprints;
+    const current = module.fingerprints;
+    const ids = Object.keys(current);
+    return ids.length === Object.keys(recorded).length && ids.every(id => recorded[id] === current[id]);
+}
+
+export function writeCachedEvaluation(entry: CachedEvaluation): void {
+    const p = cachePath(entry.ruleset_id, entry.run_id);
+    fs.mkdirSync(path.dirname(p), { recursive: true });
+    fs.writeFileSync(p, JSON.stringify(entry, null, 2));
+}
+
+/**
+ * Fingerprint the inputs the bundle loader reads for a run.
+ * Same fingerprint ⇒ same bundle ⇒ prior clause results are reusable.
+ */
+export function computeRunInputFingerprint(runId: string): string {
+    const base = path.join(RUNS_ROOT, runId);
+    let packRoot = base;
+    const bundleManifestPath = path.join(base, 'bundle.manifest.json');
+    if (fs.existsSync(bundleManifestPath)) {
+        try {
+            const manifest = JSON.parse(fs.readFileSync(bundleManifestPath, 'utf-8'));
+            if (manifest.pack_root) packRoot = path.join(base, manifest.pack_root);
+        } catch {
+            // Invalid manifest is itself part of the fingerprint below
+        }
+    }
+
+    const inputs = [
+        bundleManifestPath,
+        path.join(base, 'evidence_pointers.json'),
+        path.join(packRoot, 'timeline', 'events.ndjson'),
+        path.join(packRoot, 'trace', 'events.ndjson'),
+        path.join(base, 'timeline', 'events.ndjson'),
+    ];
+
+    const hash = crypto.createHash('sha256');
+    for (const p of [...new Set(inputs)]) {
+        hash.update(path.relative(base, p));
+        hash.update('\0');
+        hash.update(fs.existsSync(p) ? sha256(fs.readFileSync(p)) : 'absent');
+        hash.update('\n');
+    }
+    return hash.digest('hex');
+}
+
+// =============================================================================
+// Per-run Re-adjudication
+// =============================================================================
+
+function emptyBundle(runId: string): RunBundle {
+    return {
+        run_id: runId,
+        verdict: null,
+        bundle_manifest: null,
+        integrity_hash_path: null,
+        evidence_pointers: null,
+        pack: null,
+        load_status: {
+            b1_verdict: 'missing',
+            b2_manifest: 'missing',
+            b3_integrity: 'missing',
+            b4_pointers: 'missing',
+            pack: 'missing',
+            b1_was_legacy: false,
+        },
+        load_errors: [],
+    };
+}
+
+export interface ReadjudicationPlan {
+    from: string;
+    to: string;
+    delta: ClauseDelta | null;
+    target: RegisteredRuleset;
+    fromModule: ClauseModule | null;
+    targetModule: ClauseModule | null;
+}
+
+export interface ReadjudicationOutcome {
+    run_id: string;
+    /** reused: no clause evaluated; differential: subset evaluated; full: adjudicator ran */
+    mode: 'reused' | 'differential' | 'full';
+    clauses_evaluated: string[];
+    result: RulesetEvalResult;
+}
+
+/**
+ * Build a re-adjudication plan from one ruleset to another.
+ */
+export async function planReadjudication(from: string, to: string): Promise<ReadjudicationPlan> {
+    const target = await getRuleset(to);
+    if (!target?.adjudicator) {
+        throw new Error(`Ruleset not loadable or no adjudicator: ${to}`);
+    }
+    const [delta, fromModule, targetModule] = await Promise.all([
+        computeClauseDelta(from, to),
+        loadClauseModule(from),
+        loadClauseModule(to),
+    ]);
+    return { from, to, delta, target, fromModule, targetModule };
+}
+
+async function fullEvaluation(runId: string, fingerprint: string, plan: ReadjudicationPlan): Promise<ReadjudicationOutcome> {
+    const bundle = loadRunBundle(runId);
+    const result = await plan.target.adjudicator!(bundle);
+    writeCachedEvaluation({
+        cache_version: READJUDICATION_CACHE_VERSION,
+        ruleset_id: plan.to,
+        run_id: runId,
+        input_fingerprint: fingerprint,
+        evaluator_fingerprints: plan.targetModule?.fingerprints ?? null,
+        footprint: computeRunFootprint(bundle),
+        result,
+    });
+    return {
+        run_id: runId,
+        mode: 'full',
+        clauses_evaluated: result.clauses.map(c => c.clause_id),
+        result,
+    };
+}
+
+/**
+ * Re-adjudicate one run under plan.to, reusing plan.from results where possible.
+ */
+export async function readjudicateRun(runId: string, plan: ReadjudicationPlan): Promise<ReadjudicationOutcome> {
+    const fingerprint = computeRunInputFingerprint(runId);
+
+    // Already up to date for the target ruleset: same inputs, same evaluators
+    const current = readCachedEvaluation(plan.to, runId);
+    if (current && current.input_fingerprint === fingerprint && evaluatorsUnchanged(current, plan.targetModule)) {
+        return { run_id: runId, mode: 'reused', clauses_evaluated: [], result: current.result };
+    }
+
+    const { delta, targetModule } = plan;
+    if (!delta || !targetModule) {
+        return fullEvaluation(runId, fingerprint, plan);
+    }
+
+    // Applicability is run_id-based: non-applicable runs never load evidence
+    if (!targetModule.isApplicable(runId)) {
+        const result = await plan.target.adjudicator!(emptyBundle(runId));
+        writeCachedEvaluation({
+            cache_version: READJUDICATION_CACHE_VERSION,
+            ruleset_id: plan.to,
+            run_id: runId,
+            input_fingerprint: fingerprint,
+            evaluator_fingerprints: targetModule.fingerprints,
+            footprint: null,
+            result,
+        });
+        return { run_id: runId, mode: 'reused', clauses_evaluated: [], result };
+    }
+
+    // Prior results are only a baseline if computed by the current plan.from evaluators
+    const prior = readCachedEvaluation(plan.from, runId);
+    if (
+        !prior ||
+        prior.input_fingerprint !== fingerprint ||
+        !evaluatorsUnchanged(prior, plan.fromModule) ||
+        !prior.footprint ||
+        prior.result.clauses.length === 0
+    ) {
+        return fullEvaluation(runId, fingerprint, plan);
+    }
+
+    // Added clauses have no prior result; modified ones only if the run touches
+    // their inputs or their evidence-absent outcome changed
+    const affected = new Set([
+        ...delta.added,
+        ...affectedClausesForRun(prior.footprint, delta.modified, new Set(delta.absent_unchanged)),
+    ]);
+
+    const priorClauses = new Map(prior.result.clauses.map(c => [c.clause_id, c]));
+    const toEvaluate = targetModule.definitions
+        .map(d => d.clause_id)
+        .filter(id => affected.has(id) || !priorClauses.has(id));
+
+    let bundle: RunBundle | null = null;
+    const clauses: RegistryClauseResult[] = [];
+    for (const def of targetModule.definitions) {
+        if (toEvaluate.includes(def.clause_id)) {
+            const evaluator = targetModule.evaluators[def.clause_id];
+            if (!evaluator) continue;
+            bundle ??= loadRunBundle(runId);
+            clauses.push(toRegistryClause(targetModule.definitions, evaluator(bundle)));
+        } else {
+            clauses.push(priorClauses.get(def.clause_id)!);
+        }
+    }
+
+    const result = aggregateClauses(plan.to, runId, targetModule.domainNames, clauses);
+    writeCachedEvaluation({
+        cache_version: READJUDICATION_CACHE_VERSION,
+        ruleset_id: plan.to,
+        run_id: runId,
+        input_fingerprint: fingerprint,
+        evaluator_fingerprints: targetModule.fingerprints,
+        footprint: prior.footprint,
+        result,
+    });
+
+    return {
+        run_id: runId,
+        mode: toEvaluate.length > 0 ? 'differential' : 'reused',
+        clauses_evaluated: toEvaluate,
+        result,
+    };
+}
+
+// =============================================================================
+// Corpus Re-adjudication
+// =============================================================================
+
+export interface ReadjudicationSummary {
+    from: string;
+    to: string;
+    generated_at: string;
+    delta: ClauseDelta | null;
+    metrics: {
+        total_runs: number;
+        reused_runs: number;
+        differential_runs: number;
+        full_runs: number;
+        clause_evaluations: number;
+        verdict_flips: number;
+    };
+    flips: Array<{ run_id: string; verdict_from: string; verdict_to: string }>;
+}
+
+/**
+ * Re-adjudicate a set of runs (default: all runs under data/runs).
+ */
+export async function readjudicateCorpus(
+    from: string,
+    to: string,
+    runIds: string[]
+): Promise<{ summary: ReadjudicationSummary; outcomes: ReadjudicationOutcome[] }> {
+    const plan = await planReadjudication(from, to);
+    const outcomes: ReadjudicationOutcome[] = [];
+    const flips: ReadjudicationSummary['flips'] = [];
+
+    for (const runId of runIds) {
+        const outcome = await readjudicateRun(runId, plan);
+        outcomes.push(outcome);
+
+        const prior = readCachedEvaluation(from, runId);
+        if (prior && prior.result.topline_verdict !== outcome.result.topline_verdict) {
+            flips.push({
+                run_id: runId,
+                verdict_from: prior.result.topline_verdict,
+                verdict_to: outcome.result.topline_verdict,
+            });
+        }
+    }
+
+    const summary: ReadjudicationSummary = {
+        from,
+        to,
+        generated_at: new Date().toISOString(),
+        delta: plan.delta,
+        metrics: {
+            total_runs: outcomes.length,
+            reused_runs: outcomes.filter(o => o.mode === 'reused').length,
+            differential_runs: outcomes.filter(o => o.mode === 'differential').length,
+            full_runs: outcomes.filter(o => o.mode === 'full').length,
+            clause_evaluations: outcomes.reduce((n, o) => n + o.clauses_evaluated.length, 0),
+            verdict_flips: flips.length,
+        },
+        flips,
+    };
+
+    return { summary, outcomes };
+}
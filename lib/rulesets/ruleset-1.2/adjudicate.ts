@@ -7,7 +7,8 @@
  */
 
 import type { RunBundle } from '@/lib/bundles/types';
-import type { RulesetEvalResult, DomainMeta, ClauseResult as RegistryClauseResult } from '@/lib/rulesets/registry';
+import type { RulesetEvalResult } from '@/lib/rulesets/registry';
+import { aggregateClauses, toRegistryClause } from '@/lib/rulesets/clauseAggregation';
 import { CLAUSE_DEFINITIONS, DOMAIN_NAMES, type ClauseResult } from './types';
 import { evaluateClause } from './clauses';
 import { isArbitrationPack } from '@/lib/rulesets/ruleset-1.1/applicability';
@@ -34,65 +35,12 @@ export async function adjudicatorFn(bundle: RunBundle): Promise<RulesetEvalResul
         }
     }
 
-    // Aggregate results by domain
-    const domainMeta: DomainMeta[] = [];
-    for (const domain of ['D1', 'D2', 'D3', 'D4'] as const) {
-        const domainClauses = clauseResults.filter(
-            c => CLAUSE_DEFINITIONS.find(d => d.clause_id === c.clause_id)?.domain === domain
-        );
-
-        const domainStatus = domainClauses.every(c => c.status === 'PASS')
-            ? 'PASS'
-            : domainClauses.some(c => c.status === 'FAIL')
-                ? 'FAIL'
-                : 'NOT_EVALUATED';
-
-        domainMeta.push({
-            domain_id: domain,
-            domain_name: DOMAIN_NAMES[domain],
-            status: domainStatus,
-        });
-    }
-
-    // Determine topline verdict
-    const failedClauses = clauseResults.filter(c => c.status === 'FAIL');
-    const notEvaluatedClauses = clauseResults.filter(c => c.status === 'NOT_EVALUATED');
-
-    let toplineVerdict: RulesetEvalResult['topline_verdict'] = 'PASS';
-    let reasonCode: string | null = null;
-
-    if (failedClauses.length > 0) {
-        toplineVerdict = 'FAIL';
-        reasonCode = failedClauses[0].reason_code || 'CLAUSE_FAILED';
-    } else if (notEvaluatedClauses.length > 0 && clauseResults.filter(c => c.status === 'PASS').length === 0) {
-        toplineVerdict = 'NOT_EVALUATED';
-        reasonCode = notEvaluatedClauses[0].reason_code || 'CLAUSES_NOT_EVALUATED';
-    }
-
-    // Convert to registry ClauseResult format
-    const registryClauses: RegistryClauseResult[] = clauseResults.map(c => ({
-        clause_id: c.clause_id,
-        requirement_id: c.requirement_id,
-        status: c.status,
-        reason_code: c.reason_code,
-        domain_id: CLAUSE_DEFINITIONS.find(d => d.clause_id === c.clause_id)?.domain,
-        evidence_refs: c.evidence.resolved.map(r => ({
-            pointer: r.pointer,
-            resolved: r.resolved,
-            content: r.content ? { ...r.content } : undefined,
-        })),
-        notes: c.notes,
-    }));
-
-    return {
-        ruleset_id: 'ruleset-1.2',
-        run_id: bundle.run_id,
-        evaluated_at: new Date().toISOString(),
-        topline_verdict: toplineVerdict,
-        reason_code: reasonCode,
-        domain_meta: domainMeta,
-        clauses: registryClauses,
-    };
+    return aggregateClauses(
+        'ruleset-1.2',
+        bundle.run_id,
+        DOMAIN_NAMES,
+        clauseResults.map(c => toRegistryClause(CLAUSE_DEFINITIONS, c))
+    );
 }
 
 /**
@@ -0,0 +1,7 @@
+"""MPLP Validation Lab Python toolkit.
+
+Streaming checks and tooling over evidence packs, timelines and rulesets.
+Submodules are imported on demand; nothing heavy is loaded here.
+"""
+
+__version__ = "0.1.0"
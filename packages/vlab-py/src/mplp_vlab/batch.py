@@ -0,0 +1,412 @@
+"""Resumable batch production with an append-only checkpoint journal.
+
+A batch is a list of cells, one per (substrate, scenario, repetition). A
+cell runs one of:
+
+- ``produce``: a real producer (``mplp_vlab.produce``)
+- ``generate``: a gf-01 test-vector generator (``mplp_vlab.generate``)
+- ``cmd``: a shell command run from the repository root, with
+  ``RUN_ID``/``OUT_DIR``/``SCENARIO_ID``/``SUBSTRATE`` exported
+
+Every state change is appended to the journal (NDJSON, fsynced per
+record; the ``pending`` records of a new batch are synced in one go)::
+
+    {"cell": "crewai/d1_basic_pass/r0001", "state": "sealed", "attempt": 1, "root": "…", "ts": "…"}
+
+States are ``pending`` → ``running`` → ``sealed`` (the pack has a root;
+sealed here with ``seal`` if the run wrote none) → ``verified`` (full
+verify passed; its receipt makes the next check a stat comparison), or
+``failed`` with the output tail. A torn last line, left by a crash
+mid-write, is ignored on replay and truncated before the next append.
+
+On restart the journal is replayed and each cell resumes from its last
+state:
+
+- ``verified``/``sealed``: skipped if the pack still verifies (quick tier,
+  full for ``sealed``) and its root is still the journalled one, rerun
+  otherwise
+- ``running``: the run was interrupted; its output is discarded and it
+  reruns
+- ``failed``: retried until ``--retries`` is used up across all
+  invocations (``--retry-failed`` resets the count)
+
+A failed run is retried within the same invocation after an exponential
+backoff (``--backoff`` × 2^(attempt-1), capped at ``--backoff-max``), while
+other cells keep running.
+
+Usage:
+    python -m mplp_vlab.batch produce <substrate>... --out-root DIR [--scenarios a,b] [--reps N] [--workers N] [--retries 3]
+    python -m mplp_vlab.batch generate <substrate>... --out-root DIR [--reps N]
+    python -m mplp_vlab.batch cmd --cmd "<command>" --out-root DIR [--substrates a,b] [--scenarios a,b] [--reps N]
+"""
+
+import argparse
+import heapq
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from .generate import generate
+from .packhash import read_declared_root
+from .paths import repo_root
+from .produce import DEFAULT_SCENARIO, producer_command
+from .runstore import run_path
+from .seal import seal_pack
+from .verify import full_verify, verify_pack
+
+KINDS = ("produce", "generate", "cmd")
+STATES = ("pending", "running", "sealed", "verified", "failed")
+JOURNAL_NAME = "batch.journal.ndjson"
+OUTPUT_TAIL = 2000
+
+
+@dataclass(frozen=True)
+class Cell:
+    cell_id: str
+    kind: str
+    substrate: str
+    scenario_id: str
+    rep: int
+    run_id: str
+    out_dir: str
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class CellState:
+    """A cell's last journalled state."""
+
+    state: str = "pending"
+    attempts: int = 0
+    root: str | None = None
+    error: str | None = None
+
+
+@dataclass
+class CellResult:
+    cell_id: str
+    status: str  # verified | skipped | failed
+    attempts: int
+    root: str | None = None
+    wall_ms: float = 0.0
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def cell_id(substrate: str, scenario_id: str, rep: int) -> str:
+    return f"{substrate}/{scenario_id}/r{rep:04d}"
+
+
+def plan_cells(
+    kind: str,
+    substrates: list[str],
+    scenarios: list[str],
+    reps: int,
+    out_root: str | Path,
+) -> list[Cell]:
+    """The (substrate × scenario × repetition) matrix; each cell writes ``<out-root>/<run-id>``
+    (in its hash bucket when ``out_root`` has the fan-out layout, see ``mplp_vlab.runstore``)."""
+    out_root = Path(out_root).resolve()
+    cells = []
+    for substrate in substrates:
+        for scenario_id in scenarios:
+            for rep in range(1, reps + 1):
+                run_id = f"{substrate}-{scenario_id}-r{rep:04d}"
+                cells.append(Cell(cell_id(substrate, scenario_id, rep), kind, substrate, scenario_id, rep, run_id,
+                                  str(run_path(out_root, run_id))))
+    return cells
+
+
+class Journal:
+    """Append-only NDJSON checkpoint log; one record per cell state change."""
+
+    def __init__(self, path: str | Path, fsync: bool = True):
+        self.path = Path(path)
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.is_file():
+            _drop_torn_tail(self.path)
+        self._f = open(self.path, "ab")
+
+    def record(self, cell: str, state: str, sync: bool = True, **fields: Any) -> None:
+        entry = {"cell": cell, "state": state, **{k: v for k, v in fields.items() if v is not None}}
+        entry["ts"] = datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+        line = json.dumps(entry, sort_keys=True).encode("utf-8") + b"\n"
+        with self._lock:
+            self._f.write(line)
+            if sync:
+                self._sync()
+
+    def sync(self) -> None:
+        with self._lock:
+            self._sync()
+
+    def _sync(self) -> None:
+        self._f.flush()
+        if self.fsync:
+            os.fsync(self._f.fileno())
+
+    def close(self) -> None:
+        self._f.close()
+
+    def __enter__(self) -> "Journal":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def _drop_torn_tail(path: Path, chunk: int = 65536) -> None:
+    """Truncate a partial last record so appends start on a fresh line."""
+    with open(path, "rb+") as f:
+        end = f.seek(0, os.SEEK_END)
+        pos = end
+        while pos > 0:
+            start = max(0, pos - chunk)
+            f.seek(start)
+            block = f.read(pos - start)
+            cut = block.rfind(b"\n")
+            if cut >= 0:
+                keep = start + cut + 1
+                break
+            pos = start
+        else:
+            keep = 0
+        if keep != end:
+            f.truncate(keep)
+
+
+def replay(path: str | Path) -> dict[str, CellState]:
+    """Last state per cell. A torn final line is ignored; corruption elsewhere raises ``ValueError``."""
+    states: dict[str, CellState] = {}
+    path = Path(path)
+    if not path.is_file():
+        return states
+    lines = path.read_bytes().split(b"\n")
+    for n, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            if n == len(lines) or all(not rest.strip() for rest in lines[n:]):
+                break  # torn by a crash mid-write
+            raise ValueError(f"{path}:{n}: corrupt journal record") from None
+        state = states.setdefault(entry["cell"], CellState())
+        state.state = entry["state"]
+        state.attempts = max(state.attempts, entry.get("attempt", 0))
+        state.root = entry.get("root")
+        state.error = entry.get("error")
+    return states
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Delay before retrying after the ``attempt``-th failure."""
+    return min(cap, base * 2 ** (attempt - 1))
+
+
+def _still_verified(cell: Cell, prev: CellState) -> bool:
+    out_dir = Path(cell.out_dir)
+    if prev.root is None or not out_dir.is_dir():
+        return False
+    declared = read_declared_root(out_dir)
+    if declared is None or declared.hash != prev.root:
+        return False
+    return verify_pack(out_dir, full=prev.state == "sealed").ok
+
+
+def _run_command(cell: Cell, python: str | None, cmd: str | None) -> tuple[int, str]:
+    if cell.kind == "generate":
+        try:
+            generate(cell.substrate, cell.out_dir, quiet=True, python=python, perf=False)
+            return 0, ""
+        except subprocess.CalledProcessError as e:
+            return e.returncode or 1, str(e)
+    if cell.kind == "produce":
+        argv, env = producer_command(cell.substrate, cell.out_dir, cell.scenario_id, cell.run_id, python)
+        proc = subprocess.run(argv, cwd=Path(argv[1]).parents[1], env=env, capture_output=True, text=True)
+    else:
+        env = dict(os.environ, RUN_ID=cell.run_id, OUT_DIR=cell.out_dir, SCENARIO_ID=cell.scenario_id,
+                   SUBSTRATE=cell.substrate)
+        proc = subprocess.run(cmd, shell=True, cwd=repo_root(), env=env, capture_output=True, text=True)
+    return proc.returncode, (proc.stdout + proc.stderr)[-OUTPUT_TAIL:]
+
+
+def _execute(cell: Cell, prev: CellState, attempt: int, journal: Journal, python: str | None, cmd: str | None) -> CellResult:
+    start = time.perf_counter()
+    result = CellResult(cell.cell_id, "failed", attempt)
+    out_dir = Path(cell.out_dir)
+    try:
+        if prev.state in ("sealed", "verified"):
+            if _still_verified(cell, prev):
+                if prev.state == "sealed":
+                    journal.record(cell.cell_id, "verified", attempt=attempt, root=prev.root)
+                result.status, result.root = "skipped", prev.root
+                return result
+            attempt = result.attempts = attempt + 1  # the pack changed since: a fresh run
+
+        journal.record(cell.cell_id, "running", attempt=attempt, pid=os.getpid())
+        if out_dir.exists():
+            shutil.rmtree(out_dir)  # partial or stale output from an earlier attempt
+        out_dir.parent.mkdir(parents=True, exist_ok=True)
+        returncode, tail = _run_command(cell, python, cmd)
+        if returncode != 0:
+            result.error = f"exit {returncode}: {tail}"
+        elif not out_dir.is_dir():
+            result.error = "run wrote no pack"
+        else:
+            declared = read_declared_root(out_dir)
+            root = declared.hash if declared else seal_pack(out_dir)
+            journal.record(cell.cell_id, "sealed", attempt=attempt, root=root)
+            verified = full_verify(out_dir)
+            if verified.ok:
+                journal.record(cell.cell_id, "verified", attempt=attempt, root=root)
+                result.status, result.root = "verified", root
+                return result
+            result.error = f"verify: {verified.error or 'mismatched ' + ', '.join(verified.mismatched + verified.missing)}"
+    except (OSError, ValueError) as e:
+        result.error = f"{type(e).__name__}: {e}"
+    finally:
+        result.wall_ms = round((time.perf_counter() - start) * 1000, 3)
+    journal.record(cell.cell_id, "failed", attempt=attempt, error=result.error)
+    return result
+
+
+def run_batch(
+    cells: list[Cell],
+    journal_path: str | Path,
+    workers: int | None = None,
+    retries: int = 3,
+    backoff: float = 2.0,
+    backoff_max: float = 300.0,
+    python: str | None = None,
+    cmd: str | None = None,
+    retry_failed: bool = False,
+    fsync: bool = True,
+) -> dict[str, Any]:
+    """Run (or resume) a batch; returns the summary."""
+    if any(c.kind == "cmd" for c in cells) and not cmd:
+        raise ValueError("cmd cells need a command")
+    start = time.perf_counter()
+    states = replay(journal_path)
+    results: dict[str, CellResult] = {}
+    ready: list[tuple[float, int, Cell, int]] = []  # (not_before, order, cell, attempt)
+
+    with Journal(journal_path, fsync) as journal:
+        for order, cell in enumerate(cells):
+            prev = states.get(cell.cell_id)
+            if prev is None:
+                prev = states[cell.cell_id] = CellState()
+                journal.record(cell.cell_id, "pending", sync=False, kind=cell.kind, run_id=cell.run_id, out_dir=cell.out_dir)
+            if prev.state == "failed" and retry_failed:
+                prev.attempts = 0
+            if prev.state == "failed" and prev.attempts > retries:
+                results[cell.cell_id] = CellResult(cell.cell_id, "failed", prev.attempts, error=prev.error)
+                continue
+            # A sealed/verified cell is first re-checked under its own attempt number
+            attempt = prev.attempts if prev.state in ("sealed", "verified") else prev.attempts + 1
+            heapq.heappush(ready, (0.0, order, cell, attempt))
+        journal.sync()
+
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1, thread_name_prefix="batch") as pool:
+            running: dict[Future[CellResult], tuple[int, Cell]] = {}
+            while ready or running:
+                now = time.monotonic()
+                while ready and ready[0][0] <= now:
+                    _, order, cell, attempt = heapq.heappop(ready)
+                    running[pool.submit(_execute, cell, states[cell.cell_id], attempt, journal, python, cmd)] = (order, cell)
+                timeout = max(0.0, ready[0][0] - now) if ready else None
+                if not running:
+                    time.sleep(timeout or 0)
+                    continue
+                done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    order, cell = running.pop(future)
+                    result = future.result()
+                    results[cell.cell_id] = result
+                    if result.status == "failed":
+                        states[cell.cell_id] = CellState("failed", result.attempts, error=result.error)
+                        if result.attempts <= retries:
+                            delay = backoff_delay(result.attempts, backoff, backoff_max)
+                            heapq.heappush(ready, (time.monotonic() + delay, order, cell, result.attempts + 1))
+
+    ordered = [results[c.cell_id] for c in cells]
+    counts = {status: sum(r.status == status for r in ordered) for status in ("verified", "skipped", "failed")}
+    return {
+        "journal": str(journal_path),
+        "cells": len(cells),
+        **counts,
+        "retried": sum(r.attempts > 1 for r in ordered if r.status != "skipped"),
+        "wall_ms": round((time.perf_counter() - start) * 1000, 3),
+        "results": [r.to_dict() for r in ordered],
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Resumable batch production")
+    parser.add_argument("kind", choices=KINDS)
+    parser.add_argument("substrates", nargs="*", help="Producer or generator substrates")
+    parser.add_argument("--out-root", required=True, help="Each cell writes <out-root>/<run-id>")
+    parser.add_argument("--substrates", dest="substrate_list", help="Comma-separated substrates (alternative to positionals)")
+    parser.add_argument("--scenarios", default=DEFAULT_SCENARIO, help="Comma-separated scenario IDs")
+    parser.add_argument("--reps", type=int, default=1)
+    parser.add_argument("--cmd", help="Command for cmd cells")
+    parser.add_argument("--journal", help=f"Default: <out-root>/{JOURNAL_NAME}")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--retries", type=int, default=3, help="Retries per cell, across invocations")
+    parser.add_argument("--backoff", type=float, default=2.0, help="First retry delay in seconds, doubled per attempt")
+    parser.add_argument("--backoff-max", type=float, default=300.0)
+    parser.add_argument("--retry-failed", action="store_true", help="Reset the retry count of failed cells")
+    parser.add_argument("--python", help="Interpreter with the producer's or generator's dependencies")
+    parser.add_argument("--no-fsync", action="store_true", help="Flush journal records without fsync")
+    parser.add_argument("--report", help="Write the summary as JSON here")
+    args = parser.parse_args(argv)
+
+    substrates = args.substrates + (args.substrate_list.split(",") if args.substrate_list else [])
+    if args.kind == "cmd" and not args.cmd:
+        print("error: cmd cells need --cmd", file=sys.stderr)
+        return 2
+    if not substrates:
+        substrates = ["cmd"] if args.kind == "cmd" else []
+    if not substrates:
+        print("error: no substrates given", file=sys.stderr)
+        return 2
+    cells = plan_cells(args.kind, substrates, args.scenarios.split(","), args.reps, args.out_root)
+    journal = args.journal or Path(args.out_root) / JOURNAL_NAME
+    try:
+        summary = run_batch(
+            cells, journal, args.workers, args.retries, args.backoff, args.backoff_max,
+            args.python, args.cmd, args.retry_failed, not args.no_fsync,
+        )
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    for r in summary["results"]:
+        if r["status"] == "failed":
+            print(f"FAILED {r['cell_id']} after {r['attempts']} attempt(s): {(r['error'] or '').strip()[-200:]}")
+    print(
+        f"{summary['cells']} cells: {summary['verified']} verified, {summary['skipped']} skipped, "
+        f"{summary['failed']} failed ({summary['retried']} retried) in {summary['wall_ms']:.0f}ms; journal {summary['journal']}"
+    )
+    if args.report:
+        Path(args.report).write_text(json.dumps(summary, indent=2) + "\n", encoding="utf-8")
+    return 0 if summary["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""Process-pool batch verifier over every pack in the repository.
+
+Discovers packs under the standard roots (``data/runs``, ``public/data/runs``,
+``adjudication/*`` and ``test-vectors/**/run*``), classifies each by layout:
+
+- ``v2``: ``manifest.json`` declares ``pack_layout_version: "2"``
+  (nested ``data/runs/v2/<kind>/<substrate>/<pack>``)
+- ``v1``: any other pack with ``integrity/``
+- ``adjudication``: bundle with a flat ``sha256sums.txt``
+
+and runs ``verify.verify_pack`` for each over a process pool, largest pack
+first so the longest jobs do not trail at the end. Progress is streamed to
+stderr as packs complete; one aggregated JSON report is written at the end.
+
+Usage:
+    python -m mplp_vlab.batchverify [--root DIR]... [--full] [--workers N] [--out FILE]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any
+
+from .packhash import FLAT_SUMS_PATH, SUMS_PATH
+from .paths import repo_root
+from .verify import ensure_receipt_key, is_pack_dir, verify_pack
+
+# (root relative to the repo, glob the pack directory name must match)
+DEFAULT_ROOTS: tuple[tuple[str, str], ...] = (
+    ("data/runs", "*"),
+    ("public/data/runs", "*"),
+    ("adjudication", "*"),
+    ("test-vectors", "run*"),
+)
+
+# Pack subdirectories never holding nested packs
+_PACK_SUBDIRS = frozenset({"integrity", "timeline", "artifacts", "reports", "snapshots", "trace"})
+
+
+@dataclass(frozen=True)
+class PackJob:
+    path: str
+    layout: str  # "v1", "v2" or "adjudication"
+    size: int
+
+
+def _layout_of(pack_dir: Path) -> str:
+    manifest = pack_dir / "manifest.json"
+    if manifest.is_file():
+        try:
+            with open(manifest, encoding="utf-8") as f:
+                if str(json.load(f).get("pack_layout_version")) == "2":
+                    return "v2"
+        except (ValueError, AttributeError):
+            pass
+    if not (pack_dir / SUMS_PATH).is_file() and (pack_dir / FLAT_SUMS_PATH).is_file():
+        return "adjudication"
+    return "v1"
+
+
+def _tree_size(path: Path) -> int:
+    total = 0
+    for dirpath, _dirnames, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.stat(os.path.join(dirpath, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def discover(root: str | Path, pattern: str = "*") -> list[PackJob]:
+    """Packs anywhere below ``root`` whose directory name matches ``pattern``.
+
+    A pack with a ``manifest.json`` is a leaf; other pack directories (e.g.
+    ``data/runs/v2`` itself) are descended into for nested packs.
+    """
+    root = Path(root)
+    jobs: list[PackJob] = []
+    if not root.is_dir():
+        return jobs
+    for dirpath, dirnames, _filenames in os.walk(root):
+        here = Path(dirpath)
+        dirnames[:] = sorted(d for d in dirnames if d not in _PACK_SUBDIRS)
+        if here == root or not fnmatch(here.name, pattern) or not is_pack_dir(here):
+            continue
+        jobs.append(PackJob(str(here), _layout_of(here), _tree_size(here)))
+        if (here / "manifest.json").is_file():
+            dirnames[:] = []
+    return jobs
+
+
+def discover_all(roots: list[tuple[str | Path, str]] | None = None) -> list[PackJob]:
+    """Deduplicated jobs over ``roots`` (default ``DEFAULT_ROOTS``), largest first."""
+    if roots is None:
+        base = repo_root()
+        roots = [(base / rel, pattern) for rel, pattern in DEFAULT_ROOTS]
+    seen: dict[str, PackJob] = {}
+    for root, pattern in roots:
+        for job in discover(root, pattern):
+            seen.setdefault(os.path.realpath(job.path), job)
+    return sorted(seen.values(), key=lambda j: (-j.size, j.path))
+
+
+def _verify_job(job: PackJob, full: bool) -> dict[str, Any]:
+    # One hashing thread per pack: parallelism comes from the process pool
+    return verify_pack(job.path, full=full, workers=1).to_dict()
+
+
+def run_batch(
+    jobs: list[PackJob],
+    full: bool = False,
+    workers: int | None = None,
+    progress=None,
+) -> dict[str, Any]:
+    """Verify ``jobs`` in submission order over a process pool; returns the aggregated report."""
+    start = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    ensure_receipt_key()  # create the signing key once, before workers race for it
+    results: list[dict[str, Any]] = []
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_verify_job, job, full): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:  # worker crash must not lose the batch
+                result = {"pack": job.path, "ok": False, "tier": "full" if full else "quick", "error": repr(e)}
+            result.update(layout=job.layout, bytes=job.size)
+            results.append(result)
+            if progress:
+                progress(len(results), len(jobs), result)
+
+    results.sort(key=lambda r: r["pack"])
+    by_layout: dict[str, dict[str, int]] = {}
+    for r in results:
+        counts = by_layout.setdefault(r["layout"], {"packs": 0, "passed": 0, "failed": 0})
+        counts["packs"] += 1
+        counts["passed" if r["ok"] else "failed"] += 1
+    passed = sum(r["ok"] for r in results)
+    return {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "mode": "full" if full else "quick",
+        "workers": workers,
+        "wall_ms": round((time.perf_counter() - start) * 1000, 1),
+        "summary": {
+            "packs": len(results),
+            "passed": passed,
+            "failed": len(results) - passed,
+            "bytes": sum(j.size for j in jobs),
+            "by_layout": dict(sorted(by_layout.items())),
+        },
+        "verdict": "PASS" if results and passed == len(results) else "FAIL",
+        "results": results,
+    }
+
+
+def _print_progress(done: int, total: int, result: dict[str, Any]) -> None:
+    status = "PASS" if result["ok"] else "FAIL"
+    print(f"[{done}/{total}] {status} {result['layout']} {result['pack']}", file=sys.stderr, flush=True)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Batch pack verifier (process pool)")
+    parser.add_argument("--root", action="append", metavar="DIR[:GLOB]",
+                        help="Discovery root, optionally with a pack dir name glob (default: standard roots)")
+    parser.add_argument("--full", action="store_true", help="Skip the quick tier")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: all cores)")
+    parser.add_argument("--out", default=str(repo_root() / "data" / "derived" / "batch-verify.report.json"))
+    parser.add_argument("--quiet", action="store_true", help="No per-pack progress")
+    args = parser.parse_args(argv)
+
+    roots = None
+    if args.root:
+        roots = [tuple(r.split(":", 1)) if ":" in r else (r, "*") for r in args.root]
+    jobs = discover_all(roots)
+    report = run_batch(jobs, args.full, args.workers, None if args.quiet else _print_progress)
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    s = report["summary"]
+    print(f"{s['passed']}/{s['packs']} packs verified in {report['wall_ms']:.0f}ms -> {out}")
+    return 0 if report["verdict"] == "PASS" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
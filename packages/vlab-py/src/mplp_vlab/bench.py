@@ -0,0 +1,70 @@
+"""Wall-clock benchmark of ``mplp-vlab`` subcommands, each run in a fresh interpreter.
+
+Without a command, measures cold start (``<command> --help``) of every
+registered subcommand. With a command after ``--``, runs it ``--repeat``
+times (after ``--warmup`` runs) and reports min/median/max.
+
+Usage:
+    python -m mplp_vlab.bench [--repeat N] [--json]
+    python -m mplp_vlab.bench [--repeat N] [--warmup K] -- verify data/runs/gf-01-a2a-pass
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any
+
+from .cli import COMMANDS
+
+COLD_START_BUDGET_MS = 100.0
+
+
+def time_command(args: list[str], repeat: int = 10, warmup: int = 1) -> dict[str, Any]:
+    argv = [sys.executable, "-m", "mplp_vlab", *args]
+    samples: list[float] = []
+    returncode = 0
+    for i in range(warmup + repeat):
+        start = time.perf_counter()
+        returncode = subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode
+        elapsed = (time.perf_counter() - start) * 1000
+        if i >= warmup:
+            samples.append(elapsed)
+    return {
+        "command": " ".join(args),
+        "returncode": returncode,
+        "runs": repeat,
+        "min_ms": round(min(samples), 1),
+        "median_ms": round(statistics.median(samples), 1),
+        "max_ms": round(max(samples), 1),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    command: list[str] = []
+    if "--" in argv:
+        split = argv.index("--")
+        argv, command = argv[:split], argv[split + 1:]
+
+    parser = argparse.ArgumentParser(description="Benchmark mplp-vlab subcommands")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    targets = [command] if command else [[name, "--help"] for name in COMMANDS]
+    results = [time_command(t, args.repeat, args.warmup) for t in targets]
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for r in results:
+            flag = "" if command or r["median_ms"] <= COLD_START_BUDGET_MS else "  (over cold-start budget)"
+            print(f"{r['median_ms']:8.1f}ms median  {r['min_ms']:8.1f}ms min  {r['command']}{flag}")
+    return 0 if all(r["returncode"] == 0 for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
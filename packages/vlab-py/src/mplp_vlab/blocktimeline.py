@@ -0,0 +1,374 @@
+"""Seekable block-compressed timelines (``events.ndjson.zb``).
+
+NDJSON timelines compress 10-20x. A block timeline stores the same bytes
+as independently compressed blocks of whole lines, followed by a block
+index, so a reader can decompress any one block without touching the
+others (``BlockTimeline.seek_line`` / ``seek_offset``).
+
+Layout::
+
+    MAGIC (8 bytes)
+    block 0 | block 1 | ...                 codec-compressed, whole lines each
+    index (JSON, UTF-8)
+    footer: index offset (u64 LE), index length (u32 LE), MAGIC
+
+The index records the codec (stdlib ``zlib``, ``lzma`` or ``bz2``), and for
+each block ``[offset, length, raw_offset, raw_length, first_line, lines,
+crc32]`` (``raw_*`` positions are in the uncompressed stream, ``crc32`` is
+over the block's uncompressed bytes), plus ``raw_size`` and ``raw_sha256``
+of the whole uncompressed stream.
+
+Integrity stays defined over the canonical uncompressed stream:
+``packhash`` lists ``timeline/events.ndjson.zb`` in the sums as
+``timeline/events.ndjson`` with the sha256 of the decompressed bytes. That
+gives the same sums, and so the same pack roots, as the raw file. The TS
+engine reads raw timelines only; ``unpack`` restores one.
+
+Producers write blocks directly when ``VLAB_TIMELINE_FORMAT=blocks``
+(``write_timeline``).
+
+Usage:
+    python -m mplp_vlab.blocktimeline pack <events.ndjson> [--out FILE] [--block-size BYTES] [--codec zlib|lzma|bz2]
+    python -m mplp_vlab.blocktimeline unpack <events.ndjson.zb> [--out FILE]
+    python -m mplp_vlab.blocktimeline info <events.ndjson.zb>
+    python -m mplp_vlab.blocktimeline cat <events.ndjson.zb> [--line N | --offset BYTES]
+"""
+
+import argparse
+import bisect
+import bz2
+import hashlib
+import json
+import lzma
+import os
+import struct
+import sys
+import zlib
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any
+
+from .timeline import TimelineEvent, parse_line
+
+MAGIC = b"VLABTLB1"
+SUFFIX = ".zb"
+FORMAT_VERSION = 1
+DEFAULT_BLOCK_SIZE = 256 << 10
+DEFAULT_CODEC = "zlib"
+FORMAT_ENV = "VLAB_TIMELINE_FORMAT"  # ndjson (default) | blocks
+
+_FOOTER = struct.Struct("<QI8s")
+
+CODECS: dict[str, tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    "zlib": (lambda b: zlib.compress(b, 6), zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+    "bz2": (bz2.compress, bz2.decompress),
+}
+
+
+class BlockTimelineError(ValueError):
+    """Not a block timeline, or a block does not match its index."""
+
+
+@dataclass(frozen=True)
+class Block:
+    offset: int
+    length: int
+    raw_offset: int
+    raw_length: int
+    first_line: int
+    lines: int
+    crc32: int
+
+
+def is_block_timeline(path: str | Path) -> bool:
+    return str(path).endswith(SUFFIX)
+
+
+# ---------------------------------------------------------------------------
+# Writing
+# ---------------------------------------------------------------------------
+
+class BlockWriter:
+    """Buffers bytes and emits a compressed block at each line boundary past ``block_size``."""
+
+    def __init__(self, path: str | Path, block_size: int = DEFAULT_BLOCK_SIZE, codec: str = DEFAULT_CODEC) -> None:
+        if codec not in CODECS:
+            raise ValueError(f"unknown codec {codec!r} (expected one of {', '.join(CODECS)})")
+        self.path = Path(path)
+        self.block_size = block_size
+        self.codec = codec
+        self._compress = CODECS[codec][0]
+        self._f: IO[bytes] = open(self.path, "wb")
+        self._f.write(MAGIC)
+        self._buf = bytearray()
+        self._sha = hashlib.sha256()
+        self._raw_size = 0
+        self._lines = 0
+        self.blocks: list[Block] = []
+        self.index: dict[str, Any] | None = None
+
+    def write(self, data: bytes) -> None:
+        self._sha.update(data)
+        self._buf += data
+        while len(self._buf) >= self.block_size:
+            cut = self._buf.rfind(b"\n", 0, max(self.block_size, self._buf.find(b"\n") + 1)) + 1
+            if cut == 0:  # one line longer than a block: wait for its end
+                return
+            self._emit(cut)
+
+    def _emit(self, cut: int) -> None:
+        raw = bytes(self._buf[:cut])
+        del self._buf[:cut]
+        packed = self._compress(raw)
+        lines = raw.count(b"\n") + (0 if raw.endswith(b"\n") else 1)
+        self.blocks.append(Block(self._f.tell(), len(packed), self._raw_size, len(raw), self._lines + 1, lines, zlib.crc32(raw)))
+        self._f.write(packed)
+        self._raw_size += len(raw)
+        self._lines += lines
+
+    def close(self) -> dict[str, Any]:
+        """Flush the last block and write the index; returns the index."""
+        if self.index is not None:
+            return self.index
+        if self._buf:
+            self._emit(len(self._buf))
+        self.index = {
+            "format": "vlab-block-timeline",
+            "version": FORMAT_VERSION,
+            "codec": self.codec,
+            "block_size": self.block_size,
+            "raw_size": self._raw_size,
+            "raw_sha256": self._sha.hexdigest(),
+            "lines": self._lines,
+            "blocks": [[b.offset, b.length, b.raw_offset, b.raw_length, b.first_line, b.lines, b.crc32] for b in self.blocks],
+        }
+        body = json.dumps(self.index, separators=(",", ":")).encode("utf-8")
+        index_offset = self._f.tell()
+        self._f.write(body)
+        self._f.write(_FOOTER.pack(index_offset, len(body), MAGIC))
+        self._f.close()
+        return self.index
+
+    def __enter__(self) -> "BlockWriter":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        if exc[0] is None:
+            self.close()
+        else:
+            self._f.close()
+
+
+def pack_stream(source: IO[bytes], dest: str | Path, block_size: int = DEFAULT_BLOCK_SIZE,
+                codec: str = DEFAULT_CODEC) -> dict[str, Any]:
+    with BlockWriter(dest, block_size, codec) as writer:
+        for chunk in iter(lambda: source.read(1 << 20), b""):
+            writer.write(chunk)
+    return writer.close()
+
+
+def timeline_format() -> str:
+    fmt = os.environ.get(FORMAT_ENV, "ndjson").strip().lower() or "ndjson"
+    if fmt not in ("ndjson", "blocks"):
+        raise ValueError(f"{FORMAT_ENV}={fmt!r} (expected ndjson or blocks)")
+    return fmt
+
+
+def write_timeline(path: str | Path, data: bytes | Iterable[bytes], fmt: str | None = None) -> tuple[Path, str]:
+    """Write a timeline at ``path`` (``.../events.ndjson``), raw or as ``events.ndjson.zb``.
+
+    Returns the file written and the sha256 of the canonical uncompressed bytes.
+    """
+    path = Path(path)
+    chunks = [data] if isinstance(data, bytes) else data
+    if (fmt or timeline_format()) == "blocks":
+        with BlockWriter(path.with_name(path.name + SUFFIX)) as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+        return writer.path, writer.close()["raw_sha256"]
+    sha = hashlib.sha256()
+    with open(path, "wb") as f:
+        for chunk in chunks:
+            sha.update(chunk)
+            f.write(chunk)
+    return path, sha.hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+def _lines(raw: bytes) -> Iterator[bytes]:
+    """``raw`` split after each LF (like iterating a binary file)."""
+    start = 0
+    while start < len(raw):
+        end = raw.find(b"\n", start) + 1 or len(raw)
+        yield raw[start:end]
+        start = end
+
+
+class BlockTimeline:
+    """Random access to the blocks of a block timeline."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._f: IO[bytes] = open(self.path, "rb")
+        try:
+            self.index = self._read_index()
+        except BaseException:
+            self._f.close()
+            raise
+        self._decompress = CODECS[self.index["codec"]][1]
+        try:
+            self.blocks = [Block(*b) for b in self.index["blocks"]]
+        except (KeyError, TypeError):
+            self._f.close()
+            raise BlockTimelineError(f"{self.path}: malformed block index") from None
+        self._raw_starts = [b.raw_offset for b in self.blocks]
+        self._line_starts = [b.first_line for b in self.blocks]
+
+    def _read_index(self) -> dict[str, Any]:
+        if self._f.read(len(MAGIC)) != MAGIC:
+            raise BlockTimelineError(f"{self.path}: not a block timeline")
+        self._f.seek(-_FOOTER.size, os.SEEK_END)
+        index_offset, index_length, magic = _FOOTER.unpack(self._f.read(_FOOTER.size))
+        if magic != MAGIC:
+            raise BlockTimelineError(f"{self.path}: truncated (no footer)")
+        self._f.seek(index_offset)
+        try:
+            index = json.loads(self._f.read(index_length))
+        except ValueError:
+            raise BlockTimelineError(f"{self.path}: unreadable index") from None
+        if not isinstance(index, dict) or index.get("version") != FORMAT_VERSION or index.get("codec") not in CODECS:
+            raise BlockTimelineError(f"{self.path}: unsupported version or codec")
+        return index
+
+    def __len__(self) -> int:
+        return len(self.blocks)
+
+    @property
+    def raw_sha256(self) -> str:
+        return self.index["raw_sha256"]
+
+    def read_block(self, i: int) -> bytes:
+        b = self.blocks[i]
+        self._f.seek(b.offset)
+        try:
+            raw = self._decompress(self._f.read(b.length))
+        except (zlib.error, lzma.LZMAError, OSError, ValueError) as e:
+            raise BlockTimelineError(f"{self.path}: block {i} does not decompress ({e})") from None
+        if len(raw) != b.raw_length or zlib.crc32(raw) != b.crc32:
+            raise BlockTimelineError(f"{self.path}: block {i} does not match the index")
+        return raw
+
+    def seek_offset(self, raw_offset: int) -> int:
+        """Block holding byte ``raw_offset`` of the uncompressed stream."""
+        return max(0, bisect.bisect_right(self._raw_starts, raw_offset) - 1)
+
+    def seek_line(self, line: int) -> int:
+        """Block holding 1-based ``line``."""
+        return max(0, bisect.bisect_right(self._line_starts, line) - 1)
+
+    def iter_raw(self, start_block: int = 0) -> Iterator[bytes]:
+        for i in range(start_block, len(self.blocks)):
+            yield self.read_block(i)
+
+    def iter_events(self, start_block: int = 0) -> Iterator[TimelineEvent]:
+        """Events from ``start_block`` on, with offsets and line numbers of the uncompressed stream."""
+        for i in range(start_block, len(self.blocks)):
+            b = self.blocks[i]
+            offset = b.raw_offset
+            for line_no, raw in enumerate(_lines(self.read_block(i)), start=b.first_line):
+                event = parse_line(raw, offset, line_no)
+                offset += len(raw)
+                if event is not None:
+                    yield event
+
+    def events_from_line(self, line: int) -> Iterator[TimelineEvent]:
+        for event in self.iter_events(self.seek_line(line)):
+            if event.line >= line:
+                yield event
+
+    def canonical_sha256(self) -> str:
+        """Recomputed sha256 of the uncompressed stream (blocks decompressed one at a time).
+
+        Raises ``BlockTimelineError`` when it disagrees with the index's ``raw_sha256``.
+        """
+        sha = hashlib.sha256()
+        for raw in self.iter_raw():
+            sha.update(raw)
+        digest = sha.hexdigest()
+        if digest != self.index.get("raw_sha256"):
+            raise BlockTimelineError(f"{self.path}: stream does not match the index raw_sha256")
+        return digest
+
+    def close(self) -> None:
+        self._f.close()
+
+    def __enter__(self) -> "BlockTimeline":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def canonical_sha256(path: str | Path) -> str:
+    with BlockTimeline(path) as timeline:
+        return timeline.canonical_sha256()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Seekable block-compressed timelines")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_pack = sub.add_parser("pack", help="Compress an NDJSON timeline")
+    p_pack.add_argument("source")
+    p_pack.add_argument("--out", help=f"Default: <source>{SUFFIX}")
+    p_pack.add_argument("--block-size", type=int, default=DEFAULT_BLOCK_SIZE, help="Uncompressed bytes per block")
+    p_pack.add_argument("--codec", choices=sorted(CODECS), default=DEFAULT_CODEC)
+    p_unpack = sub.add_parser("unpack", help="Restore the raw NDJSON")
+    p_unpack.add_argument("source")
+    p_unpack.add_argument("--out", help=f"Default: <source> without {SUFFIX}")
+    p_info = sub.add_parser("info", help="Print the index summary")
+    p_info.add_argument("source")
+    p_cat = sub.add_parser("cat", help="Print events, optionally from a line or byte offset on")
+    p_cat.add_argument("source")
+    where = p_cat.add_mutually_exclusive_group()
+    where.add_argument("--line", type=int, default=1)
+    where.add_argument("--offset", type=int)
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "pack":
+            out = Path(args.out or args.source + SUFFIX)
+            with open(args.source, "rb") as f:
+                index = pack_stream(f, out, args.block_size, args.codec)
+            ratio = index["raw_size"] / max(1, out.stat().st_size)
+            print(f"{index['raw_sha256']}  {out}  ({len(index['blocks'])} blocks, {ratio:.1f}x)")
+            return 0
+        with BlockTimeline(args.source) as timeline:
+            if args.command == "unpack":
+                out = Path(args.out or args.source.removesuffix(SUFFIX))
+                with open(out, "wb") as f:
+                    for raw in timeline.iter_raw():
+                        f.write(raw)
+                print(f"{timeline.raw_sha256}  {out}")
+            elif args.command == "info":
+                summary = {k: v for k, v in timeline.index.items() if k != "blocks"}
+                print(json.dumps({**summary, "blocks": len(timeline), "stored_size": timeline.path.stat().st_size}, indent=2))
+            elif args.offset is not None:
+                for ev in timeline.iter_events(timeline.seek_offset(args.offset)):
+                    if ev.offset >= args.offset:
+                        print(json.dumps(ev.data))
+            else:
+                for ev in timeline.events_from_line(args.line):
+                    print(json.dumps(ev.data))
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,291 @@
+"""Streaming D1 budget accumulator.
+
+Keeps a running total per (agent, resource) of the amounts granted by
+``budget.decision`` events and checks them against the ceilings declared in
+the scenario YAML:
+
+    budget:
+      ceilings:
+        token_quota: 1000
+
+A timeline without any budget decision fails CL-D1-01 (reason
+``D1_DECISION_EVENT_MISSING``, as ``lib/rulesets`` reports it). Two checks
+are applied per decision:
+
+- CL-D1-02: the outcome is present and in the allowed set (when the ruleset
+  enables the clause)
+- ceiling: the granted total for (agent, resource) stays within the scenario
+  ceiling (reason ``D1_BUDGET_CEILING_EXCEEDED``)
+
+Only granted outcomes (allow group, ``resume``) consume budget; deny,
+throttle and suspend decisions are counted but add nothing to the total.
+
+Usable post hoc over a timeline (``scan_timeline``) or live while a producer
+logs events (``BudgetGuard``), so an over-budget run can be aborted before
+it is sealed.
+
+Usage:
+    python -m mplp_vlab.budget <events.ndjson|pack_dir> [--scenario ID] [--ruleset ruleset-1.3] [--all]
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import IO, Any
+
+from .rulesets import DEFAULT_RULESET, ruleset_clauses
+from .scenarios import ScenarioNotFoundError, budget_ceilings
+from .synonyms import SYNONYMS, in_synonym_group, is_valid_budget_outcome, normalize_token
+from .timeline import event_type_of, find_timeline, iter_events
+
+CEILING_CHECK = "SCN-BUDGET-CEILING"
+
+# Events without agent_id are charged to the run
+RUN_SCOPE = "*"
+
+_GRANTED_OUTCOMES = SYNONYMS["outcome_allow"] | {"resume", "resumed"}
+
+
+@dataclass(frozen=True)
+class BudgetViolation:
+    clause_id: str
+    reason_code: str
+    offset: int
+    line: int
+    event_id: str | None
+    agent_id: str | None
+    resource: str | None
+    total: float | None
+    ceiling: float | None
+    message: str
+
+
+@dataclass
+class BudgetReport:
+    ruleset_id: str
+    decisions: int
+    totals: dict[str, dict[str, float]]
+    ceilings: dict[str, float]
+    violation_count: int
+    first_violation: BudgetViolation | None
+
+    @property
+    def ok(self) -> bool:
+        return self.violation_count == 0
+
+    def to_dict(self) -> dict[str, Any]:
+        d = asdict(self)
+        d["verdict"] = "PASS" if self.ok else "FAIL"
+        return d
+
+
+class BudgetExceeded(RuntimeError):
+    """Raised by ``BudgetGuard`` when a logged event violates the budget."""
+
+    def __init__(self, violation: BudgetViolation):
+        super().__init__(f"{violation.reason_code}: {violation.message}")
+        self.violation = violation
+
+
+def _fields(event: dict[str, Any]) -> dict[str, Any]:
+    # Producer timelines nest the payload under "data"
+    nested = event.get("data") or event.get("payload")
+    if isinstance(nested, dict):
+        return {**nested, **{k: v for k, v in event.items() if k not in ("data", "payload")}}
+    return event
+
+
+def is_budget_decision(event: dict[str, Any]) -> bool:
+    """Same D1 inference as ``inferPrimaryDomain`` in ``lib/evidence/extract.ts``."""
+    et = normalize_token(event_type_of(event))
+    kind = event.get("decision_kind") or event.get("kind")
+    return (
+        (kind is not None and in_synonym_group("decision_kind_budget", kind))
+        or "budget" in et
+        or "quota" in et
+        or "throttle" in et
+    )
+
+
+def _amount(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class BudgetAccumulator:
+    """Incremental accumulator: ``feed`` events in stream order, then ``finish``."""
+
+    def __init__(self, ceilings: dict[str, float] | None = None, ruleset_id: str = DEFAULT_RULESET):
+        self.ruleset_id = ruleset_id
+        self.ceilings = dict(ceilings or {})
+        clauses = ruleset_clauses(ruleset_id)
+        self._check_presence = "CL-D1-01" in clauses
+        self._check_outcome = "CL-D1-02" in clauses
+        self.totals: dict[tuple[str, str], float] = {}
+        self.decisions = 0
+        self.violation_count = 0
+        self.first_violation: BudgetViolation | None = None
+
+    def feed(self, event: dict[str, Any], offset: int = 0, line: int = 0) -> BudgetViolation | None:
+        fields = _fields(event)
+        if not is_budget_decision(fields):
+            return None
+        self.decisions += 1
+
+        agent = fields.get("agent_id") or RUN_SCOPE
+        resource = fields.get("resource") or fields.get("budget_scope") or fields.get("quota_id")
+        raw_outcome = fields.get("outcome") or fields.get("decision_outcome") or fields.get("result")
+
+        def violation(clause_id: str, reason: str, message: str, total=None, ceiling=None) -> BudgetViolation:
+            v = BudgetViolation(
+                clause_id=clause_id,
+                reason_code=reason,
+                offset=offset,
+                line=line,
+                event_id=fields.get("event_id"),
+                agent_id=None if agent == RUN_SCOPE else agent,
+                resource=resource,
+                total=total,
+                ceiling=ceiling,
+                message=message,
+            )
+            self._record(v)
+            return v
+
+        if self._check_outcome:
+            if not raw_outcome:
+                return violation("CL-D1-02", "D1_DECISION_OUTCOME_MISSING", "budget decision has no outcome")
+            if not is_valid_budget_outcome(raw_outcome):
+                return violation("CL-D1-02", "D1_OUTCOME_INVALID", f"outcome '{raw_outcome}' not in allowed set")
+
+        if resource is None or normalize_token(raw_outcome) not in _GRANTED_OUTCOMES:
+            return None
+
+        key = (agent, str(resource))
+        total = self.totals.get(key, 0.0) + _amount(fields.get("amount"))
+        self.totals[key] = total
+        ceiling = self.ceilings.get(str(resource))
+        if ceiling is not None and total > ceiling:
+            return violation(
+                CEILING_CHECK,
+                "D1_BUDGET_CEILING_EXCEEDED",
+                f"{resource} total {total:g} exceeds ceiling {ceiling:g}",
+                total=total,
+                ceiling=ceiling,
+            )
+        return None
+
+    def finish(self) -> BudgetReport:
+        totals: dict[str, dict[str, float]] = {}
+        for (agent, resource), total in sorted(self.totals.items()):
+            totals.setdefault(agent, {})[resource] = total
+        violation_count, first_violation = self.violation_count, self.first_violation
+        if self.decisions == 0 and self._check_presence:
+            violation_count += 1
+            first_violation = BudgetViolation(
+                clause_id="CL-D1-01",
+                reason_code="D1_DECISION_EVENT_MISSING",
+                offset=0,
+                line=0,
+                event_id=None,
+                agent_id=None,
+                resource=None,
+                total=None,
+                ceiling=None,
+                message="timeline has no budget decision",
+            )
+        return BudgetReport(
+            ruleset_id=self.ruleset_id,
+            decisions=self.decisions,
+            totals=totals,
+            ceilings=self.ceilings,
+            violation_count=violation_count,
+            first_violation=first_violation,
+        )
+
+    def _record(self, violation: BudgetViolation) -> None:
+        self.violation_count += 1
+        if self.first_violation is None:
+            self.first_violation = violation
+
+
+class BudgetGuard:
+    """Live check for producers: ``observe`` each logged event, raises ``BudgetExceeded``."""
+
+    def __init__(self, ceilings: dict[str, float] | None = None, ruleset_id: str = DEFAULT_RULESET):
+        self.accumulator = BudgetAccumulator(ceilings, ruleset_id)
+        self._seq = 0
+
+    @classmethod
+    def for_scenario(cls, scenario_id: str, ruleset_id: str = DEFAULT_RULESET) -> "BudgetGuard":
+        return cls(budget_ceilings(scenario_id), ruleset_id)
+
+    def observe(self, event: dict[str, Any]) -> None:
+        self._seq += 1
+        violation = self.accumulator.feed(event, line=self._seq)
+        if violation is not None:
+            raise BudgetExceeded(violation)
+
+
+def scan_timeline(
+    source: str | Path | IO[bytes],
+    ceilings: dict[str, float] | None = None,
+    ruleset_id: str = DEFAULT_RULESET,
+    fail_fast: bool = True,
+) -> BudgetReport:
+    """Accumulate budget decisions over an NDJSON timeline in one streaming pass."""
+    acc = BudgetAccumulator(ceilings, ruleset_id)
+    for ev in iter_events(source):
+        if acc.feed(ev.data, ev.offset, ev.line) and fail_fast:
+            break
+    return acc.finish()
+
+
+def _scenario_of_pack(pack_dir: Path) -> str | None:
+    for name in ("manifest.json", "bundle.manifest.json"):
+        path = pack_dir / name
+        if path.is_file():
+            with open(path, encoding="utf-8") as f:
+                scenario_id = json.load(f).get("scenario_id")
+            if scenario_id:
+                return scenario_id
+    return None
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Streaming D1 budget accumulator")
+    parser.add_argument("source", help="events.ndjson, a pack directory, or '-' for stdin")
+    parser.add_argument("--scenario", help="Scenario ID for ceilings (default: pack manifest scenario_id)")
+    parser.add_argument("--ruleset", default=DEFAULT_RULESET)
+    parser.add_argument("--all", action="store_true", help="Count all violations instead of stopping at the first")
+    args = parser.parse_args(argv)
+
+    ceilings = budget_ceilings(args.scenario) if args.scenario else {}
+    if args.source == "-":
+        source = sys.stdin.buffer
+    elif Path(args.source).is_dir():
+        pack_dir = Path(args.source)
+        source = find_timeline(pack_dir)
+        if source is None:
+            print(f"No timeline found in {pack_dir}", file=sys.stderr)
+            return 2
+        if not args.scenario:
+            scenario_id = _scenario_of_pack(pack_dir)
+            try:
+                ceilings = budget_ceilings(scenario_id) if scenario_id else {}
+            except ScenarioNotFoundError:
+                ceilings = {}
+    else:
+        source = args.source
+
+    report = scan_timeline(source, ceilings, args.ruleset, fail_fast=not args.all)
+    print(json.dumps(report.to_dict(), indent=2))
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""``mplp-vlab``: one entry point for the Python tooling.
+
+Subcommands are registered by module path and imported only when invoked,
+so each pays only for its own dependencies; ``mplp-vlab --help`` imports
+none of them. Every subcommand module exposes ``main(argv) -> int`` and
+stays runnable as ``python -m mplp_vlab.<module>``.
+
+Usage:
+    mplp-vlab <command> [args...]
+    python -m mplp_vlab <command> [args...]
+"""
+
+import sys
+
+# name -> (module, one-line help). Import nothing here.
+COMMANDS: dict[str, tuple[str, str]] = {
+    "generate": ("mplp_vlab.generate", "Generate a gf-01 cross-substrate test-vector pack"),
+    "regenerate": ("mplp_vlab.regenerate", "Regenerate the whole gf-01 vector set concurrently"),
+    "produce": ("mplp_vlab.produce", "Run a real producer into an out_dir"),
+    "produce-many": ("mplp_vlab.multiproduce", "Many producer runs concurrently in one process"),
+    "batch": ("mplp_vlab.batch", "Resumable batch production with a checkpoint journal"),
+    "shard": ("mplp_vlab.shard", "Run one shard of the run matrix, or merge shard summaries"),
+    "runstore": ("mplp_vlab.runstore", "Resolve run directories; migrate run roots to the hash fan-out layout"),
+    "seal": ("mplp_vlab.seal", "Write integrity/sha256sums.txt and the pack root hash"),
+    "verify": ("mplp_vlab.verify", "Two-tier pack integrity verification"),
+    "merkle": ("mplp_vlab.merkle", "Merkle pack root and per-artifact inclusion proofs"),
+    "failfuzz": ("mplp_vlab.failfuzz", "Mutation fuzzer: labelled fail variants of a passing pack"),
+    "timelinediff": ("mplp_vlab.timelinediff", "Streaming timeline differ aligned by event_id"),
+    "blocktimeline": ("mplp_vlab.blocktimeline", "Seekable block-compressed timelines (events.ndjson.zb)"),
+    "treehash": ("mplp_vlab.treehash", "Parallel BLAKE2b tree digests of large files"),
+    "verify-batch": ("mplp_vlab.batchverify", "Verify every pack in the repository (process pool)"),
+    "equivalence": ("mplp_vlab.equivalence", "Cross-substrate / run-to-run equivalence record"),
+    "perf": ("mplp_vlab.perf", "Per-phase producer performance reports and per-substrate summary"),
+    "trace": ("mplp_vlab.tracing", "Summarize an opt-in producer span trace"),
+    "bench": ("mplp_vlab.bench", "Time subcommands (cold start and repeated runs)"),
+    "lifecycle": ("mplp_vlab.lifecycle", "D2 lifecycle state-machine validation"),
+    "budget": ("mplp_vlab.budget", "D1 budget accumulation"),
+    "handoff": ("mplp_vlab.handoff", "GF-01 handoff graph consistency"),
+    "schema": ("mplp_vlab.schema", "JSON Schema validation"),
+    "hashindex": ("mplp_vlab.hashindex", "SQLite hash index"),
+    "runner-pool": ("mplp_vlab.runnerpool", "Warm local runner pool"),
+    "lockmemo": ("mplp_vlab.lockmemo", "Lockfile / env fingerprint memo"),
+}
+
+PROG = "mplp-vlab"
+
+
+def _usage() -> str:
+    width = max(map(len, COMMANDS))
+    lines = [f"usage: {PROG} <command> [args...]", "", "commands:"]
+    lines += [f"  {name:<{width}}  {help_}" for name, (_module, help_) in COMMANDS.items()]
+    lines += ["", f"Run '{PROG} <command> --help' for command options."]
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or argv[0] in ("-h", "--help"):
+        print(_usage())
+        return 0 if argv else 2
+    if argv[0] == "--version":
+        from . import __version__
+        print(f"{PROG} {__version__}")
+        return 0
+
+    name, rest = argv[0], argv[1:]
+    if name not in COMMANDS:
+        print(f"{PROG}: unknown command '{name}'\n\n{_usage()}", file=sys.stderr)
+        return 2
+
+    from importlib import import_module
+
+    module = import_module(COMMANDS[name][0])
+    sys.argv[0] = f"{PROG} {name}"  # argparse prog in subcommand help
+    return module.main(rest)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
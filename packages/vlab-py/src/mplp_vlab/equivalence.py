@@ -0,0 +1,90 @@
+"""Equivalence record over a set of packs.
+
+Python port of ``test-vectors/cross-substrate/gf-01/verify_equivalence.ts``
+generalized to any number of packs:
+
+- ``pack_root_hash``: sha256 of ``integrity/sha256sums.txt``
+- ``verdict_hash``: sha256 over the concatenated hex sha256 of
+  ``artifacts/*`` in name order (the TS local evaluator verdict)
+
+``root_match`` (every pack has the same root, i.e. run-to-run determinism)
+and ``verdict_match`` (every pack has the same verdict hash) are reported
+side by side; ``--expect`` selects which one decides the exit code.
+
+Usage:
+    python -m mplp_vlab.equivalence <pack_dir>... [--expect root|verdict] [--out FILE]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+from .packhash import SUMS_PATH, hash_file, sha256_bytes
+
+
+def verdict_hash(pack_dir: str | Path) -> str:
+    artifacts = Path(pack_dir) / "artifacts"
+    combined = "".join(hash_file(f) for f in sorted(artifacts.iterdir(), key=lambda p: p.name) if f.is_file())
+    return sha256_bytes(combined.encode("ascii"))
+
+
+def _substrate(manifest: dict[str, Any]) -> str | None:
+    substrate = manifest.get("substrate")
+    if isinstance(substrate, dict):
+        return substrate.get("type")
+    if substrate:
+        return substrate
+    return (manifest.get("substrate_ref") or {}).get("substrate_id")
+
+
+def pack_info(pack_dir: str | Path) -> dict[str, Any]:
+    pack_dir = Path(pack_dir)
+    manifest_path = pack_dir / "manifest.json"
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8")) if manifest_path.is_file() else {}
+    return {
+        "pack": str(pack_dir),
+        "pack_id": manifest.get("pack_id"),
+        "scenario_id": manifest.get("scenario_id"),
+        "substrate": _substrate(manifest),
+        "pack_root_hash": hash_file(pack_dir / SUMS_PATH),
+        "verdict_hash": verdict_hash(pack_dir),
+    }
+
+
+def equivalence_record(packs: list[str | Path]) -> dict[str, Any]:
+    infos = [pack_info(p) for p in packs]
+    scenarios = sorted({i["scenario_id"] for i in infos if i["scenario_id"]})
+    return {
+        "scenario_ids": scenarios,
+        "evaluator": "mplp-vlab",
+        "equivalence_type": "cross_substrate" if len({i["substrate"] for i in infos}) > 1 else "run_to_run",
+        "packs": infos,
+        "root_match": len({i["pack_root_hash"] for i in infos}) == 1,
+        "verdict_match": len({i["verdict_hash"] for i in infos}) == 1,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Pack equivalence record")
+    parser.add_argument("packs", nargs="+", help="Pack directories (two or more)")
+    parser.add_argument("--expect", choices=("root", "verdict"), default="verdict",
+                        help="Match that decides the exit code")
+    parser.add_argument("--out", help="Write the record here instead of stdout")
+    args = parser.parse_args(argv)
+    if len(args.packs) < 2:
+        parser.error("need at least two packs")
+
+    record = equivalence_record(args.packs)
+    text = json.dumps(record, indent=2) + "\n"
+    if args.out:
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.out).write_text(text, encoding="utf-8")
+    else:
+        sys.stdout.write(text)
+    return 0 if record[f"{args.expect}_match"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
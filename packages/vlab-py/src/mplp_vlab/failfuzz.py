@@ -0,0 +1,623 @@
+"""Mutation-based fail-pack fuzzer.
+
+Takes a passing pack and writes many mutated variants of it, each labelled
+with the verdict a correct verifier must reach. Mutations are
+domain-aware and only applied where the source makes them meaningful:
+
+- ``drop_confirm`` (D3, CL-D3-03): drops confirm/gate/audit events and turns
+  an allowed authz decision into a deny
+- ``reorder_lifecycle`` (D2, CL-D2-03): moves a terminal transition in front
+  of an earlier active transition or execution event of the same scope
+- ``drop_terminal`` (D2, CL-D2-01): removes every terminal transition
+- ``corrupt_terminal_state`` (D2, CL-D2-02): replaces or drops the state of a
+  terminal transition
+- ``corrupt_outcome`` (D1, CL-D1-02): replaces or drops a budget outcome
+- ``break_handoff`` (GF-01): redirects a handoff to an agent that never
+  receives it, or drops the receiver's ``agent.init``
+- ``tamper_byte`` (integrity): flips one byte of a sealed file after sealing
+
+Timeline mutations are resealed under the source's root convention, so only
+the targeted check can catch them; ``tamper_byte`` is the one mutation
+applied after sealing. Untouched timeline lines keep their original bytes.
+
+The source timeline is located like the TypeScript loader does
+(``find_timeline``); a run whose ``bundle.manifest.json`` ``pack_root``
+points outside it (``data/runs`` bundles of ``public/data/runs`` packs) is
+fuzzed from that pack. The source is first resealed into
+``<out>/baseline`` and run through the
+Python checkers (``verify``, ``budget``, ``lifecycle``, ``handoff``): a
+mutation whose checker already fails on the baseline is skipped, since its
+variants would prove nothing. There is no Python D3 checker, so
+``drop_confirm`` variants are labelled for the TypeScript verifier and
+reported as ``unchecked``.
+
+Variants are built on a process pool, one ``random.Random`` per variant
+seeded from ``(seed, index)``, so a run is reproducible regardless of the
+worker count. ``labels.jsonl`` holds one line per variant, in index order:
+
+    {"variant": "...", "mutation": "corrupt_outcome", "detail": {...},
+     "expected": {"verdict": "FAIL", "checker": "budget", "reason_codes": [...]}}
+
+With ``--check`` each worker also runs the checkers on its variant and
+records the observed verdicts and timings. A variant a checker passes is a
+false pass (exit 1); a checker that raises is a crash (exit 1); the
+slowest variants are listed in ``summary.json`` to point at verifier slow
+paths. ``--discard`` deletes checked variants and keeps only the labels.
+
+Usage:
+    python -m mplp_vlab.failfuzz <pass_pack> --out DIR [--variants 1000] [--seed 0] [--workers N] [--mutations a,b] [--check] [--discard]
+"""
+
+import argparse
+import json
+import random
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+from .budget import is_budget_decision, scan_timeline
+from .handoff import AGENT_INIT, HANDOFF, check_pack
+from .lifecycle import (
+    EXECUTION,
+    TRANSITION_ACTIVE,
+    TRANSITION_INVALID,
+    TRANSITION_TERMINAL,
+    classify_event,
+    validate_timeline,
+)
+from .merkle import MERKLE_ROOT_PATH
+from .packhash import BLOCK_TIMELINE_SUFFIX, hash_canonical, read_declared_root, read_sums, stored_path
+from .rulesets import DEFAULT_RULESET, ruleset_clauses
+from .scenarios import ScenarioNotFoundError, budget_ceilings
+from .seal import seal_pack
+from .synonyms import in_synonym_group, is_valid_budget_outcome, normalize_token
+from .timeline import event_type_of, find_timeline, iter_events, pack_root
+from .treehash import read_mode
+from .verify import full_verify
+
+CHECKERS = ("integrity", "budget", "lifecycle", "handoff")
+
+# Same tokens as CL-D3-03 in lib/rulesets/ruleset-1.3/clauses.ts
+CONFIRM_TOKENS = ("confirm", "gate", "audit")
+
+_OUTCOME_KEYS = ("outcome", "decision_outcome", "result")
+_STATE_KEYS = ("to_state", "state", "status")
+_NESTED_KEYS = ("data", "payload")
+
+
+@dataclass
+class Mutation:
+    events: list[dict[str, Any]]
+    checker: str  # a CHECKERS name, or "d3" (TypeScript only)
+    clause_id: str
+    reason_codes: list[str]
+    detail: dict[str, Any] = field(default_factory=dict)
+    tamper: bool = False
+
+
+@dataclass
+class Variant:
+    index: int
+    variant: str
+    source: str
+    mutation: str
+    seed: str
+    clause_id: str
+    expected: dict[str, Any]
+    detail: dict[str, Any]
+    observed: dict[str, dict[str, Any]] | None = None
+    status: str | None = None  # caught | false_pass | reason_mismatch | crash | unchecked
+
+    def to_dict(self) -> dict[str, Any]:
+        d = asdict(self)
+        if self.observed is None:
+            del d["observed"], d["status"]
+        return d
+
+
+# --- event helpers -----------------------------------------------------------
+
+def _holder(event: dict[str, Any], keys: tuple[str, ...]) -> dict[str, Any] | None:
+    """The dict carrying the first of ``keys``: the event itself, else its nested payload."""
+    if any(event.get(k) for k in keys):
+        return event
+    for name in _NESTED_KEYS:
+        nested = event.get(name)
+        if isinstance(nested, dict) and any(nested.get(k) for k in keys):
+            return nested
+    return None
+
+
+def _replace(event: dict[str, Any], keys: tuple[str, ...], value: Any) -> dict[str, Any]:
+    """Copy of ``event`` with the first present key of ``keys`` set to ``value`` (all dropped when None)."""
+    event = dict(event)
+    targets = [event]
+    for name in _NESTED_KEYS:
+        if isinstance(event.get(name), dict):
+            event[name] = dict(event[name])
+            targets.append(event[name])
+    for target in targets:
+        for key in keys:
+            if value is None:
+                target.pop(key, None)
+            elif target.get(key):
+                target[key] = value
+                return event
+    if value is not None:
+        event[keys[0]] = value
+    return event
+
+
+def _outcome(event: dict[str, Any]) -> Any:
+    holder = _holder(event, _OUTCOME_KEYS)
+    return next((holder[k] for k in _OUTCOME_KEYS if holder.get(k)), None) if holder else None
+
+
+def _is_authz(event: dict[str, Any]) -> bool:
+    kind = event.get("decision_kind") or event.get("kind")
+    return (kind is not None and in_synonym_group("decision_kind_authz", kind)) or "authz" in normalize_token(event_type_of(event))
+
+
+def _bogus(rng: random.Random, valid: Callable[[str], bool]) -> str:
+    while True:
+        token = rng.choice(["bogus", "unknown", "maybe", "n/a", "ALLOW?", "0"]) + f"_{rng.randrange(1 << 16):04x}"
+        if not valid(token):
+            return token
+
+
+# --- mutations ----------------------------------------------------------------
+# Each takes (events, rng, clauses) and returns None when the source offers no target.
+
+def drop_confirm(events: list[dict[str, Any]], rng: random.Random, clauses: frozenset[str]) -> Mutation | None:
+    gates = {i for i, e in enumerate(events) if any(t in normalize_token(event_type_of(e)) for t in CONFIRM_TOKENS)}
+    authz = [i for i, e in enumerate(events) if _is_authz(e) and i not in gates]
+    if not authz or "CL-D3-03" not in clauses or not _outcome(events[authz[0]]):
+        return None
+    first = authz[0]
+    allowed = in_synonym_group("outcome_allow", _outcome(events[first]))
+    if not allowed and not gates:
+        return None  # the source itself would fail CL-D3-03
+    out = list(events)
+    if allowed:
+        out[first] = _replace(events[first], _OUTCOME_KEYS, rng.choice(["deny", "denied", "reject"]))
+    out = [e for i, e in enumerate(out) if i not in gates]
+    return Mutation(out, "d3", "CL-D3-03", ["D3_DENY_WITHOUT_CONFIRM_GATE"],
+                    {"dropped": len(gates), "event_id": events[first].get("event_id")})
+
+
+def reorder_lifecycle(events: list[dict[str, Any]], rng: random.Random, clauses: frozenset[str]) -> Mutation | None:
+    if "CL-D2-03" not in clauses:
+        return None
+    classes = [classify_event(e) for e in events]
+    moves = []
+    for t, cls in enumerate(classes):
+        if cls != TRANSITION_TERMINAL:
+            continue
+        agent = events[t].get("agent_id")
+        moves += [
+            (t, j) for j in range(t) if classes[j] in (TRANSITION_ACTIVE, EXECUTION)
+            and (agent is None or events[j].get("agent_id") == agent)
+        ]
+    if not moves:
+        return None
+    t, j = rng.choice(moves)
+    out = events[:t] + events[t + 1:]
+    out.insert(j, events[t])
+    return Mutation(out, "lifecycle", "CL-D2-03",
+                    ["D2_TERMINAL_STATE_REVERSAL_DETECTED", "D2_POST_TERMINAL_EXECUTION_DETECTED"],
+                    {"event_id": events[t].get("event_id"), "before": events[j].get("event_id")})
+
+
+def drop_terminal(events: list[dict[str, Any]], rng: random.Random, clauses: frozenset[str]) -> Mutation | None:
+    terminal = [e for e in events if classify_event(e) == TRANSITION_TERMINAL]
+    if not terminal or "CL-D2-01" not in clauses:
+        return None
+    out = [e for e in events if classify_event(e) != TRANSITION_TERMINAL]
+    return Mutation(out, "lifecycle", "CL-D2-01", ["D2_TERMINAL_EVENT_MISSING"], {"dropped": len(terminal)})
+
+
+def corrupt_terminal_state(events: list[dict[str, Any]], rng: random.Random, clauses: frozenset[str]) -> Mutation | None:
+    terminal = [i for i, e in enumerate(events) if classify_event(e) == TRANSITION_TERMINAL]
+    if not terminal or "CL-D2-02" not in clauses:
+        return None
+    i = rng.choice(terminal)
+    state = None if rng.random() < 0.25 else _bogus(rng, lambda s: classify_event({"type": "lifecycle", "state": s}) != TRANSITION_INVALID)
+    out = list(events)
+    out[i] = _replace(events[i], _STATE_KEYS, state)
+    # Dropping the only terminal event may surface as CL-D2-01 at end of stream
+    return Mutation(out, "lifecycle", "CL-D2-02",
+                    ["D2_TERMINAL_STATE_NOT_IN_ALLOWED_SET", "D2_TERMINAL_STATE_MISSING", "D2_TERMINAL_EVENT_MISSING"],
+                    {"event_id": events[i].get("event_id"), "state": state})
+
+
+def corrupt_outcome(events: list[dict[str, Any]], rng: random.Random, clauses: frozenset[str]) -> Mutation | None:
+    decisions = [i for i, e in enumerate(events) if is_budget_decision(e)]
+    if not decisions or "CL-D1-02" not in clauses:
+        return None
+    i = rng.choice(decisions)
+    outcome = None if rng.random() < 0.25 else _bogus(rng, is_valid_budget_outcome)
+    out = list(events)
+    out[i] = _replace(events[i], _OUTCOME_KEYS, outcome)
+    reason = "D1_DECISION_OUTCOME_MISSING" if outcome is None else "D1_OUTCOME_INVALID"
+    return Mutation(out, "budget", "CL-D1-02", [reason], {"event_id": events[i].get("event_id"), "outcome": outcome})
+
+
+def break_handoff(events: list[dict[str, Any]], rng: random.Random, clauses: frozenset[str]) -> Mutation | None:
+    handoffs = [i for i, e in enumerate(events) if event_type_of(e) == HANDOFF and e.get("from_agent") and e.get("to_agent")]
+    if not handoffs:
+        return None
+    i = rng.choice(handoffs)
+    sender, receiver = events[i]["from_agent"], events[i]["to_agent"]
+    receipt = next(
+        (j for j in range(i + 1, len(events)) if event_type_of(events[j]) == AGENT_INIT
+         and events[j].get("agent_id") == receiver and events[j].get("received_from") == sender),
+        None,
+    )
+    out = list(events)
+    if receipt is not None and rng.random() < 0.5:
+        del out[receipt]
+        detail = {"mode": "drop_receipt", "event_id": events[receipt].get("event_id")}
+    else:
+        agents = {e.get("agent_id") for e in events} | {e.get("to_agent") for e in events}
+        ghost = next(f"ghost-{n}" for n in range(rng.randrange(1000), 10**6) if f"ghost-{n}" not in agents)
+        out[i] = dict(events[i], to_agent=ghost)
+        detail = {"mode": "redirect", "event_id": events[i].get("event_id"), "to_agent": ghost}
+    return Mutation(out, "handoff", "GF-01",
+                    ["HANDOFF_NOT_RECEIVED", "HANDOFF_RECEIPT_UNMATCHED", "AGENT_ACTED_BEFORE_INIT", "TRACE_COUNT_MISMATCH"],
+                    detail)
+
+
+def tamper_byte(events: list[dict[str, Any]], rng: random.Random, clauses: frozenset[str]) -> Mutation | None:
+    return Mutation(events, "integrity", "INTEGRITY", ["mismatch"], tamper=True)
+
+
+MUTATIONS: dict[str, Callable[[list[dict[str, Any]], random.Random, frozenset[str]], Mutation | None]] = {
+    "drop_confirm": drop_confirm,
+    "reorder_lifecycle": reorder_lifecycle,
+    "drop_terminal": drop_terminal,
+    "corrupt_terminal_state": corrupt_terminal_state,
+    "corrupt_outcome": corrupt_outcome,
+    "break_handoff": break_handoff,
+    "tamper_byte": tamper_byte,
+}
+
+
+# --- checks -------------------------------------------------------------------
+
+def _scenario_ceilings(pack_dir: Path) -> dict[str, float]:
+    for name in ("manifest.json", "bundle.manifest.json"):
+        path = pack_dir / name
+        if path.is_file():
+            scenario_id = json.loads(path.read_text(encoding="utf-8")).get("scenario_id")
+            if scenario_id:
+                try:
+                    return budget_ceilings(scenario_id)
+                except ScenarioNotFoundError:
+                    return {}
+    return {}
+
+
+def _integrity(pack_dir: Path, ruleset_id: str) -> tuple[bool, str | None]:
+    r = full_verify(pack_dir, workers=1, write=False)
+    for reason, failed in (
+        ("mismatch", r.mismatched), ("missing", r.missing), ("uncovered", r.uncovered),
+        ("root", r.root_ok is False), ("merkle", r.merkle_ok is False), ("tree", r.tree_ok is False),
+    ):
+        if failed:
+            return r.ok, reason
+    return r.ok, r.error
+
+
+def _first(report: Any) -> tuple[bool, str | None]:
+    return report.ok, report.first_violation.reason_code if report.first_violation else None
+
+
+_CHECKS: dict[str, Callable[[Path, str], tuple[bool, str | None]]] = {
+    "integrity": _integrity,
+    "budget": lambda p, r: _first(scan_timeline(find_timeline(p), _scenario_ceilings(p), r)),
+    "lifecycle": lambda p, r: _first(validate_timeline(find_timeline(p), r)),
+    "handoff": lambda p, r: _first(check_pack(p)),
+}
+
+
+def run_checks(pack_dir: str | Path, ruleset_id: str = DEFAULT_RULESET) -> dict[str, dict[str, Any]]:
+    """Per-checker ``{ok, reason, ms}``; a checker that raises reports ``ok: None`` and the error."""
+    pack_dir = Path(pack_dir)
+    observed = {}
+    for name in CHECKERS:
+        start = time.perf_counter()
+        try:
+            ok, reason = _CHECKS[name](pack_dir, ruleset_id)
+            observed[name] = {"ok": ok, "reason": reason}
+        except Exception as e:  # a crash is a finding, not a fuzzer failure
+            observed[name] = {"ok": None, "reason": None, "error": f"{type(e).__name__}: {e}"}
+        observed[name]["ms"] = round((time.perf_counter() - start) * 1000, 3)
+    return observed
+
+
+def classify(variant: Variant) -> str:
+    checker = variant.expected["checker"]
+    seen = (variant.observed or {}).get(checker)
+    if seen is None:
+        return "unchecked"
+    if seen["ok"] is None:
+        return "crash"
+    if seen["ok"]:
+        return "false_pass"
+    return "caught" if seen["reason"] in variant.expected["reason_codes"] else "reason_mismatch"
+
+
+# --- variant building ---------------------------------------------------------
+
+@dataclass
+class _Source:
+    pack: Path
+    timeline: str  # relative path of the stored timeline
+    events: list[dict[str, Any]]
+    raw: dict[int, bytes]  # id(event) -> original line
+    root_kind: str
+    merkle: bool
+    tree_leaf: int | None
+
+
+def load_source(pack_dir: str | Path) -> _Source:
+    pack_dir = Path(pack_dir)
+    timeline = find_timeline(pack_dir)
+    if timeline is None:
+        raise FileNotFoundError(f"no timeline in {pack_dir}")
+    if not timeline.resolve().is_relative_to(pack_dir.resolve()):
+        # The bundle's pack_root lies outside the run (data/runs -> public/data/runs): fuzz that pack
+        pack_dir = pack_root(pack_dir).resolve()
+        timeline = timeline.resolve()
+        if not timeline.is_relative_to(pack_dir):
+            raise ValueError(f"timeline {timeline} is outside pack {pack_dir}")
+    if timeline.suffix == ".zb":
+        from .blocktimeline import BlockTimeline
+
+        with BlockTimeline(timeline) as t:
+            data = b"".join(t.iter_raw())
+    else:
+        data = timeline.read_bytes()
+    events, raw = [], {}
+    for ev in iter_events(timeline):
+        end = data.find(b"\n", ev.offset)
+        events.append(ev.data)
+        raw[id(ev.data)] = data[ev.offset:end if end >= 0 else len(data)].rstrip(b"\r")
+    declared = read_declared_root(pack_dir)
+    mode = read_mode(pack_dir)
+    return _Source(
+        pack=pack_dir,
+        timeline=timeline.relative_to(pack_dir).as_posix(),
+        events=events,
+        raw=raw,
+        root_kind=declared.kind if declared else "pack.sha256",
+        merkle=(pack_dir / MERKLE_ROOT_PATH).is_file(),
+        tree_leaf=int(mode["leaf_size"]) if mode else None,
+    )
+
+
+def _render(source: _Source, events: list[dict[str, Any]]) -> bytes:
+    return b"".join(
+        source.raw[id(e)] + b"\n" if id(e) in source.raw else json.dumps(e, separators=(",", ":")).encode() + b"\n"
+        for e in events
+    )
+
+
+def _seal(source: _Source, pack_dir: Path) -> None:
+    kwargs = {"tree": True, "leaf_size": source.tree_leaf} if source.tree_leaf else {}
+    seal_pack(pack_dir, root=source.root_kind, merkle=source.merkle, workers=1, **kwargs)
+
+
+def _write_timeline(pack_dir: Path, rel: str, data: bytes) -> None:
+    path = pack_dir / rel
+    if rel.endswith(".zb"):
+        from .blocktimeline import write_timeline
+
+        write_timeline(path.with_suffix(""), data, fmt="blocks")
+    else:
+        path.write_bytes(data)
+
+
+def _still_canonical(path: Path, expected: str) -> bool:
+    try:
+        return hash_canonical(path) == expected
+    except ValueError:
+        return False
+
+
+def _tamper(pack_dir: Path, rng: random.Random) -> dict[str, Any]:
+    entries = [e for e in read_sums(pack_dir) or [] if stored_path(pack_dir, e.path).stat().st_size > 0]
+    entry = rng.choice(entries)
+    path = stored_path(pack_dir, entry.path)
+    original = path.read_bytes()
+    for attempt in range(1, 65):
+        data = bytearray(original)
+        offset = rng.randrange(len(data))
+        data[offset] ^= 1 << rng.randrange(8)
+        path.write_bytes(bytes(data))
+        # Block timelines are summed by content: a flip in container metadata
+        # that still decodes to the same stream is not tampering, so redraw
+        if not path.name.endswith(BLOCK_TIMELINE_SUFFIX) or not _still_canonical(path, entry.hash):
+            break
+    return {"path": entry.path, "offset": offset, "attempts": attempt}
+
+
+_worker: dict[str, Any] = {}
+
+
+def _init_worker(name: str, baseline: str, out_dir: str, clauses: frozenset[str], ruleset_id: str, check: bool, discard: bool) -> None:
+    _worker.update(
+        name=name, source=load_source(baseline), out=Path(out_dir), clauses=clauses,
+        ruleset=ruleset_id, check=check, discard=discard,
+    )
+
+
+def _build(job: tuple[int, str, str]) -> dict[str, Any]:
+    index, name, seed = job
+    source: _Source = _worker["source"]
+    rng = random.Random(seed)
+    mutation = MUTATIONS[name](source.events, rng, _worker["clauses"])
+    if mutation is None:
+        raise ValueError(f"mutation {name} does not apply to {source.pack}")
+
+    variant_dir = _worker["out"] / f"{_worker['name']}-fz-{index:05d}-{name}"
+    if variant_dir.exists():
+        shutil.rmtree(variant_dir)
+    shutil.copytree(source.pack, variant_dir)
+    detail = dict(mutation.detail)
+    if mutation.tamper:
+        detail.update(_tamper(variant_dir, rng))
+    else:
+        _write_timeline(variant_dir, source.timeline, _render(source, mutation.events))
+        _seal(source, variant_dir)
+
+    variant = Variant(
+        index=index, variant=variant_dir.name, source=_worker["name"], mutation=name, seed=seed, clause_id=mutation.clause_id,
+        expected={"verdict": "FAIL", "checker": mutation.checker, "reason_codes": mutation.reason_codes},
+        detail=detail,
+    )
+    if _worker["check"]:
+        variant.observed = run_checks(variant_dir, _worker["ruleset"])
+        variant.status = classify(variant)
+        if _worker["discard"]:
+            shutil.rmtree(variant_dir)
+    return variant.to_dict()
+
+
+# --- driver -------------------------------------------------------------------
+
+def prepare_baseline(pack_dir: str | Path, out_dir: str | Path, ruleset_id: str = DEFAULT_RULESET) -> tuple[Path, dict[str, dict[str, Any]]]:
+    """Reseal a copy of the source into ``<out>/baseline`` and check it."""
+    source = load_source(pack_dir)
+    baseline = Path(out_dir) / "baseline"
+    if baseline.exists():
+        shutil.rmtree(baseline)
+    shutil.copytree(source.pack, baseline)
+    _seal(source, baseline)
+    return baseline, run_checks(baseline, ruleset_id)
+
+
+def applicable_mutations(
+    source: _Source, baseline: dict[str, dict[str, Any]], clauses: frozenset[str], names: list[str] | None = None,
+) -> list[str]:
+    """Mutations with a target in the source whose checker passes the baseline (in MUTATIONS order)."""
+    chosen = []
+    for name in names or list(MUTATIONS):
+        mutation = MUTATIONS[name](source.events, random.Random(0), clauses)
+        if mutation is None:
+            continue
+        if mutation.checker in baseline and not baseline[mutation.checker]["ok"]:
+            continue
+        chosen.append(name)
+    return chosen
+
+
+def fuzz(
+    pack_dir: str | Path,
+    out_dir: str | Path,
+    variants: int = 1000,
+    seed: int = 0,
+    workers: int | None = None,
+    mutations: list[str] | None = None,
+    ruleset_id: str = DEFAULT_RULESET,
+    check: bool = False,
+    discard: bool = False,
+    slowest: int = 10,
+) -> dict[str, Any]:
+    """Write ``variants`` mutants of ``pack_dir`` under ``out_dir`` with ``labels.jsonl`` and ``summary.json``."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    clauses = ruleset_clauses(ruleset_id)
+    baseline_dir, baseline = prepare_baseline(pack_dir, out_dir, ruleset_id)
+    names = applicable_mutations(load_source(baseline_dir), baseline, clauses, mutations)
+    if not names:
+        raise ValueError(f"no mutation applies to {pack_dir} (baseline: {baseline})")
+
+    # Round-robin keeps every applicable mutation represented; the rng picks the target
+    jobs = [(i, names[i % len(names)], f"{seed}:{i}") for i in range(variants)]
+    initargs = (Path(pack_dir).name, str(baseline_dir), str(out_dir), clauses, ruleset_id, check, discard)
+    labels_path = out_dir / "labels.jsonl"
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as pool, \
+            open(labels_path, "w", encoding="utf-8") as labels:
+        for label in pool.map(_build, jobs, chunksize=max(1, variants // (8 * (workers or 1)))):
+            labels.write(json.dumps(label, sort_keys=True) + "\n")
+            results.append(label)
+
+    by_mutation: dict[str, dict[str, int]] = {}
+    for label in results:
+        counts = by_mutation.setdefault(label["mutation"], {"variants": 0})
+        counts["variants"] += 1
+        if "status" in label:
+            counts[label["status"]] = counts.get(label["status"], 0) + 1
+    summary: dict[str, Any] = {
+        "source": str(pack_dir),
+        "seed": seed,
+        "ruleset_id": ruleset_id,
+        "variants": len(results),
+        "baseline": baseline,
+        "mutations": by_mutation,
+        "labels": labels_path.name,
+    }
+    if check:
+        timed = sorted(results, key=lambda l: -sum(o["ms"] for o in l["observed"].values()))
+        summary["false_passes"] = [l["variant"] for l in results if l["status"] == "false_pass"]
+        summary["crashes"] = [l["variant"] for l in results if l["status"] == "crash"]
+        summary["slowest"] = [
+            {"variant": l["variant"], "ms": {k: o["ms"] for k, o in l["observed"].items()}} for l in timed[:slowest]
+        ]
+    (out_dir / "summary.json").write_text(json.dumps(summary, indent=2) + "\n", encoding="utf-8")
+    return summary
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate labelled fail variants of a passing pack")
+    parser.add_argument("pack", help="A pack that passes the checks its mutations target")
+    parser.add_argument("--out", required=True, help="Output directory for variants, labels.jsonl and summary.json")
+    parser.add_argument("--variants", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--mutations", help=f"Comma-separated subset of: {', '.join(MUTATIONS)}")
+    parser.add_argument("--ruleset", default=DEFAULT_RULESET)
+    parser.add_argument("--check", action="store_true", help="Run the Python checkers on every variant")
+    parser.add_argument("--discard", action="store_true", help="Delete variants once checked (requires --check)")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    names = args.mutations.split(",") if args.mutations else None
+    unknown = sorted(set(names or []) - set(MUTATIONS))
+    if unknown:
+        print(f"error: unknown mutation(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    if args.discard and not args.check:
+        print("error: --discard requires --check", file=sys.stderr)
+        return 2
+    try:
+        summary = fuzz(
+            args.pack, args.out, args.variants, args.seed, args.workers, names,
+            args.ruleset, args.check, args.discard,
+        )
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(f"{summary['variants']} variants of {summary['source']} -> {Path(args.out) / summary['labels']}")
+        for name, counts in summary["mutations"].items():
+            rest = " ".join(f"{k}={v}" for k, v in sorted(counts.items()) if k != "variants")
+            print(f"  {name:<24} {counts['variants']:>6}  {rest}")
+        for variant in summary.get("false_passes", []):
+            print(f"FALSE PASS {variant}")
+        for variant in summary.get("crashes", []):
+            print(f"CRASH {variant}")
+    return 1 if summary.get("false_passes") or summary.get("crashes") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""Run a gf-01 cross-substrate test-vector generator with a uniform interface.
+
+The generators under ``test-vectors/cross-substrate/gf-01/<substrate>/`` are
+standalone scripts: ``generate_ma_pack.py --out DIR`` (multi-agent, also
+``generate_ma_pack.mjs`` for mcp) and ``generate_pack.py`` (single-agent,
+always writes ``./pack``). This wraps both behind ``--out``.
+
+The generators are standalone and deterministic, so their phases are not
+instrumented; with ``--perf`` the wrapper records the generator process as
+one ``generate`` phase (children's CPU and peak RSS) in
+``reports/producer.perf.json`` after the pack is written. The report is
+outside the pack's sums and root hash (``packhash.EXCLUDED_PATHS``).
+
+Usage:
+    python -m mplp_vlab.generate <substrate> [--single] [--out DIR] [--python PATH] [--perf]
+    python -m mplp_vlab.generate --list
+"""
+
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from .paths import repo_root
+from .perf import PerfRecorder
+
+MA_GENERATORS = ("generate_ma_pack.py", "generate_ma_pack.mjs")
+SINGLE_GENERATOR = "generate_pack.py"
+
+
+def vectors_dir() -> Path:
+    return repo_root() / "test-vectors" / "cross-substrate" / "gf-01"
+
+
+def substrates(single: bool = False) -> list[str]:
+    names = (SINGLE_GENERATOR,) if single else MA_GENERATORS
+    return sorted(d.name for d in vectors_dir().iterdir() if d.is_dir() and any((d / n).is_file() for n in names))
+
+
+def generator_for(substrate: str, single: bool = False) -> Path:
+    base = vectors_dir() / substrate
+    for name in (SINGLE_GENERATOR,) if single else MA_GENERATORS:
+        if (base / name).is_file():
+            return base / name
+    kind = "single-agent" if single else "multi-agent"
+    raise FileNotFoundError(f"no {kind} generator for substrate '{substrate}' in {base}")
+
+
+def _command(script: Path, python: str | None = None) -> list[str]:
+    return ["node", str(script)] if script.suffix == ".mjs" else [python or sys.executable, str(script)]
+
+
+def generate(
+    substrate: str,
+    out: str | Path | None = None,
+    single: bool = False,
+    quiet: bool = False,
+    python: str | None = None,
+    perf: bool = False,
+) -> Path:
+    """Generate one pack; returns the pack directory. Raises ``CalledProcessError`` on failure.
+
+    ``python`` is the interpreter holding the substrate's requirements
+    (``requirements*.txt`` next to the generator).
+    """
+    script = generator_for(substrate, single)
+    out_dir = Path(out).resolve() if out else script.parent / "pack"
+    output = subprocess.DEVNULL if quiet else None
+    recorder = PerfRecorder(script.name, substrate)
+    if not single:
+        with recorder.child_phase("generate"):
+            subprocess.run([*_command(script, python), "--out", str(out_dir)], cwd=script.parent, check=True, stdout=output)
+    else:
+        # generate_pack.py hardcodes ./pack: run it in a scratch dir and move the result
+        with tempfile.TemporaryDirectory(prefix="vlab-gen-") as scratch:
+            with recorder.child_phase("generate"):
+                subprocess.run(_command(script, python), cwd=scratch, check=True, stdout=output)
+            if out_dir.exists():
+                shutil.rmtree(out_dir)
+            out_dir.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(str(Path(scratch) / "pack"), out_dir)
+    if perf:
+        recorder.run_id = _pack_id(out_dir)
+        recorder.write(out_dir)
+    return out_dir
+
+
+def _pack_id(pack_dir: Path) -> str | None:
+    try:
+        return json.loads((pack_dir / "manifest.json").read_text(encoding="utf-8")).get("pack_id")
+    except (OSError, ValueError):
+        return None
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="gf-01 cross-substrate pack generator")
+    parser.add_argument("substrate", nargs="?", help="Substrate directory name (e.g. langchain, a2a)")
+    parser.add_argument("--single", action="store_true", help="Single-agent generate_pack.py")
+    parser.add_argument("--out", help="Output pack directory (default: <substrate>/pack)")
+    parser.add_argument("--python", help="Interpreter with the substrate's requirements")
+    parser.add_argument("--perf", action="store_true", help="Write reports/producer.perf.json into the pack")
+    parser.add_argument("--list", action="store_true", help="List substrates with a generator")
+    args = parser.parse_args(argv)
+
+    if args.list or not args.substrate:
+        for name in substrates(args.single):
+            print(name)
+        return 0 if args.list else 2
+    try:
+        print(generate(args.substrate, args.out, args.single, python=args.python, perf=args.perf))
+    except FileNotFoundError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    except subprocess.CalledProcessError as e:
+        return e.returncode or 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+"""Handoff graph builder and multi-agent consistency checker (GF-01).
+
+Multi-agent timelines record a handoff as a ``handoff`` event carrying
+``from_agent``/``to_agent``, answered by an ``agent.init`` of the receiver
+with ``received_from``. One pass over the timeline builds the handoff graph
+and checks:
+
+- every handoff is received by a matching ``agent.init``
+- every ``received_from`` answers an outstanding handoff
+- no agent acts before its ``agent.init``, and no agent is initialized twice
+- the handoff graph is acyclic
+
+The ``execution_summary`` and ``agent_summaries`` of ``artifacts/trace.json``
+are then cross-checked against the counts observed in the timeline.
+
+All bookkeeping is keyed by agent or (sender, receiver) pair, so cost is
+linear in events plus agents; no pairwise search is performed.
+
+Usage:
+    python -m mplp_vlab.handoff <pack_dir> [--fail-fast]
+"""
+
+import argparse
+import json
+import sys
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import IO, Any
+
+from .timeline import event_type_of, find_timeline, iter_events
+
+HANDOFF = "handoff"
+AGENT_INIT = "agent.init"
+
+
+@dataclass(frozen=True)
+class HandoffViolation:
+    reason_code: str
+    offset: int | None
+    line: int | None
+    event_id: str | None
+    agent_id: str | None
+    message: str
+
+
+@dataclass
+class HandoffReport:
+    events: int
+    agents: int
+    handoffs: int
+    edges: dict[str, dict[str, int]]
+    acyclic: bool
+    violation_count: int
+    first_violation: HandoffViolation | None
+    violations: list[HandoffViolation] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.violation_count == 0
+
+    def to_dict(self) -> dict[str, Any]:
+        d = asdict(self)
+        d["verdict"] = "PASS" if self.ok else "FAIL"
+        return d
+
+
+class HandoffGraphBuilder:
+    """Incremental builder: ``feed`` events in stream order, then ``finish``."""
+
+    def __init__(self, keep_violations: int = 100):
+        self.events = 0
+        self.handoffs = 0
+        self.edges: dict[tuple[str, str], int] = {}
+        self.event_counts: dict[str, int] = {}
+        self._initialized: set[str] = set()
+        # (sender, receiver) -> offsets/lines/ids of handoffs not yet received, oldest first
+        self._pending: dict[tuple[str, str], deque[tuple[int, int, str | None]]] = {}
+        self._keep = keep_violations
+        self.violations: list[HandoffViolation] = []
+        self.violation_count = 0
+
+    def feed(self, event: dict[str, Any], offset: int = 0, line: int = 0) -> HandoffViolation | None:
+        self.events += 1
+        et = event_type_of(event)
+        agent = event.get("agent_id")
+        event_id = event.get("event_id")
+        first: HandoffViolation | None = None
+
+        def flag(reason: str, message: str, who: str | None = agent) -> None:
+            nonlocal first
+            v = HandoffViolation(reason, offset, line, event_id, who, message)
+            self._record(v)
+            first = first or v
+
+        if agent:
+            self.event_counts[agent] = self.event_counts.get(agent, 0) + 1
+
+        if et == AGENT_INIT and agent:
+            if agent in self._initialized:
+                flag("AGENT_REINITIALIZED", f"{agent} initialized more than once")
+            self._initialized.add(agent)
+            sender = event.get("received_from")
+            if sender:
+                queue = self._pending.get((sender, agent))
+                if queue:
+                    queue.popleft()
+                    if not queue:
+                        del self._pending[(sender, agent)]
+                else:
+                    flag("HANDOFF_RECEIPT_UNMATCHED", f"{agent} received_from {sender} without a pending handoff")
+            return first
+
+        if agent and agent not in self._initialized:
+            flag("AGENT_ACTED_BEFORE_INIT", f"{et or 'event'} from {agent} before agent.init")
+
+        if et == HANDOFF:
+            self.handoffs += 1
+            sender, receiver = event.get("from_agent"), event.get("to_agent")
+            if not sender or not receiver:
+                flag("HANDOFF_ENDPOINT_MISSING", "handoff without from_agent/to_agent")
+                return first
+            if agent and sender != agent:
+                flag("HANDOFF_SENDER_MISMATCH", f"handoff from_agent {sender} emitted by {agent}")
+            key = (sender, receiver)
+            self.edges[key] = self.edges.get(key, 0) + 1
+            self._pending.setdefault(key, deque()).append((offset, line, event_id))
+        return first
+
+    def finish(self, trace: dict[str, Any] | None = None) -> HandoffReport:
+        for (sender, receiver), queue in self._pending.items():
+            for offset, line, event_id in queue:
+                self._record(HandoffViolation(
+                    "HANDOFF_NOT_RECEIVED", offset, line, event_id, sender,
+                    f"handoff {sender} -> {receiver} never received",
+                ))
+
+        acyclic = _is_acyclic(self.edges)
+        if not acyclic:
+            self._record(HandoffViolation(
+                "HANDOFF_CYCLE_DETECTED", None, None, None, None, "handoff graph contains a cycle",
+            ))
+
+        if trace is not None:
+            self._cross_check(trace)
+
+        edges: dict[str, dict[str, int]] = {}
+        for (sender, receiver), count in sorted(self.edges.items()):
+            edges.setdefault(sender, {})[receiver] = count
+        return HandoffReport(
+            events=self.events,
+            agents=len(self.event_counts),
+            handoffs=self.handoffs,
+            edges=edges,
+            acyclic=acyclic,
+            violation_count=self.violation_count,
+            first_violation=self.violations[0] if self.violations else None,
+            violations=self.violations,
+        )
+
+    def _cross_check(self, trace: dict[str, Any]) -> None:
+        summary = trace.get("execution_summary") or {}
+        for key, observed in (
+            ("total_events", self.events),
+            ("handoffs", self.handoffs),
+            ("total_agents", len(self.event_counts)),
+        ):
+            declared = summary.get(key)
+            if declared is not None and declared != observed:
+                self._record(HandoffViolation(
+                    "TRACE_COUNT_MISMATCH", None, None, None, None,
+                    f"execution_summary.{key}={declared}, timeline has {observed}",
+                ))
+        for agent_summary in trace.get("agent_summaries") or []:
+            agent = agent_summary.get("agent_id")
+            declared = agent_summary.get("events_count")
+            observed = self.event_counts.get(agent, 0)
+            if declared is not None and declared != observed:
+                self._record(HandoffViolation(
+                    "TRACE_COUNT_MISMATCH", None, None, None, agent,
+                    f"agent_summaries[{agent}].events_count={declared}, timeline has {observed}",
+                ))
+
+    def _record(self, violation: HandoffViolation) -> None:
+        self.violation_count += 1
+        if len(self.violations) < self._keep:
+            self.violations.append(violation)
+
+
+def _is_acyclic(edges: dict[tuple[str, str], int]) -> bool:
+    """Kahn's algorithm, O(V + E)."""
+    out: dict[str, list[str]] = {}
+    indegree: dict[str, int] = {}
+    for sender, receiver in edges:
+        out.setdefault(sender, []).append(receiver)
+        indegree.setdefault(sender, 0)
+        indegree[receiver] = indegree.get(receiver, 0) + 1
+    ready = deque(node for node, d in indegree.items() if d == 0)
+    visited = 0
+    while ready:
+        node = ready.popleft()
+        visited += 1
+        for nxt in out.get(node, ()):
+            indegree[nxt] -= 1
+            if indegree[nxt] == 0:
+                ready.append(nxt)
+    return visited == len(indegree)
+
+
+def check_timeline(
+    source: str | Path | IO[bytes],
+    trace: dict[str, Any] | None = None,
+    fail_fast: bool = False,
+) -> HandoffReport:
+    """Build the handoff graph over an NDJSON timeline in one streaming pass."""
+    builder = HandoffGraphBuilder()
+    for ev in iter_events(source):
+        if builder.feed(ev.data, ev.offset, ev.line) and fail_fast:
+            return builder.finish()
+    return builder.finish(trace)
+
+
+def check_pack(pack_dir: str | Path, fail_fast: bool = False) -> HandoffReport:
+    """Check a pack's timeline and cross-check it against ``artifacts/trace.json``."""
+    pack_dir = Path(pack_dir)
+    timeline = find_timeline(pack_dir)
+    if timeline is None:
+        raise FileNotFoundError(f"no timeline in {pack_dir}")
+    trace_path = pack_dir / "artifacts" / "trace.json"
+    trace = None
+    if trace_path.is_file():
+        with open(trace_path, encoding="utf-8") as f:
+            trace = json.load(f)
+    return check_timeline(timeline, trace, fail_fast)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="GF-01 handoff graph consistency checker")
+    parser.add_argument("pack", help="Pack directory (or events.ndjson)")
+    parser.add_argument("--fail-fast", action="store_true", help="Stop at the first timeline violation")
+    args = parser.parse_args(argv)
+
+    if Path(args.pack).is_dir():
+        report = check_pack(args.pack, args.fail_fast)
+    else:
+        report = check_timeline(args.pack, fail_fast=args.fail_fast)
+    print(json.dumps(report.to_dict(), indent=2))
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
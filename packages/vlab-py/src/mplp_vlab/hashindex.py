@@ -0,0 +1,364 @@
+"""Global SQLite index of hashed files across packs, adjudications and releases.
+
+Ingests every ``sha256sums.txt`` (pack ``integrity/``, ``adjudication/*``,
+``export/``, ``releases/**``), every pack root hash file (``pack.sha256``,
+``pack_root_hash.txt``), pack ``manifest.json`` files and release
+``MANIFEST.json`` run lists into one database, so questions like "which packs
+contain this digest?" or "which releases include this run?" are answered by
+an index lookup.
+
+Updates are incremental: a source file is re-read only when its
+(mtime_ns, size) differs from the last ingest, and sources that disappeared
+are dropped.
+
+Usage:
+    python -m mplp_vlab.hashindex update
+    python -m mplp_vlab.hashindex digest <sha256-or-prefix>
+    python -m mplp_vlab.hashindex run <run_id>
+    python -m mplp_vlab.hashindex pack <pack_dir>
+    python -m mplp_vlab.hashindex stats
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator
+
+from .paths import repo_root
+
+SCHEMA_VERSION = 1
+
+# Top-level directories scanned for sources
+SCAN_ROOTS = ("data", "adjudication", "export", "releases", "public", "test-vectors", "fixtures", "reverification")
+SKIP_DIRS = {"node_modules", ".git", ".next", "__pycache__"}
+
+SUMS_FILES = {"sha256sums.txt"}
+ROOT_HASH_FILES = {"pack.sha256", "pack_root_hash.txt"}
+PACK_MANIFESTS = {"manifest.json"}
+RELEASE_MANIFESTS = {"MANIFEST.json"}
+
+_HEX64 = re.compile(r"^[0-9a-f]{64}$")
+
+_DDL = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    source TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    file TEXT NOT NULL,
+    digest TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_digest ON entries(digest);
+CREATE INDEX IF NOT EXISTS entries_scope ON entries(scope);
+CREATE INDEX IF NOT EXISTS entries_source ON entries(source);
+CREATE TABLE IF NOT EXISTS packs (
+    source TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    pack_id TEXT,
+    scenario_id TEXT,
+    substrate TEXT,
+    layout_version TEXT,
+    release TEXT
+);
+CREATE INDEX IF NOT EXISTS packs_scope ON packs(scope);
+CREATE INDEX IF NOT EXISTS packs_pack_id ON packs(pack_id);
+CREATE INDEX IF NOT EXISTS packs_source ON packs(source);
+CREATE TABLE IF NOT EXISTS root_hashes (
+    source TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    root_hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS root_hashes_hash ON root_hashes(root_hash);
+CREATE INDEX IF NOT EXISTS root_hashes_scope ON root_hashes(scope);
+CREATE INDEX IF NOT EXISTS root_hashes_source ON root_hashes(source);
+CREATE TABLE IF NOT EXISTS release_runs (
+    source TEXT NOT NULL,
+    release TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    substrate TEXT,
+    pack_root_hash TEXT
+);
+CREATE INDEX IF NOT EXISTS release_runs_run ON release_runs(run_id);
+CREATE INDEX IF NOT EXISTS release_runs_hash ON release_runs(pack_root_hash);
+CREATE INDEX IF NOT EXISTS release_runs_source ON release_runs(source);
+"""
+
+_SOURCE_TABLES = ("entries", "packs", "root_hashes", "release_runs")
+
+
+def default_db_path() -> Path:
+    return repo_root() / "data" / "derived" / "hash-index.sqlite"
+
+
+@dataclass
+class UpdateStats:
+    scanned: int = 0
+    ingested: int = 0
+    unchanged: int = 0
+    removed: int = 0
+
+
+def parse_sums(text: str) -> Iterator[tuple[str, str]]:
+    """(digest, path) pairs from ``<hash>  <path>`` lines (``*`` binary marker tolerated)."""
+    for line in text.splitlines():
+        parts = line.strip().split(None, 1)
+        if len(parts) == 2 and _HEX64.match(parts[0]):
+            yield parts[0], parts[1].lstrip("*").removeprefix("./")
+
+
+def _scope_of(rel: str) -> str:
+    """Pack or bundle directory a source belongs to."""
+    parent = os.path.dirname(rel)
+    if os.path.basename(parent) == "integrity":
+        parent = os.path.dirname(parent)
+    return parent
+
+
+def _release_of(rel: str) -> str | None:
+    parts = rel.split("/")
+    if parts[0] == "releases" and len(parts) > 2:
+        return parts[2] if parts[1] in ("archive", "unified") and len(parts) > 3 else parts[1]
+    return None
+
+
+def _classify(name: str) -> str | None:
+    if name in SUMS_FILES:
+        return "sums"
+    if name in ROOT_HASH_FILES:
+        return "root_hash"
+    if name in RELEASE_MANIFESTS:
+        return "release_manifest"
+    if name in PACK_MANIFESTS:
+        return "pack_manifest"
+    return None
+
+
+class HashIndex:
+    """Python API over the index database."""
+
+    def __init__(self, db_path: str | Path | None = None, root: str | Path | None = None):
+        self.root = Path(root) if root else repo_root()
+        self.db_path = Path(db_path) if db_path else default_db_path()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "HashIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _migrate(self) -> None:
+        row = None
+        try:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        except sqlite3.OperationalError:
+            pass
+        if row is not None and int(row[0]) != SCHEMA_VERSION:
+            for table in ("meta", "sources", *_SOURCE_TABLES):
+                self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+        self.conn.executescript(_DDL)
+        self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+        self.conn.commit()
+
+    # -- ingest -------------------------------------------------------------
+
+    def iter_sources(self) -> Iterator[tuple[str, str, os.stat_result]]:
+        for top in SCAN_ROOTS:
+            base = self.root / top
+            if not base.is_dir():
+                continue
+            for dirpath, dirnames, filenames in os.walk(base):
+                dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+                for name in filenames:
+                    kind = _classify(name)
+                    if kind is None:
+                        continue
+                    full = os.path.join(dirpath, name)
+                    yield os.path.relpath(full, self.root).replace(os.sep, "/"), kind, os.stat(full)
+
+    def update(self) -> UpdateStats:
+        stats = UpdateStats()
+        known = {row["path"]: (row["mtime_ns"], row["size"]) for row in self.conn.execute("SELECT * FROM sources")}
+        seen: set[str] = set()
+        with self.conn:
+            for rel, kind, st in self.iter_sources():
+                stats.scanned += 1
+                seen.add(rel)
+                if known.get(rel) == (st.st_mtime_ns, st.st_size):
+                    stats.unchanged += 1
+                    continue
+                self._drop_source(rel)
+                self._ingest(rel, kind)
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?, ?)",
+                    (rel, kind, _scope_of(rel), st.st_mtime_ns, st.st_size),
+                )
+                stats.ingested += 1
+            for rel in known.keys() - seen:
+                self._drop_source(rel)
+                self.conn.execute("DELETE FROM sources WHERE path = ?", (rel,))
+                stats.removed += 1
+        return stats
+
+    def _drop_source(self, rel: str) -> None:
+        for table in _SOURCE_TABLES:
+            self.conn.execute(f"DELETE FROM {table} WHERE source = ?", (rel,))
+
+    def _ingest(self, rel: str, kind: str) -> None:
+        path = self.root / rel
+        scope = _scope_of(rel)
+        try:
+            if kind == "sums":
+                rows = [(rel, scope, f, d) for d, f in parse_sums(path.read_text(encoding="utf-8", errors="replace"))]
+                self.conn.executemany("INSERT INTO entries VALUES (?, ?, ?, ?)", rows)
+            elif kind == "root_hash":
+                token = (path.read_text(encoding="utf-8", errors="replace").split() or [""])[0]
+                if _HEX64.match(token):
+                    self.conn.execute("INSERT INTO root_hashes VALUES (?, ?, ?)", (rel, scope, token))
+            elif kind == "pack_manifest":
+                self._ingest_pack_manifest(rel, scope, _load_json(path))
+            elif kind == "release_manifest":
+                self._ingest_release_manifest(rel, _load_json(path))
+        except (OSError, ValueError):
+            # Unreadable sources are still recorded so they are retried only when they change
+            pass
+
+    def _ingest_pack_manifest(self, rel: str, scope: str, manifest: Any) -> None:
+        if not isinstance(manifest, dict) or not (manifest.get("pack_id") or manifest.get("run_id")):
+            return
+        substrate = manifest.get("substrate")
+        if isinstance(substrate, dict):
+            substrate = substrate.get("type") or substrate.get("substrate_id")
+        substrate = substrate or (manifest.get("substrate_ref") or {}).get("substrate_id")
+        self.conn.execute(
+            "INSERT INTO packs VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                rel, scope,
+                manifest.get("pack_id") or manifest.get("run_id"),
+                manifest.get("scenario_id"),
+                substrate,
+                str(manifest.get("pack_layout_version", "1")),
+                _release_of(rel),
+            ),
+        )
+        root_hash = (manifest.get("hashes") or {}).get("pack_root_hash")
+        if isinstance(root_hash, str) and _HEX64.match(root_hash):
+            self.conn.execute("INSERT INTO root_hashes VALUES (?, ?, ?)", (rel, scope, root_hash))
+
+    def _ingest_release_manifest(self, rel: str, manifest: Any) -> None:
+        if not isinstance(manifest, dict):
+            return
+        release = _release_of(rel) or os.path.dirname(rel)
+        rows = [
+            (rel, release, run["run_id"], run.get("substrate"), run.get("pack_root_hash"))
+            for run in manifest.get("runs") or []
+            if isinstance(run, dict) and run.get("run_id")
+        ]
+        self.conn.executemany("INSERT INTO release_runs VALUES (?, ?, ?, ?, ?)", rows)
+
+    # -- queries ------------------------------------------------------------
+
+    def find_digest(self, digest: str) -> list[dict[str, Any]]:
+        """Files (and pack roots) with this digest; a shorter hex string matches as a prefix."""
+        digest = digest.lower()
+        if len(digest) == 64:
+            cond, args = "digest = ?", (digest,)
+            root_cond = "root_hash = ?"
+        else:
+            # Range scan keeps prefix lookups on the index
+            upper = digest + "g"
+            cond, args = "digest >= ? AND digest < ?", (digest, upper)
+            root_cond = "root_hash >= ? AND root_hash < ?"
+        hits = [dict(r) | {"kind": "file"} for r in self.conn.execute(
+            f"SELECT scope, file, digest, source FROM entries WHERE {cond} ORDER BY scope, file", args)]
+        hits += [dict(r) | {"kind": "pack_root", "file": None} for r in self.conn.execute(
+            f"SELECT scope, root_hash AS digest, source FROM root_hashes WHERE {root_cond} ORDER BY scope", args)]
+        return hits
+
+    def releases_for_run(self, run_id: str) -> list[dict[str, Any]]:
+        """Releases that list ``run_id`` in MANIFEST.json or ship a pack with that ID."""
+        rows = [dict(r) for r in self.conn.execute(
+            "SELECT release, run_id, substrate, pack_root_hash, source FROM release_runs WHERE run_id = ? ORDER BY release",
+            (run_id,))]
+        rows += [dict(r) | {"pack_root_hash": None} for r in self.conn.execute(
+            "SELECT release, pack_id AS run_id, substrate, source FROM packs "
+            "WHERE pack_id = ? AND release IS NOT NULL ORDER BY release", (run_id,))]
+        return rows
+
+    def pack_files(self, scope: str) -> list[dict[str, Any]]:
+        scope = scope.rstrip("/")
+        return [dict(r) for r in self.conn.execute(
+            "SELECT file, digest FROM entries WHERE scope = ? ORDER BY file", (scope,))]
+
+    def locate_pack(self, pack_id: str) -> list[dict[str, Any]]:
+        return [dict(r) for r in self.conn.execute(
+            "SELECT scope, pack_id, scenario_id, substrate, layout_version, release FROM packs "
+            "WHERE pack_id = ? ORDER BY scope", (pack_id,))]
+
+    def stats(self) -> dict[str, int]:
+        return {
+            table: self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("sources", *_SOURCE_TABLES)
+        }
+
+
+def _load_json(path: Path) -> Any:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Global hash index over packs, adjudications and releases")
+    parser.add_argument("--db", help=f"Database path (default: {default_db_path()})")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("update", help="Incrementally ingest changed sources")
+    sub.add_parser("stats", help="Row counts")
+    p = sub.add_parser("digest", help="Files/packs with a digest (or hex prefix)")
+    p.add_argument("digest")
+    p = sub.add_parser("run", help="Releases and locations of a run/pack ID")
+    p.add_argument("run_id")
+    p = sub.add_parser("pack", help="Indexed files of a pack directory (repo-relative)")
+    p.add_argument("scope")
+    for name in ("digest", "run", "pack"):
+        sub.choices[name].add_argument("--no-update", action="store_true", help="Query without refreshing")
+    args = parser.parse_args(argv)
+
+    with HashIndex(args.db) as index:
+        if args.cmd == "update" or not getattr(args, "no_update", True):
+            stats = index.update()
+            if args.cmd == "update":
+                print(json.dumps(stats.__dict__, indent=2))
+                return 0
+        if args.cmd == "stats":
+            result: Any = index.stats()
+        elif args.cmd == "digest":
+            result = index.find_digest(args.digest)
+        elif args.cmd == "run":
+            result = {"releases": index.releases_for_run(args.run_id), "locations": index.locate_pack(args.run_id)}
+        else:
+            result = index.pack_files(args.scope)
+    print(json.dumps(result, indent=2))
+    return 0 if result else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+"""Streaming D2 lifecycle state-machine validator.
+
+Consumes a timeline as a stream and drives a per-agent state machine whose
+transition table is compiled from the ruleset's enabled D2 clauses:
+
+- CL-D2-01: at least one terminal ``lifecycle.*`` transition must exist
+- CL-D2-02: lifecycle transitions must target a known state
+- CL-D2-03: no execution event, by any agent, after the run's first
+  terminal transition (run-wide, as ``lib/rulesets`` evaluates it)
+
+One check goes beyond ``lib/rulesets``: a lifecycle transition of an agent
+that has already terminated is reported under CL-D2-03 as
+``D2_TERMINAL_STATE_REVERSAL_DETECTED``. That check is per agent: other
+agents may still transition after one terminates.
+
+Single pass, one small integer of state per agent, so timelines far larger
+than memory are fine. The first violation is reported with its byte offset.
+
+Usage:
+    python -m mplp_vlab.lifecycle <events.ndjson|pack_dir> [--ruleset ruleset-1.3] [--all]
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import IO, Any
+
+from .rulesets import DEFAULT_RULESET, ruleset_clauses
+from .synonyms import ALLOWED_TERMINAL_STATES, normalize_token
+from .timeline import event_type_of, find_timeline, iter_events
+
+# States
+ACTIVE, TERMINAL = 0, 1
+
+# Event classes
+OTHER, TRANSITION_ACTIVE, TRANSITION_TERMINAL, TRANSITION_INVALID, TRANSITION_NO_STATE, EXECUTION = range(6)
+
+# Non-terminal lifecycle states accepted on a lifecycle transition
+ACTIVE_LIFECYCLE_STATES = frozenset({
+    "created", "init", "initialized", "pending", "queued", "ready", "running", "active",
+    "in_progress", "waiting", "blocked", "paused", "suspended", "resumed", "retrying",
+})
+
+# Same tokens as CL-D2-03 in lib/rulesets/ruleset-1.3/clauses.ts
+EXECUTION_TOKENS = ("exec", "dispatch", "invoke", "run")
+
+# Events without agent_id apply to the whole run
+RUN_SCOPE = "*"
+
+
+@dataclass(frozen=True)
+class LifecycleViolation:
+    clause_id: str
+    reason_code: str
+    offset: int
+    line: int
+    event_id: str | None
+    agent_id: str | None
+    message: str
+
+
+@dataclass
+class LifecycleReport:
+    ruleset_id: str
+    events: int
+    agents: int
+    terminal_agents: int
+    violation_count: int
+    first_violation: LifecycleViolation | None
+
+    @property
+    def ok(self) -> bool:
+        return self.violation_count == 0
+
+    def to_dict(self) -> dict[str, Any]:
+        d = asdict(self)
+        d["verdict"] = "PASS" if self.ok else "FAIL"
+        return d
+
+
+# A cell: (next_state, clause_id, reason_code) — clause/reason None when allowed
+Cell = tuple[int, str | None, str | None]
+
+
+@dataclass(frozen=True)
+class TransitionTable:
+    ruleset_id: str
+    cells: tuple[tuple[Cell, ...], ...]
+    require_terminal: bool
+
+    def step(self, state: int, event_class: int) -> Cell:
+        return self.cells[state][event_class]
+
+
+@lru_cache(maxsize=None)
+def compile_transition_table(ruleset_id: str = DEFAULT_RULESET) -> TransitionTable:
+    """Build the [state][event_class] table from the ruleset's D2 clauses."""
+    clauses = ruleset_clauses(ruleset_id)
+    d2_02 = "CL-D2-02" in clauses
+    d2_03 = "CL-D2-03" in clauses
+
+    def cell(next_state: int, clause: str | None = None, reason: str | None = None, enabled: bool = True) -> Cell:
+        return (next_state, clause, reason) if enabled else (next_state, None, None)
+
+    active_row = (
+        cell(ACTIVE),  # OTHER
+        cell(ACTIVE),  # TRANSITION_ACTIVE
+        cell(TERMINAL),  # TRANSITION_TERMINAL
+        cell(ACTIVE, "CL-D2-02", "D2_TERMINAL_STATE_NOT_IN_ALLOWED_SET", d2_02),
+        cell(ACTIVE, "CL-D2-02", "D2_TERMINAL_STATE_MISSING", d2_02),
+        cell(ACTIVE),  # EXECUTION
+    )
+    terminal_row = (
+        cell(TERMINAL),
+        cell(TERMINAL, "CL-D2-03", "D2_TERMINAL_STATE_REVERSAL_DETECTED", d2_03),
+        cell(TERMINAL),
+        cell(TERMINAL, "CL-D2-02", "D2_TERMINAL_STATE_NOT_IN_ALLOWED_SET", d2_02),
+        cell(TERMINAL, "CL-D2-02", "D2_TERMINAL_STATE_MISSING", d2_02),
+        cell(TERMINAL, "CL-D2-03", "D2_POST_TERMINAL_EXECUTION_DETECTED", d2_03),
+    )
+    return TransitionTable(
+        ruleset_id=ruleset_id,
+        cells=(active_row, terminal_row),
+        require_terminal="CL-D2-01" in clauses,
+    )
+
+
+def classify_event(event: dict[str, Any]) -> int:
+    et = normalize_token(event_type_of(event))
+    if "lifecycle" in et:
+        raw_state = event.get("to_state") or event.get("state") or event.get("status")
+        if not raw_state:
+            return TRANSITION_NO_STATE
+        state = normalize_token(raw_state)
+        if state in ALLOWED_TERMINAL_STATES:
+            return TRANSITION_TERMINAL
+        if state in ACTIVE_LIFECYCLE_STATES:
+            return TRANSITION_ACTIVE
+        return TRANSITION_INVALID
+    if any(token in et for token in EXECUTION_TOKENS):
+        return EXECUTION
+    return OTHER
+
+
+class LifecycleValidator:
+    """Incremental validator: ``feed`` events in stream order, then ``finish``."""
+
+    def __init__(self, table: TransitionTable):
+        self.table = table
+        self._states: dict[str, int] = {}
+        self._run_state = ACTIVE
+        self._events = 0
+        self._terminal_seen = False
+        self.violation_count = 0
+        self.first_violation: LifecycleViolation | None = None
+
+    def feed(self, event: dict[str, Any], offset: int = 0, line: int = 0) -> LifecycleViolation | None:
+        self._events += 1
+        agent = event.get("agent_id") or RUN_SCOPE
+        event_class = classify_event(event)
+
+        current = max(self._states.get(agent, ACTIVE), self._run_state)
+        if event_class == EXECUTION and self._terminal_seen:
+            current = TERMINAL  # post-terminal execution is run-wide
+        next_state, clause_id, reason = self.table.step(current, event_class)
+
+        if agent == RUN_SCOPE:
+            if event_class != EXECUTION:  # executions never change lifecycle state
+                self._run_state = next_state
+        elif event_class != EXECUTION:
+            self._states[agent] = next_state
+        else:
+            self._states.setdefault(agent, ACTIVE)
+        if event_class == TRANSITION_TERMINAL:
+            self._terminal_seen = True
+
+        if clause_id is None:
+            return None
+        violation = LifecycleViolation(
+            clause_id=clause_id,
+            reason_code=reason,
+            offset=offset,
+            line=line,
+            event_id=event.get("event_id"),
+            agent_id=None if agent == RUN_SCOPE else agent,
+            message=f"{event_type_of(event)} not allowed in state {'TERMINAL' if current else 'ACTIVE'}",
+        )
+        self._record(violation)
+        return violation
+
+    def finish(self, end_offset: int = 0) -> LifecycleReport:
+        if self.table.require_terminal and not self._terminal_seen:
+            self._record(LifecycleViolation(
+                clause_id="CL-D2-01",
+                reason_code="D2_TERMINAL_EVENT_MISSING",
+                offset=end_offset,
+                line=0,
+                event_id=None,
+                agent_id=None,
+                message="timeline ended without a terminal lifecycle transition",
+            ))
+        terminal_agents = sum(1 for s in self._states.values() if s == TERMINAL)
+        return LifecycleReport(
+            ruleset_id=self.table.ruleset_id,
+            events=self._events,
+            agents=len(self._states),
+            terminal_agents=terminal_agents,
+            violation_count=self.violation_count,
+            first_violation=self.first_violation,
+        )
+
+    def _record(self, violation: LifecycleViolation) -> None:
+        self.violation_count += 1
+        if self.first_violation is None:
+            self.first_violation = violation
+
+
+def validate_timeline(
+    source: str | Path | IO[bytes],
+    ruleset_id: str = DEFAULT_RULESET,
+    fail_fast: bool = True,
+) -> LifecycleReport:
+    """Validate an NDJSON timeline in one streaming pass."""
+    validator = LifecycleValidator(compile_transition_table(ruleset_id))
+    end_offset = 0
+    for ev in iter_events(source):
+        end_offset = ev.offset
+        if validator.feed(ev.data, ev.offset, ev.line) and fail_fast:
+            return validator.finish(ev.offset)
+    return validator.finish(end_offset)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Streaming D2 lifecycle validator")
+    parser.add_argument("timeline", help="Path to events.ndjson, a pack directory, or '-' for stdin")
+    parser.add_argument("--ruleset", default=DEFAULT_RULESET)
+    parser.add_argument("--all", action="store_true", help="Count all violations instead of stopping at the first")
+    args = parser.parse_args(argv)
+
+    if args.timeline == "-":
+        source = sys.stdin.buffer
+    elif Path(args.timeline).is_dir():
+        source = find_timeline(args.timeline)
+        if source is None:
+            print(f"No timeline found in {args.timeline}", file=sys.stderr)
+            return 2
+    else:
+        source = args.timeline
+    report = validate_timeline(source, args.ruleset, fail_fast=not args.all)
+    print(json.dumps(report.to_dict(), indent=2))
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+"""Memoized lockfile hash and environment fingerprint for producer runs.
+
+``run-via-runner.sh`` runs ``uv lock`` in a container and re-hashes
+``uv.lock`` on every run; ``run-in-container.sh`` starts a container for
+``env-fingerprint.sh`` on every run. Both results only depend on their
+inputs, so they are cached in ``data/derived/runner-memo.json``:
+
+- lock: keyed by (sha256 of ``pyproject.toml``, runner image digest). A hit
+  also requires ``uv.lock`` to still hash to the recorded value (checked by
+  stat first, rehashed only when the stat changed).
+- fingerprint: keyed by (runner id, runner image digest, capture command
+  and the sha256 of each ``--input`` file it runs, e.g.
+  ``env-fingerprint.sh``), so editing the script or the command recaptures.
+
+On a miss the given command is run (from the repository root) and the result
+recorded. An ``unknown`` image digest is never cached.
+
+Usage:
+    python -m mplp_vlab.lockmemo lock --project DIR --image-digest D [-- <lock command>]
+    python -m mplp_vlab.lockmemo fingerprint --runner R --image-digest D [--input FILE]... -- <fingerprint command>
+"""
+
+import argparse
+import fcntl
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from collections.abc import Callable, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+from .packhash import hash_file
+from .paths import repo_root
+
+MEMO_VERSION = 1
+LOCK_FILE = "uv.lock"
+PYPROJECT = "pyproject.toml"
+UNKNOWN_DIGEST = "unknown"
+
+
+def memo_path() -> Path:
+    return Path(os.environ.get("VLAB_RUNNER_MEMO") or repo_root() / "data" / "derived" / "runner-memo.json")
+
+
+def inputs_key(command: Sequence[str], inputs: Sequence[str | Path] = ()) -> str:
+    """sha256 over a command line and the contents of the files it reads (first 16 hex chars)."""
+    h = hashlib.sha256(json.dumps(list(command)).encode("utf-8"))
+    for path in sorted(str(p) for p in inputs):
+        h.update(f"\0{path}\0{hash_file(path)}".encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+def _stat_key(path: Path) -> list[int]:
+    st = path.stat()
+    return [st.st_size, st.st_mtime_ns]
+
+
+class RunnerMemo:
+    """JSON-file memo, safe for concurrent producer runs (``flock`` around read-modify-write)."""
+
+    def __init__(self, path: str | Path | None = None):
+        self.path = Path(path) if path else memo_path()
+
+    @contextmanager
+    def _locked(self) -> Iterator[dict[str, Any]]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_suffix(".lock"), "w") as guard:
+            fcntl.flock(guard, fcntl.LOCK_EX)
+            try:
+                memo = json.loads(self.path.read_text(encoding="utf-8"))
+                if memo.get("memo_version") != MEMO_VERSION:
+                    raise ValueError("memo version")
+            except (FileNotFoundError, ValueError):
+                memo = {"memo_version": MEMO_VERSION, "locks": {}, "fingerprints": {}}
+            before = json.dumps(memo, sort_keys=True)
+            yield memo
+            if json.dumps(memo, sort_keys=True) != before:
+                tmp = self.path.with_suffix(".tmp")
+                tmp.write_text(json.dumps(memo, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+                os.replace(tmp, self.path)
+
+    def lock_sha256(
+        self,
+        project_dir: str | Path,
+        image_digest: str,
+        run_lock: Callable[[], None] | None = None,
+    ) -> tuple[str, bool]:
+        """``(sha256 of uv.lock, cache hit)``; ``run_lock`` regenerates the lock on a miss."""
+        project_dir = Path(project_dir).resolve()
+        lock_path = project_dir / LOCK_FILE
+        key = f"{hash_file(project_dir / PYPROJECT)}:{image_digest}"
+        cacheable = image_digest != UNKNOWN_DIGEST
+
+        with self._locked() as memo:
+            entry = memo["locks"].get(str(project_dir)) if cacheable else None
+            if entry and entry["key"] == key and lock_path.is_file():
+                if entry["lock_stat"] == _stat_key(lock_path):
+                    return entry["lock_sha256"], True
+                if hash_file(lock_path) == entry["lock_sha256"]:
+                    entry["lock_stat"] = _stat_key(lock_path)  # touched, not changed
+                    return entry["lock_sha256"], True
+
+            if run_lock is not None:
+                run_lock()
+            lock_sha = hash_file(lock_path)
+            if cacheable:
+                memo["locks"][str(project_dir)] = {
+                    "key": key,
+                    "lock_sha256": lock_sha,
+                    "lock_stat": _stat_key(lock_path),
+                }
+            return lock_sha, False
+
+    def env_fingerprint(
+        self,
+        runner_id: str,
+        image_digest: str,
+        capture: Callable[[], dict[str, Any]],
+        command: Sequence[str] = (),
+        inputs: Sequence[str | Path] = (),
+    ) -> tuple[dict[str, Any], bool]:
+        """``(fingerprint, cache hit)``; ``capture`` computes it on a miss.
+
+        ``command`` and ``inputs`` are what ``capture`` runs; a change to either is a miss.
+        """
+        key = f"{runner_id}:{image_digest}:{inputs_key(command, inputs)}"
+        with self._locked() as memo:
+            if image_digest != UNKNOWN_DIGEST and key in memo["fingerprints"]:
+                return memo["fingerprints"][key], True
+            fingerprint = capture()
+            if image_digest != UNKNOWN_DIGEST:
+                memo["fingerprints"][key] = fingerprint
+            return fingerprint, False
+
+
+def _run(command: list[str]) -> str:
+    proc = subprocess.run(command, cwd=repo_root(), stdout=subprocess.PIPE, check=True, text=True)
+    return proc.stdout
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    command: list[str] = []
+    if "--" in argv:
+        split = argv.index("--")
+        argv, command = argv[:split], argv[split + 1:]
+
+    parser = argparse.ArgumentParser(description="Lockfile and env fingerprint memo")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("lock", help="Print the uv.lock sha256, running the lock command on a miss")
+    p.add_argument("--project", required=True, help="Producer directory holding pyproject.toml")
+    p.add_argument("--image-digest", required=True)
+    p = sub.add_parser("fingerprint", help="Print the env fingerprint JSON, running the command on a miss")
+    p.add_argument("--runner", required=True)
+    p.add_argument("--image-digest", required=True)
+    p.add_argument("--input", action="append", default=[], help="File the command reads (part of the memo key)")
+    args = parser.parse_args(argv)
+
+    if args.command == "fingerprint" and not command:
+        parser.error("fingerprint needs a capture command after --")
+    memo = RunnerMemo()
+    try:
+        if args.command == "lock":
+            sha, hit = memo.lock_sha256(args.project, args.image_digest, (lambda: _run(command)) if command else None)
+            print(sha)
+        else:
+            fingerprint, hit = memo.env_fingerprint(
+                args.runner, args.image_digest, lambda: json.loads(_run(command)), command, args.input
+            )
+            print(json.dumps(fingerprint, indent=2))
+    except subprocess.CalledProcessError as e:
+        print(f"error: {' '.join(command)} exited with {e.returncode}", file=sys.stderr)
+        return e.returncode or 1
+    except OSError as e:  # no uv.lock and no lock command, missing pyproject.toml or --input
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    print(f"[lockmemo] {args.command}: {'hit' if hit else 'miss'}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+"""Merkle pack root with inclusion proofs (optional, alongside the flat root).
+
+The flat roots (``pack.sha256``, ``pack_root_hash.txt``) hash the whole sums
+listing, so proving one artifact needs all of it. The Merkle root is built
+over the same ``(path, sha256)`` leaves, shaped like the pack's directory
+tree, so a single file or a whole directory (``artifacts/``) can be checked
+against the root with a proof of a few hashes per directory level.
+
+Node hashes (sha256, domain-separated, names are basenames in UTF-8):
+
+    leaf(name, digest)    = H(0x00 || name || 0x00 || digest bytes)
+    pair(left, right)     = H(0x01 || left || right)
+    dir(name, children)   = H(0x02 || name || 0x00 || fold(children))
+
+``fold`` combines a directory's child nodes, sorted by name, as a binary
+tree: adjacent pairs are combined level by level and an odd last node moves
+up unchanged (an empty directory folds to ``H("")``). The pack root is
+``dir("", ...)`` over the top level.
+
+A proof lists, from the target up to the pack directory, the pair-siblings
+within each directory fold (``"L"``/``"R"`` = sibling on the left/right).
+The root lives in ``integrity/merkle.sha256`` (``<root>  merkle``); the
+flat root and ``sha256sums.txt`` are unchanged.
+
+Usage:
+    python -m mplp_vlab.merkle root <pack_dir> [--write]
+    python -m mplp_vlab.merkle prove <pack_dir> <path|dir/> [--out proof.json]
+    python -m mplp_vlab.merkle check <proof.json> [--target FILE|DIR] [--root HEX]
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+from .packhash import SumsEntry, canonical_entry, hash_canonical, list_pack_files, read_sums
+
+MERKLE_ROOT_PATH = "integrity/merkle.sha256"
+PROOF_VERSION = 1
+
+Tree = dict[str, "Tree | str"]  # name -> subtree or sha256 hex
+
+
+def _h(*parts: bytes) -> bytes:
+    return hashlib.sha256(b"".join(parts)).digest()
+
+
+def leaf_node(name: str, digest: str) -> bytes:
+    return _h(b"\x00", name.encode("utf-8"), b"\x00", bytes.fromhex(digest))
+
+
+def pair_node(left: bytes, right: bytes) -> bytes:
+    return _h(b"\x01", left, right)
+
+
+def dir_node(name: str, folded: bytes) -> bytes:
+    return _h(b"\x02", name.encode("utf-8"), b"\x00", folded)
+
+
+def fold(nodes: list[bytes]) -> bytes:
+    if not nodes:
+        return _h(b"")
+    level = list(nodes)
+    while len(level) > 1:
+        level = [pair_node(level[i], level[i + 1]) if i + 1 < len(level) else level[i] for i in range(0, len(level), 2)]
+    return level[0]
+
+
+def audit_path(nodes: list[bytes], index: int) -> list[tuple[str, str]]:
+    """Siblings of ``nodes[index]`` in ``fold(nodes)``, bottom up."""
+    path: list[tuple[str, str]] = []
+    level = list(nodes)
+    while len(level) > 1:
+        if index % 2:
+            path.append(("L", level[index - 1].hex()))
+        elif index + 1 < len(level):
+            path.append(("R", level[index + 1].hex()))
+        level = [pair_node(level[i], level[i + 1]) if i + 1 < len(level) else level[i] for i in range(0, len(level), 2)]
+        index //= 2
+    return path
+
+
+def apply_path(node: bytes, path: list[list[str]] | list[tuple[str, str]]) -> bytes:
+    for side, sibling in path:
+        node = pair_node(bytes.fromhex(sibling), node) if side == "L" else pair_node(node, bytes.fromhex(sibling))
+    return node
+
+
+# ---------------------------------------------------------------------------
+# Trees
+# ---------------------------------------------------------------------------
+
+def build_tree(entries: list[SumsEntry]) -> Tree:
+    tree: Tree = {}
+    for e in entries:
+        *dirs, name = e.path.split("/")
+        node = tree
+        for d in dirs:
+            node = node.setdefault(d, {})
+            if not isinstance(node, dict):
+                raise ValueError(f"{e.path}: '{d}' is both a file and a directory")
+        node[name] = e.hash
+    return tree
+
+
+def _children(tree: Tree) -> tuple[list[str], list[bytes]]:
+    names = sorted(tree)
+    return names, [_node(name, tree[name]) for name in names]
+
+
+def _node(name: str, value: "Tree | str") -> bytes:
+    if isinstance(value, str):
+        return leaf_node(name, value)
+    return dir_node(name, fold(_children(value)[1]))
+
+
+def merkle_root(entries: list[SumsEntry]) -> str:
+    return _node("", build_tree(entries)).hex()
+
+
+def prove(entries: list[SumsEntry], target: str) -> dict[str, Any]:
+    """Inclusion proof of a file path, or of a directory (``artifacts`` / ``artifacts/``)."""
+    tree = build_tree(entries)
+    parts = [p for p in target.strip("/").split("/") if p]
+    if not parts:
+        raise KeyError("target must name a file or directory inside the pack")
+    chain: list[Tree] = [tree]
+    for p in parts[:-1]:
+        child = chain[-1].get(p)
+        if not isinstance(child, dict):
+            raise KeyError(f"{target}: not in pack")
+        chain.append(child)
+    value = chain[-1].get(parts[-1])
+    if value is None:
+        raise KeyError(f"{target}: not in pack")
+
+    levels = []
+    for depth in range(len(parts) - 1, -1, -1):
+        names, nodes = _children(chain[depth])
+        levels.append({"dir": "/".join(parts[:depth]), "path": audit_path(nodes, names.index(parts[depth]))})
+    kind = "file" if isinstance(value, str) else "dir"
+    return {
+        "merkle_version": PROOF_VERSION,
+        "target": "/".join(parts),
+        "kind": kind,
+        "digest": value if kind == "file" else _node(parts[-1], value).hex(),
+        "root": _node("", tree).hex(),
+        "levels": levels,
+    }
+
+
+def root_from_proof(proof: dict[str, Any], node: bytes | None = None) -> str:
+    """Walk ``proof`` up from the target node (leaf or directory node; default: the recorded digest)."""
+    name = proof["target"].rsplit("/", 1)[-1]
+    if node is None:
+        node = leaf_node(name, proof["digest"]) if proof["kind"] == "file" else bytes.fromhex(proof["digest"])
+    for level in proof["levels"]:
+        node = apply_path(node, level["path"])
+        node = dir_node(level["dir"].rsplit("/", 1)[-1] if level["dir"] else "", node)
+    return node.hex()
+
+
+def subtree_node(directory: str | Path, name: str) -> bytes:
+    """Directory node of a local copy of a pack directory (files rehashed)."""
+    directory = Path(directory)
+    entries = [canonical_entry(directory, rel) for rel in list_pack_files(directory)]
+    return dir_node(name, fold(_children(build_tree(entries))[1]))
+
+
+def check_proof(proof: dict[str, Any], target: str | Path | None = None, root: str | None = None) -> bool:
+    """Check ``proof`` against ``root`` (default: the root it records).
+
+    With ``target`` the local file (or directory) is rehashed and must match
+    too; without it only the recorded digest is tied to the root.
+    """
+    name = proof["target"].rsplit("/", 1)[-1]
+    node = None
+    if target is not None:
+        target = Path(target)
+        if proof["kind"] == "file":
+            node = leaf_node(name, hash_canonical(target))
+        else:
+            node = subtree_node(target, name)
+    return root_from_proof(proof, node) == (root or proof["root"])
+
+
+# ---------------------------------------------------------------------------
+# Packs
+# ---------------------------------------------------------------------------
+
+def pack_entries(pack_dir: str | Path) -> list[SumsEntry]:
+    """Leaves from the pack's sums file, or by hashing the files when it has none."""
+    entries = read_sums(pack_dir)
+    if entries is None:
+        pack_dir = Path(pack_dir)
+        entries = sorted((canonical_entry(pack_dir, rel) for rel in list_pack_files(pack_dir)), key=lambda e: e.path)
+    return entries
+
+
+def read_merkle_root(pack_dir: str | Path) -> str | None:
+    path = Path(pack_dir) / MERKLE_ROOT_PATH
+    if not path.is_file():
+        return None
+    return (path.read_text(encoding="utf-8").split() or [None])[0]
+
+
+def write_merkle_root(pack_dir: str | Path, entries: list[SumsEntry] | None = None) -> str:
+    root = merkle_root(entries if entries is not None else pack_entries(pack_dir))
+    path = Path(pack_dir) / MERKLE_ROOT_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"{root}  merkle\n", encoding="utf-8")
+    return root
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Merkle pack root and inclusion proofs")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_root = sub.add_parser("root", help="Print (and with --write, record) the Merkle root")
+    p_root.add_argument("pack")
+    p_root.add_argument("--write", action="store_true", help=f"Write {MERKLE_ROOT_PATH}")
+    p_prove = sub.add_parser("prove", help="Inclusion proof for a file or directory")
+    p_prove.add_argument("pack")
+    p_prove.add_argument("target", help="Pack-relative file path, or directory (artifacts/)")
+    p_prove.add_argument("--out", help="Write the proof here (default: stdout)")
+    p_check = sub.add_parser("check", help="Check a proof")
+    p_check.add_argument("proof")
+    p_check.add_argument("--target", help="Local copy of the file or directory to rehash")
+    p_check.add_argument("--root", help="Trusted root (default: the root in the proof)")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "root":
+            entries = pack_entries(args.pack)
+            print(write_merkle_root(args.pack, entries) if args.write else merkle_root(entries))
+            return 0
+        if args.command == "prove":
+            proof = json.dumps(prove(pack_entries(args.pack), args.target), indent=2) + "\n"
+            if args.out:
+                Path(args.out).write_text(proof, encoding="utf-8")
+            else:
+                sys.stdout.write(proof)
+            return 0
+        proof = json.loads(Path(args.proof).read_text(encoding="utf-8"))
+        ok = check_proof(proof, args.target, args.root)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    print(f"{'PASS' if ok else 'FAIL'} {proof['kind']} {proof['target']}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""Run many producer runs concurrently in one process (asyncio, bounded).
+
+``mplp_vlab.produce`` starts one interpreter per run. For I/O-bound
+substrates (agents whose model calls are network-shaped, emulated locally
+by stub latencies) most of a run is spent waiting, so one process can drive
+many runs at once. This loads ``produce-real.py`` in-process and, for each
+run:
+
+- builds the pack with the producer's ``build_pack_async`` on the shared
+  loop when it has one, else its ``build_pack`` in a worker thread
+- writes and hashes the files on a separate I/O thread pool, then writes
+  ``integrity/sha256sums.txt``, ``manifest.json`` and then
+  ``reports/producer.perf.json`` (phase CPU times there are process-wide,
+  so they include the other runs in flight) and, with ``VLAB_TRACE`` set,
+  the run's own span trace (``mplp_vlab.tracing``); with
+  ``VLAB_TIMELINE_FORMAT=blocks`` the timeline is written block-compressed
+  (``mplp_vlab.blocktimeline``), its sums entry unchanged
+
+At most ``concurrency`` runs are in flight (``asyncio.Semaphore``). Each run
+has its own timeline and budget guard and writes only its own out_dir
+(``<out_root>/<run_id>``), the same file set as a standalone run with the
+same inputs. Contents match such a run except for wall-clock values (event
+``timestamp``, ``established_at``, step latencies, and so the sums and
+hashes over them). A producer run through ``build_pack_async``
+(magentic_one) is always on the realtime scheduler: ``artifacts/trace.json``
+records ``"scheduler": "realtime"``, which a standalone run does only when
+that scheduler is selected. A run aborted by its budget guard or failing for any
+other reason is reported and never gets a manifest; the others continue.
+
+The producer's substrate dependencies must be importable by this interpreter.
+
+Usage:
+    python -m mplp_vlab.multiproduce <substrate> --out-root DIR [--runs N] [--concurrency K]
+        [--io-workers N] [--scenario ID] [--run-prefix P] [--report PATH]
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+from .blocktimeline import write_timeline
+from .packhash import SumsEntry, render_sums, sha256_bytes
+from .perf import PerfRecorder
+from .schema import validate_on_write
+from .tracing import Tracer, tracer_from_env
+from .produce import DEFAULT_SCENARIO, PRODUCER_SCRIPT, producers_dir
+from .runstore import run_path
+
+DEFAULT_CONCURRENCY = 8
+
+
+@dataclass
+class RunSpec:
+    run_id: str
+    out_dir: Path
+    scenario_id: str = DEFAULT_SCENARIO
+
+
+@dataclass
+class RunOutcome:
+    run_id: str
+    out_dir: str
+    status: str  # ok | aborted (budget guard) | failed
+    wall_ms: float
+    files: dict[str, str] = field(default_factory=dict)  # sealed path -> sha256
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def load_producer(substrate_or_path: str | Path) -> ModuleType:
+    """Import a producer script as a module (its directory goes on ``sys.path`` for sibling imports)."""
+    path = Path(substrate_or_path)
+    if not path.suffix:
+        path = producers_dir() / str(substrate_or_path) / PRODUCER_SCRIPT
+    if not path.is_file():
+        raise FileNotFoundError(f"no producer for '{substrate_or_path}' ({path})")
+    path = path.resolve()
+    if str(path.parent) not in sys.path:
+        sys.path.insert(0, str(path.parent))
+    spec = importlib.util.spec_from_file_location(f"_producer_{path.parent.parent.name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    if not hasattr(module, "build_pack"):
+        raise AttributeError(f"{path} has no build_pack(scenario_id, run_id)")
+    return module
+
+
+def _write(path: Path, text: str) -> str:
+    data = text.encode("utf-8")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.name == "events.ndjson":
+        return write_timeline(path, data)[1]
+    path.write_bytes(data)
+    return sha256_bytes(data)
+
+
+async def _write_pack(out_dir: Path, files: dict[str, str], sealed: tuple[str, ...], io: ThreadPoolExecutor,
+                      perf: PerfRecorder, tracer: Tracer | None = None) -> dict[str, str]:
+    loop = asyncio.get_running_loop()
+    validate_on_write(files, perf)  # VLAB_VALIDATE=1
+    for sub in ("reports", "integrity"):
+        (out_dir / sub).mkdir(parents=True, exist_ok=True)
+    with perf.phase("write_and_hash"):
+        hashes = await asyncio.gather(*(loop.run_in_executor(io, _write, out_dir / p, files[p]) for p in sealed))
+        entries = [SumsEntry(p, h) for p, h in zip(sealed, hashes)]
+        await loop.run_in_executor(io, _write, out_dir / "integrity" / "sha256sums.txt", render_sums(entries))
+    # Manifest last: a run interrupted before this point is never sealable
+    with perf.phase("manifest_write"):
+        await loop.run_in_executor(io, _write, out_dir / "manifest.json", files["manifest.json"])
+    await loop.run_in_executor(io, perf.write, out_dir)
+    if tracer is not None:
+        await loop.run_in_executor(io, tracer.write, out_dir, perf.substrate or "producer")
+    return {e.path: e.hash for e in entries}
+
+
+async def produce_runs(
+    producer: ModuleType,
+    runs: list[RunSpec],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    io_workers: int = 4,
+) -> list[RunOutcome]:
+    """Produce ``runs``, at most ``concurrency`` at once; outcomes in ``runs`` order."""
+    gate = asyncio.Semaphore(max(1, concurrency))
+    budget_error = getattr(producer, "BudgetExceeded", ())
+    build_async = getattr(producer, "build_pack_async", None)
+    sealed = tuple(producer.SEALED_FILES)
+    substrate = getattr(producer, "SUBSTRATE_ID", None)
+    loop = asyncio.get_running_loop()
+
+    async def one(spec: RunSpec, io: ThreadPoolExecutor) -> RunOutcome:
+        async with gate:
+            start = time.perf_counter()
+            outcome = RunOutcome(spec.run_id, str(spec.out_dir), "ok", 0.0)
+            perf = PerfRecorder("multiproduce", substrate, spec.run_id)
+            tracer = tracer_from_env()
+            try:
+                if build_async is not None:
+                    files = await build_async(spec.scenario_id, spec.run_id, perf=perf, tracer=tracer)
+                else:
+                    build = partial(producer.build_pack, spec.scenario_id, spec.run_id, perf=perf, tracer=tracer)
+                    files = await loop.run_in_executor(None, build)
+                outcome.files = await _write_pack(Path(spec.out_dir), files, sealed, io, perf, tracer)
+            except budget_error as e:
+                outcome.status, outcome.error = "aborted", str(e)
+            except Exception as e:
+                outcome.status, outcome.error = "failed", f"{type(e).__name__}: {e}"
+            outcome.wall_ms = round((time.perf_counter() - start) * 1000, 1)
+            return outcome
+
+    with ThreadPoolExecutor(max_workers=max(1, io_workers), thread_name_prefix="vlab-io") as io:
+        return list(await asyncio.gather(*(one(spec, io) for spec in runs)))
+
+
+def plan_runs(out_root: str | Path, count: int, prefix: str, scenario_id: str = DEFAULT_SCENARIO) -> list[RunSpec]:
+    out_root = Path(out_root).resolve()
+    return [RunSpec(f"{prefix}-{i:03d}", run_path(out_root, f"{prefix}-{i:03d}"), scenario_id) for i in range(1, count + 1)]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Concurrent in-process producer runs")
+    parser.add_argument("substrate", help="Producer directory under producers/real, or a produce-real.py path")
+    parser.add_argument("--out-root", required=True, help="Each run writes <out-root>/<run-id>")
+    parser.add_argument("--runs", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Runs in flight at once")
+    parser.add_argument("--io-workers", type=int, default=4, help="Threads for file writes and hashing")
+    parser.add_argument("--scenario", default=DEFAULT_SCENARIO, help="SCENARIO_ID for every run")
+    parser.add_argument("--run-prefix", help="Run id prefix (default: <substrate>-multi)")
+    parser.add_argument("--report", help="Write the outcomes as JSON here")
+    args = parser.parse_args(argv)
+
+    try:
+        producer = load_producer(args.substrate)
+    except (FileNotFoundError, AttributeError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    prefix = args.run_prefix or f"{Path(args.substrate).name}-multi"
+    runs = plan_runs(args.out_root, args.runs, prefix, args.scenario)
+
+    start = time.perf_counter()
+    outcomes = asyncio.run(produce_runs(producer, runs, args.concurrency, args.io_workers))
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    for o in outcomes:
+        detail = f"  ({o.error})" if o.error else ""
+        print(f"{o.status:<8} {o.wall_ms:8.1f}ms  {o.out_dir}{detail}")
+    ok = sum(o.status == "ok" for o in outcomes)
+    print(f"{ok}/{len(outcomes)} runs ok in {wall_ms:.0f}ms ({len(outcomes) / (wall_ms / 1000):.1f} runs/s, concurrency {args.concurrency})")
+
+    if args.report:
+        report = {
+            "substrate": args.substrate,
+            "scenario_id": args.scenario,
+            "concurrency": args.concurrency,
+            "wall_ms": round(wall_ms, 1),
+            "runs": [o.to_dict() for o in outcomes],
+        }
+        Path(args.report).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    return 0 if ok == len(outcomes) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
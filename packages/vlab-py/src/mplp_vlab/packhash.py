@@ -0,0 +1,168 @@
+"""Pack hashing primitives.
+
+Python mirror of ``lib/engine/packHash.ts`` (the pack hash SSOT) plus the
+root hash convention of the Python generators. Keep the two in sync:
+
+- files under ``integrity/``, ``.DS_Store``/``Thumbs.db``/``.gitkeep`` and
+  the per-run reports in ``EXCLUDED_PATHS`` are excluded from enumeration
+- sums live in ``integrity/sha256sums.txt``; adjudication bundles keep a
+  flat ``sha256sums.txt`` at the bundle root instead
+- ``sha256sums.txt`` lines are ``<hash>  <path>`` with LF endings
+- ``integrity/pack.sha256`` holds ``<root>  pack`` where root is the sha256
+  of the sums lines joined with LF, no trailing newline (TS engine)
+- ``pack_root_hash.txt`` holds the sha256 of the ``sha256sums.txt`` bytes
+  (``test-vectors/**/generate_*.py``)
+
+Block-compressed timelines (``*.ndjson.zb``, see ``blocktimeline``) are
+listed under their uncompressed name with the sha256 of the uncompressed
+stream (``canonical_relpath``, ``hash_canonical``), so a compressed pack
+has the same sums and roots as its raw twin.
+"""
+
+import hashlib
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+EXCLUDED_DIRS = frozenset({"integrity"})
+EXCLUDED_FILES = frozenset({".DS_Store", "Thumbs.db", ".gitkeep"})
+
+SUMS_PATH = "integrity/sha256sums.txt"
+FLAT_SUMS_PATH = "sha256sums.txt"
+PACK_SHA256_PATH = "integrity/pack.sha256"
+ROOT_HASH_TXT = "pack_root_hash.txt"
+
+# Per-run measurements (see ``perf``, ``tracing``): never sealed, hashed or required by coverage
+EXCLUDED_PATHS = frozenset({
+    "reports/producer.perf.json",
+    "reports/producer.trace.json",
+    "reports/producer.speedscope.json",
+})
+
+CHUNK_SIZE = 1 << 20
+
+BLOCK_TIMELINE_SUFFIX = ".ndjson.zb"
+
+_SUMS_LINE = re.compile(r"^([a-f0-9]{64})\s+\*?(.+)$")
+
+
+@dataclass(frozen=True)
+class SumsEntry:
+    path: str
+    hash: str
+
+
+@dataclass(frozen=True)
+class DeclaredRoot:
+    kind: str  # "pack.sha256" or "pack_root_hash.txt"
+    hash: str
+
+
+def sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path: str | Path, algorithm: str = "sha256") -> str:
+    """Streamed file digest; memory stays at one chunk."""
+    h = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def canonical_relpath(rel: str) -> str:
+    """Sums path of a stored pack file (a block timeline is listed uncompressed)."""
+    return rel.removesuffix(".zb") if rel.endswith(BLOCK_TIMELINE_SUFFIX) else rel
+
+
+def stored_path(pack_dir: str | Path, rel: str) -> Path:
+    """File holding sums path ``rel``: the file itself, else its block-compressed form."""
+    path = Path(pack_dir) / rel
+    if not path.exists() and rel.endswith(".ndjson"):
+        packed = path.with_name(path.name + ".zb")
+        if packed.exists():
+            return packed
+    return path
+
+
+def hash_canonical(path: str | Path) -> str:
+    """sha256 of a stored file's canonical bytes (decompressed for a block timeline)."""
+    if str(path).endswith(BLOCK_TIMELINE_SUFFIX):
+        from .blocktimeline import canonical_sha256
+
+        return canonical_sha256(path)
+    return hash_file(path)
+
+
+def canonical_entry(pack_dir: str | Path, rel: str) -> SumsEntry:
+    """Sums entry of stored pack file ``rel``."""
+    return SumsEntry(canonical_relpath(rel), hash_canonical(Path(pack_dir) / rel))
+
+
+def list_pack_files(pack_dir: str | Path) -> list[str]:
+    """Relative POSIX paths of all pack files, exclusion rules applied, sorted."""
+    pack_dir = Path(pack_dir)
+    files: list[str] = []
+    for dirpath, dirnames, filenames in os.walk(pack_dir):
+        dirnames[:] = [d for d in dirnames if d not in EXCLUDED_DIRS]
+        for name in filenames:
+            if name not in EXCLUDED_FILES:
+                rel = Path(dirpath, name).relative_to(pack_dir).as_posix()
+                if rel not in EXCLUDED_PATHS:
+                    files.append(rel)
+    return sorted(files)
+
+
+def parse_sums(text: str) -> list[SumsEntry]:
+    """Entries in file order (the order the root hash is computed over)."""
+    entries = []
+    for line in text.splitlines():
+        m = _SUMS_LINE.match(line.strip())
+        if m:
+            entries.append(SumsEntry(m.group(2).removeprefix("./"), m.group(1)))
+    return entries
+
+
+def sums_path(pack_dir: str | Path) -> Path | None:
+    """``integrity/sha256sums.txt``, else a flat bundle-root ``sha256sums.txt``."""
+    for rel in (SUMS_PATH, FLAT_SUMS_PATH):
+        path = Path(pack_dir) / rel
+        if path.is_file():
+            return path
+    return None
+
+
+def read_sums(pack_dir: str | Path) -> list[SumsEntry] | None:
+    path = sums_path(pack_dir)
+    if path is None:
+        return None
+    return parse_sums(path.read_text(encoding="utf-8"))
+
+
+def render_sums(entries: list[SumsEntry]) -> str:
+    return "".join(f"{e.hash}  {e.path}\n" for e in entries)
+
+
+def pack_root_hash(entries: list[SumsEntry]) -> str:
+    """TS engine root: sha256 of the sums lines joined with LF, no trailing newline."""
+    return sha256_bytes("\n".join(f"{e.hash}  {e.path}" for e in entries).encode("utf-8"))
+
+
+def read_declared_root(pack_dir: str | Path) -> DeclaredRoot | None:
+    pack_dir = Path(pack_dir)
+    for rel, kind in ((PACK_SHA256_PATH, "pack.sha256"), (ROOT_HASH_TXT, "pack_root_hash.txt")):
+        path = pack_dir / rel
+        if path.is_file():
+            token = (path.read_text(encoding="utf-8").split() or [""])[0]
+            if re.fullmatch(r"[a-f0-9]{64}", token):
+                return DeclaredRoot(kind, token)
+    return None
+
+
+def compute_root(pack_dir: str | Path, declared: DeclaredRoot, entries: list[SumsEntry]) -> str:
+    """Recompute the root under the convention of the declared root file."""
+    if declared.kind == "pack_root_hash.txt":
+        return hash_file(sums_path(pack_dir) or Path(pack_dir) / SUMS_PATH)
+    return pack_root_hash(entries)
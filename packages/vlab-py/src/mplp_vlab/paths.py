@@ -0,0 +1,27 @@
+"""Repository path resolution.
+
+The repo root is taken from ``VLAB_ROOT`` when set, otherwise located by
+walking up from this file to the directory holding ``data/rulesets``.
+"""
+
+import os
+from pathlib import Path
+
+
+def repo_root() -> Path:
+    """Return the Validation Lab repository root."""
+    env = os.environ.get("VLAB_ROOT")
+    if env:
+        return Path(env).resolve()
+    for parent in Path(__file__).resolve().parents:
+        if (parent / "data" / "rulesets").is_dir() and (parent / "package.json").is_file():
+            return parent
+    return Path.cwd()
+
+
+def rulesets_dir() -> Path:
+    return repo_root() / "data" / "rulesets"
+
+
+def scenarios_dir() -> Path:
+    return repo_root() / "data" / "scenarios"
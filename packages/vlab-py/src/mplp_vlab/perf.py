@@ -0,0 +1,203 @@
+"""Per-phase performance report of a producer or generator run.
+
+Every pack gets ``reports/producer.perf.json``:
+
+    {"perf_version": "1", "tool": "...", "substrate": "...", "run_id": "...",
+     "host": {...}, "phases": [{"name", "wall_ms", "cpu_ms", "cpu_clock", "peak_rss_kb"}],
+     "total": {"wall_ms", "cpu_ms", "peak_rss_kb"}}
+
+``cpu_clock`` is ``process`` (``time.process_time``), ``thread`` (a phase
+measured inside one worker thread) or ``children`` (a generator subprocess).
+``peak_rss_kb`` is the high-water mark of the process (or of its children)
+at the end of the phase, not the phase's own peak.
+
+Timings differ on every run, so the report is excluded from pack
+enumeration (``packhash.EXCLUDED_PATHS``): it is never sealed, never part
+of a root hash and not required by sums coverage.
+
+Usage:
+    python -m mplp_vlab.perf <pack_dir|perf.json>...
+    python -m mplp_vlab.perf --summary <dir>... [--json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PERF_PATH = "reports/producer.perf.json"
+PERF_VERSION = "1"
+
+
+def snapshot() -> tuple[float, float]:
+    """``(wall, cpu)`` start point for ``PerfRecorder.record``."""
+    return time.perf_counter(), time.process_time()
+
+
+def peak_rss_kb(children: bool = False) -> int | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # bytes on macOS
+
+
+def children_cpu() -> float:
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+class PerfRecorder:
+    """Collects phases in order; ``start`` (a ``snapshot``) lets the total include work done before construction."""
+
+    def __init__(self, tool: str, substrate: str | None = None, run_id: str | None = None,
+                 start: tuple[float, float] | None = None) -> None:
+        self.tool = tool
+        self.substrate = substrate
+        self.run_id = run_id
+        self.start = start or snapshot()
+        self.phases: list[dict[str, Any]] = []
+
+    def add(self, name: str, wall_ms: float, cpu_ms: float, cpu_clock: str = "process",
+            peak_kb: int | None = None, **extra: Any) -> None:
+        self.phases.append({
+            "name": name,
+            "wall_ms": round(wall_ms, 3),
+            "cpu_ms": round(cpu_ms, 3),
+            "cpu_clock": cpu_clock,
+            "peak_rss_kb": peak_rss_kb() if peak_kb is None else peak_kb,
+            **extra,
+        })
+
+    def record(self, name: str, since: tuple[float, float], **extra: Any) -> None:
+        """Phase from ``since`` (a ``snapshot``) to now."""
+        wall, cpu = snapshot()
+        self.add(name, (wall - since[0]) * 1000, (cpu - since[1]) * 1000, **extra)
+
+    @contextmanager
+    def phase(self, name: str, **extra: Any) -> Iterator[None]:
+        since = snapshot()
+        yield
+        self.record(name, since, **extra)
+
+    @contextmanager
+    def child_phase(self, name: str, **extra: Any) -> Iterator[None]:
+        """Phase spent waiting on subprocesses: CPU and peak RSS are the children's."""
+        wall, cpu = time.perf_counter(), children_cpu()
+        yield
+        self.add(name, (time.perf_counter() - wall) * 1000, (children_cpu() - cpu) * 1000, "children",
+                 peak_rss_kb(children=True), **extra)
+
+    def to_dict(self) -> dict[str, Any]:
+        wall, cpu = snapshot()
+        cpu += sum(p["cpu_ms"] for p in self.phases if p["cpu_clock"] == "children") / 1000
+        peaks = [p["peak_rss_kb"] for p in self.phases if p["peak_rss_kb"] is not None]
+        return {
+            "perf_version": PERF_VERSION,
+            "tool": self.tool,
+            "substrate": self.substrate,
+            "run_id": self.run_id,
+            "host": {
+                "python": platform.python_version(),
+                "platform": f"{sys.platform}-{platform.machine()}",
+                "cpu_count": os.cpu_count(),
+            },
+            "phases": self.phases,
+            "total": {
+                "wall_ms": round((wall - self.start[0]) * 1000, 3),
+                "cpu_ms": round((cpu - self.start[1]) * 1000, 3),
+                "peak_rss_kb": max(peaks, default=peak_rss_kb()),
+            },
+        }
+
+    def write(self, pack_dir: str | Path) -> Path:
+        path = Path(pack_dir) / PERF_PATH
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2) + "\n", encoding="utf-8")
+        return path
+
+
+def load_report(path: str | Path) -> dict[str, Any]:
+    path = Path(path)
+    if path.is_dir():
+        path = path / PERF_PATH
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def find_reports(roots: list[str | Path]) -> list[Path]:
+    found: set[Path] = set()
+    for root in roots:
+        found.update(Path(root).rglob(Path(PERF_PATH).name))
+    return sorted(p for p in found if p.parent.name == "reports")
+
+
+def summarize(reports: list[dict[str, Any]]) -> dict[str, dict[str, dict[str, float]]]:
+    """``{substrate: {phase: {runs, wall_ms_median, wall_ms_max, cpu_ms_median, peak_rss_kb_max}}}``."""
+    grouped: dict[str, dict[str, list[dict[str, Any]]]] = {}
+    for report in reports:
+        by_phase = grouped.setdefault(report.get("substrate") or "unknown", {})
+        for phase in [*report["phases"], {"name": "total", **report["total"]}]:
+            by_phase.setdefault(phase["name"], []).append(phase)
+    summary: dict[str, dict[str, dict[str, float]]] = {}
+    for substrate, by_phase in sorted(grouped.items()):
+        summary[substrate] = {}
+        for name, samples in by_phase.items():
+            peaks = [s["peak_rss_kb"] for s in samples if s.get("peak_rss_kb") is not None]
+            summary[substrate][name] = {
+                "runs": len(samples),
+                "wall_ms_median": round(statistics.median(s["wall_ms"] for s in samples), 3),
+                "wall_ms_max": max(s["wall_ms"] for s in samples),
+                "cpu_ms_median": round(statistics.median(s["cpu_ms"] for s in samples), 3),
+                "peak_rss_kb_max": max(peaks, default=None),
+            }
+    return summary
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Producer / generator performance reports")
+    parser.add_argument("paths", nargs="+", help="Pack dirs or perf.json files (directories to scan with --summary)")
+    parser.add_argument("--summary", action="store_true", help="Per-substrate, per-phase aggregate over all reports found")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.summary:
+            reports = [load_report(p) for p in find_reports(args.paths)]
+            result: Any = summarize(reports)
+        else:
+            result = [load_report(p) for p in args.paths]
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    elif args.summary:
+        for substrate, phases in result.items():
+            print(substrate)
+            for name, s in phases.items():
+                print(f"  {name:<20} {s['runs']:>5} runs  {s['wall_ms_median']:10.1f}ms median  "
+                      f"{s['wall_ms_max']:10.1f}ms max  {s['cpu_ms_median']:10.1f}ms cpu  {s['peak_rss_kb_max']} kB peak")
+    else:
+        for path, report in zip(args.paths, result):
+            print(f"{path} ({report['substrate']}, {report['tool']})")
+            for p in [*report["phases"], {"name": "total", **report["total"]}]:
+                print(f"  {p['name']:<20} {p['wall_ms']:10.1f}ms wall  {p['cpu_ms']:10.1f}ms cpu  {p['peak_rss_kb']} kB peak")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
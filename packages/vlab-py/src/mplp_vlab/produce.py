@@ -0,0 +1,81 @@
+"""Run a real producer (``producers/real/<substrate>/src/produce-real.py``).
+
+The producers are configured through ``SCENARIO_ID``/``RUN_ID``/``OUT_DIR``;
+this maps flags onto those variables and runs the producer with the given
+interpreter (the producer's own venv, since its substrate dependencies are
+not part of this package). Without ``--out`` the pack goes to the run's
+directory under ``data/runs/v2/real/<substrate>`` (``mplp_vlab.runstore``).
+
+Usage:
+    python -m mplp_vlab.produce <substrate> (--out DIR | --run-id ID) [--scenario ID] [--python PATH]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from .paths import repo_root
+from .runstore import RunStoreError, real_run_dir
+
+PRODUCER_SCRIPT = Path("src") / "produce-real.py"
+DEFAULT_SCENARIO = "d1_basic_pass"
+
+
+def producers_dir() -> Path:
+    return repo_root() / "producers" / "real"
+
+
+def producers() -> list[str]:
+    return sorted(d.name for d in producers_dir().iterdir() if (d / PRODUCER_SCRIPT).is_file())
+
+
+def producer_command(
+    substrate: str,
+    out_dir: str | Path,
+    scenario_id: str = DEFAULT_SCENARIO,
+    run_id: str | None = None,
+    python: str | None = None,
+) -> tuple[list[str], dict[str, str]]:
+    """``(argv, env)`` for one producer run."""
+    script = producers_dir() / substrate / PRODUCER_SCRIPT
+    if not script.is_file():
+        raise FileNotFoundError(f"no producer for substrate '{substrate}' ({script})")
+    out_dir = Path(out_dir).resolve()
+    env = dict(os.environ, SCENARIO_ID=scenario_id, RUN_ID=run_id or out_dir.name, OUT_DIR=str(out_dir))
+    return [python or sys.executable, str(script)], env
+
+
+def produce(substrate: str, out_dir: str | Path, scenario_id: str = DEFAULT_SCENARIO,
+            run_id: str | None = None, python: str | None = None) -> int:
+    argv, env = producer_command(substrate, out_dir, scenario_id, run_id, python)
+    return subprocess.run(argv, cwd=Path(argv[1]).parents[1], env=env).returncode
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run a real producer")
+    parser.add_argument("substrate", nargs="?", help="Producer directory under producers/real")
+    parser.add_argument("--out", help="Pack output directory (OUT_DIR; default: the run's data/runs/v2/real directory)")
+    parser.add_argument("--scenario", default=DEFAULT_SCENARIO, help="SCENARIO_ID")
+    parser.add_argument("--run-id", help="RUN_ID (default: out directory name)")
+    parser.add_argument("--python", help="Interpreter with the producer's dependencies")
+    parser.add_argument("--list", action="store_true", help="List producers")
+    args = parser.parse_args(argv)
+
+    if args.list or not args.substrate:
+        for name in producers():
+            print(name)
+        return 0 if args.list else 2
+    if not args.out and not args.run_id:
+        parser.error("--out or --run-id is required")
+    try:
+        out = args.out or real_run_dir(args.substrate, args.run_id)
+        return produce(args.substrate, out, args.scenario, args.run_id, args.python)
+    except (FileNotFoundError, RunStoreError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
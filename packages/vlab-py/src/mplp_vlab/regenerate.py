@@ -0,0 +1,324 @@
+"""Regenerate the whole gf-01 cross-substrate vector set in one command.
+
+Every substrate under ``test-vectors/cross-substrate/gf-01/`` gets its
+repetitions ``run1``..``runN`` from the multi-agent generator. Substrates
+that also have the single-agent ``generate_pack.py`` get ``pack`` as well.
+All jobs go through ``mplp_vlab.generate`` and run concurrently, so a full
+regeneration takes about as long as the slowest substrate.
+
+Environments are resolved once per distinct requirements set, not once per
+job:
+
+- a generator whose ``requirements*.txt`` has no requirement lines (most
+  of them) runs on this interpreter, and ``.mjs`` generators run on node
+- otherwise a venv keyed by (Python version, requirement lines) is created
+  under ``data/derived/gf01-envs/`` (git-ignored, override with
+  ``VLAB_GF01_ENV_DIR``) and reused until the requirements change
+
+Each venv is built in the background, and the jobs that need it wait for
+it while the rest are already running. ``--host-python`` skips venvs
+altogether.
+
+Each job writes to a staging directory that replaces the target once the
+generator succeeds, so a failed job leaves the previous vector in place.
+When all jobs are done:
+
+- determinism: for each substrate, all successful repetitions have the
+  same ``pack_root_hash`` (a substrate with no successful repetition is
+  reported under ``failed`` only)
+- equivalence: the ``mplp_vlab.equivalence`` record over every substrate's
+  ``run1`` (cross-substrate ``verdict_match``)
+- changed: targets whose root differs from the one they had before
+
+The exit status is 1 if any job failed or any substrate is
+nondeterministic. Equivalence is reported but does not decide the exit
+status, since the gf-01 substrates write differently seeded artifacts.
+
+Usage:
+    python -m mplp_vlab.regenerate [--substrates a,b] [--reps 2] [--no-single] [--out-root DIR] [--jobs N] [--host-python] [--report FILE]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from .equivalence import equivalence_record
+from .generate import SINGLE_GENERATOR, generate, generator_for, substrates, vectors_dir
+from .packhash import SUMS_PATH, hash_file
+from .paths import repo_root
+
+MA_REQUIREMENTS = "requirements_ma.txt"
+SINGLE_REQUIREMENTS = "requirements.txt"
+ENV_MARKER = "env.json"
+
+
+@dataclass
+class Env:
+    key: str | None  # None: this interpreter / node, no venv
+    python: str | None
+    requirements: list[str]
+    created: bool = False
+    wall_ms: float = 0.0
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class Job:
+    substrate: str
+    target: str  # run1..runN or pack
+    single: bool
+    out_dir: str
+    env_key: str | None
+    ok: bool = False
+    root_before: str | None = None
+    root: str | None = None
+    wait_ms: float = 0.0
+    wall_ms: float = 0.0
+    error: str | None = None
+
+    @property
+    def changed(self) -> bool:
+        return self.root is not None and self.root != self.root_before
+
+    def to_dict(self) -> dict[str, Any]:
+        d = asdict(self)
+        d["changed"] = self.changed
+        return d
+
+
+def env_cache_dir() -> Path:
+    return Path(os.environ.get("VLAB_GF01_ENV_DIR") or repo_root() / "data" / "derived" / "gf01-envs")
+
+
+def requirement_lines(path: Path) -> list[str]:
+    """Requirement lines of a requirements file, comments and blanks dropped; ``[]`` when absent."""
+    if not path.is_file():
+        return []
+    lines = (line.split("#", 1)[0].strip() for line in path.read_text(encoding="utf-8").splitlines())
+    return sorted(line for line in lines if line)
+
+
+def requirements_for(substrate: str, single: bool = False) -> list[str]:
+    script = generator_for(substrate, single)
+    if script.suffix == ".mjs":
+        return []
+    return requirement_lines(script.parent / (SINGLE_REQUIREMENTS if single else MA_REQUIREMENTS))
+
+
+def env_key(requirements: list[str]) -> str | None:
+    """Cache key of the venv holding ``requirements``; ``None`` when none is needed."""
+    if not requirements:
+        return None
+    canonical = json.dumps({"python": platform.python_version(), "requirements": requirements}, sort_keys=True)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def _create_env(venv: Path, requirements: list[str]) -> None:
+    staging = venv.with_name(f"{venv.name}.tmp-{os.getpid()}")
+    if staging.exists():
+        shutil.rmtree(staging)
+    subprocess.run([sys.executable, "-m", "venv", str(staging)], check=True, capture_output=True)
+    (staging / "requirements.txt").write_text("\n".join(requirements) + "\n", encoding="utf-8")
+    try:
+        subprocess.run(
+            [str(staging / "bin" / "python"), "-m", "pip", "install", "--quiet", "-r", str(staging / "requirements.txt")],
+            check=True, capture_output=True, text=True,
+        )
+    except subprocess.CalledProcessError as e:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise RuntimeError(f"pip install failed: {(e.stderr or '').strip().splitlines()[-1:] or e}") from None
+    marker = {"python": platform.python_version(), "requirements": requirements}
+    (staging / ENV_MARKER).write_text(json.dumps(marker, indent=2) + "\n", encoding="utf-8")
+    if venv.exists():
+        shutil.rmtree(venv)
+    staging.rename(venv)
+
+
+def resolve_env(requirements: list[str]) -> Env:
+    """The cached venv for ``requirements``, created on a miss."""
+    key = env_key(requirements)
+    if key is None:
+        return Env(None, None, [])
+    start = time.perf_counter()
+    venv = env_cache_dir() / key
+    env = Env(key, str(venv / "bin" / "python"), requirements)
+    if not (venv / ENV_MARKER).is_file():
+        try:
+            env_cache_dir().mkdir(parents=True, exist_ok=True)
+            _create_env(venv, requirements)
+            env.created = True
+        except (OSError, RuntimeError, subprocess.CalledProcessError) as e:
+            env.error = str(e)
+            env.python = None
+    env.wall_ms = round((time.perf_counter() - start) * 1000, 3)
+    return env
+
+
+def _root(pack_dir: Path) -> str | None:
+    sums = pack_dir / SUMS_PATH
+    return hash_file(sums) if sums.is_file() else None
+
+
+def plan_jobs(
+    names: list[str], reps: int = 2, single: bool = True, out_root: str | Path | None = None, host_python: bool = False,
+) -> list[Job]:
+    """One job per (substrate, repetition), plus ``pack`` where a single-agent generator exists."""
+    base = vectors_dir()
+    out_base = Path(out_root).resolve() if out_root else base
+    singles = set(substrates(single=True)) if single else set()
+    jobs = []
+    for name in names:
+        targets = [(f"run{i}", False) for i in range(1, reps + 1)] + ([("pack", True)] if name in singles else [])
+        for target, is_single in targets:
+            key = None if host_python else env_key(requirements_for(name, is_single))
+            out_dir = out_base / name / target
+            job = Job(name, target, is_single, str(out_dir), key)
+            job.root_before = _root(base / name / target)
+            jobs.append(job)
+    return jobs
+
+
+def _run_job(job: Job, env: "Future[Env] | None", perf: bool) -> Job:
+    start = time.perf_counter()
+    python = None
+    if env is not None:
+        resolved = env.result()
+        if resolved.error:
+            job.error = f"environment {resolved.key}: {resolved.error}"
+            return job
+        python = resolved.python
+    job.wait_ms = round((time.perf_counter() - start) * 1000, 3)
+
+    out_dir = Path(job.out_dir)
+    staging = out_dir.with_name(f".{out_dir.name}.regen-{os.getpid()}")
+    if staging.exists():
+        shutil.rmtree(staging)
+    try:
+        generate(job.substrate, staging, job.single, quiet=True, python=python, perf=perf)
+        if out_dir.exists():
+            shutil.rmtree(out_dir)
+        staging.rename(out_dir)
+        job.root = _root(out_dir)
+        job.ok = job.root is not None
+        if not job.ok:
+            job.error = f"generator wrote no {SUMS_PATH}"
+    except (OSError, subprocess.CalledProcessError) as e:
+        job.error = str(e)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+        job.wall_ms = round((time.perf_counter() - start) * 1000, 3)
+    return job
+
+
+def regenerate(
+    names: list[str] | None = None,
+    reps: int = 2,
+    single: bool = True,
+    out_root: str | Path | None = None,
+    jobs: int | None = None,
+    host_python: bool = False,
+    perf: bool = False,
+) -> dict[str, Any]:
+    """Regenerate the vector set concurrently; returns the report."""
+    start = time.perf_counter()
+    names = names or substrates()
+    unknown = sorted(set(names) - set(substrates()))
+    if unknown:
+        raise ValueError(f"no multi-agent generator for: {', '.join(unknown)}")
+    planned = plan_jobs(names, reps, single, out_root, host_python)
+
+    requirements = {}
+    for job in planned:
+        if job.env_key is not None:
+            requirements[job.env_key] = requirements_for(job.substrate, job.single)
+    workers = jobs or len(planned) + len(requirements)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="regen") as pool:
+        envs = {key: pool.submit(resolve_env, reqs) for key, reqs in requirements.items()}
+        futures = [pool.submit(_run_job, job, envs.get(job.env_key), perf) for job in planned]
+        done = [f.result() for f in futures]
+        resolved = [f.result() for f in envs.values()]
+
+    determinism = {}
+    for name in names:
+        roots = {j.root for j in done if j.substrate == name and not j.single and j.ok}
+        if roots:
+            determinism[name] = len(roots) == 1
+    firsts = [Path(j.out_dir) for j in done if j.target == "run1" and j.ok]
+    report = {
+        "vectors": str(vectors_dir()),
+        "out_root": str(Path(out_root).resolve()) if out_root else None,
+        "reps": reps,
+        "envs": [e.to_dict() for e in resolved],
+        "jobs": [j.to_dict() for j in done],
+        "failed": [f"{j.substrate}/{j.target}" for j in done if not j.ok],
+        "changed": [f"{j.substrate}/{j.target}" for j in done if j.changed],
+        "determinism": determinism,
+        "deterministic": all(determinism.values()),
+        "equivalence": equivalence_record(firsts) if len(firsts) > 1 else None,
+        "slowest_job_ms": max((j.wall_ms for j in done), default=0.0),
+        "sum_job_ms": round(sum(j.wall_ms for j in done), 3),
+        "wall_ms": round((time.perf_counter() - start) * 1000, 3),
+    }
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Regenerate the gf-01 cross-substrate vector set")
+    parser.add_argument("--substrates", help="Comma-separated subset (default: every substrate with a generator)")
+    parser.add_argument("--reps", type=int, default=2, help="Repetitions per substrate: run1..runN")
+    parser.add_argument("--no-single", action="store_true", help=f"Skip the single-agent {SINGLE_GENERATOR} packs")
+    parser.add_argument("--out-root", help="Write <substrate>/<target> here instead of over the vectors")
+    parser.add_argument("--jobs", type=int, default=None, help="Concurrent jobs (default: all at once)")
+    parser.add_argument("--host-python", action="store_true", help="Run every generator on this interpreter, no venvs")
+    parser.add_argument("--perf", action="store_true", help="Write reports/producer.perf.json into each pack")
+    parser.add_argument("--report", help="Write the JSON report here")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    if args.reps < 1:
+        print("error: --reps must be at least 1", file=sys.stderr)
+        return 2
+    names = args.substrates.split(",") if args.substrates else None
+    try:
+        report = regenerate(names, args.reps, not args.no_single, args.out_root, args.jobs, args.host_python, args.perf)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    if args.report:
+        Path(args.report).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.report).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for env in report["envs"]:
+            state = f"error: {env['error']}" if env["error"] else ("created" if env["created"] else "cached")
+            print(f"env {env['key']}  {state}  ({', '.join(env['requirements'])})")
+        for job in report["jobs"]:
+            status = "ok" if job["ok"] else f"FAILED: {job['error']}"
+            flag = " changed" if job["changed"] else ""
+            print(f"{job['substrate'] + '/' + job['target']:<24} {job['wall_ms']:>9.1f} ms  {(job['root'] or '-')[:16]}  {status}{flag}")
+        for name, ok in report["determinism"].items():
+            if not ok:
+                print(f"NONDETERMINISTIC {name}")
+        if report["equivalence"] is not None:
+            print(f"cross-substrate verdict_match: {report['equivalence']['verdict_match']}")
+        print(f"wall {report['wall_ms']:.1f} ms (slowest job {report['slowest_job_ms']:.1f} ms, sum {report['sum_job_ms']:.1f} ms)")
+    return 0 if not report["failed"] and report["deterministic"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
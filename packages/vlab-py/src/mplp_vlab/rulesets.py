@@ -0,0 +1,29 @@
+"""Ruleset manifest access (``data/rulesets/<id>/manifest.yaml``)."""
+
+from functools import lru_cache
+from typing import Any
+
+import yaml
+
+from .paths import rulesets_dir
+
+DEFAULT_RULESET = "ruleset-1.3"
+
+
+class RulesetNotFoundError(LookupError):
+    pass
+
+
+@lru_cache(maxsize=None)
+def load_ruleset_manifest(ruleset_id: str) -> dict[str, Any]:
+    path = rulesets_dir() / ruleset_id / "manifest.yaml"
+    if not path.is_file():
+        raise RulesetNotFoundError(f"ruleset manifest not found: {path}")
+    with open(path, encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
+def ruleset_clauses(ruleset_id: str) -> frozenset[str]:
+    """Clause IDs enabled by a ruleset (``clauses`` or v0.3 ``four_domain_clauses``)."""
+    manifest = load_ruleset_manifest(ruleset_id)
+    return frozenset(manifest.get("clauses") or manifest.get("four_domain_clauses") or [])
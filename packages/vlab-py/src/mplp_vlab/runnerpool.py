@@ -0,0 +1,453 @@
+"""Warm local runner pool: a process-isolated alternative to ``run-in-container.sh``.
+
+``runners/_lib/run-in-container.sh`` builds the image, starts one container
+for ``env-fingerprint.sh`` and another for the producer on every run. This
+pool keeps N warm workers for a runner instead:
+
+- each worker owns a venv (created once, reused across pool restarts) and a
+  long-lived interpreter started from it; with ``--project`` the venv holds
+  that producer's dependencies, installed once per ``pyproject.toml`` +
+  ``uv.lock`` (``uv sync --frozen`` when ``uv`` is on PATH, else ``pip
+  install`` of the declared dependencies)
+- the environment fingerprint (same fields as ``env-fingerprint.sh``) is
+  captured once, when the worker starts
+- every run is executed by a worker in a fresh child process with a
+  scrubbed environment, a private ``HOME``/``TMPDIR`` and, where available,
+  user + PID namespaces (``unshare``; ``--no-network`` adds a network
+  namespace)
+- after a successful run ``reports/runner.meta.json`` is stamped with the
+  worker fingerprint, ``manifest.json`` ``env_ref`` is patched and
+  ``integrity/sha256sums.txt`` is rewritten, as the container script does;
+  a run that exits non-zero (e.g. the budget guard's exit 3) is left
+  unstamped and unsealed
+
+Only the ``python-3.11`` runner is supported. The repository root is the
+working directory of every run (``/workspace`` in the container); ``RUN_ID``
+and ``OUT_DIR`` are exported as the run-via-runner scripts do.
+
+Usage:
+    python -m mplp_vlab.runnerpool --cmd "<command>" <out_dir>... [--project DIR] [--workers N] [--no-network]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tomllib
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import IO, Any
+
+from .packhash import SUMS_PATH, canonical_entry, list_pack_files, render_sums
+from .paths import repo_root
+
+# runner_id -> (interpreter on PATH, required "major.minor")
+RUNNERS: dict[str, tuple[str, str]] = {
+    "python-3.11": ("python3.11", "3.11"),
+}
+
+RUNNER_TYPE = "local-pool"
+
+# Host variables a run may inherit; everything else is scrubbed
+_PASSTHROUGH_ENV = ("LANG", "LC_ALL", "TZ", "TERM", "SOURCE_DATE_EPOCH")
+
+_OUTPUT_TAIL = 4096
+
+# Written into a worker venv once the project's dependencies are installed
+_DEPS_MARKER = ".vlab-deps.json"
+
+
+class RunnerUnavailableError(RuntimeError):
+    pass
+
+
+@dataclass
+class RunResult:
+    run_id: str
+    out_dir: str
+    returncode: int
+    worker_id: int
+    worker_pid: int
+    wall_ms: float
+    output_tail: str
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def pool_cache_dir() -> Path:
+    return Path(os.environ.get("VLAB_RUNNER_POOL_DIR") or repo_root() / "data" / "derived" / "runner-pool")
+
+
+def env_fingerprint() -> dict[str, str]:
+    """Same fields, in the same order, as ``runners/_lib/env-fingerprint.sh`` for ``python-*``."""
+    return {
+        "os": platform.system().lower(),
+        "arch": platform.machine(),
+        "runtime_type": "python",
+        "runtime_version": platform.python_version(),
+    }
+
+
+def fingerprint_digest(fingerprint: dict[str, Any]) -> str:
+    """Stands in for the container ``image_digest``."""
+    canonical = json.dumps(fingerprint, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return "local:sha256:" + hashlib.sha256(canonical).hexdigest()
+
+
+def project_key(project: str | Path) -> str:
+    """Hash of the project's ``pyproject.toml`` and ``uv.lock``: one set of worker venvs per lock state."""
+    project = Path(project)
+    h = hashlib.sha256()
+    for name in ("pyproject.toml", "uv.lock"):
+        path = project / name
+        h.update(name.encode("utf-8") + b"\0")
+        h.update(path.read_bytes() if path.is_file() else b"")
+    return h.hexdigest()[:16]
+
+
+def _install_command(project: Path, venv: Path) -> tuple[list[str], dict[str, str]]:
+    """``uv sync`` of the lock into ``venv``, else ``pip install`` of the declared dependencies."""
+    uv = shutil.which("uv")
+    if uv and (project / "uv.lock").is_file():
+        env = {**os.environ, "UV_PROJECT_ENVIRONMENT": str(venv)}
+        return [uv, "sync", "--frozen", "--inexact", "--no-install-project", "--quiet"], env
+    if not (venv / "bin" / "pip").exists():
+        raise RunnerUnavailableError(f"installing {project} needs uv on PATH or worker venvs with pip")
+    with open(project / "pyproject.toml", "rb") as f:
+        dependencies = tomllib.load(f).get("project", {}).get("dependencies", [])
+    if not dependencies:
+        return [], {}
+    cmd = [str(venv / "bin" / "python"), "-m", "pip", "install", "--quiet", "--disable-pip-version-check", *dependencies]
+    return cmd, dict(os.environ)
+
+
+def _unshare_prefix(network: bool) -> list[str]:
+    """User + PID namespace wrapper, or ``[]`` when unprivileged namespaces are unavailable."""
+    unshare = shutil.which("unshare")
+    if not unshare:
+        return []
+    prefix = [unshare, "--user", "--map-root-user", "--pid", "--fork", "--kill-child"]
+    if not network:
+        prefix.append("--net")
+    probe = subprocess.run([*prefix, "true"], capture_output=True)
+    return prefix if probe.returncode == 0 else []
+
+
+# ---------------------------------------------------------------------------
+# Worker side (runs inside the worker venv interpreter)
+# ---------------------------------------------------------------------------
+
+def _serve(venv: str, sandbox: list[str]) -> int:
+    """Worker loop: one JSON request per stdin line, one JSON reply per stdout line."""
+    out = sys.stdout
+    sys.stdout = sys.stderr  # keep the protocol channel clean
+    out.write(json.dumps({"ready": True, "pid": os.getpid(), "fingerprint": env_fingerprint()}) + "\n")
+    out.flush()
+    venv_bin = str(Path(venv) / "bin")
+    for line in sys.stdin:
+        request = json.loads(line)
+        start = time.perf_counter()
+        with tempfile.TemporaryDirectory(prefix="vlab-run-") as home:
+            env = {k: os.environ[k] for k in _PASSTHROUGH_ENV if k in os.environ}
+            env.update(
+                PATH=f"{venv_bin}:/usr/local/bin:/usr/bin:/bin",
+                VIRTUAL_ENV=venv,
+                HOME=home,
+                TMPDIR=home,
+                PYTHONDONTWRITEBYTECODE="1",
+                **request["env"],
+            )
+            try:
+                proc = subprocess.run(
+                    [*sandbox, "/bin/sh", "-c", request["cmd"]],
+                    cwd=request["cwd"],
+                    env=env,
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    timeout=request.get("timeout"),
+                    start_new_session=True,
+                )
+                returncode, output = proc.returncode, proc.stdout
+            except subprocess.TimeoutExpired as e:
+                returncode, output = -9, (e.stdout or b"") + b"\n[runner-pool] timeout\n"
+        out.write(json.dumps({
+            "returncode": returncode,
+            "wall_ms": round((time.perf_counter() - start) * 1000, 1),
+            "output_tail": output[-_OUTPUT_TAIL:].decode("utf-8", "replace"),
+        }) + "\n")
+        out.flush()
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# Pool side
+# ---------------------------------------------------------------------------
+
+class _Worker:
+    def __init__(self, worker_id: int, python: str, venv: Path, sandbox: list[str]):
+        self.worker_id = worker_id
+        env = {k: v for k, v in os.environ.items() if k not in ("PYTHONHOME", "VIRTUAL_ENV")}
+        env["PYTHONPATH"] = str(Path(__file__).resolve().parent.parent)
+        self.proc = subprocess.Popen(
+            [python, "-m", "mplp_vlab.runnerpool", "--serve", "--venv", str(venv), "--sandbox", json.dumps(sandbox)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            env=env,
+            text=True,
+        )
+        hello = self._read()
+        self.pid: int = hello["pid"]
+        self.fingerprint: dict[str, str] = hello["fingerprint"]
+
+    def _read(self) -> dict[str, Any]:
+        stdout: IO[str] = self.proc.stdout  # type: ignore[assignment]
+        line = stdout.readline()
+        if not line:
+            raise RunnerUnavailableError(f"worker {self.worker_id} exited (code {self.proc.poll()})")
+        return json.loads(line)
+
+    def run(self, request: dict[str, Any]) -> dict[str, Any]:
+        stdin: IO[str] = self.proc.stdin  # type: ignore[assignment]
+        stdin.write(json.dumps(request) + "\n")
+        stdin.flush()
+        return self._read()
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def close(self) -> None:
+        if self.proc.stdin:
+            self.proc.stdin.close()
+        try:
+            self.proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+
+
+class RunnerPool:
+    """N warm workers for one runner; ``submit`` runs a command into an out_dir."""
+
+    def __init__(
+        self,
+        runner_id: str = "python-3.11",
+        size: int = 2,
+        network: bool = True,
+        isolate: bool = True,
+        cache_dir: str | Path | None = None,
+        with_pip: bool = True,
+        project: str | Path | None = None,
+    ):
+        if runner_id not in RUNNERS:
+            raise RunnerUnavailableError(f"runner {runner_id} not supported by the local pool")
+        interpreter, version = RUNNERS[runner_id]
+        python = shutil.which(interpreter)
+        if python is None:
+            raise RunnerUnavailableError(f"{interpreter} not found on PATH")
+        self.runner_id = runner_id
+        self.size = size
+        self.sandbox = _unshare_prefix(network) if isolate else []
+        self._cache = Path(cache_dir) if cache_dir else pool_cache_dir()
+        self._with_pip = with_pip
+        self.project = Path(project).resolve() if project else None
+        if self.project and not (self.project / "pyproject.toml").is_file():
+            raise RunnerUnavailableError(f"no pyproject.toml in {self.project}")
+        self._python = python
+        self._version = version
+        self._idle: queue.Queue[_Worker] = queue.Queue()
+        self._workers: list[_Worker] = []
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="runner-pool")
+        for worker_id in range(size):
+            self._idle.put(self._spawn(worker_id))
+
+    def _venv(self, worker_id: int) -> Path:
+        base = self._cache / self.runner_id
+        if self.project:
+            base = base / f"{self.project.name}-{project_key(self.project)}"
+        venv = base / f"worker-{worker_id}"
+        python = venv / "bin" / "python"
+        if not python.exists():
+            args = [self._python, "-m", "venv", str(venv)]
+            if not self._with_pip:
+                args.append("--without-pip")
+            subprocess.run(args, check=True, capture_output=True)
+        if self.project and not (venv / _DEPS_MARKER).is_file():
+            self._install(venv)
+        return venv
+
+    def _install(self, venv: Path) -> None:
+        cmd, env = _install_command(self.project, venv)
+        proc = subprocess.run(cmd, cwd=self.project, env=env, capture_output=True, text=True) if cmd else None
+        if proc and proc.returncode != 0:
+            tail = (proc.stderr or proc.stdout)[-_OUTPUT_TAIL:]
+            raise RunnerUnavailableError(f"installing {self.project} into {venv} failed:\n{tail}")
+        marker = {"project": str(self.project), "key": project_key(self.project)}
+        (venv / _DEPS_MARKER).write_text(json.dumps(marker, indent=2) + "\n", encoding="utf-8")
+
+    def _spawn(self, worker_id: int) -> _Worker:
+        venv = self._venv(worker_id)
+        worker = _Worker(worker_id, str(venv / "bin" / "python"), venv, self.sandbox)
+        runtime = worker.fingerprint["runtime_version"]
+        if not runtime.startswith(self._version + "."):
+            worker.close()
+            raise RunnerUnavailableError(f"{self.runner_id} worker runs Python {runtime}")
+        with self._lock:
+            self._workers.append(worker)
+        return worker
+
+    @property
+    def workers(self) -> list[_Worker]:
+        return list(self._workers)
+
+    def submit(
+        self,
+        cmd: str,
+        out_dir: str | Path,
+        run_id: str | None = None,
+        env: dict[str, str] | None = None,
+        timeout: float | None = None,
+        seal: bool = True,
+    ) -> "Future[RunResult]":
+        return self._executor.submit(self.run, cmd, out_dir, run_id, env, timeout, seal)
+
+    def run(
+        self,
+        cmd: str,
+        out_dir: str | Path,
+        run_id: str | None = None,
+        env: dict[str, str] | None = None,
+        timeout: float | None = None,
+        seal: bool = True,
+    ) -> RunResult:
+        out_dir = Path(out_dir).resolve()
+        run_id = run_id or out_dir.name
+        (out_dir / "reports").mkdir(parents=True, exist_ok=True)
+        (out_dir / "integrity").mkdir(parents=True, exist_ok=True)
+        request = {
+            "cmd": cmd,
+            "cwd": str(repo_root()),
+            "env": {"RUN_ID": run_id, "OUT_DIR": str(out_dir), **(env or {})},
+            "timeout": timeout,
+        }
+        worker = self._idle.get()
+        try:
+            if not worker.alive:
+                worker = self._respawn(worker)
+            executed_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+            reply = worker.run(request)
+        finally:
+            self._idle.put(worker)
+        if reply["returncode"] == 0:
+            _stamp(out_dir, self.runner_id, worker, executed_at)
+            if seal:
+                _seal(out_dir)
+        return RunResult(run_id, str(out_dir), reply["returncode"], worker.worker_id, worker.pid,
+                         reply["wall_ms"], reply["output_tail"])
+
+    def _respawn(self, dead: _Worker) -> _Worker:
+        with self._lock:
+            self._workers.remove(dead)
+        return self._spawn(dead.worker_id)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        for worker in self._workers:
+            worker.close()
+
+    def __enter__(self) -> "RunnerPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _stamp(out_dir: Path, runner_id: str, worker: _Worker, executed_at: str) -> None:
+    """``reports/runner.meta.json`` and manifest ``env_ref``, as ``run-in-container.sh`` writes them."""
+    digest = fingerprint_digest(worker.fingerprint)
+    meta = {
+        "runner_id": runner_id,
+        "runner_type": RUNNER_TYPE,
+        "image_digest": digest,
+        "container_digest": digest,
+        "worker_id": worker.worker_id,
+        "environment_fingerprint": worker.fingerprint,
+        "workdir": str(repo_root()),
+        "executed_at": executed_at,
+    }
+    (out_dir / "reports" / "runner.meta.json").write_text(json.dumps(meta, indent=2) + "\n", encoding="utf-8")
+
+    manifest_path = out_dir / "manifest.json"
+    if manifest_path.is_file():
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        manifest["env_ref"] = {
+            "runner_type": RUNNER_TYPE,
+            "runner_id": runner_id,
+            "image_digest": digest,
+            "environment_fingerprint": worker.fingerprint,
+            "executed_at": executed_at,
+            "note": "Sealed by runner pool",
+        }
+        manifest_path.write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+
+
+def _seal(out_dir: Path) -> None:
+    entries = sorted((canonical_entry(out_dir, rel) for rel in list_pack_files(out_dir)), key=lambda e: e.path)
+    (out_dir / SUMS_PATH).write_text(render_sums(entries), encoding="utf-8")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Warm local runner pool")
+    parser.add_argument("out_dirs", nargs="*", help="One run per out_dir (RUN_ID = directory name)")
+    parser.add_argument("--cmd", help="Command run from the repository root")
+    parser.add_argument("--runner", default="python-3.11", choices=sorted(RUNNERS))
+    parser.add_argument("--project", help="Producer project whose locked dependencies the worker venvs get")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--timeout", type=float)
+    parser.add_argument("--no-network", action="store_true", help="Run in a network namespace")
+    parser.add_argument("--no-isolation", action="store_true", help="Skip user/PID namespaces")
+    parser.add_argument("--no-seal", action="store_true", help="Do not rewrite integrity/sha256sums.txt")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--venv", help=argparse.SUPPRESS)
+    parser.add_argument("--sandbox", default="[]", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        return _serve(args.venv, json.loads(args.sandbox))
+    if not args.cmd or not args.out_dirs:
+        parser.error("--cmd and at least one out_dir are required")
+
+    try:
+        pool = RunnerPool(args.runner, args.workers, network=not args.no_network, isolate=not args.no_isolation,
+                          project=args.project)
+    except RunnerUnavailableError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    with pool:
+        futures = [pool.submit(args.cmd, d, timeout=args.timeout, seal=not args.no_seal) for d in args.out_dirs]
+        results = [f.result() for f in futures]
+    for r in results:
+        status = "OK" if r.ok else f"FAIL({r.returncode})"
+        print(f"{status} {r.run_id} worker={r.worker_id} {r.wall_ms:.0f}ms")
+        if not r.ok:
+            print(r.output_tail, file=sys.stderr)
+    return 0 if all(r.ok for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,309 @@
+"""Run directory storage: flat or hash-prefix fan-out layout.
+
+Run roots (``data/runs``, ``public/data/runs``,
+``data/runs/v2/real/<substrate>``) hold one directory per run. Flat, a
+root lists every run in one directory, which gets slow past tens of
+thousands of entries. Fan-out puts each run under the leading hex digits of
+``sha256(run_id)``::
+
+    data/runs/3f/a9/<run_id>/        depth 2, width 2: 65536 buckets
+
+A root's layout is recorded in ``<root>/.runstore.json``; a root without
+one is flat. Every path is computed from the run ID and the marker, so
+resolving, creating or checking a run never lists a directory.
+
+``migrate`` converts a root in either direction. Runs are moved with
+``rename`` (atomic within the filesystem) after the marker is written, and
+``resolve_run`` falls back to the flat location, so readers and writers keep
+working during and after an interrupted migration; rerunning it finishes
+the job. ``--symlinks`` leaves ``<root>/<run_id>`` as a relative link to the
+bucket for readers that still build flat paths (the TypeScript loaders,
+shell gates). Converting back to flat removes those links.
+
+Usage:
+    python -m mplp_vlab.runstore path <run_id> [--public | --real SUBSTRATE | --root DIR] [--existing]
+    python -m mplp_vlab.runstore migrate [ROOT...] [--all] [--to fanout|flat] [--depth 2] [--width 2] [--symlinks] [--dry-run]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from .paths import repo_root
+
+MARKER = ".runstore.json"
+LAYOUTS = ("flat", "fanout")
+# Entries of a run root that are not runs (data/runs/v2 holds the v2 tree)
+RESERVED = frozenset({"v2"})
+
+
+class RunStoreError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Layout:
+    kind: str = "flat"
+    depth: int = 2
+    width: int = 2
+
+    def relpath(self, run_id: str) -> Path:
+        if self.kind == "flat":
+            return Path(run_id)
+        return Path(*bucket(run_id, self.depth, self.width), run_id)
+
+    def is_bucket(self, name: str) -> bool:
+        return len(name) == self.width and all(c in "0123456789abcdef" for c in name)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def bucket(run_id: str, depth: int = 2, width: int = 2) -> tuple[str, ...]:
+    digest = hashlib.sha256(run_id.encode("utf-8")).hexdigest()
+    return tuple(digest[i * width : (i + 1) * width] for i in range(depth))
+
+
+def _check_run_id(run_id: str) -> None:
+    if not run_id or run_id in (".", "..") or "/" in run_id or os.sep in run_id or run_id.startswith("."):
+        raise RunStoreError(f"invalid run id: {run_id!r}")
+    if run_id in RESERVED:
+        raise RunStoreError(f"run id {run_id!r} is reserved")
+
+
+@lru_cache(maxsize=256)
+def _read_layout(root: str) -> Layout:
+    try:
+        with open(os.path.join(root, MARKER), encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return Layout()
+    if data.get("kind") not in LAYOUTS:
+        raise RunStoreError(f"{root}/{MARKER}: unknown layout {data.get('kind')!r}")
+    return Layout(data["kind"], int(data.get("depth", 2)), int(data.get("width", 2)))
+
+
+def layout_of(root: str | Path) -> Layout:
+    """The root's layout (cached per process; ``migrate`` clears the cache)."""
+    return _read_layout(os.path.abspath(root))
+
+
+def run_path(root: str | Path, run_id: str) -> Path:
+    """Where ``run_id`` lives (or is to be written) under ``root``."""
+    _check_run_id(run_id)
+    return Path(root) / layout_of(root).relpath(run_id)
+
+
+def resolve_run(root: str | Path, run_id: str) -> Path | None:
+    """The existing directory of ``run_id``, also found at its flat location mid-migration."""
+    path = run_path(root, run_id)
+    if path.is_dir():
+        return path
+    flat = Path(root) / run_id
+    return flat if flat.is_dir() else None
+
+
+def iter_runs(root: str | Path) -> Iterator[Path]:
+    """Run directories under ``root`` (compat symlinks are not listed twice)."""
+    root = Path(root)
+    if not root.is_dir():
+        return
+    layout = layout_of(root)
+    for entry in sorted(os.scandir(root), key=lambda e: e.name):
+        if entry.name.startswith(".") or entry.name in RESERVED or entry.is_symlink() or not entry.is_dir():
+            continue
+        if layout.kind == "fanout" and layout.is_bucket(entry.name):
+            yield from _walk_buckets(Path(entry.path), layout.depth - 1)
+        else:
+            yield Path(entry.path)  # flat, or not yet migrated
+
+
+def _walk_buckets(path: Path, depth: int) -> Iterator[Path]:
+    for entry in sorted(os.scandir(path), key=lambda e: e.name):
+        if entry.is_dir(follow_symlinks=False):
+            yield from _walk_buckets(Path(entry.path), depth - 1) if depth else [Path(entry.path)]
+
+
+def runs_root() -> Path:
+    return repo_root() / "data" / "runs"
+
+
+def public_runs_root() -> Path:
+    return repo_root() / "public" / "data" / "runs"
+
+
+def real_runs_root(substrate: str) -> Path:
+    return runs_root() / "v2" / "real" / substrate
+
+
+def run_dir(run_id: str) -> Path:
+    return run_path(runs_root(), run_id)
+
+
+def public_run_dir(run_id: str) -> Path:
+    return run_path(public_runs_root(), run_id)
+
+
+def real_run_dir(substrate: str, run_id: str) -> Path:
+    return run_path(real_runs_root(substrate), run_id)
+
+
+def known_roots() -> list[Path]:
+    """``data/runs``, ``public/data/runs`` and every ``data/runs/v2/real/<substrate>``."""
+    real = runs_root() / "v2" / "real"
+    substrates = sorted(p for p in real.iterdir() if p.is_dir()) if real.is_dir() else []
+    return [runs_root(), public_runs_root(), *substrates]
+
+
+def _write_marker(root: Path, layout: Layout) -> None:
+    tmp = root / f"{MARKER}.tmp-{os.getpid()}"
+    tmp.write_text(json.dumps(layout.to_dict(), indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp, root / MARKER)
+    _read_layout.cache_clear()
+
+
+def _flat_runs(root: Path, layout: Layout) -> list[Path]:
+    return [
+        Path(e.path) for e in os.scandir(root)
+        if not e.name.startswith(".") and e.name not in RESERVED and not e.is_symlink() and e.is_dir()
+        and not (layout.kind == "fanout" and layout.is_bucket(e.name))
+    ]
+
+
+def migrate(
+    root: str | Path,
+    to: str = "fanout",
+    depth: int = 2,
+    width: int = 2,
+    symlinks: bool = False,
+    dry_run: bool = False,
+) -> dict[str, Any]:
+    """Convert ``root`` to the ``to`` layout; idempotent and safe to rerun after an interruption."""
+    if to not in LAYOUTS:
+        raise RunStoreError(f"unknown layout: {to}")
+    if not 1 <= depth <= 4 or not 1 <= width <= 4:
+        raise RunStoreError("depth and width must be between 1 and 4")
+    root = Path(root)
+    if not root.is_dir():
+        raise RunStoreError(f"not a directory: {root}")
+    current = layout_of(root)
+    target = Layout(to, depth, width) if to == "fanout" else Layout()
+    if current.kind == "fanout" and to == "fanout" and current != target:
+        raise RunStoreError(f"{root} is already fan-out with depth {current.depth}, width {current.width}; migrate to flat first")
+    report: dict[str, Any] = {"root": str(root), "from": current.kind, "to": to, "moved": 0, "linked": 0, "unlinked": 0,
+                              "conflicts": [], "dry_run": dry_run}
+
+    if to == "fanout":
+        pending = _flat_runs(root, target)
+        report["moved"] = len(pending)
+        if dry_run:
+            return report
+        _write_marker(root, target)  # new runs go to buckets from here on
+        for src in pending:
+            dest = root / target.relpath(src.name)
+            if dest.exists():
+                report["conflicts"].append(src.name)
+                report["moved"] -= 1
+                continue
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            os.rename(src, dest)
+        if symlinks:
+            for path in iter_runs(root):
+                link = root / path.name
+                if not os.path.lexists(link):
+                    os.symlink(path.relative_to(root), link)
+                    report["linked"] += 1
+        return report
+
+    if current.kind == "flat":
+        return report
+    runs = list(iter_runs(root))
+    report["moved"] = sum(p.parent != root for p in runs)
+    if dry_run:
+        return report
+    for path in runs:
+        if path.parent == root:
+            continue
+        dest = root / path.name
+        if dest.is_symlink():
+            dest.unlink()
+            report["unlinked"] += 1
+        elif dest.exists():
+            report["conflicts"].append(path.name)
+            report["moved"] -= 1
+            continue
+        os.rename(path, dest)
+    for entry in os.scandir(root):
+        if current.is_bucket(entry.name) and entry.is_dir(follow_symlinks=False):
+            _prune_empty(Path(entry.path))
+    if not report["conflicts"]:
+        (root / MARKER).unlink()
+        _read_layout.cache_clear()
+    return report
+
+
+def _prune_empty(path: Path) -> None:
+    for entry in os.scandir(path):
+        if entry.is_dir(follow_symlinks=False):
+            _prune_empty(Path(entry.path))
+    try:
+        path.rmdir()
+    except OSError:
+        pass  # still holds something that is not a migrated run
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run directory storage layout")
+    sub = parser.add_subparsers(dest="action", required=True)
+    p = sub.add_parser("path", help="Directory of a run (for shell scripts)")
+    p.add_argument("run_id")
+    where = p.add_mutually_exclusive_group()
+    where.add_argument("--public", action="store_true", help="Under public/data/runs")
+    where.add_argument("--real", metavar="SUBSTRATE", help="Under data/runs/v2/real/<substrate>")
+    where.add_argument("--root", help="Under this run root (default: data/runs)")
+    p.add_argument("--existing", action="store_true", help="Resolve an existing run; exit 1 if there is none")
+    p = sub.add_parser("migrate", help="Convert run roots between flat and fan-out")
+    p.add_argument("roots", nargs="*")
+    p.add_argument("--all", action="store_true", help="data/runs, public/data/runs and every data/runs/v2/real/<substrate>")
+    p.add_argument("--to", choices=LAYOUTS, default="fanout")
+    p.add_argument("--depth", type=int, default=2)
+    p.add_argument("--width", type=int, default=2)
+    p.add_argument("--symlinks", action="store_true", help="Leave <root>/<run_id> links for flat-path readers")
+    p.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.action == "path":
+            root = public_runs_root() if args.public else real_runs_root(args.real) if args.real else Path(args.root or runs_root())
+            path = resolve_run(root, args.run_id) if args.existing else run_path(root, args.run_id)
+            if path is None:
+                return 1
+            print(path)
+            return 0
+        roots = (known_roots() if args.all else []) + [Path(r) for r in args.roots]
+        if not roots:
+            raise RunStoreError("no roots given (pass ROOT... or --all)")
+        reports = [migrate(r, args.to, args.depth, args.width, args.symlinks, args.dry_run)
+                   for r in roots if Path(r).is_dir() or not args.all]
+    except (OSError, RunStoreError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    for r in reports:
+        verb = "would move" if r["dry_run"] else "moved"
+        print(f"{r['root']}: {r['from']} -> {r['to']}, {verb} {r['moved']} run(s), "
+              f"{r['linked']} link(s) added, {r['unlinked']} removed")
+        for name in r["conflicts"]:
+            print(f"  conflict: {name} exists in both places, left in place")
+    return 0 if not any(r["conflicts"] for r in reports) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,27 @@
+"""Scenario definition access (``data/scenarios/<id>.yaml``)."""
+
+from functools import lru_cache
+from typing import Any
+
+import yaml
+
+from .paths import scenarios_dir
+
+
+class ScenarioNotFoundError(LookupError):
+    pass
+
+
+@lru_cache(maxsize=None)
+def load_scenario(scenario_id: str) -> dict[str, Any]:
+    path = scenarios_dir() / f"{scenario_id}.yaml"
+    if not path.is_file():
+        raise ScenarioNotFoundError(f"scenario not found: {path}")
+    with open(path, encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
+def budget_ceilings(scenario_id: str) -> dict[str, float]:
+    """Per-(agent, resource) ceilings from the scenario's ``budget.ceilings`` map."""
+    budget = load_scenario(scenario_id).get("budget") or {}
+    return {str(resource): float(limit) for resource, limit in (budget.get("ceilings") or {}).items()}
@@ -0,0 +1,575 @@
+"""Compiled JSON Schema validation.
+
+Each schema is compiled once into a tree of closures and cached per process,
+so validating an instance costs only the checks its schema actually declares.
+Covers the draft-07 keywords used by the schemas shipped in this repo
+(``schemas/``, ``producers/contract/``, ``lib/schemas/``): type, enum, const,
+properties, required, additionalProperties, patternProperties, items,
+min/maxItems, uniqueItems, min/maxLength, pattern, minimum/maximum (and
+exclusive forms), allOf/anyOf/oneOf/not, if/then/else and ``$ref`` (local
+pointers and relative files). ``format`` is an annotation only, as with the
+default Ajv instance used by the TS gates.
+
+Four ways to use it:
+
+- ``get_validator("schemas/v2/evidence-pack.v2.schema.json")(obj)`` for a
+  single document
+- ``validate_ndjson(path, schema_ref)`` for a timeline, streamed line by line
+- ``validate_documents(files)`` for a pack still in memory
+  (``{relative path: text}``); ``validate_on_write`` runs it in the real
+  producers and ``multiproduce`` before anything is written when
+  ``VLAB_VALIDATE=1`` and reports failures on stderr
+- ``validate_tree(root, rules, workers=N)`` for whole directories, fanned out
+  over a process pool
+
+The producers' pre-seal ``manifest.json`` and their ``{timestamp, event,
+data}`` timeline lines match no shipped schema (the v2 pack schema needs the
+refs the runner adds after the run), so no default rule names them; pass a
+rule to validate them once one exists.
+
+Schema references are ``<path>[#<json-pointer>]``, relative to the repo root.
+
+Usage:
+    python -m mplp_vlab.schema <dir>... [--rule GLOB=SCHEMA_REF]... [--protocol] [--workers N]
+"""
+
+import argparse
+import contextlib
+import fnmatch
+import io
+import json
+import os
+import posixpath
+import re
+import sys
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import IO, Any, Callable, Iterable, Iterator, Mapping
+
+from .paths import repo_root
+from .timeline import iter_events
+
+# Node signature: (instance, json_path, errors) -> None
+Node = Callable[[Any, str, list], None]
+
+
+class SchemaCompileError(ValueError):
+    """A schema (or a ``$ref`` target) cannot be loaded or compiled."""
+
+
+@dataclass(frozen=True)
+class SchemaViolation:
+    path: str
+    keyword: str
+    message: str
+    line: int | None = None
+
+
+# Pack file → schema rules. Globs are matched against the path relative to
+# the scanned root; first match wins. DEFAULT_RULES cover the producer
+# contract; PROTOCOL_RULES add the full MPLP module schemas for artifacts.
+BUNDLE_MANIFEST_REF = "producers/contract/producer-output.schema.json#/properties/bundle.manifest.json"
+EVIDENCE_POINTERS_REF = "producers/contract/producer-output.schema.json#/properties/evidence_pointers.json"
+
+DEFAULT_RULES: tuple[tuple[str, str], ...] = (
+    ("bundle.manifest.json", BUNDLE_MANIFEST_REF),
+    ("evidence_pointers.json", EVIDENCE_POINTERS_REF),
+    ("producer-run.manifest.json", "producers/contract/producer-run-manifest.schema.json"),
+)
+
+# Arbitration fixtures and loader-only bundles reuse the producer contract's
+# file names without claiming to follow it. A file matched to one of these
+# schemas is only validated next to this marker, which every producer writes.
+CLAIM_MARKERS: dict[str, str] = {
+    BUNDLE_MANIFEST_REF: "producer-run.manifest.json",
+    EVIDENCE_POINTERS_REF: "producer-run.manifest.json",
+}
+
+PROTOCOL_RULES: tuple[tuple[str, str], ...] = (
+    ("artifacts/context.json", "lib/schemas/mplp-context.schema.json"),
+    ("artifacts/plan.json", "lib/schemas/mplp-plan.schema.json"),
+    ("artifacts/trace.json", "lib/schemas/mplp-trace.schema.json"),
+)
+
+
+# ---------------------------------------------------------------------------
+# Compiler
+# ---------------------------------------------------------------------------
+
+_TYPE_CHECKS: dict[str, Callable[[Any], bool]] = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: (isinstance(v, int) and not isinstance(v, bool)) or (isinstance(v, float) and v.is_integer()),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+}
+
+
+def _is_number(v: Any) -> bool:
+    return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+
+def _canon(v: Any) -> str:
+    # Equality that keeps true != 1, as JSON Schema requires
+    return json.dumps(v, sort_keys=True, separators=(",", ":"))
+
+
+def _resolve_pointer(doc: Any, pointer: str) -> Any:
+    node = doc
+    for token in (t for t in pointer.split("/") if t):
+        token = token.replace("~1", "/").replace("~0", "~")
+        if isinstance(node, list):
+            node = node[int(token)]
+        elif isinstance(node, dict) and token in node:
+            node = node[token]
+        else:
+            raise SchemaCompileError(f"unresolvable pointer #{pointer}")
+    return node
+
+
+class SchemaCompiler:
+    """Compiles schema files into validator nodes; one instance per process."""
+
+    def __init__(self, root: Path | None = None):
+        self.root = root or repo_root()
+        self._docs: dict[Path, Any] = {}
+        self._nodes: dict[tuple[Path, str], Node] = {}
+
+    def load(self, path: Path) -> Any:
+        doc = self._docs.get(path)
+        if doc is None:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    doc = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                raise SchemaCompileError(f"cannot load schema {path}: {e}") from None
+            self._docs[path] = doc
+        return doc
+
+    def compile_ref(self, path: Path, pointer: str = "") -> Node:
+        key = (path, pointer)
+        node = self._nodes.get(key)
+        if node is not None:
+            return node
+        # Placeholder first so recursive $refs resolve to the finished node
+        cell: list[Node] = []
+        self._nodes[key] = lambda inst, p, errs: cell[0](inst, p, errs)
+        try:
+            compiled = self._compile(_resolve_pointer(self.load(path), pointer), path)
+        except SchemaCompileError:
+            del self._nodes[key]  # do not leave an empty placeholder for the next lookup
+            raise
+        cell.append(compiled)
+        self._nodes[key] = compiled
+        return compiled
+
+    def _compile_ref_string(self, ref: str, base: Path) -> Node:
+        file_part, _, pointer = ref.partition("#")
+        target = (base.parent / file_part).resolve() if file_part else base
+        return self.compile_ref(target, pointer)
+
+    def _compile(self, schema: Any, base: Path) -> Node:
+        if schema is True or schema == {}:
+            return lambda inst, p, errs: None
+        if schema is False:
+            return lambda inst, p, errs: errs.append(SchemaViolation(p or "/", "false", "no value allowed"))
+        if not isinstance(schema, dict):
+            raise SchemaCompileError(f"schema must be an object or boolean, got {type(schema).__name__}")
+
+        checks: list[Node] = []
+        add = checks.append
+
+        if "$ref" in schema:
+            add(self._compile_ref_string(schema["$ref"], base))
+
+        if "type" in schema:
+            types = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+            preds = [_TYPE_CHECKS[t] for t in types]
+            expected = "|".join(types)
+
+            def check_type(inst, p, errs, preds=preds, expected=expected):
+                if not any(pred(inst) for pred in preds):
+                    errs.append(SchemaViolation(p or "/", "type", f"expected {expected}"))
+            add(check_type)
+
+        if "enum" in schema:
+            allowed = {_canon(v) for v in schema["enum"]}
+
+            def check_enum(inst, p, errs, allowed=allowed):
+                if _canon(inst) not in allowed:
+                    errs.append(SchemaViolation(p or "/", "enum", f"{inst!r} not in enum"))
+            add(check_enum)
+
+        if "const" in schema:
+            const = _canon(schema["const"])
+
+            def check_const(inst, p, errs, const=const):
+                if _canon(inst) != const:
+                    errs.append(SchemaViolation(p or "/", "const", f"expected {const}"))
+            add(check_const)
+
+        self._compile_object(schema, base, add)
+        self._compile_array(schema, base, add)
+        self._compile_scalar(schema, add)
+        self._compile_combinators(schema, base, add)
+
+        if len(checks) == 1:
+            return checks[0]
+
+        def run_all(inst, p, errs, checks=tuple(checks)):
+            for check in checks:
+                check(inst, p, errs)
+        return run_all
+
+    def _compile_object(self, schema: dict, base: Path, add: Callable[[Node], None]) -> None:
+        required = tuple(schema.get("required") or ())
+        props = {k: self._compile(v, base) for k, v in (schema.get("properties") or {}).items()}
+        patterns = [(re.compile(k), self._compile(v, base)) for k, v in (schema.get("patternProperties") or {}).items()]
+        additional = schema.get("additionalProperties", True)
+        additional_node = None if isinstance(additional, bool) else self._compile(additional, base)
+
+        if required:
+            def check_required(inst, p, errs):
+                if isinstance(inst, dict):
+                    for name in required:
+                        if name not in inst:
+                            errs.append(SchemaViolation(p or "/", "required", f"missing property '{name}'"))
+            add(check_required)
+
+        if not props and not patterns and additional is True:
+            return
+
+        def check_properties(inst, p, errs):
+            if not isinstance(inst, dict):
+                return
+            for name, value in inst.items():
+                child = f"{p}/{name}"
+                matched = False
+                node = props.get(name)
+                if node is not None:
+                    node(value, child, errs)
+                    matched = True
+                for regex, pnode in patterns:
+                    if regex.search(name):
+                        pnode(value, child, errs)
+                        matched = True
+                if matched:
+                    continue
+                if additional is False:
+                    errs.append(SchemaViolation(p or "/", "additionalProperties", f"unexpected property '{name}'"))
+                elif additional_node is not None:
+                    additional_node(value, child, errs)
+        add(check_properties)
+
+    def _compile_array(self, schema: dict, base: Path, add: Callable[[Node], None]) -> None:
+        items = schema.get("items")
+        if isinstance(items, list):
+            tuple_nodes = [self._compile(s, base) for s in items]
+
+            def check_tuple(inst, p, errs):
+                if isinstance(inst, list):
+                    for i, (value, node) in enumerate(zip(inst, tuple_nodes)):
+                        node(value, f"{p}/{i}", errs)
+            add(check_tuple)
+        elif items is not None:
+            item_node = self._compile(items, base)
+
+            def check_items(inst, p, errs):
+                if isinstance(inst, list):
+                    for i, value in enumerate(inst):
+                        item_node(value, f"{p}/{i}", errs)
+            add(check_items)
+
+        min_items, max_items = schema.get("minItems"), schema.get("maxItems")
+        if min_items is not None or max_items is not None:
+            def check_count(inst, p, errs):
+                if isinstance(inst, list):
+                    if min_items is not None and len(inst) < min_items:
+                        errs.append(SchemaViolation(p or "/", "minItems", f"fewer than {min_items} items"))
+                    if max_items is not None and len(inst) > max_items:
+                        errs.append(SchemaViolation(p or "/", "maxItems", f"more than {max_items} items"))
+            add(check_count)
+
+        if schema.get("uniqueItems"):
+            def check_unique(inst, p, errs):
+                if isinstance(inst, list) and len({_canon(v) for v in inst}) != len(inst):
+                    errs.append(SchemaViolation(p or "/", "uniqueItems", "duplicate items"))
+            add(check_unique)
+
+    def _compile_scalar(self, schema: dict, add: Callable[[Node], None]) -> None:
+        min_len, max_len = schema.get("minLength"), schema.get("maxLength")
+        pattern = re.compile(schema["pattern"]) if "pattern" in schema else None
+        if min_len is not None or max_len is not None or pattern is not None:
+            def check_string(inst, p, errs):
+                if not isinstance(inst, str):
+                    return
+                if min_len is not None and len(inst) < min_len:
+                    errs.append(SchemaViolation(p or "/", "minLength", f"shorter than {min_len}"))
+                if max_len is not None and len(inst) > max_len:
+                    errs.append(SchemaViolation(p or "/", "maxLength", f"longer than {max_len}"))
+                if pattern is not None and not pattern.search(inst):
+                    errs.append(SchemaViolation(p or "/", "pattern", f"does not match {pattern.pattern}"))
+            add(check_string)
+
+        bounds = [
+            (k, schema[k], op) for k, op in (
+                ("minimum", lambda v, b: v >= b),
+                ("maximum", lambda v, b: v <= b),
+                ("exclusiveMinimum", lambda v, b: v > b),
+                ("exclusiveMaximum", lambda v, b: v < b),
+            ) if _is_number(schema.get(k))
+        ]
+        if bounds:
+            def check_bounds(inst, p, errs):
+                if _is_number(inst):
+                    for keyword, bound, op in bounds:
+                        if not op(inst, bound):
+                            errs.append(SchemaViolation(p or "/", keyword, f"{inst} violates {keyword} {bound}"))
+            add(check_bounds)
+
+    def _compile_combinators(self, schema: dict, base: Path, add: Callable[[Node], None]) -> None:
+        for sub in schema.get("allOf") or ():
+            add(self._compile(sub, base))
+
+        if "anyOf" in schema or "oneOf" in schema:
+            for keyword in ("anyOf", "oneOf"):
+                if keyword not in schema:
+                    continue
+                branches = [self._compile(s, base) for s in schema[keyword]]
+                exactly_one = keyword == "oneOf"
+
+                def check_branches(inst, p, errs, branches=branches, keyword=keyword, exactly_one=exactly_one):
+                    passed = sum(1 for b in branches if _passes(b, inst, p))
+                    if passed == 0 or (exactly_one and passed > 1):
+                        errs.append(SchemaViolation(p or "/", keyword, f"{passed} of {len(branches)} branches matched"))
+                add(check_branches)
+
+        if "not" in schema:
+            negated = self._compile(schema["not"], base)
+
+            def check_not(inst, p, errs):
+                if _passes(negated, inst, p):
+                    errs.append(SchemaViolation(p or "/", "not", "matched a forbidden schema"))
+            add(check_not)
+
+        if "if" in schema:
+            cond = self._compile(schema["if"], base)
+            then_node = self._compile(schema["then"], base) if "then" in schema else None
+            else_node = self._compile(schema["else"], base) if "else" in schema else None
+
+            def check_if(inst, p, errs):
+                branch = then_node if _passes(cond, inst, p) else else_node
+                if branch is not None:
+                    branch(inst, p, errs)
+            add(check_if)
+
+
+def _passes(node: Node, inst: Any, path: str) -> bool:
+    errs: list = []
+    node(inst, path, errs)
+    return not errs
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+Validator = Callable[[Any], list[SchemaViolation]]
+
+
+@lru_cache(maxsize=None)
+def _compiler() -> SchemaCompiler:
+    return SchemaCompiler()
+
+
+@lru_cache(maxsize=None)
+def get_validator(schema_ref: str) -> Validator:
+    """Compiled validator for ``<path>[#<pointer>]`` (relative to the repo root), cached per process."""
+    compiler = _compiler()
+    file_part, _, pointer = schema_ref.partition("#")
+    node = compiler.compile_ref((compiler.root / file_part).resolve(), pointer)
+
+    def validate(instance: Any) -> list[SchemaViolation]:
+        errs: list[SchemaViolation] = []
+        node(instance, "", errs)
+        return errs
+    return validate
+
+
+def validate_ndjson(source: str | Path | IO[bytes], schema_ref: str, limit: int = 100) -> tuple[int, list[SchemaViolation]]:
+    """Validate every line of an NDJSON stream; returns (lines, first ``limit`` violations)."""
+    validate = get_validator(schema_ref)
+    lines = 0
+    found: list[SchemaViolation] = []
+    for ev in iter_events(source):
+        lines += 1
+        if len(found) >= limit:
+            continue
+        for v in validate(ev.data):
+            found.append(SchemaViolation(v.path, v.keyword, v.message, ev.line))
+    return lines, found[:limit]
+
+
+# ---------------------------------------------------------------------------
+# Batch mode
+# ---------------------------------------------------------------------------
+
+@dataclass
+class FileResult:
+    file: str
+    schema_ref: str
+    ok: bool
+    violations: list[SchemaViolation]
+    error: str | None = None
+
+
+def match_rule(rel_path: str, rules: Iterable[tuple[str, str]]) -> str | None:
+    for pattern, schema_ref in rules:
+        if rel_path == pattern or rel_path.endswith("/" + pattern) or fnmatch.fnmatch(rel_path, pattern):
+            return schema_ref
+    return None
+
+
+def iter_targets(roots: Iterable[str | Path], rules: tuple[tuple[str, str], ...]) -> Iterator[tuple[str, str]]:
+    """(file, schema_ref) pairs under ``roots`` matching a rule (and claiming its schema, see ``CLAIM_MARKERS``)."""
+    for root in roots:
+        root = Path(root)
+        for dirpath, _dirnames, filenames in os.walk(root):
+            for name in filenames:
+                full = Path(dirpath) / name
+                schema_ref = match_rule(full.relative_to(root).as_posix(), rules)
+                marker = CLAIM_MARKERS.get(schema_ref or "")
+                if schema_ref and (marker is None or marker in filenames):
+                    yield str(full), schema_ref
+
+
+def validate_file(file: str, schema_ref: str) -> FileResult:
+    try:
+        if file.endswith(".ndjson"):
+            _, violations = validate_ndjson(file, schema_ref)
+        else:
+            with open(file, encoding="utf-8") as f:
+                violations = get_validator(schema_ref)(json.load(f))
+    except SchemaCompileError:
+        raise  # the schema is broken, not the file
+    except (OSError, ValueError) as e:
+        return FileResult(file, schema_ref, False, [], str(e))
+    return FileResult(file, schema_ref, not violations, violations)
+
+
+def validate_documents(
+    files: Mapping[str, str | bytes],
+    rules: tuple[tuple[str, str], ...] = DEFAULT_RULES + PROTOCOL_RULES,
+) -> list[FileResult]:
+    """Validate an in-memory pack (``{relative path: content}``) before it is written."""
+    names: dict[str, set[str]] = {}
+    for rel in files:
+        names.setdefault(posixpath.dirname(rel), set()).add(posixpath.basename(rel))
+    results = []
+    for rel in sorted(files):
+        schema_ref = match_rule(rel, rules)
+        marker = CLAIM_MARKERS.get(schema_ref or "")
+        if not schema_ref or (marker is not None and marker not in names[posixpath.dirname(rel)]):
+            continue
+        data = files[rel]
+        data = data.encode("utf-8") if isinstance(data, str) else data
+        try:
+            if rel.endswith(".ndjson"):
+                _, violations = validate_ndjson(io.BytesIO(data), schema_ref)
+            else:
+                violations = get_validator(schema_ref)(json.loads(data))
+        except SchemaCompileError:
+            raise
+        except ValueError as e:
+            results.append(FileResult(rel, schema_ref, False, [], str(e)))
+            continue
+        results.append(FileResult(rel, schema_ref, not violations, violations))
+    return results
+
+
+def _first_problem(result: FileResult) -> str:
+    if result.error:
+        return result.error
+    return f"{result.violations[0].path}: {result.violations[0].message}" if result.violations else ""
+
+
+def validate_on_write(files: Mapping[str, str | bytes], perf: Any = None) -> list[FileResult]:
+    """Producer hook: with ``VLAB_VALIDATE=1``, ``validate_documents`` and print each failure to stderr.
+
+    Returns the failed results (none when validation is off). ``perf`` (a
+    ``PerfRecorder``) times it as a ``schema_validate`` phase.
+    """
+    if os.environ.get("VLAB_VALIDATE", "0") == "0":
+        return []
+    with perf.phase("schema_validate") if perf is not None else contextlib.nullcontext():
+        failed = [r for r in validate_documents(files) if not r.ok]
+    for r in failed:
+        print(f"warning: schema: {r.file} [{r.schema_ref}] {_first_problem(r)}", file=sys.stderr)
+    return failed
+
+
+def _validate_chunk(chunk: list[tuple[str, str]]) -> list[FileResult]:
+    return [validate_file(file, schema_ref) for file, schema_ref in chunk]
+
+
+def validate_tree(
+    roots: Iterable[str | Path],
+    rules: tuple[tuple[str, str], ...] = DEFAULT_RULES,
+    workers: int | None = None,
+    chunk_size: int = 64,
+) -> list[FileResult]:
+    """Validate every rule-matched file under ``roots``; ``workers > 1`` uses a process pool.
+
+    Every referenced schema is compiled first, so a broken schema raises one
+    ``SchemaCompileError`` before any file is read.
+    """
+    targets = list(iter_targets(roots, rules))
+    for schema_ref in sorted({schema_ref for _, schema_ref in targets}):
+        get_validator(schema_ref)
+    if not workers or workers <= 1 or len(targets) <= chunk_size:
+        return _validate_chunk(targets)
+    from concurrent.futures import ProcessPoolExecutor  # producers importing the hook skip it
+
+    chunks = [targets[i:i + chunk_size] for i in range(0, len(targets), chunk_size)]
+    results: list[FileResult] = []
+    # Each worker compiles a schema the first time it sees it, then reuses it
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk_results in pool.map(_validate_chunk, chunks):
+            results.extend(chunk_results)
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compiled JSON Schema validation over packs")
+    parser.add_argument("roots", nargs="+", help="Directories to scan")
+    parser.add_argument("--rule", action="append", default=[], metavar="GLOB=SCHEMA_REF",
+                        help="File glob → schema ref (replaces the default rules)")
+    parser.add_argument("--protocol", action="store_true", help="Also validate artifacts against MPLP module schemas")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--json", action="store_true", help="Print full results as JSON")
+    args = parser.parse_args(argv)
+
+    rules = tuple(tuple(r.split("=", 1)) for r in args.rule) if args.rule else DEFAULT_RULES
+    if args.protocol:
+        rules += PROTOCOL_RULES
+    try:
+        results = validate_tree(args.roots, rules, args.workers)
+    except SchemaCompileError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+
+    failed = [r for r in results if not r.ok]
+    if args.json:
+        print(json.dumps([asdict(r) for r in results], indent=2))
+    else:
+        for r in failed:
+            print(f"FAIL {r.file} [{r.schema_ref}] {_first_problem(r)}")
+        print(f"{len(results) - len(failed)}/{len(results)} files valid")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
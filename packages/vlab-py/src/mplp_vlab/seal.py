@@ -0,0 +1,112 @@
+"""Seal a pack: write ``integrity/sha256sums.txt`` and its root hash.
+
+Two root conventions (see ``packhash``):
+
+- ``pack.sha256`` (default): ``integrity/pack.sha256`` as the TS engine
+  writes it
+- ``pack_root_hash.txt``: sha256 of the sums file, as the gf-01 generators
+  write it (the root file itself is not listed in the sums)
+
+``--merkle`` also writes ``integrity/merkle.sha256`` (see ``merkle``).
+``--tree`` also writes BLAKE2b tree digests to ``integrity/tree.b2sums``
+and records them in ``manifest.json`` before the sums are taken (see
+``treehash``). Files are hashed on a thread pool; in tree mode the leaves of
+large files are spread over it as well. Block-compressed timelines are
+listed uncompressed (``timeline/events.ndjson``, see ``blocktimeline``).
+
+Usage:
+    python -m mplp_vlab.seal <pack_dir>... [--root pack.sha256|pack_root_hash.txt] [--merkle]
+                                           [--tree [--leaf-size BYTES]] [--workers N]
+"""
+
+import argparse
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .packhash import (
+    PACK_SHA256_PATH,
+    ROOT_HASH_TXT,
+    SUMS_PATH,
+    SumsEntry,
+    canonical_relpath,
+    hash_canonical,
+    list_pack_files,
+    pack_root_hash,
+    render_sums,
+    sha256_bytes,
+)
+from .treehash import DEFAULT_LEAF_SIZE, MANIFEST_PATH, default_workers, tree_hash_files, write_tree_sums
+
+ROOT_KINDS = ("pack.sha256", "pack_root_hash.txt")
+
+
+def seal_pack(
+    pack_dir: str | Path,
+    root: str = "pack.sha256",
+    merkle: bool = False,
+    tree: bool = False,
+    leaf_size: int = DEFAULT_LEAF_SIZE,
+    workers: int | None = None,
+) -> str:
+    """Rewrite the sums and the root file; returns the root hash."""
+    if root not in ROOT_KINDS:
+        raise ValueError(f"unknown root kind {root!r}")
+    pack_dir = Path(pack_dir)
+    rels = [rel for rel in list_pack_files(pack_dir) if rel != ROOT_HASH_TXT]
+    if tree and MANIFEST_PATH not in rels:
+        raise ValueError(f"{pack_dir}: tree mode records itself in {MANIFEST_PATH}, which is missing")
+
+    with ThreadPoolExecutor(max_workers=workers or default_workers()) as pool:
+        # The manifest is hashed last: tree mode rewrites it once the tree digests are in
+        sha = {rel: pool.submit(hash_canonical, pack_dir / rel) for rel in rels if not (tree and rel == MANIFEST_PATH)}
+        if tree:
+            tree_entries = tree_hash_files(pack_dir, [rel for rel in rels if rel != MANIFEST_PATH], leaf_size, pool=pool)
+            write_tree_sums(pack_dir, tree_entries, leaf_size)
+            sha[MANIFEST_PATH] = pool.submit(hash_canonical, pack_dir / MANIFEST_PATH)
+        # Block timelines are listed under their uncompressed name (see ``packhash``)
+        entries = sorted((SumsEntry(canonical_relpath(rel), sha[rel].result()) for rel in rels), key=lambda e: e.path)
+    sums = render_sums(entries).encode("utf-8")
+    (pack_dir / "integrity").mkdir(exist_ok=True)
+    (pack_dir / SUMS_PATH).write_bytes(sums)
+    if root == "pack.sha256":
+        digest = pack_root_hash(entries)
+        (pack_dir / PACK_SHA256_PATH).write_text(f"{digest}  pack\n", encoding="utf-8")
+    else:
+        digest = sha256_bytes(sums)
+        (pack_dir / ROOT_HASH_TXT).write_text(digest + "\n", encoding="utf-8")
+    if merkle:
+        from .merkle import write_merkle_root
+
+        write_merkle_root(pack_dir, entries)
+    return digest
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Seal evidence packs")
+    parser.add_argument("packs", nargs="+", help="Pack directories")
+    parser.add_argument("--root", choices=ROOT_KINDS, default="pack.sha256", help="Root hash convention")
+    parser.add_argument("--merkle", action="store_true", help="Also write the Merkle root (integrity/merkle.sha256)")
+    parser.add_argument("--tree", action="store_true", help="Also write BLAKE2b tree digests (integrity/tree.b2sums)")
+    parser.add_argument("--leaf-size", type=int, default=DEFAULT_LEAF_SIZE, help="Tree mode leaf size in bytes")
+    parser.add_argument("--workers", type=int, help="Hashing threads (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    status = 0
+    for pack in args.packs:
+        if not Path(pack).is_dir():
+            print(f"error: {pack} is not a directory", file=sys.stderr)
+            status = 2
+            continue
+        try:
+            digest = seal_pack(pack, args.root, args.merkle, args.tree, args.leaf_size, args.workers)
+        except ValueError as e:
+            print(f"error: {e}", file=sys.stderr)
+            status = 2
+            continue
+        print(f"{digest}  {pack}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
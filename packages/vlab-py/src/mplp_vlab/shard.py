@@ -0,0 +1,303 @@
+"""Deterministic sharding of the run matrix across hosts.
+
+The matrix is substrates (``producers/real/_registry/substrates.v2.yaml``;
+for ``produce``, those with a real producer) × scenarios
+(``data/scenarios/*.yaml``) × repetitions, as planned by
+``mplp_vlab.batch``. Its cells are sorted by cell ID and shard ``i/N``
+takes every N-th one starting at the i-th, so every host computes the same
+split from the same checkout without talking to the others.
+
+A shared directory stands in for a queue::
+
+    <shared>/claims/shard-0002-of-0004.json     who runs the shard (created exclusively)
+    <shared>/journals/shard-0002-of-0004.ndjson batch checkpoint journal
+    <shared>/shards/shard-0002-of-0004.json     shard summary, written when the shard finishes
+    <shared>/runs/<run-id>/                     packs (unless --out-root)
+    <shared>/index.json                         merged index
+
+A shard is claimed by creating its claim file with ``O_EXCL``; another host
+asking for the same shard is refused (``--force`` takes a claim over, e.g.
+after a host died). Rerunning on the claiming host resumes from the journal
+(``mplp_vlab.batch``), so verified cells are not produced again.
+
+Summaries record the matrix parameters and a fingerprint (sha256 of the
+sorted cell IDs). ``merge`` rebuilds the expected matrix from them and
+reports shards that are missing or planned against another matrix, cells
+claimed by more than one summary (duplicates), cells that no summary
+verified (gaps: missing or failed) and cells outside the matrix.
+
+Usage:
+    python -m mplp_vlab.shard run --shard 2/4 --shared DIR [--kind produce] [--substrates a,b] [--scenarios a,b] [--reps N]
+    python -m mplp_vlab.shard merge --shared DIR [--index PATH]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import socket
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from .batch import KINDS, Cell, plan_cells, run_batch
+from .paths import repo_root, scenarios_dir
+from .produce import producers
+
+REGISTRY = Path("producers") / "real" / "_registry" / "substrates.v2.yaml"
+INDEX_NAME = "index.json"
+
+
+class ShardError(ValueError):
+    pass
+
+
+def registry_path() -> Path:
+    return repo_root() / REGISTRY
+
+
+def registry_substrates() -> list[str]:
+    with open(registry_path(), encoding="utf-8") as f:
+        registry = yaml.safe_load(f) or {}
+    return [str(s["substrate_id"]) for s in registry.get("substrates") or []]
+
+
+def matrix_substrates(kind: str) -> list[str]:
+    """Registry substrates; for ``produce``, only those with a real producer."""
+    substrates = registry_substrates()
+    if kind == "produce":
+        available = set(producers())
+        substrates = [s for s in substrates if s in available]
+    return substrates
+
+
+def matrix_scenarios() -> list[str]:
+    return sorted(p.stem for p in scenarios_dir().glob("*.yaml"))
+
+
+def parse_shard(spec: str) -> tuple[int, int]:
+    """``"i/N"`` (1-based) → ``(i, N)``."""
+    try:
+        index, count = (int(part) for part in spec.split("/"))
+    except ValueError:
+        raise ShardError(f"shard must be i/N, got {spec!r}") from None
+    if not 1 <= index <= count:
+        raise ShardError(f"shard index out of range: {spec}")
+    return index, count
+
+
+def shard_name(index: int, count: int) -> str:
+    return f"shard-{index:04d}-of-{count:04d}"
+
+
+def fingerprint(cells: list[Cell]) -> str:
+    return hashlib.sha256("\n".join(sorted(c.cell_id for c in cells)).encode("utf-8")).hexdigest()
+
+
+def shard_cells(cells: list[Cell], index: int, count: int) -> list[Cell]:
+    """Cells of shard ``index``/``count``: every ``count``-th cell of the matrix sorted by cell ID."""
+    return sorted(cells, key=lambda c: c.cell_id)[index - 1 :: count]
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+def _write_json(path: Path, data: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp-{os.getpid()}")
+    tmp.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def claim(shared: str | Path, index: int, count: int, matrix: str, host: str, force: bool = False) -> dict[str, Any]:
+    """Claim a shard for ``host``; the claiming host may claim it again (resume)."""
+    path = Path(shared) / "claims" / f"{shard_name(index, count)}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    record = {"shard": f"{index}/{count}", "host": host, "pid": os.getpid(), "fingerprint": matrix, "claimed_at": _now()}
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    except FileExistsError:
+        held = json.loads(path.read_text(encoding="utf-8"))
+        if not force:
+            if held.get("host") != host:
+                raise ShardError(f"shard {index}/{count} is claimed by {held.get('host')} (--force to take it over)") from None
+            if held.get("fingerprint") != matrix:
+                raise ShardError(f"shard {index}/{count} was claimed for another matrix (--force to restart it)") from None
+        record["previous"] = held
+        _write_json(path, record)
+        return record
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(json.dumps(record, indent=2) + "\n")
+    return record
+
+
+def run_shard(
+    shard: str,
+    shared: str | Path,
+    kind: str = "produce",
+    substrates: list[str] | None = None,
+    scenarios: list[str] | None = None,
+    reps: int = 1,
+    out_root: str | Path | None = None,
+    host: str | None = None,
+    force: bool = False,
+    **batch_options: Any,
+) -> dict[str, Any]:
+    """Claim, produce, seal and verify one shard; writes and returns its summary."""
+    index, count = parse_shard(shard)
+    shared = Path(shared).resolve()
+    substrates = substrates or matrix_substrates(kind)
+    scenarios = scenarios or matrix_scenarios()
+    if not substrates:
+        raise ShardError(f"no substrate in {REGISTRY} has a {kind} entry point here; pass --substrates")
+    if not scenarios:
+        raise ShardError(f"no scenarios in {scenarios_dir()}")
+    out_root = Path(out_root).resolve() if out_root else shared / "runs"
+    cells = plan_cells(kind, substrates, scenarios, reps, out_root)
+    matrix = fingerprint(cells)
+    host = host or socket.gethostname()
+    claimed = claim(shared, index, count, matrix, host, force)
+
+    mine = shard_cells(cells, index, count)
+    name = shard_name(index, count)
+    batch = run_batch(mine, shared / "journals" / f"{name}.ndjson", **batch_options)
+    by_id = {c.cell_id: c for c in mine}
+    summary = {
+        "shard": f"{index}/{count}",
+        "index": index,
+        "count": count,
+        "fingerprint": matrix,
+        "matrix": {"kind": kind, "substrates": substrates, "scenarios": scenarios, "reps": reps, "cells": len(cells)},
+        "host": host,
+        "claimed_at": claimed["claimed_at"],
+        "finished_at": _now(),
+        **{k: batch[k] for k in ("cells", "verified", "skipped", "failed", "retried", "wall_ms")},
+        "results": [
+            {**r, "run_id": by_id[r["cell_id"]].run_id, "out_dir": by_id[r["cell_id"]].out_dir}
+            for r in batch["results"]
+        ],
+    }
+    _write_json(shared / "shards" / f"{name}.json", summary)
+    return summary
+
+
+def merge(shared: str | Path, index_path: str | Path | None = None) -> dict[str, Any]:
+    """Combine shard summaries into one index; writes and returns it."""
+    shared = Path(shared)
+    paths = sorted((shared / "shards").glob("shard-*.json"))
+    if not paths:
+        raise ShardError(f"no shard summaries in {shared / 'shards'}")
+    summaries = [(p.name, json.loads(p.read_text(encoding="utf-8"))) for p in paths]
+
+    # The reference matrix is the one most summaries were planned against
+    keys = [(s["fingerprint"], s["count"]) for _, s in summaries]
+    reference = max(sorted(set(keys)), key=keys.count)
+    ref = next(s for _, s in summaries if (s["fingerprint"], s["count"]) == reference)
+    spec = ref["matrix"]
+    expected = {c.cell_id: c for c in plan_cells(spec["kind"], spec["substrates"], spec["scenarios"], spec["reps"], "/")}
+    if fingerprint(list(expected.values())) != ref["fingerprint"]:
+        raise ShardError(f"matrix in {paths[keys.index(reference)].name} does not match its fingerprint")
+    count = ref["count"]
+
+    mismatched = [name for name, s in summaries if (s["fingerprint"], s["count"]) != reference]
+    seen_shards = {s["index"] for _, s in summaries if (s["fingerprint"], s["count"]) == reference}
+    claims: dict[str, list[tuple[str, dict[str, Any]]]] = {}
+    for name, s in summaries:
+        if name in mismatched:
+            continue
+        for r in s["results"]:
+            claims.setdefault(r["cell_id"], []).append((s["shard"], r))
+
+    cells, duplicates, failed = [], [], []
+    for cid in sorted(claims):
+        entries = claims[cid]
+        if len(entries) > 1:
+            roots = {r.get("root") for _, r in entries}
+            duplicates.append({"cell_id": cid, "shards": [shard for shard, _ in entries], "roots_agree": len(roots) == 1})
+        # Prefer a verified result when a cell was reported more than once
+        shard, r = next(((sh, r) for sh, r in entries if r["status"] != "failed"), entries[0])
+        if r["status"] == "failed":
+            failed.append(cid)
+        cells.append({"cell_id": cid, "shard": shard, "run_id": r["run_id"], "status": r["status"],
+                      "root": r.get("root"), "out_dir": r["out_dir"]})
+
+    gaps = sorted(set(expected) - set(claims)) + failed
+    index = {
+        "created_at": _now(),
+        "fingerprint": ref["fingerprint"],
+        "matrix": spec,
+        "shards": count,
+        "summaries": [name for name, _ in summaries],
+        "missing_shards": [f"{i}/{count}" for i in range(1, count + 1) if i not in seen_shards],
+        "mismatched": mismatched,
+        "duplicates": duplicates,
+        "gaps": sorted(gaps),
+        "unexpected": sorted(set(claims) - set(expected)),
+        "cells": cells,
+    }
+    index["complete"] = not any(index[k] for k in ("missing_shards", "mismatched", "duplicates", "gaps", "unexpected"))
+    _write_json(Path(index_path) if index_path else shared / INDEX_NAME, index)
+    return index
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Deterministic sharding of the run matrix")
+    sub = parser.add_subparsers(dest="action", required=True)
+    p = sub.add_parser("run", help="Claim, produce and seal one shard")
+    p.add_argument("--shard", required=True, help="i/N, 1-based")
+    p.add_argument("--shared", required=True, help="Shared coordination directory")
+    p.add_argument("--kind", choices=KINDS, default="produce")
+    p.add_argument("--substrates", help="Comma-separated (default: the v2 registry)")
+    p.add_argument("--scenarios", help="Comma-separated (default: data/scenarios/*.yaml)")
+    p.add_argument("--reps", type=int, default=1)
+    p.add_argument("--out-root", help="Pack directory (default: <shared>/runs)")
+    p.add_argument("--cmd", help="Command for cmd cells")
+    p.add_argument("--host", help="Name recorded in the claim (default: hostname)")
+    p.add_argument("--force", action="store_true", help="Take over a shard claimed elsewhere")
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--retries", type=int, default=3)
+    p.add_argument("--python", help="Interpreter with the producer's or generator's dependencies")
+    p = sub.add_parser("merge", help="Combine shard summaries into one index")
+    p.add_argument("--shared", required=True)
+    p.add_argument("--index", help=f"Default: <shared>/{INDEX_NAME}")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.action == "run":
+            if args.kind == "cmd" and not args.cmd:
+                raise ShardError("cmd cells need --cmd")
+            summary = run_shard(
+                args.shard, args.shared, args.kind,
+                args.substrates.split(",") if args.substrates else None,
+                args.scenarios.split(",") if args.scenarios else None,
+                args.reps, args.out_root, args.host, args.force,
+                workers=args.workers, retries=args.retries, python=args.python, cmd=args.cmd,
+            )
+        else:
+            index = merge(args.shared, args.index)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    if args.action == "run":
+        print(
+            f"shard {summary['shard']} on {summary['host']}: {summary['cells']} of {summary['matrix']['cells']} cells, "
+            f"{summary['verified']} verified, {summary['skipped']} skipped, {summary['failed']} failed"
+        )
+        return 0 if summary["failed"] == 0 else 1
+    for key in ("missing_shards", "mismatched", "gaps", "unexpected"):
+        if index[key]:
+            print(f"{key}: {', '.join(index[key])}")
+    for dup in index["duplicates"]:
+        print(f"duplicate: {dup['cell_id']} in {', '.join(dup['shards'])}" + ("" if dup["roots_agree"] else " (roots differ)"))
+    print(f"{len(index['cells'])} of {index['matrix']['cells']} cells from {len(index['summaries'])} summaries: "
+          + ("complete" if index["complete"] else "INCOMPLETE"))
+    return 0 if index["complete"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
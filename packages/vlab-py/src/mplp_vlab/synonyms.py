@@ -0,0 +1,78 @@
+"""Token normalization and allowed-value sets.
+
+Python mirror of ``lib/evidence/synonyms.ts`` and the validation helpers in
+``lib/evidence/extract.ts``. Keep both sides in sync: streaming checks
+must agree with the TypeScript clause evaluators on every token.
+"""
+
+import re
+from typing import Any
+
+_SEPARATORS = re.compile(r"[\s_-]+")
+
+
+def normalize_token(value: Any) -> str:
+    """Trim, lowercase and collapse separators to ``_``."""
+    return _SEPARATORS.sub("_", str("" if value is None else value).strip().lower())
+
+
+SYNONYMS: dict[str, frozenset[str]] = {
+    "decision_kind_budget": frozenset({
+        "budget", "cost", "quota", "token_budget", "rate_limit",
+        "resource_budget", "throttle", "suspend", "resume",
+    }),
+    "decision_kind_authz": frozenset({
+        "authz", "authorize", "authorization", "permission", "access_control", "access",
+    }),
+    "decision_kind_terminate": frozenset({
+        "terminate", "termination", "abort", "stop", "cancel", "kill",
+    }),
+    "terminal_state_success": frozenset({"success", "succeeded", "done", "completed", "finished"}),
+    "terminal_state_failure": frozenset({"fail", "failed", "error", "failure"}),
+    "terminal_state_cancelled": frozenset({"cancelled", "canceled", "aborted"}),
+    "outcome_allow": frozenset({
+        "allow", "allowed", "grant", "granted", "permit", "permitted", "approve", "approved",
+    }),
+    "outcome_deny": frozenset({
+        "deny", "denied", "reject", "rejected", "refuse", "refused", "block", "blocked",
+    }),
+    "outcome_terminated": frozenset({
+        "terminated", "stopped", "aborted", "killed", "cancelled", "canceled",
+    }),
+}
+
+
+def in_synonym_group(group: str, value: Any) -> bool:
+    return normalize_token(value) in SYNONYMS[group]
+
+
+# extract.ts: ALLOWED_TERMINAL_STATES
+ALLOWED_TERMINAL_STATES = frozenset({
+    "success", "succeeded", "done", "completed", "finished",
+    "fail", "failed", "error", "failure",
+    "cancelled", "canceled", "aborted", "terminated",
+})
+
+# extract.ts: ALLOWED_TERMINATION_REASONS
+ALLOWED_TERMINATION_REASONS = frozenset({
+    "ttl", "timeout", "loop", "loop_detected", "manual", "user_cancel",
+    "error", "failure", "resource_exhausted", "policy_violation", "external",
+})
+
+# extract.ts: isValidBudgetOutcome extras beyond allow/deny groups
+_BUDGET_OUTCOME_EXTRAS = frozenset({"throttle", "throttled", "suspend", "suspended", "resume", "resumed"})
+
+
+def is_valid_terminal_state(state: Any) -> bool:
+    return bool(state) and normalize_token(state) in ALLOWED_TERMINAL_STATES
+
+
+def is_valid_budget_outcome(outcome: Any) -> bool:
+    if not outcome:
+        return False
+    token = normalize_token(outcome)
+    return (
+        token in SYNONYMS["outcome_allow"]
+        or token in SYNONYMS["outcome_deny"]
+        or token in _BUDGET_OUTCOME_EXTRAS
+    )
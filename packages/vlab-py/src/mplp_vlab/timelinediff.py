@@ -0,0 +1,382 @@
+"""Streaming timeline differ for reproducibility failures (``run1`` vs ``run2``).
+
+Two ``events.ndjson`` streams (raw or block-compressed) are compared in
+three stages, never holding either file in memory:
+
+1. Shared prefix: both streams are read in 1 MiB chunks and compared as
+   bytes, with a running sha256 over each. Identical timelines exit here
+   without a single JSON parse; the digests equal the timelines' sums
+   entries.
+2. From the first differing line on, events are parsed and aligned by key:
+   ``event_id``, or ``<event type>#<n>`` (the n-th event of that type
+   after the shared prefix) for timelines without ids. A key seen on one side waits in a pending window
+   until the other side produces it; a pair is compared, unmatched keys
+   pushed out of the window (``--window`` per side) or left at the end are
+   reported as removed (left only) or added (right only). Whenever nothing
+   is pending, the streams are compared as bytes again, so a timeline that
+   diverges briefly and reconverges is parsed only around the divergence.
+3. Changed pairs get key-level deltas (JSON pointer, old and new value).
+   ``--ignore /ts`` drops volatile keys from the comparison.
+
+Memory is bounded by the pending windows plus ``--limit`` reported entries
+(the counts always cover the whole stream).
+
+Usage:
+    python -m mplp_vlab.timelinediff <left> <right> [--ignore POINTER]... [--window N] [--limit N] [--json]
+        (left/right: events.ndjson[.zb] files or pack/run directories)
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .blocktimeline import BlockTimeline, is_block_timeline
+from .timeline import TimelineEvent, find_timeline, parse_line
+
+CHUNK_SIZE = 1 << 20
+DEFAULT_WINDOW = 10000
+DEFAULT_LIMIT = 1000
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class Delta:
+    path: str  # JSON pointer
+    op: str  # added | removed | changed
+    left: Any = None
+    right: Any = None
+
+
+@dataclass
+class DiffEntry:
+    op: str  # added | removed | changed
+    key: str
+    left_line: int | None
+    right_line: int | None
+    deltas: list[Delta] = field(default_factory=list)
+
+
+@dataclass
+class TimelineDiff:
+    left: str
+    right: str
+    identical: bool = False
+    left_sha256: str = ""
+    right_sha256: str = ""
+    common_prefix_lines: int = 0
+    resynced_lines: int = 0  # byte-equal lines skipped after the prefix
+    matched: int = 0  # events parsed and paired
+    added: int = 0
+    removed: int = 0
+    changed: int = 0
+    truncated: bool = False
+    entries: list[DiffEntry] = field(default_factory=list)
+
+    @property
+    def equivalent(self) -> bool:
+        """No added, removed or changed events (byte-identical, or equal up to ignored keys and order)."""
+        return not (self.added or self.removed or self.changed)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "equivalent": self.equivalent}
+
+
+# ---------------------------------------------------------------------------
+# Streams
+# ---------------------------------------------------------------------------
+
+class _Stream:
+    """Uncompressed bytes of a timeline with a running sha256 over everything consumed."""
+
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        self._chunks = chunks
+        self._buf = b""
+        self._pos = 0
+        self.sha = hashlib.sha256()
+        self.offset = 0
+
+    def _fill(self) -> bool:
+        chunk = next(self._chunks, b"")
+        if not chunk:
+            return False
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self, n: int) -> bytes:
+        while len(self._buf) - self._pos < n and self._fill():
+            pass
+        return self._buf[self._pos:self._pos + n]
+
+    def consume(self, n: int) -> None:
+        self.sha.update(memoryview(self._buf)[self._pos:self._pos + n])
+        self._pos += n
+        self.offset += n
+
+    def lines(self) -> Iterator[bytes]:
+        while True:
+            end = self._buf.find(b"\n", self._pos) + 1
+            while not end and self._fill():
+                end = self._buf.find(b"\n", self._pos) + 1
+            if not end:
+                end = len(self._buf)
+                if end == self._pos:
+                    return
+            line = self._buf[self._pos:end]
+            self.consume(end - self._pos)
+            yield line
+
+    def drain(self) -> None:
+        self.consume(len(self._buf) - self._pos)
+        for chunk in self._chunks:
+            self.sha.update(chunk)
+            self.offset += len(chunk)
+
+
+def _open(path: Path, stack: ExitStack) -> _Stream:
+    if is_block_timeline(path):
+        return _Stream(stack.enter_context(BlockTimeline(path)).iter_raw())
+    f = stack.enter_context(open(path, "rb"))
+    return _Stream(iter(lambda: f.read(CHUNK_SIZE), b""))
+
+
+def _skip_common_prefix(a: _Stream, b: _Stream) -> int:
+    """Consume the longest common prefix of whole lines; returns its line count."""
+    lines = 0
+    size = CHUNK_SIZE
+    while True:
+        ca, cb = a.peek(size), b.peek(size)
+        n = min(len(ca), len(cb))  # a chunk shorter than size ends its stream
+        if ca[:n] == cb[:n]:
+            if len(ca) == len(cb):
+                if n == 0:
+                    return lines
+                # A partial last line is carried over and compared with the rest of it
+                cut = n if n < size else ca.rfind(b"\n") + 1
+                if not cut:
+                    size *= 2  # one line longer than the chunk
+                    continue
+                lines += ca.count(b"\n", 0, cut)
+                a.consume(cut)
+                b.consume(cut)
+                size = CHUNK_SIZE
+                continue
+            first_diff = n
+        else:
+            lo, hi = 0, n  # ca[:lo] == cb[:lo], ca[:hi] != cb[:hi]
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                if ca[lo:mid] == cb[lo:mid]:
+                    lo = mid
+                else:
+                    hi = mid
+            first_diff = lo
+        cut = ca.rfind(b"\n", 0, first_diff) + 1
+        lines += ca.count(b"\n", 0, cut)
+        a.consume(cut)
+        b.consume(cut)
+        return lines
+
+
+# ---------------------------------------------------------------------------
+# Deltas
+# ---------------------------------------------------------------------------
+
+def _escape(key: str) -> str:
+    return key.replace("~", "~0").replace("/", "~1")
+
+
+def json_deltas(left: Any, right: Any, path: str = "") -> list[Delta]:
+    """Key-level differences between two JSON values (lists compared by index)."""
+    if isinstance(left, dict) and isinstance(right, dict):
+        out: list[Delta] = []
+        for key in sorted(left.keys() | right.keys()):
+            sub = f"{path}/{_escape(key)}"
+            lv, rv = left.get(key, _MISSING), right.get(key, _MISSING)
+            if lv is _MISSING:
+                out.append(Delta(sub, "added", right=rv))
+            elif rv is _MISSING:
+                out.append(Delta(sub, "removed", left=lv))
+            else:
+                out.extend(json_deltas(lv, rv, sub))
+        return out
+    if isinstance(left, list) and isinstance(right, list):
+        out = []
+        for i in range(max(len(left), len(right))):
+            sub = f"{path}/{i}"
+            if i >= len(left):
+                out.append(Delta(sub, "added", right=right[i]))
+            elif i >= len(right):
+                out.append(Delta(sub, "removed", left=left[i]))
+            else:
+                out.extend(json_deltas(left[i], right[i], sub))
+        return out
+    if type(left) is not type(right) or left != right:
+        return [Delta(path or "/", "changed", left, right)]
+    return []
+
+
+def _drop(data: dict[str, Any], pointers: list[list[str]]) -> dict[str, Any]:
+    for parts in pointers:
+        node: Any = data
+        for part in parts[:-1]:
+            node = node.get(part) if isinstance(node, dict) else None
+        if isinstance(node, dict):
+            node.pop(parts[-1], None)
+    return data
+
+
+def _parse_pointer(pointer: str) -> list[str]:
+    return [p.replace("~1", "/").replace("~0", "~") for p in pointer.lstrip("/").split("/")]
+
+
+# ---------------------------------------------------------------------------
+# Diff
+# ---------------------------------------------------------------------------
+
+class _Side:
+    def __init__(self, stream: _Stream, first_line: int) -> None:
+        self.stream = stream
+        self.line = first_line
+        self.ordinals: dict[str, int] = {}
+        self.pending: OrderedDict[str, TimelineEvent] = OrderedDict()
+
+    def events_iter(self) -> Iterator[TimelineEvent]:
+        for raw in self.stream.lines():
+            self.line += 1
+            event = parse_line(raw, self.stream.offset - len(raw), self.line)
+            if event is not None:
+                yield event
+
+    def key(self, event: TimelineEvent) -> str:
+        if event.event_id is not None:
+            return str(event.event_id)
+        kind = event.event_type
+        self.ordinals[kind] = self.ordinals.get(kind, 0) + 1
+        return f"{kind}#{self.ordinals[kind]}"
+
+
+def diff_timelines(
+    left: str | Path,
+    right: str | Path,
+    ignore: list[str] | None = None,
+    window: int = DEFAULT_WINDOW,
+    limit: int = DEFAULT_LIMIT,
+) -> TimelineDiff:
+    left, right = Path(left), Path(right)
+    result = TimelineDiff(str(left), str(right))
+    pointers = [_parse_pointer(p) for p in ignore or []]
+
+    def report(entry: DiffEntry) -> None:
+        setattr(result, entry.op, getattr(result, entry.op) + 1)
+        if len(result.entries) < limit:
+            result.entries.append(entry)
+        else:
+            result.truncated = True
+
+    with ExitStack() as stack:
+        a, b = _open(left, stack), _open(right, stack)
+        prefix = _skip_common_prefix(a, b)
+        result.common_prefix_lines = prefix
+        if not a.peek(1) and not b.peek(1):
+            result.identical = True
+        else:
+            sl, sr = _Side(a, prefix), _Side(b, prefix)
+            it_l, it_r = sl.events_iter(), sr.events_iter()
+
+            def offer(side: _Side, other: _Side, event: TimelineEvent, is_left: bool) -> None:
+                key = side.key(event)
+                match = other.pending.pop(key, None)
+                if match is None:
+                    side.pending[key] = event
+                    if len(side.pending) > window:
+                        old_key, old = side.pending.popitem(last=False)
+                        report(DiffEntry("removed" if is_left else "added", old_key,
+                                         old.line if is_left else None, None if is_left else old.line))
+                    return
+                result.matched += 1
+                ev_l, ev_r = (event, match) if is_left else (match, event)
+                deltas = json_deltas(_drop(ev_l.data, pointers), _drop(ev_r.data, pointers))
+                if deltas:
+                    report(DiffEntry("changed", key, ev_l.line, ev_r.line, deltas))
+
+            while True:
+                if not sl.pending and not sr.pending:
+                    skipped = _skip_common_prefix(a, b)
+                    if skipped:
+                        # Everything before is paired, so ordinals restart in step on both sides
+                        result.resynced_lines += skipped
+                        sl.line += skipped
+                        sr.line += skipped
+                        sl.ordinals.clear()
+                        sr.ordinals.clear()
+                ev_l, ev_r = next(it_l, None), next(it_r, None)
+                if ev_l is None and ev_r is None:
+                    break
+                if ev_l is not None:
+                    offer(sl, sr, ev_l, True)
+                if ev_r is not None:
+                    offer(sr, sl, ev_r, False)
+            for key, ev in sl.pending.items():
+                report(DiffEntry("removed", key, ev.line, None))
+            for key, ev in sr.pending.items():
+                report(DiffEntry("added", key, None, ev.line))
+        a.drain()
+        b.drain()
+        result.left_sha256, result.right_sha256 = a.sha.hexdigest(), b.sha.hexdigest()
+    return result
+
+
+def _timeline_arg(path: str) -> Path:
+    p = Path(path)
+    if p.is_dir():
+        found = find_timeline(p)
+        if found is None:
+            raise FileNotFoundError(f"no timeline in {p}")
+        return found
+    return p
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Streaming timeline differ (aligned by event_id)")
+    parser.add_argument("left", help="events.ndjson[.zb] or a pack/run directory")
+    parser.add_argument("right")
+    parser.add_argument("--ignore", action="append", default=[], metavar="POINTER",
+                        help="JSON pointer left out of the comparison (repeatable), e.g. /ts")
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW, help="Unmatched events held per side")
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT, help="Entries reported (counts are complete)")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    try:
+        diff = diff_timelines(_timeline_arg(args.left), _timeline_arg(args.right), args.ignore, args.window, args.limit)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    if args.json:
+        print(json.dumps(diff.to_dict(), indent=2))
+    elif diff.identical:
+        print(f"identical ({diff.common_prefix_lines} lines, sha256 {diff.left_sha256})")
+    else:
+        print(f"diverge after line {diff.common_prefix_lines}: {diff.matched} matched, "
+              f"{diff.changed} changed, {diff.removed} removed, {diff.added} added")
+        for e in diff.entries:
+            where = f"L{e.left_line or '-'}/R{e.right_line or '-'}"
+            print(f"{e.op[0].upper()} {e.key} ({where})")
+            for d in e.deltas:
+                print(f"    {d.op:<7} {d.path}: {json.dumps(d.left)} -> {json.dumps(d.right)}")
+        if diff.truncated:
+            print(f"... {diff.added + diff.removed + diff.changed - len(diff.entries)} more")
+    return 0 if diff.equivalent else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+"""Opt-in, ring-buffered tracing spans for producer hot paths.
+
+Producers hook agent steps, LLM calls and tool calls in the substrate and
+record each as a span. Tracing is off unless ``VLAB_TRACE`` is set; when off
+no hook is installed, so untraced runs pay nothing. When on, a span costs
+two ``perf_counter_ns`` reads and one append to a bounded ``deque``: the
+buffer keeps the newest ``VLAB_TRACE_BUFFER`` spans (default 65536) and
+counts the rest as dropped.
+
+``VLAB_TRACE`` selects the format written next to the perf report:
+
+- ``chrome`` (or ``1``): ``reports/producer.trace.json``, Chrome trace
+  event format (``chrome://tracing``, Perfetto)
+- ``speedscope``: ``reports/producer.speedscope.json``, one evented
+  profile per track
+
+Both are per-run measurements, excluded from pack enumeration and thus from
+sums, roots and coverage (``packhash.EXCLUDED_PATHS``).
+
+Spans go on a track: an explicit ``track``, else the track bound with
+``bind_track`` in the current context (asyncio tasks each get their own, so
+orchestration sessions sharing one loop thread stay apart), else the
+recording thread's name.
+
+Usage:
+    python -m mplp_vlab.tracing <trace.json> [--top N]
+"""
+
+import argparse
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+CHROME_PATH = "reports/producer.trace.json"
+SPEEDSCOPE_PATH = "reports/producer.speedscope.json"
+FORMATS = {"chrome": CHROME_PATH, "speedscope": SPEEDSCOPE_PATH}
+DEFAULT_CAPACITY = 65536
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+
+@dataclass(frozen=True)
+class Span:
+    name: str
+    cat: str  # agent_step | llm | tool | crew | ...
+    start_ns: int
+    end_ns: int
+    track: str
+    args: dict[str, Any] | None = None
+
+
+class Tracer:
+    """Bounded span buffer. ``begin``/``end`` for callback hooks, ``span`` for code blocks."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, fmt: str = "chrome") -> None:
+        if fmt not in FORMATS:
+            raise ValueError(f"unknown trace format {fmt!r} (expected one of {', '.join(FORMATS)})")
+        self.fmt = fmt
+        self.spans: deque[Span] = deque(maxlen=capacity)
+        self.recorded = 0
+        self.origin_ns = time.perf_counter_ns()
+        self._lock = threading.Lock()
+        self._track: contextvars.ContextVar[str | None] = contextvars.ContextVar("vlab_trace_track", default=None)
+
+    @property
+    def dropped(self) -> int:
+        return self.recorded - len(self.spans)
+
+    def bind_track(self, track: str) -> None:
+        """Default track for spans begun later in this context (thread or asyncio task)."""
+        self._track.set(track)
+
+    def begin(self, name: str, cat: str, track: str | None = None, **args: Any) -> tuple:
+        track = track or self._track.get() or threading.current_thread().name
+        return name, cat, time.perf_counter_ns(), track, args
+
+    def end(self, token: tuple, **args: Any) -> None:
+        end_ns = time.perf_counter_ns()
+        name, cat, start_ns, track, begin_args = token
+        span = Span(name, cat, start_ns, end_ns, track, {**begin_args, **args} or None)
+        with self._lock:
+            self.spans.append(span)
+            self.recorded += 1
+
+    @contextmanager
+    def span(self, name: str, cat: str, track: str | None = None, **args: Any) -> Iterator[None]:
+        token = self.begin(name, cat, track, **args)
+        try:
+            yield
+        finally:
+            self.end(token)
+
+    def snapshot(self) -> list[Span]:
+        with self._lock:
+            return sorted(self.spans, key=lambda s: (s.start_ns, -s.end_ns))
+
+    # -- output ------------------------------------------------------------
+
+    def to_chrome(self, metadata: dict[str, Any] | None = None) -> dict[str, Any]:
+        spans = self.snapshot()
+        tids = {track: i for i, track in enumerate(dict.fromkeys(s.track for s in spans), start=1)}
+        events: list[dict[str, Any]] = [
+            {"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": track}}
+            for track, tid in tids.items()
+        ]
+        for s in spans:
+            event = {
+                "name": s.name,
+                "cat": s.cat,
+                "ph": "X",
+                "ts": (s.start_ns - self.origin_ns) / 1000,
+                "dur": (s.end_ns - s.start_ns) / 1000,
+                "pid": 1,
+                "tid": tids[s.track],
+            }
+            if s.args:
+                event["args"] = s.args
+            events.append(event)
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {**(metadata or {}), "spans": len(spans), "dropped": self.dropped},
+        }
+
+    def to_speedscope(self, name: str = "producer") -> dict[str, Any]:
+        spans = self.snapshot()
+        frames: dict[str, int] = {}
+        profiles = []
+        for track in dict.fromkeys(s.track for s in spans):
+            events: list[dict[str, Any]] = []
+            stack: list[tuple[int, int]] = []  # (frame, end_ns)
+            for s in (s for s in spans if s.track == track):
+                while stack and stack[-1][1] <= s.start_ns:
+                    frame, end_ns = stack.pop()
+                    events.append({"type": "C", "frame": frame, "at": end_ns - self.origin_ns})
+                frame = frames.setdefault(f"{s.cat}:{s.name}", len(frames))
+                # Evented profiles must nest: clip a span that outlives its parent
+                end_ns = min(s.end_ns, stack[-1][1]) if stack else s.end_ns
+                events.append({"type": "O", "frame": frame, "at": s.start_ns - self.origin_ns})
+                stack.append((frame, end_ns))
+            while stack:
+                frame, end_ns = stack.pop()
+                events.append({"type": "C", "frame": frame, "at": end_ns - self.origin_ns})
+            profiles.append({
+                "type": "evented",
+                "name": f"{name} [{track}]",
+                "unit": "nanoseconds",
+                "startValue": events[0]["at"],
+                "endValue": events[-1]["at"],
+                "events": events,
+            })
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": name,
+            "exporter": "mplp_vlab.tracing",
+            "shared": {"frames": [{"name": f} for f in frames]},
+            "profiles": profiles,
+        }
+
+    def write(self, pack_dir: str | Path, name: str = "producer", metadata: dict[str, Any] | None = None) -> Path:
+        path = Path(pack_dir) / FORMATS[self.fmt]
+        body = self.to_chrome(metadata) if self.fmt == "chrome" else self.to_speedscope(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(body, separators=(",", ":")) + "\n", encoding="utf-8")
+        return path
+
+
+def tracer_from_env() -> Tracer | None:
+    """A fresh ``Tracer`` when ``VLAB_TRACE`` is set, else ``None`` (tracing off)."""
+    fmt = os.environ.get("VLAB_TRACE", "").strip().lower()
+    if fmt in ("", "0"):
+        return None
+    capacity = int(os.environ.get("VLAB_TRACE_BUFFER", DEFAULT_CAPACITY))
+    return Tracer(capacity, "chrome" if fmt == "1" else fmt)
+
+
+def top_spans(trace: dict[str, Any], n: int = 10) -> list[dict[str, Any]]:
+    """Total and count per (cat, name) in a Chrome trace, largest total first."""
+    totals: dict[tuple[str, str], list[float]] = {}
+    for e in trace.get("traceEvents", []):
+        if e.get("ph") == "X":
+            totals.setdefault((e.get("cat", ""), e["name"]), []).append(e["dur"])
+    rows = [
+        {"cat": cat, "name": name, "count": len(durs), "total_ms": round(sum(durs) / 1000, 3),
+         "max_ms": round(max(durs) / 1000, 3)}
+        for (cat, name), durs in totals.items()
+    ]
+    return sorted(rows, key=lambda r: -r["total_ms"])[:n]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Summarize a producer Chrome trace")
+    parser.add_argument("trace", help="reports/producer.trace.json (or a pack dir)")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args(argv)
+
+    path = Path(args.trace)
+    if path.is_dir():
+        path = path / CHROME_PATH
+    try:
+        trace = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    other = trace.get("otherData", {})
+    print(f"{path}: {other.get('spans', '?')} spans, {other.get('dropped', 0)} dropped")
+    for r in top_spans(trace, args.top):
+        print(f"  {r['total_ms']:10.3f}ms total  {r['count']:6d}x  {r['max_ms']:9.3f}ms max  {r['cat']}:{r['name']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
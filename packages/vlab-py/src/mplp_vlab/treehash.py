@@ -0,0 +1,187 @@
+"""Parallel BLAKE2b tree hashing for large pack files (optional integrity mode).
+
+sha256 is sequential: one multi-GB ``timeline/events.ndjson`` hashes on one
+core however many the machine has. Tree mode splits every file into
+fixed-size leaves, hashes the leaves in parallel (threads: ``hashlib`` and
+file reads release the GIL) and combines them with the tree parameters of
+``hashlib.blake2b`` (BLAKE2 spec, section 2.10):
+
+    leaf i  = blake2b(chunk i, digest_size=32, fanout=0, depth=2,
+                      leaf_size=L, inner_size=32, node_offset=i,
+                      node_depth=0, last_node=(i is the last leaf))
+    file    = blake2b(leaf 0 || leaf 1 || ..., same parameters,
+                      node_offset=0, node_depth=1, last_node=True)
+
+An empty file is one empty last leaf. These digests are not plain
+``b2sum`` digests.
+
+Digests go to ``integrity/tree.b2sums`` (``<hex>  <path>``, the
+``sha256sums.txt`` line format) for every sealed file except
+``manifest.json``. The manifest records the mode, leaf size and the sha256
+of the b2sums file under ``tree_hash``, which binds the tree digests into
+the sha256 pack root. ``sha256sums.txt`` keeps its format and the root
+convention is unchanged; sha256-only verifiers keep working as long as
+they exempt ``integrity/tree.b2sums`` from coverage like the other
+integrity files (``lib/engine/verify.ts`` does). ``verify`` checks contents
+through the tree digests when the manifest declares them (``--hash``).
+
+Usage:
+    python -m mplp_vlab.treehash <file>... [--leaf-size BYTES] [--workers N]
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .packhash import SumsEntry, parse_sums, render_sums, sha256_bytes
+
+if TYPE_CHECKING:  # the thread pool is imported only where hashing runs
+    from concurrent.futures import Executor, Future
+
+B2SUMS_PATH = "integrity/tree.b2sums"
+MANIFEST_PATH = "manifest.json"
+MANIFEST_KEY = "tree_hash"
+ALGORITHM = "blake2b-tree"
+DIGEST_SIZE = 32
+DEFAULT_LEAF_SIZE = 4 << 20
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def _params(leaf_size: int, node_offset: int, node_depth: int, last_node: bool) -> dict[str, Any]:
+    return {
+        "digest_size": DIGEST_SIZE,
+        "fanout": 0,
+        "depth": 2,
+        "leaf_size": leaf_size,
+        "inner_size": DIGEST_SIZE,
+        "node_offset": node_offset,
+        "node_depth": node_depth,
+        "last_node": last_node,
+    }
+
+
+def _leaf(path: Path, index: int, leaf_size: int, last: bool) -> bytes:
+    with open(path, "rb") as f:
+        f.seek(index * leaf_size)
+        data = f.read(leaf_size)
+    return hashlib.blake2b(data, **_params(leaf_size, index, 0, last)).digest()
+
+
+def root_digest(leaves: list[bytes], leaf_size: int) -> str:
+    return hashlib.blake2b(b"".join(leaves), **_params(leaf_size, 0, 1, True)).hexdigest()
+
+
+class _Pending:
+    """Leaf futures of one file."""
+
+    def __init__(self, leaves: "list[Future]") -> None:
+        self.leaves = leaves
+
+    def result(self, leaf_size: int) -> str:
+        return root_digest([f.result() for f in self.leaves], leaf_size)
+
+
+def submit_file(pool: "Executor", path: str | Path, leaf_size: int = DEFAULT_LEAF_SIZE) -> _Pending:
+    """Queue every leaf of ``path`` on ``pool``; ``.result(leaf_size)`` joins them."""
+    path = Path(path)
+    count = max(1, math.ceil(path.stat().st_size / leaf_size))
+    return _Pending([pool.submit(_leaf, path, i, leaf_size, i == count - 1) for i in range(count)])
+
+
+def tree_hash_file(path: str | Path, leaf_size: int = DEFAULT_LEAF_SIZE, workers: int | None = None) -> str:
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=workers or default_workers()) as pool:
+        return submit_file(pool, path, leaf_size).result(leaf_size)
+
+
+def tree_hash_files(
+    pack_dir: str | Path, rels: list[str], leaf_size: int = DEFAULT_LEAF_SIZE, workers: int | None = None,
+    pool: "Executor | None" = None,
+) -> list[SumsEntry]:
+    """Tree digests of ``rels``; the leaves of all files share one pool, so small and large files overlap."""
+    if pool is None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=workers or default_workers()) as own:
+            return tree_hash_files(pack_dir, rels, leaf_size, pool=own)
+    pack_dir = Path(pack_dir)
+    pending = [(rel, submit_file(pool, pack_dir / rel, leaf_size)) for rel in rels]
+    return [SumsEntry(rel, p.result(leaf_size)) for rel, p in pending]
+
+
+# ---------------------------------------------------------------------------
+# Packs
+# ---------------------------------------------------------------------------
+
+def read_mode(pack_dir: str | Path) -> dict[str, Any] | None:
+    """The manifest's ``tree_hash`` record, or ``None`` for sha256-only packs."""
+    path = Path(pack_dir) / MANIFEST_PATH
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    mode = manifest.get(MANIFEST_KEY) if isinstance(manifest, dict) else None
+    return mode if isinstance(mode, dict) and mode.get("algorithm") == ALGORITHM else None
+
+
+def read_b2sums(pack_dir: str | Path) -> tuple[bytes, list[SumsEntry]] | None:
+    path = Path(pack_dir) / B2SUMS_PATH
+    if not path.is_file():
+        return None
+    raw = path.read_bytes()
+    return raw, parse_sums(raw.decode("utf-8"))
+
+
+def write_tree_sums(pack_dir: str | Path, entries: list[SumsEntry], leaf_size: int = DEFAULT_LEAF_SIZE) -> dict[str, Any]:
+    """Write the b2sums file and record the mode in ``manifest.json`` (which must exist)."""
+    pack_dir = Path(pack_dir)
+    sums = render_sums(entries).encode("utf-8")
+    (pack_dir / B2SUMS_PATH).parent.mkdir(parents=True, exist_ok=True)
+    (pack_dir / B2SUMS_PATH).write_bytes(sums)
+
+    mode = {
+        "algorithm": ALGORITHM,
+        "digest_size": DIGEST_SIZE,
+        "leaf_size": leaf_size,
+        "sums": B2SUMS_PATH,
+        "sums_sha256": sha256_bytes(sums),
+    }
+    manifest_path = pack_dir / MANIFEST_PATH
+    text = manifest_path.read_text(encoding="utf-8")
+    manifest = json.loads(text)
+    manifest[MANIFEST_KEY] = mode
+    manifest_path.write_text(json.dumps(manifest, indent=2) + ("\n" if text.endswith("\n") else ""), encoding="utf-8")
+    return mode
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="BLAKE2b tree digests of files")
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--leaf-size", type=int, default=DEFAULT_LEAF_SIZE, help="Leaf (chunk) size in bytes")
+    parser.add_argument("--workers", type=int, help="Hashing threads (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    try:
+        with ThreadPoolExecutor(max_workers=args.workers or default_workers()) as pool:
+            pending = [(f, submit_file(pool, f, args.leaf_size)) for f in args.files]
+            for f, p in pending:
+                print(f"{p.result(args.leaf_size)}  {f}")
+    except OSError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
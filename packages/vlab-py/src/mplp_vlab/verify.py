@@ -0,0 +1,344 @@
+"""Two-tier pack integrity verifier.
+
+Full tier: rehashes every file listed in ``integrity/sha256sums.txt`` (or
+the flat ``sha256sums.txt`` of an adjudication bundle) streamed and in
+parallel, checks coverage (every pack file is listed) and recomputes the
+declared root (``integrity/pack.sha256`` or
+``pack_root_hash.txt``, see ``packhash``). Same checks as INT-001..003 in
+``lib/engine/verify.ts``. A pack sealed with a Merkle root
+(``integrity/merkle.sha256``) has that root recomputed as well. When the
+manifest declares BLAKE2b tree digests (``treehash``), file contents are
+checked against ``integrity/tree.b2sums`` instead, with the leaves of large
+files hashed in parallel; the manifest itself, any file the b2sums do not
+list, coverage and the root are checked as usual. ``--hash sha256`` forces
+the sha256 rehash.
+
+A sums entry for ``*.ndjson`` is satisfied by a block-compressed
+``*.ndjson.zb``, hashed over its uncompressed stream (see ``packhash``).
+
+Quick tier: compares stat metadata (size, mtime_ns, inode) of every pack
+file against the receipt written by the last full verify and, if nothing
+changed, returns that verify's verdict (pass or fail). Receipts are
+HMAC-SHA256 signed with a local key, so a hand-edited or copied receipt is
+rejected. Any mismatch (or a missing/invalid receipt) escalates to the full
+tier automatically, which refreshes the receipt.
+
+Usage:
+    python -m mplp_vlab.verify <pack_dir|dir_of_packs>... [--full] [--workers N] [--hash auto|sha256|tree] [--json]
+"""
+
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from .packhash import (
+    EXCLUDED_FILES,
+    FLAT_SUMS_PATH,
+    PACK_SHA256_PATH,
+    ROOT_HASH_TXT,
+    SUMS_PATH,
+    compute_root,
+    canonical_relpath,
+    hash_canonical,
+    list_pack_files,
+    read_declared_root,
+    read_sums,
+    sha256_bytes,
+    stored_path,
+)
+from .merkle import merkle_root, read_merkle_root
+from .paths import repo_root
+from .runstore import RESERVED, iter_runs, layout_of
+from .treehash import read_b2sums, read_mode, submit_file
+
+RECEIPT_VERSION = 1
+HASH_MODES = ("auto", "sha256", "tree")
+
+# Not covered by sha256sums.txt by construction
+_COVERAGE_EXEMPT = frozenset({ROOT_HASH_TXT, FLAT_SUMS_PATH})
+
+# Result fields that describe the run rather than the pack
+_VOLATILE_FIELDS = frozenset({"tier", "escalated", "escalation_reason", "duration_ms"})
+
+
+@dataclass
+class VerifyResult:
+    pack: str
+    ok: bool
+    tier: str  # "quick" or "full"
+    escalated: bool = False
+    escalation_reason: str | None = None
+    files: int = 0
+    mismatched: list[str] = field(default_factory=list)
+    missing: list[str] = field(default_factory=list)
+    uncovered: list[str] = field(default_factory=list)
+    root_kind: str | None = None
+    root_ok: bool | None = None
+    merkle_ok: bool | None = None
+    hash_mode: str = "sha256"
+    tree_ok: bool | None = None
+    error: str | None = None
+    duration_ms: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+# ---------------------------------------------------------------------------
+# Receipts
+# ---------------------------------------------------------------------------
+
+def receipts_dir() -> Path:
+    return Path(os.environ.get("VLAB_RECEIPTS_DIR") or repo_root() / "data" / "derived" / "verify-receipts")
+
+
+def _key_path() -> Path:
+    return Path(os.environ.get("VLAB_RECEIPT_KEY") or Path.home() / ".config" / "mplp-vlab" / "receipt.key")
+
+
+def ensure_receipt_key() -> bytes:
+    """The receipt signing key, created on first use.
+
+    The key is written to a temp file and hard-linked into place, so a
+    concurrent reader never sees a partial key and the first writer wins.
+    Call it once before fanning verifications out over processes.
+    """
+    path = _key_path()
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    key = secrets.token_bytes(32)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)  # mode 0600
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(key)
+            f.flush()
+            os.fsync(f.fileno())
+        os.link(tmp, path)
+    except FileExistsError:  # another process won the race
+        return path.read_bytes()
+    finally:
+        os.unlink(tmp)
+    return key
+
+
+def _sign(body: dict[str, Any], key: bytes) -> str:
+    canonical = json.dumps(body, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hmac.new(key, canonical, hashlib.sha256).hexdigest()
+
+
+def _receipt_path(pack_dir: Path) -> Path:
+    digest = hashlib.sha256(str(pack_dir.resolve()).encode("utf-8")).hexdigest()[:24]
+    return receipts_dir() / f"{digest}.json"
+
+
+def _stat_inventory(pack_dir: Path) -> dict[str, list[int]]:
+    """Stat of every file in the pack, integrity files included."""
+    inventory: dict[str, list[int]] = {}
+    for dirpath, _dirnames, filenames in os.walk(pack_dir):
+        for name in filenames:
+            if name in EXCLUDED_FILES:
+                continue
+            full = os.path.join(dirpath, name)
+            st = os.stat(full)
+            inventory[os.path.relpath(full, pack_dir).replace(os.sep, "/")] = [st.st_size, st.st_mtime_ns, st.st_ino]
+    return inventory
+
+
+def write_receipt(pack_dir: Path, result: VerifyResult, inventory: dict[str, list[int]]) -> None:
+    body = {
+        "receipt_version": RECEIPT_VERSION,
+        "pack": str(pack_dir.resolve()),
+        "verified_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "result": {k: v for k, v in result.to_dict().items() if k not in _VOLATILE_FIELDS},
+        "files": inventory,
+    }
+    receipt = {"body": body, "hmac_sha256": _sign(body, ensure_receipt_key())}
+    path = _receipt_path(pack_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(receipt), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _load_receipt(pack_dir: Path) -> tuple[dict[str, Any] | None, str | None]:
+    path = _receipt_path(pack_dir)
+    try:
+        receipt = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None, "no receipt"
+    except ValueError:
+        return None, "receipt unreadable"
+    body = receipt.get("body") or {}
+    if not hmac.compare_digest(_sign(body, ensure_receipt_key()), str(receipt.get("hmac_sha256", ""))):
+        return None, "receipt signature invalid"
+    if body.get("receipt_version") != RECEIPT_VERSION or body.get("pack") != str(pack_dir.resolve()):
+        return None, "receipt stale"
+    return body, None
+
+
+# ---------------------------------------------------------------------------
+# Tiers
+# ---------------------------------------------------------------------------
+
+def _tree_digests(pack_dir: Path, result: VerifyResult) -> tuple[dict[str, str], int]:
+    """Tree digests bound to the manifest, or ``{}`` (``result.tree_ok`` set when declared)."""
+    mode = read_mode(pack_dir)
+    if mode is None:
+        return {}, 0
+    b2 = read_b2sums(pack_dir)
+    result.tree_ok = b2 is not None and sha256_bytes(b2[0]) == mode.get("sums_sha256")
+    if not result.tree_ok:
+        return {}, 0
+    result.hash_mode = "tree"
+    return {e.path: e.hash for e in b2[1]}, int(mode["leaf_size"])
+
+
+def full_verify(pack_dir: str | Path, workers: int | None = None, write: bool = True, hash_mode: str = "auto") -> VerifyResult:
+    """Rehash everything and record the verdict in a fresh receipt."""
+    from concurrent.futures import ThreadPoolExecutor  # only the full tier pays for it
+
+    start = time.perf_counter()
+    pack_dir = Path(pack_dir)
+    result = VerifyResult(pack=str(pack_dir), ok=False, tier="full")
+    # Snapshot stats before hashing so a concurrent write invalidates the receipt
+    inventory = _stat_inventory(pack_dir)
+
+    entries = read_sums(pack_dir)
+    if entries is None:
+        result.error = f"{SUMS_PATH} not found"
+        result.duration_ms = (time.perf_counter() - start) * 1000
+        return result
+    result.files = len(entries)
+    tree, leaf_size = _tree_digests(pack_dir, result) if hash_mode != "sha256" else ({}, 0)
+    if hash_mode == "tree" and result.tree_ok is None:
+        result.error = "manifest declares no tree_hash"
+
+    with ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 1) + 4)) as pool:
+        pending = []
+        for entry in entries:
+            full = stored_path(pack_dir, entry.path)
+            stored = full.relative_to(pack_dir).as_posix()
+            if not full.is_file():
+                result.missing.append(entry.path)
+            elif stored in tree:
+                pending.append((entry.path, tree[stored], partial(submit_file(pool, full, leaf_size).result, leaf_size)))
+            else:
+                pending.append((entry.path, entry.hash, pool.submit(hash_canonical, full).result))
+        for path, expected, digest in pending:
+            try:
+                actual = digest()
+            except ValueError:  # a stored block timeline that no longer decodes
+                actual = None
+            if actual != expected:
+                result.mismatched.append(path)
+
+    listed = {e.path for e in entries}
+    result.uncovered = [
+        f for f in list_pack_files(pack_dir) if canonical_relpath(f) not in listed and f not in _COVERAGE_EXEMPT
+    ]
+
+    declared = read_declared_root(pack_dir)
+    if declared is not None:
+        result.root_kind = declared.kind
+        result.root_ok = compute_root(pack_dir, declared, entries) == declared.hash
+    merkle = read_merkle_root(pack_dir)
+    if merkle is not None:
+        result.merkle_ok = merkle_root(entries) == merkle
+
+    result.ok = (
+        not (result.missing or result.mismatched or result.uncovered)
+        and result.root_ok is not False
+        and result.merkle_ok is not False
+        and result.tree_ok is not False
+        and result.error is None
+    )
+    if write:
+        write_receipt(pack_dir, result, inventory)
+    result.duration_ms = (time.perf_counter() - start) * 1000
+    return result
+
+
+def quick_verify(pack_dir: str | Path, workers: int | None = None, hash_mode: str = "auto") -> VerifyResult:
+    """Stat comparison against the signed receipt; escalates to ``full_verify`` on any mismatch."""
+    start = time.perf_counter()
+    pack_dir = Path(pack_dir)
+    body, reason = _load_receipt(pack_dir)
+    if body is not None:
+        recorded = body.get("files") or {}
+        current = _stat_inventory(pack_dir)
+        if current == recorded:
+            cached = VerifyResult(**body["result"], tier="quick")
+            cached.duration_ms = (time.perf_counter() - start) * 1000
+            return cached
+        changed = sorted(set(current) ^ set(recorded) | {f for f in current.keys() & recorded.keys() if current[f] != recorded[f]})
+        reason = f"stat changed: {', '.join(changed[:3])}{'...' if len(changed) > 3 else ''}"
+
+    result = full_verify(pack_dir, workers, hash_mode=hash_mode)
+    result.escalated = True
+    result.escalation_reason = reason
+    result.duration_ms = (time.perf_counter() - start) * 1000
+    return result
+
+
+def verify_pack(pack_dir: str | Path, full: bool = False, workers: int | None = None, hash_mode: str = "auto") -> VerifyResult:
+    try:
+        return full_verify(pack_dir, workers, hash_mode=hash_mode) if full else quick_verify(pack_dir, workers, hash_mode)
+    except OSError as e:
+        return VerifyResult(pack=str(pack_dir), ok=False, tier="full" if full else "quick", error=str(e))
+
+
+def is_pack_dir(path: Path) -> bool:
+    return any((path / rel).is_file() for rel in (SUMS_PATH, PACK_SHA256_PATH, FLAT_SUMS_PATH))
+
+
+def expand_targets(paths: list[str]) -> list[Path]:
+    """Pack directories as given, or the pack children of a directory (through its hash buckets
+    when it is a fan-out run root)."""
+    targets: list[Path] = []
+    for p in map(Path, paths):
+        if is_pack_dir(p):
+            targets.append(p)
+        elif p.is_dir():
+            children = [*iter_runs(p), *(p / r for r in RESERVED)] if layout_of(p).kind == "fanout" else p.iterdir()
+            targets.extend(sorted(c for c in children if c.is_dir() and is_pack_dir(c)))
+    return targets
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Two-tier pack integrity verifier")
+    parser.add_argument("paths", nargs="+", help="Pack directories or directories of packs")
+    parser.add_argument("--full", action="store_true", help="Skip the quick tier")
+    parser.add_argument("--workers", type=int, help="Hashing threads per pack")
+    parser.add_argument("--hash", choices=HASH_MODES, default="auto",
+                        help="Content hashes: tree digests when the manifest declares them (auto), or force one")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = [verify_pack(p, args.full, args.workers, args.hash) for p in expand_targets(args.paths)]
+    if args.json:
+        print(json.dumps([r.to_dict() for r in results], indent=2))
+    else:
+        for r in results:
+            status = "PASS" if r.ok else "FAIL"
+            note = f" (escalated: {r.escalation_reason})" if r.escalated else ""
+            print(f"{status} [{r.tier}] {r.pack} {r.duration_ms:.1f}ms{note}")
+        passed = sum(r.ok for r in results)
+        print(f"{passed}/{len(results)} packs verified")
+    return 0 if results and all(r.ok for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
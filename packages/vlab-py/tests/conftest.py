@@ -0,0 +1,10 @@
+from pathlib import Path
+
+import pytest
+
+from mplp_vlab.paths import repo_root
+
+
+@pytest.fixture
+def runs_dir() -> Path:
+    return repo_root() / "data" / "runs"
@@ -0,0 +1,125 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from mplp_vlab.batch import Journal, backoff_delay, main, plan_cells, replay, run_batch
+from mplp_vlab.packhash import read_declared_root
+
+# Writes a small pack; fails while <OUT_DIR>.fail holds a positive count (decremented per attempt)
+PRODUCER = """
+import json, os, pathlib, sys
+out = pathlib.Path(os.environ["OUT_DIR"])
+flag = out.with_name(out.name + ".fail")
+if flag.is_file() and int(flag.read_text()) > 0:
+    flag.write_text(str(int(flag.read_text()) - 1))
+    out.mkdir(parents=True, exist_ok=True)
+    (out / "partial.json").write_text("{}")
+    sys.exit("boom")
+(out / "timeline").mkdir(parents=True)
+(out / "manifest.json").write_text(json.dumps({"run_id": os.environ["RUN_ID"], "scenario_id": os.environ["SCENARIO_ID"]}))
+(out / "timeline" / "events.ndjson").write_text('{"event": "STEP"}\\n')
+"""
+
+
+@pytest.fixture
+def batch(tmp_path, monkeypatch):
+    monkeypatch.setenv("VLAB_RECEIPTS_DIR", str(tmp_path / "receipts"))
+    monkeypatch.setenv("VLAB_RECEIPT_KEY", str(tmp_path / "receipt.key"))
+    (tmp_path / "producer.py").write_text(PRODUCER)
+    cells = plan_cells("cmd", ["sub"], ["s1", "s2"], 2, tmp_path / "out")
+    cmd = f"{sys.executable} {tmp_path / 'producer.py'}"
+    return tmp_path, cells, cmd
+
+
+def _fail(cell, times):
+    flag = Path(cell.out_dir + ".fail")
+    flag.parent.mkdir(parents=True, exist_ok=True)
+    flag.write_text(str(times))
+
+
+def test_plan_and_backoff():
+    cells = plan_cells("produce", ["a", "b"], ["x"], 2, "/tmp/o")
+    assert [c.cell_id for c in cells] == ["a/x/r0001", "a/x/r0002", "b/x/r0001", "b/x/r0002"]
+    assert cells[0].out_dir.endswith("/a-x-r0001")
+    assert [backoff_delay(n, 2.0, 10.0) for n in (1, 2, 3, 4)] == [2.0, 4.0, 8.0, 10.0]
+
+
+def test_run_retry_and_resume(batch):
+    tmp_path, cells, cmd = batch
+    journal = tmp_path / "out" / "batch.journal.ndjson"
+    _fail(cells[1], 2)
+    summary = run_batch(cells, journal, workers=2, retries=3, backoff=0.01, cmd=cmd)
+    assert (summary["verified"], summary["failed"], summary["retried"]) == (4, 0, 1)
+    result = next(r for r in summary["results"] if r["cell_id"] == cells[1].cell_id)
+    assert result["attempts"] == 3 and result["root"] == read_declared_root(cells[1].out_dir).hash
+    assert not (tmp_path / "out" / cells[1].run_id / "partial.json").exists()
+    states = replay(journal)
+    assert {s.state for s in states.values()} == {"verified"}
+    records = [json.loads(line) for line in journal.read_text().splitlines()]
+    assert [r["state"] for r in records if r["cell"] == cells[1].cell_id] == [
+        "pending", "running", "failed", "running", "failed", "running", "sealed", "verified",
+    ]
+
+    # Restart: everything still verifies, nothing reruns
+    again = run_batch(cells, journal, cmd=f"{sys.executable} -c 'raise SystemExit(1)'")
+    assert again["skipped"] == 4 and again["failed"] == 0
+
+    # A tampered pack is rerun, the others are skipped
+    (tmp_path / "out" / cells[2].run_id / "manifest.json").write_text("{}")
+    again = run_batch(cells, journal, cmd=cmd)
+    assert (again["skipped"], again["verified"]) == (3, 1)
+
+
+def test_crash_mid_batch_resumes(batch):
+    tmp_path, cells, cmd = batch
+    journal = tmp_path / "out" / "batch.journal.ndjson"
+    run_batch(cells[:2], journal, cmd=cmd)
+    # A crash left cell 2 running, cell 3 sealed but unverified, and a torn record
+    with Journal(journal) as j:
+        j.record(cells[2].cell_id, "running", attempt=1)
+    (tmp_path / "out" / cells[2].run_id).mkdir()
+    run_batch([cells[3]], tmp_path / "scratch.ndjson", cmd=cmd)
+    root = read_declared_root(cells[3].out_dir).hash
+    with Journal(journal) as j:
+        j.record(cells[3].cell_id, "sealed", attempt=1, root=root)
+    with open(journal, "ab") as f:
+        f.write(b'{"cell": "sub/s2/r0002", "sta')
+
+    assert replay(journal)[cells[2].cell_id].state == "running"
+    summary = run_batch(cells, journal, cmd=cmd)
+    statuses = {r["cell_id"]: (r["status"], r["attempts"]) for r in summary["results"]}
+    assert statuses == {
+        cells[0].cell_id: ("skipped", 1),
+        cells[1].cell_id: ("skipped", 1),
+        cells[2].cell_id: ("verified", 2),
+        cells[3].cell_id: ("skipped", 1),
+    }
+    assert replay(journal)[cells[3].cell_id].state == "verified"  # full verify recorded on resume
+    assert all(json.loads(line) for line in journal.read_text().splitlines())  # torn tail truncated
+
+
+def test_retries_are_bounded_across_invocations(batch, capsys):
+    tmp_path, cells, cmd = batch
+    journal = tmp_path / "out" / "batch.journal.ndjson"
+    _fail(cells[0], 10)
+    summary = run_batch(cells[:1], journal, retries=1, backoff=0.01, cmd=cmd)
+    assert summary["failed"] == 1 and summary["results"][0]["attempts"] == 2
+    assert "boom" in summary["results"][0]["error"]
+    # Retries used up: not run again until --retry-failed
+    assert run_batch(cells[:1], journal, retries=1, cmd=cmd)["results"][0]["attempts"] == 2
+    _fail(cells[0], 0)
+    args = ["cmd", "--cmd", cmd, "--out-root", str(tmp_path / "out"), "--substrates", "sub", "--scenarios", "s1",
+            "--retries", "1", "--backoff", "0.01"]
+    assert main(args) == 1
+    assert main(args + ["--retry-failed"]) == 0
+    assert "1 verified" in capsys.readouterr().out
+    assert main(["cmd", "--out-root", str(tmp_path / "out")]) == 2
+
+
+def test_corrupt_journal_is_rejected(tmp_path):
+    journal = tmp_path / "j.ndjson"
+    journal.write_text('{"cell": "a", "state": "pending"}\nnot json\n{"cell": "a", "state": "running"}\n')
+    with pytest.raises(ValueError):
+        replay(journal)
@@ -0,0 +1,48 @@
+import pytest
+
+from mplp_vlab.batchverify import discover_all, run_batch
+from mplp_vlab.packhash import SumsEntry, pack_root_hash, render_sums, sha256_bytes
+
+
+@pytest.fixture(autouse=True)
+def receipts(tmp_path, monkeypatch):
+    monkeypatch.setenv("VLAB_RECEIPTS_DIR", str(tmp_path / "receipts"))
+    monkeypatch.setenv("VLAB_RECEIPT_KEY", str(tmp_path / "receipt.key"))
+
+
+def make_pack(root, files, flat=False):
+    for rel, data in files.items():
+        (root / rel).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel).write_bytes(data)
+    entries = sorted((SumsEntry(rel, sha256_bytes(data)) for rel, data in files.items()), key=lambda e: e.path)
+    if flat:
+        (root / "sha256sums.txt").write_text(render_sums(entries))
+        return
+    (root / "integrity").mkdir(parents=True, exist_ok=True)
+    (root / "integrity/sha256sums.txt").write_text(render_sums(entries))
+    (root / "integrity/pack.sha256").write_text(f"{pack_root_hash(entries)}  pack\n")
+
+
+def test_discover_and_batch(tmp_path):
+    runs = tmp_path / "runs"
+    make_pack(runs / "small-v1", {"manifest.json": b"{}"})
+    make_pack(runs / "v2/real/x/big-v2", {"manifest.json": b'{"pack_layout_version": "2"}', "timeline/events.ndjson": b"x" * 4096})
+    make_pack(tmp_path / "adj/bundle", {"verdict.json": b"{}"}, flat=True)
+    make_pack(tmp_path / "vectors/sub/run1", {"manifest.json": b"{}"})
+    make_pack(tmp_path / "vectors/sub/pack", {"manifest.json": b"{}"})
+
+    jobs = discover_all([(runs, "*"), (tmp_path / "adj", "*"), (tmp_path / "vectors", "run*")])
+    assert [j.layout for j in jobs][0] == "v2"  # largest first
+    assert sorted(j.layout for j in jobs) == ["adjudication", "v1", "v1", "v2"]
+    assert not any(j.path.endswith("/pack") for j in jobs)
+
+    seen = []
+    report = run_batch(jobs, workers=2, progress=lambda done, total, r: seen.append(done))
+    assert report["verdict"] == "PASS" and report["summary"]["passed"] == 4
+    assert report["summary"]["by_layout"]["adjudication"] == {"packs": 1, "passed": 1, "failed": 0}
+    assert seen == [1, 2, 3, 4]
+
+    (runs / "small-v1/manifest.json").write_bytes(b"[]")
+    report = run_batch(jobs, workers=2)
+    assert report["verdict"] == "FAIL"
+    assert [r["pack"] for r in report["results"] if not r["ok"]] == [str(runs / "small-v1")]
@@ -0,0 +1,96 @@
+import json
+import shutil
+
+import pytest
+
+from mplp_vlab.blocktimeline import BlockTimeline, BlockTimelineError, BlockWriter, main, write_timeline
+from mplp_vlab.packhash import sha256_bytes
+from mplp_vlab.seal import seal_pack
+from mplp_vlab.timeline import find_timeline, iter_events
+from mplp_vlab.verify import full_verify
+
+
+def _events(n):
+    lines = [json.dumps({"event_id": f"e{i}", "event": "STEP", "data": {"i": i, "pad": "x" * (i % 50)}}) for i in range(n)]
+    return ("\n".join(lines[: n // 2]) + "\n\n" + "\n".join(lines[n // 2:]) + "\n").encode()
+
+
+@pytest.mark.parametrize("codec", ["zlib", "lzma", "bz2"])
+def test_roundtrip_and_seek(tmp_path, codec):
+    raw = _events(2000)
+    (tmp_path / "events.ndjson").write_bytes(raw)
+    with BlockWriter(tmp_path / "events.ndjson.zb", block_size=4096, codec=codec) as w:
+        for i in range(0, len(raw), 1000):  # chunks split lines
+            w.write(raw[i:i + 1000])
+    expected = list(iter_events(tmp_path / "events.ndjson"))
+
+    with BlockTimeline(tmp_path / "events.ndjson.zb") as t:
+        assert len(t) > 10 and t.raw_sha256 == sha256_bytes(raw) == t.canonical_sha256()
+        assert b"".join(t.iter_raw()) == raw
+        assert list(t.iter_events()) == expected
+        target = expected[1500]
+        block = t.seek_line(target.line)
+        assert next(e for e in t.iter_events(block) if e.line == target.line) == target
+        assert next(t.events_from_line(target.line)) == target
+        assert t.seek_offset(target.offset) == block
+    assert list(iter_events(tmp_path / "events.ndjson.zb")) == expected
+
+
+def test_long_lines_and_unterminated_tail(tmp_path):
+    raw = b'{"a": "' + b"y" * 10000 + b'"}\n{"b": 1}'
+    path, digest = write_timeline(tmp_path / "events.ndjson", raw, fmt="blocks")
+    assert path.name == "events.ndjson.zb" and digest == sha256_bytes(raw)
+    events = list(iter_events(path))
+    assert [e.line for e in events] == [1, 2] and events[1].offset == raw.index(b'{"b"')
+
+
+def test_corrupt_block_rejected(tmp_path):
+    write_timeline(tmp_path / "events.ndjson", _events(500), fmt="blocks")
+    path = tmp_path / "events.ndjson.zb"
+    with BlockTimeline(path) as t:
+        offset = t.blocks[0].offset + 5
+    data = bytearray(path.read_bytes())
+    data[offset] ^= 0xFF
+    path.write_bytes(bytes(data))
+    with BlockTimeline(path) as t, pytest.raises(BlockTimelineError):
+        t.read_block(0)
+    # the index's stream digest is checked on a full read, and a garbled index is rejected on open
+    write_timeline(tmp_path / "events.ndjson", _events(500), fmt="blocks")
+    data = path.read_bytes()
+    digest = sha256_bytes(_events(500)).encode()
+    path.write_bytes(data.replace(digest, digest[:-1] + (b"0" if digest[-1:] != b"0" else b"1")))
+    with BlockTimeline(path) as t, pytest.raises(BlockTimelineError):
+        t.canonical_sha256()
+    path.write_bytes(data.replace(b'"blocks":', b'"blocks";'))
+    with pytest.raises(BlockTimelineError):
+        BlockTimeline(path)
+    (tmp_path / "plain.zb").write_bytes(b"not a timeline")
+    with pytest.raises(BlockTimelineError):
+        BlockTimeline(tmp_path / "plain.zb")
+
+
+def test_pack_hashes_stay_canonical(tmp_path, monkeypatch):
+    monkeypatch.setenv("VLAB_RECEIPTS_DIR", str(tmp_path / "receipts"))
+    monkeypatch.setenv("VLAB_RECEIPT_KEY", str(tmp_path / "receipt.key"))
+    raw_pack = tmp_path / "raw"
+    (raw_pack / "timeline").mkdir(parents=True)
+    (raw_pack / "manifest.json").write_text("{}")
+    (raw_pack / "timeline" / "events.ndjson").write_bytes(_events(3000))
+    raw_root = seal_pack(raw_pack)
+
+    packed = tmp_path / "packed"
+    shutil.copytree(raw_pack, packed)
+    assert main(["pack", str(packed / "timeline" / "events.ndjson")]) == 0
+    (packed / "timeline" / "events.ndjson").unlink()
+    stored = packed / "timeline" / "events.ndjson.zb"
+    assert stored.stat().st_size * 5 < len(_events(3000))
+    assert find_timeline(packed) == stored
+
+    # same sums and root as the raw pack, and verify checks the decompressed stream
+    assert seal_pack(packed) == raw_root
+    assert (packed / "integrity" / "sha256sums.txt").read_text() == (raw_pack / "integrity" / "sha256sums.txt").read_text()
+    result = full_verify(packed, write=False)
+    assert result.ok and not result.uncovered
+
+    write_timeline(packed / "timeline" / "events.ndjson", _events(2999), fmt="blocks")
+    assert full_verify(packed, write=False).mismatched == ["timeline/events.ndjson"]
@@ -0,0 +1,117 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+import mplp_vlab
+from mplp_vlab.budget import BudgetExceeded, BudgetGuard, main, scan_timeline
+from mplp_vlab.produce import producers_dir
+from mplp_vlab.scenarios import budget_ceilings
+
+
+def ndjson(*events) -> io.BytesIO:
+    return io.BytesIO("".join(json.dumps(e) + "\n" for e in events).encode())
+
+
+def decision(outcome="allow", amount=400, agent="a", resource="token_quota"):
+    return {"event_type": "budget.decision", "decision_kind": "budget", "outcome": outcome,
+            "resource": resource, "amount": amount, "agent_id": agent}
+
+
+def test_scenario_ceilings():
+    assert budget_ceilings("d1-budget-pass-scenario") == {"token_quota": 1000.0}
+
+
+def test_pass_fixture_within_ceiling(runs_dir):
+    report = scan_timeline(runs_dir / "arb-d1-budget-pass-fixture-v0.3" / "trace" / "events.ndjson",
+                           budget_ceilings("d1-budget-pass-scenario"))
+    assert report.ok
+    assert report.totals == {"*": {"token_quota": 1000.0}}
+
+
+def test_invalid_outcome_fixture(runs_dir):
+    report = scan_timeline(runs_dir / "arb-d1-budget-fail-outcome-invalid-v0.4" / "trace" / "events.ndjson")
+    assert report.first_violation.reason_code == "D1_OUTCOME_INVALID"
+    assert report.first_violation.event_id == "evt-budget-001"
+
+
+def test_ceiling_is_per_agent_and_only_counts_grants():
+    stream = ndjson(
+        decision(agent="a"), decision(agent="b"), decision(agent="a"),
+        decision(outcome="deny", agent="a"), decision(agent="a"),
+    )
+    report = scan_timeline(stream, {"token_quota": 1000})
+    v = report.first_violation
+    assert v.reason_code == "D1_BUDGET_CEILING_EXCEEDED"
+    assert (v.agent_id, v.total, v.line) == ("a", 1200.0, 5)
+    assert report.decisions == 5
+
+
+def test_guard_aborts_on_producer_events():
+    guard = BudgetGuard({"token_quota": 500})
+    guard.observe({"event": "RUN_STARTED", "data": {}})
+    guard.observe({"event": "budget.decision", "data": decision(amount=300)})
+    with pytest.raises(BudgetExceeded) as exc:
+        guard.observe({"event": "budget.decision", "data": decision(amount=300)})
+    assert exc.value.violation.total == 600.0
+
+
+def test_no_decision_is_not_a_pass(runs_dir, capsys):
+    report = scan_timeline(ndjson({"event_type": "agent.init", "agent_id": "a"}))
+    assert not report.ok and report.decisions == 0
+    assert (report.first_violation.clause_id, report.first_violation.reason_code) == ("CL-D1-01", "D1_DECISION_EVENT_MISSING")
+
+    # Bundle runs resolve their pack_root: a public pack (mcp) and the flattened v0.3 trace
+    assert main([str(runs_dir / "mcp-d1-budget-pass-01")]) == 0
+    assert json.loads(capsys.readouterr().out)["decisions"] == 1
+    assert main([str(runs_dir / "pydantic-ai-d1-budget-fail-01")]) == 1
+    assert json.loads(capsys.readouterr().out)["first_violation"]["reason_code"] == "D1_OUTCOME_INVALID"
+    assert main([str(runs_dir / "arb-d1-budget-fail-fixture-v0.3")]) == 1
+    assert json.loads(capsys.readouterr().out)["first_violation"]["reason_code"] == "D1_DECISION_EVENT_MISSING"
+
+
+# Charges 600 token_quota per orchestration step; the scenario ceiling is 1000
+OVER_BUDGET_DRIVER = textwrap.dedent("""
+    import os, runpy, sys
+    sys.path[:0] = [os.path.dirname(sys.argv[1]), sys.argv[2]]
+    import vlab_hooks
+
+    log_event = vlab_hooks.log_event
+
+    def charging_log_event(timeline, event, data):
+        log_event(timeline, event, data)
+        if event == "ORCHESTRATION_STEP":
+            log_event(timeline, "budget.decision", {"decision_kind": "budget", "outcome": "allow",
+                                                    "resource": "token_quota", "amount": 600})
+
+    vlab_hooks.log_event = charging_log_event
+    runpy.run_path(sys.argv[1], run_name="__main__")
+""")
+
+
+def test_producer_over_ceiling_exits_3(tmp_path):
+    script = producers_dir() / "magentic_one" / "src" / "produce-real.py"
+    env = dict(os.environ, PYTHONPATH=str(Path(mplp_vlab.__file__).parents[1]),
+               OUT_DIR=str(tmp_path / "out"), SCENARIO_ID="d1-budget-pass-scenario")
+    proc = subprocess.run([sys.executable, "-c", OVER_BUDGET_DRIVER, str(script), str(producers_dir() / "_lib")],
+                          env=env, capture_output=True, text=True)
+    assert proc.returncode == 3, proc.stderr
+    assert "Budget guard aborted run: D1_BUDGET_CEILING_EXCEEDED" in proc.stderr
+    assert not (tmp_path / "out" / "manifest.json").exists()
+
+
+def test_producer_refuses_to_run_without_its_guard(tmp_path):
+    (tmp_path / "yaml.py").write_text("raise ImportError('No module named yaml')\n")  # pyyaml missing
+    script = producers_dir() / "magentic_one" / "src" / "produce-real.py"
+    env = dict(os.environ, PYTHONPATH=str(tmp_path), OUT_DIR=str(tmp_path / "out"))
+    proc = subprocess.run([sys.executable, str(script)], env=env, capture_output=True, text=True)
+    assert proc.returncode == 2 and "error: budget guard unavailable" in proc.stderr
+
+    proc = subprocess.run([sys.executable, str(script)], env=dict(env, VLAB_BUDGET_GUARD="0"), capture_output=True, text=True)
+    assert proc.returncode == 0 and "warning: mplp_vlab unavailable" in proc.stderr
+    assert (tmp_path / "out" / "timeline" / "events.ndjson").is_file()
@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import mplp_vlab
+from mplp_vlab.cli import COMMANDS, main
+from mplp_vlab.equivalence import equivalence_record
+from mplp_vlab.generate import generate
+from mplp_vlab.paths import repo_root
+
+GF01 = repo_root() / "test-vectors" / "cross-substrate" / "gf-01"
+
+
+def test_help_imports_no_subcommand():
+    code = "import sys; from mplp_vlab.cli import main; main(['--help']); print(sorted(m for m in sys.modules if m.startswith('mplp_vlab.')))"
+    env = dict(os.environ, PYTHONPATH=str(Path(mplp_vlab.__file__).parents[1]))
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env).stdout
+    assert out.strip().splitlines()[-1] == "['mplp_vlab.cli']"
+    assert all(name in out for name in ("generate", "produce", "seal", "verify", "equivalence", "bench"))
+
+
+def test_unknown_command(capsys):
+    assert main(["nope"]) == 2
+    assert "unknown command" in capsys.readouterr().err
+
+
+def test_seal_then_verify(tmp_path, monkeypatch):
+    monkeypatch.setenv("VLAB_RECEIPTS_DIR", str(tmp_path / "receipts"))
+    monkeypatch.setenv("VLAB_RECEIPT_KEY", str(tmp_path / "receipt.key"))
+    pack = tmp_path / "pack"
+    (pack / "timeline").mkdir(parents=True)
+    (pack / "manifest.json").write_text("{}")
+    (pack / "timeline" / "events.ndjson").write_text('{"a": 1}\n')
+    for root in ("pack.sha256", "pack_root_hash.txt"):
+        assert main(["seal", str(pack), "--root", root]) == 0
+        assert main(["verify", str(pack), "--full"]) == 0
+
+
+def test_generate_matches_vector(tmp_path):
+    out = generate("a2a", tmp_path / "a2a", quiet=True)
+    assert (out / "pack_root_hash.txt").read_text() == (GF01 / "a2a" / "run1" / "pack_root_hash.txt").read_text()
+
+
+def test_equivalence_run_to_run():
+    record = equivalence_record([GF01 / "a2a" / "run1", GF01 / "a2a" / "run2"])
+    assert record["equivalence_type"] == "run_to_run"
+    assert record["root_match"] and record["verdict_match"]
+    assert set(COMMANDS) >= {"generate", "produce", "seal", "verify", "equivalence", "bench"}
@@ -0,0 +1,115 @@
+import json
+import random
+
+import pytest
+
+from mplp_vlab import failfuzz
+from mplp_vlab.blocktimeline import write_timeline
+from mplp_vlab.failfuzz import MUTATIONS, fuzz, load_source, main, run_checks
+from mplp_vlab.rulesets import DEFAULT_RULESET, ruleset_clauses
+from mplp_vlab.seal import seal_pack
+from mplp_vlab.verify import full_verify
+
+EVENTS = [
+    {"event_id": "e0", "type": "agent.init", "agent_id": "a"},
+    {"event_id": "e1", "type": "lifecycle.transition", "agent_id": "a", "to_state": "running"},
+    {"event_id": "e2", "type": "budget.decision", "agent_id": "a", "data": {"outcome": "allow", "resource": "tokens", "amount": 10}},
+    {"event_id": "e3", "type": "authz.decision", "agent_id": "a", "decision_kind": "authz", "outcome": "allow"},
+    {"event_id": "e4", "type": "confirm.gate", "agent_id": "a"},
+    {"event_id": "e5", "type": "handoff", "agent_id": "a", "from_agent": "a", "to_agent": "b"},
+    {"event_id": "e6", "type": "agent.init", "agent_id": "b", "received_from": "a"},
+    {"event_id": "e7", "type": "tool.invoke", "agent_id": "b"},
+    {"event_id": "e8", "type": "lifecycle.transition", "agent_id": "b", "to_state": "completed"},
+    {"event_id": "e9", "type": "lifecycle.transition", "agent_id": "a", "to_state": "completed"},
+]
+
+
+@pytest.fixture
+def pack(tmp_path, monkeypatch):
+    monkeypatch.setenv("VLAB_RECEIPTS_DIR", str(tmp_path / "receipts"))
+    monkeypatch.setenv("VLAB_RECEIPT_KEY", str(tmp_path / "receipt.key"))
+    root = tmp_path / "src-pack"
+    (root / "timeline").mkdir(parents=True)
+    (root / "manifest.json").write_text(json.dumps({"pack_id": "p"}))
+    # Spacing the fuzzer must preserve on untouched lines
+    (root / "timeline" / "events.ndjson").write_text("".join(json.dumps(e, indent=None) + "\n" for e in EVENTS))
+    seal_pack(root, root="pack_root_hash.txt")
+    return root
+
+
+def _strip_timings(labels):
+    for label in labels:
+        for observed in label.get("observed", {}).values():
+            observed.pop("ms")
+    return labels
+
+
+def test_mutations_target_their_checker(pack):
+    source = load_source(pack)
+    clauses = ruleset_clauses(DEFAULT_RULESET)
+    for name, mutate in MUTATIONS.items():
+        mutation = mutate(source.events, random.Random(1), clauses)
+        assert mutation is not None, name
+    moved = MUTATIONS["reorder_lifecycle"](source.events, random.Random(3), clauses)
+    assert [e["event_id"] for e in moved.events].index(moved.detail["event_id"]) < [e["event_id"] for e in moved.events].index(moved.detail["before"])
+    dropped = MUTATIONS["drop_confirm"](source.events, random.Random(1), clauses)
+    assert "e4" not in {e["event_id"] for e in dropped.events}
+    assert next(e for e in dropped.events if e["event_id"] == "e3")["outcome"] != "allow"
+    assert EVENTS[3]["outcome"] == "allow" and source.events[3]["outcome"] == "allow"  # source untouched
+
+
+def test_fuzz_labels_and_catches(pack, tmp_path):
+    summary = fuzz(pack, tmp_path / "out", variants=21, seed=7, workers=1, check=True)
+    assert all(summary["baseline"][c]["ok"] for c in failfuzz.CHECKERS)
+    assert set(summary["mutations"]) == set(MUTATIONS)
+    assert summary["false_passes"] == summary["crashes"] == []
+    labels = [json.loads(line) for line in (tmp_path / "out" / "labels.jsonl").read_text().splitlines()]
+    assert [l["index"] for l in labels] == list(range(21))
+    statuses = {l["mutation"]: l["status"] for l in labels}
+    assert statuses.pop("drop_confirm") == "unchecked" and set(statuses.values()) == {"caught"}
+
+    variant = tmp_path / "out" / labels[1]["variant"]
+    assert labels[1]["variant"] == "src-pack-fz-00001-reorder_lifecycle"
+    assert (variant / "pack_root_hash.txt").is_file() and full_verify(variant, write=False).ok
+    lines = (variant / "timeline" / "events.ndjson").read_text().splitlines()
+    assert json.dumps(EVENTS[0], indent=None) in lines  # untouched lines keep their bytes
+
+    # Same labels whatever the worker count
+    fuzz(pack, tmp_path / "again", variants=21, seed=7, workers=2, check=True, discard=True)
+    again = [json.loads(line) for line in (tmp_path / "again" / "labels.jsonl").read_text().splitlines()]
+    assert _strip_timings(again) == _strip_timings(labels)
+    assert not (tmp_path / "again" / labels[1]["variant"]).exists()
+
+
+def test_block_timeline_tamper_is_a_mismatch(pack, tmp_path):
+    events = pack / "timeline" / "events.ndjson"
+    write_timeline(events, events.read_bytes() * 40, fmt="blocks")
+    events.unlink()
+    summary = fuzz(pack, tmp_path / "out", variants=12, workers=1, mutations=["tamper_byte", "drop_terminal"], check=True)
+    assert summary["false_passes"] == summary["crashes"] == []
+    labels = [json.loads(line) for line in (tmp_path / "out" / "labels.jsonl").read_text().splitlines()]
+    tampered = [l for l in labels if l["detail"].get("path") == "timeline/events.ndjson"]
+    assert tampered and all(l["observed"]["integrity"]["reason"] == "mismatch" for l in tampered)
+    assert (tmp_path / "out" / labels[1]["variant"] / "timeline" / "events.ndjson.zb").is_file()
+
+
+def test_baseline_gates_mutations_and_cli(pack, tmp_path, capsys):
+    lines = (pack / "timeline" / "events.ndjson").read_text().splitlines()
+    (pack / "timeline" / "events.ndjson").write_text("\n".join(lines[:-2]) + "\n")  # no terminal: D2 fails already
+    assert main([str(pack), "--out", str(tmp_path / "out"), "--variants", "8", "--workers", "1", "--check"]) == 0
+    summary = json.loads((tmp_path / "out" / "summary.json").read_text())
+    assert summary["baseline"]["lifecycle"]["ok"] is False
+    assert not {"reorder_lifecycle", "drop_terminal", "corrupt_terminal_state"} & set(summary["mutations"])
+    assert run_checks(tmp_path / "out" / "baseline")["integrity"]["ok"]
+    assert main([str(pack), "--out", str(tmp_path / "x"), "--mutations", "nope"]) == 2
+    assert main([str(pack), "--out", str(tmp_path / "x"), "--discard"]) == 2
+    assert "error:" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("run_id", ["arb-d3-authz-decision-pass-fixture-v0.3", "pydantic-ai-d1-budget-pass-01"])
+def test_repo_pass_fixtures_get_timeline_mutations(runs_dir, run_id, tmp_path, monkeypatch):
+    monkeypatch.setenv("VLAB_RECEIPTS_DIR", str(tmp_path / "receipts"))
+    monkeypatch.setenv("VLAB_RECEIPT_KEY", str(tmp_path / "receipt.key"))
+    summary = fuzz(runs_dir / run_id, tmp_path / "out", variants=8, workers=1, check=True, discard=True)
+    assert len(summary["mutations"]) > 1 and "tamper_byte" in summary["mutations"]
+    assert summary["false_passes"] == [] and summary["crashes"] == []
@@ -0,0 +1,60 @@
+import io
+import json
+
+from mplp_vlab.handoff import check_pack, check_timeline
+from mplp_vlab.paths import repo_root
+
+
+def ndjson(*events) -> io.BytesIO:
+    return io.BytesIO("".join(json.dumps(e) + "\n" for e in events).encode())
+
+
+def init(agent, received_from=None):
+    ev = {"type": "agent.init", "agent_id": agent}
+    if received_from:
+        ev["received_from"] = received_from
+    return ev
+
+
+def handoff(sender, receiver):
+    return {"type": "handoff", "agent_id": sender, "from_agent": sender, "to_agent": receiver}
+
+
+def test_release_pack_consistent():
+    pack = repo_root() / "releases" / "v0.6" / "artifacts" / "packs" / "gf-01-ma-a2a-official-v0.6"
+    report = check_pack(pack)
+    assert report.ok, report.violations
+    assert report.edges == {"agent_a": {"agent_b": 1}}
+
+
+def test_unreceived_handoff_and_early_action():
+    report = check_timeline(ndjson(
+        init("a"),
+        handoff("a", "b"),
+        {"type": "task.start", "agent_id": "c"},
+    ))
+    codes = [v.reason_code for v in report.violations]
+    assert codes == ["AGENT_ACTED_BEFORE_INIT", "HANDOFF_NOT_RECEIVED"]
+    assert report.violations[1].line == 2
+
+
+def test_unmatched_receipt():
+    report = check_timeline(ndjson(init("a"), init("b", received_from="a")))
+    assert report.first_violation.reason_code == "HANDOFF_RECEIPT_UNMATCHED"
+
+
+def test_trace_count_cross_check():
+    trace = {"execution_summary": {"total_events": 5, "handoffs": 1},
+             "agent_summaries": [{"agent_id": "a", "events_count": 2}]}
+    report = check_timeline(ndjson(init("a"), handoff("a", "b"), init("b", received_from="a")), trace)
+    assert [v.message for v in report.violations] == ["execution_summary.total_events=5, timeline has 3"]
+
+
+def test_many_agents_chain():
+    n = 2000
+    events = [init("agent-0")]
+    for i in range(n):
+        events += [handoff(f"agent-{i}", f"agent-{i + 1}"), init(f"agent-{i + 1}", received_from=f"agent-{i}")]
+    report = check_timeline(ndjson(*events))
+    assert report.ok and report.acyclic
+    assert report.agents == n + 1
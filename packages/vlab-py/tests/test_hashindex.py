@@ -0,0 +1,52 @@
+import os
+
+from mplp_vlab.hashindex import HashIndex, parse_sums
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def make_tree(root):
+    a, b = "a" * 64, "b" * 64
+    write(root / "data/runs/run-x/integrity/sha256sums.txt", f"{a}  timeline/events.ndjson\n{b}  manifest.json\n")
+    write(root / "data/runs/run-x/integrity/pack.sha256", f"{'c' * 64}  pack\n")
+    write(root / "data/runs/run-x/manifest.json", '{"pack_id": "run-x", "scenario_id": "gf-01"}')
+    write(root / "releases/v9.9/MANIFEST.json", '{"runs": [{"run_id": "run-x", "pack_root_hash": "%s"}]}' % ("c" * 64))
+    write(root / "adjudication/run-x/sha256sums.txt", f"{a}  verdict.json\n")
+    return a
+
+
+def test_parse_sums():
+    assert list(parse_sums(f"{'a' * 64}  ./x/y.json\n\nnot a line\n")) == [("a" * 64, "x/y.json")]
+
+
+def test_queries(tmp_path):
+    digest = make_tree(tmp_path)
+    with HashIndex(tmp_path / "idx.sqlite", root=tmp_path) as index:
+        index.update()
+        assert {h["scope"] for h in index.find_digest(digest)} == {"data/runs/run-x", "adjudication/run-x"}
+        assert index.find_digest("ccc")[0]["kind"] == "pack_root"
+        assert [r["release"] for r in index.releases_for_run("run-x")] == ["v9.9"]
+        assert index.locate_pack("run-x")[0]["scope"] == "data/runs/run-x"
+        assert len(index.pack_files("data/runs/run-x")) == 2
+
+
+def test_incremental_update(tmp_path):
+    make_tree(tmp_path)
+    sums = tmp_path / "adjudication/run-x/sha256sums.txt"
+    with HashIndex(tmp_path / "idx.sqlite", root=tmp_path) as index:
+        first = index.update()
+        assert first.ingested == first.scanned == 5
+        assert index.update().unchanged == 5
+
+        write(sums, f"{'d' * 64}  verdict.json\n")
+        os.utime(sums, ns=(1, 1))
+        stats = index.update()
+        assert stats.ingested == 1
+        assert index.find_digest("d" * 64)[0]["file"] == "verdict.json"
+
+        sums.unlink()
+        assert index.update().removed == 1
+        assert index.find_digest("d" * 64) == []
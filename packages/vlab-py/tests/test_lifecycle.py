@@ -0,0 +1,101 @@
+import io
+import json
+
+from mplp_vlab.lifecycle import (
+    EXECUTION,
+    OTHER,
+    TRANSITION_INVALID,
+    TRANSITION_TERMINAL,
+    classify_event,
+    compile_transition_table,
+    main,
+    validate_timeline,
+)
+from mplp_vlab.timeline import find_timeline
+
+
+def ndjson(*events) -> io.BytesIO:
+    return io.BytesIO("".join(json.dumps(e) + "\n" for e in events).encode())
+
+
+def test_classify_event():
+    assert classify_event({"event_type": "lifecycle.transition", "to_state": "Succeeded"}) == TRANSITION_TERMINAL
+    assert classify_event({"type": "lifecycle", "state": "maybe_done"}) == TRANSITION_INVALID
+    assert classify_event({"event": "tool.execute"}) == EXECUTION
+    assert classify_event({"event_type": "agent.init"}) == OTHER
+
+
+def test_pass_fixture(runs_dir):
+    report = validate_timeline(runs_dir / "arb-d2-lifecycle-state-pass-fixture-v0.3" / "trace" / "events.ndjson")
+    assert report.ok
+    assert report.terminal_agents == 1
+
+
+def test_pack_directories_resolve_their_trace(runs_dir, capsys):
+    # pack_root "pack" is not shipped; the run-level timeline/ only holds a placeholder event
+    for name, verdict in (
+        ("arb-d2-lifecycle-state-pass-fixture-v0.3", "PASS"),
+        ("arb-d2-lifecycle-state-fail-fixture-v0.3", "FAIL"),
+    ):
+        pack = runs_dir / name
+        assert find_timeline(pack) == pack / "trace" / "events.ndjson"
+        assert main([str(pack)]) == (0 if verdict == "PASS" else 1)
+        assert json.loads(capsys.readouterr().out)["verdict"] == verdict
+    # pack_root pointing into public/data/runs
+    found = find_timeline(runs_dir / "mcp-d1-budget-pass-01")
+    assert found.resolve() == (runs_dir / ".." / ".." / "public" / "data" / "runs" / "mcp-d1-budget-pass-01" / "pack"
+                               / "timeline" / "events.ndjson").resolve()
+
+
+def test_post_terminal_execution_reports_offset(runs_dir):
+    path = runs_dir / "arb-d2-lifecycle-fail-post-terminal-exec-v0.4" / "trace" / "events.ndjson"
+    report = validate_timeline(path)
+    v = report.first_violation
+    assert v.reason_code == "D2_POST_TERMINAL_EXECUTION_DETECTED"
+    assert v.event_id == "evt-exec-001"
+    with open(path, "rb") as f:
+        f.seek(v.offset)
+        assert json.loads(f.readline())["event_id"] == "evt-exec-001"
+
+
+def test_terminal_state_invalid(runs_dir):
+    report = validate_timeline(runs_dir / "arb-d2-lifecycle-fail-terminal-state-invalid-v0.4" / "trace" / "events.ndjson")
+    assert report.first_violation.clause_id == "CL-D2-02"
+
+
+def test_missing_terminal_reported_at_end(runs_dir):
+    report = validate_timeline(runs_dir / "arb-d2-lifecycle-state-fail-fixture-v0.3" / "trace" / "events.ndjson")
+    assert report.first_violation.reason_code == "D2_TERMINAL_EVENT_MISSING"
+
+
+def test_post_terminal_execution_is_run_wide():
+    # As CL-D2-03 in lib/rulesets: b executing after a terminated is a violation
+    stream = ndjson(
+        {"event_type": "lifecycle.transition", "to_state": "done", "agent_id": "a"},
+        {"event_type": "tool.execute", "agent_id": "b"},
+    )
+    report = validate_timeline(stream)
+    assert report.first_violation.reason_code == "D2_POST_TERMINAL_EXECUTION_DETECTED"
+    assert report.first_violation.agent_id == "b"
+
+
+def test_reversal_is_per_agent():
+    stream = ndjson(
+        {"event_type": "lifecycle.transition", "to_state": "done", "agent_id": "a"},
+        {"event_type": "lifecycle.transition", "to_state": "running", "agent_id": "b"},
+        {"event_type": "lifecycle.transition", "to_state": "running", "agent_id": "a"},
+    )
+    report = validate_timeline(stream, fail_fast=False)
+    assert report.violation_count == 1 and report.first_violation.agent_id == "a"
+    assert report.first_violation.reason_code == "D2_TERMINAL_STATE_REVERSAL_DETECTED"
+
+
+def test_table_follows_ruleset_clauses():
+    # ruleset-1.1 enables CL-D2-01 only
+    table = compile_transition_table("ruleset-1.1")
+    stream = ndjson(
+        {"event_type": "lifecycle.transition", "to_state": "done"},
+        {"event_type": "tool.execute"},
+    )
+    assert table.require_terminal
+    assert validate_timeline(stream, "ruleset-1.1").ok
@@ -0,0 +1,76 @@
+import os
+
+from mplp_vlab.lockmemo import RunnerMemo, main
+
+
+def make_project(root):
+    root.mkdir()
+    (root / "pyproject.toml").write_text('[project]\nname = "p"\n')
+    (root / "uv.lock").write_text("version = 1\n")
+    return root
+
+
+def test_lock_memo_invalidation(tmp_path):
+    project = make_project(tmp_path / "producer")
+    memo = RunnerMemo(tmp_path / "memo.json")
+    calls = []
+
+    def relock():
+        calls.append(1)
+        (project / "uv.lock").write_text(f"version = 1\n# {len(calls)}\n")
+
+    sha, hit = memo.lock_sha256(project, "sha256:img", relock)
+    assert not hit and len(calls) == 1
+    assert memo.lock_sha256(project, "sha256:img", relock) == (sha, True)
+
+    os.utime(project / "uv.lock", ns=(1, 1))  # touched, content unchanged
+    assert memo.lock_sha256(project, "sha256:img", relock) == (sha, True)
+
+    assert not memo.lock_sha256(project, "sha256:other", relock)[1]  # image changed
+    (project / "pyproject.toml").write_text('[project]\nname = "q"\n')
+    assert not memo.lock_sha256(project, "sha256:other", relock)[1]  # pyproject changed
+    (project / "uv.lock").write_text("edited\n")
+    assert not memo.lock_sha256(project, "sha256:other", relock)[1]  # lock edited
+    assert len(calls) == 4
+
+
+def test_fingerprint_memo(tmp_path):
+    memo = RunnerMemo(tmp_path / "memo.json")
+    captured = []
+
+    def capture():
+        captured.append(1)
+        return {"os": "linux", "arch": "x86_64", "runtime_type": "python", "runtime_version": "3.11.7"}
+
+    fp, hit = memo.env_fingerprint("python-3.11", "sha256:img", capture)
+    assert not hit and fp["runtime_type"] == "python"
+    assert memo.env_fingerprint("python-3.11", "sha256:img", capture) == (fp, True)
+    assert not memo.env_fingerprint("python-3.11", "sha256:new", capture)[1]
+    assert not memo.env_fingerprint("python-3.11", "unknown", capture)[1]
+    assert not memo.env_fingerprint("python-3.11", "unknown", capture)[1]
+    assert len(captured) == 4
+
+
+def test_fingerprint_key_covers_command_and_script(tmp_path):
+    memo = RunnerMemo(tmp_path / "memo.json")
+    script = tmp_path / "env-fingerprint.sh"
+    script.write_text("echo '{}'\n")
+    command = ["bash", str(script)]
+
+    def capture():
+        return {"os": "linux"}
+
+    assert not memo.env_fingerprint("r", "sha256:img", capture, command, [script])[1]
+    assert memo.env_fingerprint("r", "sha256:img", capture, command, [script])[1]
+    script.write_text("echo '{\"os\": \"linux\"}'\n")
+    assert not memo.env_fingerprint("r", "sha256:img", capture, command, [script])[1]  # script edited
+    assert not memo.env_fingerprint("r", "sha256:img", capture, [*command, "--runner", "r"], [script])[1]
+
+
+def test_cli_missing_lock_is_an_error(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("VLAB_RUNNER_MEMO", str(tmp_path / "memo.json"))
+    project = make_project(tmp_path / "producer")
+    (project / "uv.lock").unlink()
+    assert main(["lock", "--project", str(project), "--image-digest", "sha256:img"]) == 2
+    err = capsys.readouterr().err
+    assert err.startswith("error:") and "uv.lock" in err
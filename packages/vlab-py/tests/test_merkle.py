@@ -0,0 +1,80 @@
+import json
+import shutil
+
+import pytest
+
+from mplp_vlab.merkle import check_proof, main, merkle_root, pack_entries, prove, read_merkle_root
+from mplp_vlab.packhash import SumsEntry, sha256_bytes
+from mplp_vlab.seal import seal_pack
+from mplp_vlab.verify import full_verify
+
+FILES = {
+    "manifest.json": b"{}",
+    "artifacts/context.json": b'{"c": 1}',
+    "artifacts/plan.json": b'{"p": 1}',
+    "artifacts/trace.json": b'{"t": 1}',
+    "artifacts/sub/extra.txt": b"x",
+    "timeline/events.ndjson": b'{"a": 1}\n',
+}
+
+
+@pytest.fixture
+def pack(tmp_path, monkeypatch):
+    monkeypatch.setenv("VLAB_RECEIPTS_DIR", str(tmp_path / "receipts"))
+    monkeypatch.setenv("VLAB_RECEIPT_KEY", str(tmp_path / "receipt.key"))
+    root = tmp_path / "pack"
+    for rel, data in FILES.items():
+        (root / rel).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel).write_bytes(data)
+    flat = seal_pack(root, merkle=True)
+    assert (root / "integrity" / "pack.sha256").read_text().startswith(flat)
+    return root
+
+
+def test_every_file_and_dir_proves(pack):
+    entries = pack_entries(pack)
+    root = read_merkle_root(pack)
+    assert root == merkle_root(entries)
+    for target in [*FILES, "artifacts", "artifacts/sub/", "timeline"]:
+        proof = prove(entries, target)
+        assert proof["root"] == root and check_proof(proof)
+        assert check_proof(json.loads(json.dumps(proof)), pack / target, root)
+
+
+def test_tampering_detected(pack, tmp_path):
+    entries = pack_entries(pack)
+    proof = prove(entries, "artifacts/plan.json")
+    (tmp_path / "plan.json").write_bytes(b'{"p": 2}')
+    assert not check_proof(proof, tmp_path / "plan.json")
+    assert not check_proof(proof, root="0" * 64)
+
+    # subset check: a local copy of artifacts/ with one file changed
+    copy = tmp_path / "artifacts"
+    shutil.copytree(pack / "artifacts", copy)
+    dir_proof = prove(entries, "artifacts/")
+    assert check_proof(dir_proof, copy)
+    (copy / "sub" / "extra.txt").write_bytes(b"y")
+    assert not check_proof(dir_proof, copy)
+
+
+def test_structure_is_bound():
+    a = [SumsEntry("a/x", sha256_bytes(b"1")), SumsEntry("b/x", sha256_bytes(b"2"))]
+    moved = [SumsEntry("a/x", sha256_bytes(b"2")), SumsEntry("b/x", sha256_bytes(b"1"))]
+    flat = [SumsEntry("a_x", sha256_bytes(b"1")), SumsEntry("b/x", sha256_bytes(b"2"))]
+    assert len({merkle_root(a), merkle_root(moved), merkle_root(flat)}) == 3
+    with pytest.raises(KeyError):
+        prove(a, "c/x")
+
+
+def test_verify_checks_merkle_root(pack):
+    assert full_verify(pack, write=False).merkle_ok is True
+    (pack / "integrity" / "merkle.sha256").write_text("0" * 64 + "  merkle\n")
+    result = full_verify(pack, write=False)
+    assert result.root_ok and result.merkle_ok is False and not result.ok
+
+
+def test_cli_roundtrip(pack, tmp_path, capsys):
+    out = tmp_path / "proof.json"
+    assert main(["prove", str(pack), "artifacts/trace.json", "--out", str(out)]) == 0
+    assert main(["check", str(out), "--target", str(pack / "artifacts" / "trace.json"), "--root", read_merkle_root(pack)]) == 0
+    assert "PASS file artifacts/trace.json" in capsys.readouterr().out
@@ -0,0 +1,64 @@
+import asyncio
+
+from mplp_vlab.multiproduce import load_producer, plan_runs, produce_runs
+from mplp_vlab.verify import full_verify
+
+STAND_IN = '''
+import asyncio, json
+
+SEALED_FILES = ("artifacts/trace.json", "timeline/events.ndjson")
+in_flight = 0
+peak = 0
+
+class BudgetExceeded(Exception):
+    pass
+
+def build_pack(scenario_id, run_id, perf=None, tracer=None):
+    raise AssertionError("async path expected")
+
+async def build_pack_async(scenario_id, run_id, perf=None, tracer=None):
+    global in_flight, peak
+    in_flight += 1
+    peak = max(peak, in_flight)
+    await asyncio.sleep(0.02)  # network-shaped model call
+    in_flight -= 1
+    if run_id.endswith("-003"):
+        raise BudgetExceeded("D1 ceiling")
+    return {
+        "artifacts/trace.json": json.dumps({"run_id": run_id}),
+        "timeline/events.ndjson": json.dumps({"event": "RUN_STARTED"}) + "\\n",
+        "manifest.json": json.dumps({"pack_id": run_id}),
+    }
+'''
+
+
+def test_bounded_runs_each_own_out_dir(tmp_path):
+    script = tmp_path / "producer" / "src" / "produce-real.py"
+    script.parent.mkdir(parents=True)
+    script.write_text(STAND_IN)
+    producer = load_producer(script)
+    runs = plan_runs(tmp_path / "out", 10, "stand-in")
+
+    outcomes = asyncio.run(produce_runs(producer, runs, concurrency=4, io_workers=2))
+
+    assert producer.peak == 4
+    assert [o.run_id for o in outcomes] == [r.run_id for r in runs]
+    aborted = outcomes[2]
+    assert aborted.status == "aborted" and not (runs[2].out_dir / "manifest.json").exists()
+    for spec, outcome in zip(runs, outcomes):
+        if outcome is aborted:
+            continue
+        assert outcome.status == "ok"
+        assert (spec.out_dir / "manifest.json").read_text() == '{"pack_id": "%s"}' % spec.run_id
+        result = full_verify(spec.out_dir, workers=1, write=False)
+        assert result.files == 2 and not (result.missing or result.mismatched)
+        assert set(outcome.files) == set(producer.SEALED_FILES)
+
+
+def test_magentic_one_in_process(tmp_path):
+    producer = load_producer("magentic_one")
+    runs = plan_runs(tmp_path, 3, "m1")
+    outcomes = asyncio.run(produce_runs(producer, runs, concurrency=3))
+    assert all(o.status == "ok" for o in outcomes), outcomes
+    traces = {(r.out_dir / "artifacts" / "trace.json").read_text() for r in runs}
+    assert len(traces) == 1 and '"realtime"' in traces.pop()
@@ -0,0 +1,68 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from mplp_vlab.perf import PERF_PATH, PerfRecorder, find_reports, load_report, summarize
+from mplp_vlab.produce import producers_dir
+from mplp_vlab.verify import full_verify
+
+
+def test_phases_and_summary(tmp_path):
+    for i, substrate in enumerate(("crewai", "crewai", "autogen")):
+        perf = PerfRecorder("produce-real.py", substrate, f"run-{i}")
+        with perf.phase("hashing"):
+            sum(range(10000))
+        perf.add("crew_kickoff", 5.0 + i, 1.0, "thread", crew_index=0)
+        perf.write(tmp_path / f"pack{i}")
+
+    report = load_report(tmp_path / "pack0")
+    assert [p["name"] for p in report["phases"]] == ["hashing", "crew_kickoff"]
+    assert report["phases"][1]["cpu_clock"] == "thread" and report["phases"][1]["crew_index"] == 0
+    assert report["total"]["wall_ms"] >= report["phases"][0]["wall_ms"]
+
+    summary = summarize([load_report(p) for p in find_reports([tmp_path])])
+    assert summary["crewai"]["crew_kickoff"] == {
+        "runs": 2, "wall_ms_median": 5.5, "wall_ms_max": 6.0, "cpu_ms_median": 1.0,
+        "peak_rss_kb_max": summary["crewai"]["crew_kickoff"]["peak_rss_kb_max"],
+    }
+    assert summary["autogen"]["total"]["runs"] == 1
+
+
+def test_report_is_never_sealed(tmp_path, monkeypatch):
+    monkeypatch.setenv("VLAB_RECEIPTS_DIR", str(tmp_path / "receipts"))
+    monkeypatch.setenv("VLAB_RECEIPT_KEY", str(tmp_path / "receipt.key"))
+    pack = tmp_path / "pack"
+    pack.mkdir()
+    (pack / "manifest.json").write_text("{}")
+    (pack / "integrity").mkdir()
+    PerfRecorder("produce-real.py", "crewai").write(pack)
+    subprocess.run([sys.executable, "-m", "mplp_vlab.seal", str(pack)], check=True, env=_env())
+    root = (pack / "integrity" / "pack.sha256").read_text()
+    assert PERF_PATH not in (pack / "integrity" / "sha256sums.txt").read_text()
+    assert full_verify(pack, write=False).ok
+
+    # Rewriting the report and resealing leaves the root alone
+    PerfRecorder("produce-real.py", "crewai", "other-run").write(pack)
+    subprocess.run([sys.executable, "-m", "mplp_vlab.seal", str(pack)], check=True, env=_env())
+    assert (pack / "integrity" / "pack.sha256").read_text() == root
+    assert full_verify(pack, write=False).ok
+
+
+def test_producer_writes_report(tmp_path):
+    out = tmp_path / "m1"
+    env = dict(_env(), OUT_DIR=str(out), RUN_ID="m1-perf")
+    script = producers_dir() / "magentic_one" / "src" / "produce-real.py"
+    subprocess.run([sys.executable, str(script)], check=True, env=env, stdout=subprocess.DEVNULL)
+    report = json.loads((out / PERF_PATH).read_text())
+    assert report["run_id"] == "m1-perf" and report["substrate"] == "magentic_one"
+    assert [p["name"] for p in report["phases"]] == [
+        "framework_import", "agent_construction", "orchestration_run",
+        "artifact_writes", "timeline_flush", "hashing", "manifest_write",
+    ]
+
+
+def _env():
+    import mplp_vlab
+    return dict(os.environ, PYTHONPATH=str(Path(mplp_vlab.__file__).parents[1]))
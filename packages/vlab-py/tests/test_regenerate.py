@@ -0,0 +1,96 @@
+import json
+import os
+import sys
+
+import pytest
+
+from mplp_vlab import regenerate as regen
+from mplp_vlab.regenerate import env_key, main, regenerate, requirement_lines
+
+GENERATOR = """
+import argparse, hashlib, json, os, random, sys
+parser = argparse.ArgumentParser()
+parser.add_argument("--out", default="pack")
+out = parser.parse_args().out
+os.makedirs(os.path.join(out, "artifacts"), exist_ok=True)
+os.makedirs(os.path.join(out, "integrity"), exist_ok=True)
+body = json.dumps({{"substrate": {substrate!r}, "noise": {noise}}})
+with open(os.path.join(out, "artifacts", "plan.json"), "w") as f:
+    f.write(body)
+with open(os.path.join(out, "manifest.json"), "w") as f:
+    json.dump({{"pack_id": {substrate!r}, "scenario_id": "gf-01", "substrate": {substrate!r}}}, f)
+with open(os.path.join(out, "integrity", "sha256sums.txt"), "w") as f:
+    f.write(hashlib.sha256(body.encode()).hexdigest() + "  artifacts/plan.json\\n")
+"""
+
+
+@pytest.fixture
+def vectors(tmp_path, monkeypatch):
+    monkeypatch.setenv("VLAB_ROOT", str(tmp_path))
+    monkeypatch.setenv("VLAB_GF01_ENV_DIR", str(tmp_path / "envs"))
+    base = tmp_path / "test-vectors" / "cross-substrate" / "gf-01"
+    for substrate, noise, requirements in (
+        ("alpha", "0", "# pure Python\n"),
+        ("beta", "random.random()", None),
+        ("gamma", "1", "# pinned\nsomepkg==1.0  # comment\n\n"),
+    ):
+        (base / substrate).mkdir(parents=True)
+        (base / substrate / "generate_ma_pack.py").write_text(GENERATOR.format(substrate=substrate, noise=noise))
+        if requirements is not None:
+            (base / substrate / "requirements_ma.txt").write_text(requirements)
+    (base / "alpha" / "generate_pack.py").write_text(GENERATOR.format(substrate="alpha-single", noise="0"))
+    return base
+
+
+@pytest.fixture
+def fake_envs(monkeypatch):
+    created = []
+
+    def create(venv, requirements):
+        (venv / "bin").mkdir(parents=True)
+        os.symlink(sys.executable, venv / "bin" / "python")
+        (venv / regen.ENV_MARKER).write_text(json.dumps(requirements))
+        created.append(requirements)
+
+    monkeypatch.setattr(regen, "_create_env", create)
+    return created
+
+
+def test_requirements_and_env_keys(vectors):
+    assert requirement_lines(vectors / "gamma" / "requirements_ma.txt") == ["somepkg==1.0"]
+    assert requirement_lines(vectors / "alpha" / "requirements_ma.txt") == []
+    assert env_key([]) is None
+    assert env_key(["b", "a"]) != env_key(["a"]) and len(env_key(["a"])) == 16
+
+
+def test_regenerate_checks_determinism_and_caches_envs(vectors, fake_envs, tmp_path):
+    report = regenerate(reps=3, out_root=tmp_path / "out")
+    jobs = {f"{j['substrate']}/{j['target']}": j for j in report["jobs"]}
+    assert set(jobs) == {f"{s}/run{i}" for s in ("alpha", "beta", "gamma") for i in (1, 2, 3)} | {"alpha/pack"}
+    assert all(j["ok"] for j in jobs.values()) and report["failed"] == []
+    assert report["determinism"] == {"alpha": True, "beta": False, "gamma": True}
+    assert not report["deterministic"]
+    assert report["equivalence"]["equivalence_type"] == "cross_substrate"
+    assert (tmp_path / "out" / "alpha" / "pack" / "manifest.json").is_file()
+    assert not list((tmp_path / "out" / "alpha").glob(".*regen*"))  # staging dirs cleaned up
+    # one venv for gamma's three runs, created once and then reused
+    assert fake_envs == [["somepkg==1.0"]]
+    assert [e["created"] for e in report["envs"]] == [True]
+    assert jobs["gamma/run1"]["env_key"] == report["envs"][0]["key"] and jobs["alpha/run1"]["env_key"] is None
+
+    again = regenerate(["gamma"], reps=1, out_root=tmp_path / "out")
+    assert [e["created"] for e in again["envs"]] == [False] and len(fake_envs) == 1
+
+
+def test_in_place_failures_keep_previous_vectors(vectors, fake_envs, capsys):
+    assert main(["--substrates", "alpha,gamma", "--no-single", "--host-python"]) == 0
+    previous = (vectors / "alpha" / "run1" / "artifacts" / "plan.json").read_text()
+    assert regenerate(["alpha"], single=False)["changed"] == []
+
+    (vectors / "alpha" / "generate_ma_pack.py").write_text("raise SystemExit(3)")
+    report = regenerate(["alpha"], single=False)
+    assert report["failed"] == ["alpha/run1", "alpha/run2"]
+    assert report["determinism"] == {} and report["deterministic"]  # failed, not nondeterministic
+    assert (vectors / "alpha" / "run1" / "artifacts" / "plan.json").read_text() == previous
+    assert main(["--substrates", "nope"]) == 2
+    assert "error:" in capsys.readouterr().err
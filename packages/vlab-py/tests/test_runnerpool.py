@@ -0,0 +1,78 @@
+import json
+import shutil
+import zipfile
+
+import pytest
+
+from mplp_vlab.runnerpool import RunnerPool, RunnerUnavailableError, project_key
+
+pytestmark = pytest.mark.skipif(shutil.which("python3.11") is None, reason="python3.11 not on PATH")
+
+
+def test_pool_reuses_workers_and_stamps_meta(tmp_path):
+    (tmp_path / "run-a").mkdir()
+    (tmp_path / "run-a" / "manifest.json").write_text('{"pack_id": "run-a"}')
+    cmd = 'printf "%s" "$RUN_ID" > "$OUT_DIR/out.txt"; test -n "$VIRTUAL_ENV"'
+    with RunnerPool(size=2, cache_dir=tmp_path / "cache", with_pip=False) as pool:
+        pids = {w.pid for w in pool.workers}
+        futures = [pool.submit(cmd, tmp_path / f"run-{x}") for x in "abcd"]
+        results = [f.result() for f in futures]
+        assert {w.pid for w in pool.workers} == pids
+
+    assert all(r.ok for r in results)
+    assert {r.worker_pid for r in results} <= pids
+    assert (tmp_path / "run-c" / "out.txt").read_text() == "run-c"
+
+    meta = json.loads((tmp_path / "run-a" / "reports" / "runner.meta.json").read_text())
+    assert meta["runner_id"] == "python-3.11"
+    assert list(meta["environment_fingerprint"]) == ["os", "arch", "runtime_type", "runtime_version"]
+    assert meta["environment_fingerprint"]["runtime_version"].startswith("3.11.")
+    manifest = json.loads((tmp_path / "run-a" / "manifest.json").read_text())
+    assert manifest["env_ref"]["image_digest"] == meta["image_digest"]
+    sums = (tmp_path / "run-a" / "integrity" / "sha256sums.txt").read_text()
+    assert "  out.txt\n" in sums and "  reports/runner.meta.json\n" in sums
+
+
+def test_failing_run_keeps_worker(tmp_path):
+    with RunnerPool(size=1, cache_dir=tmp_path / "cache", with_pip=False) as pool:
+        failed = pool.run("echo boom; exit 4", tmp_path / "run-x", seal=False)
+        assert failed.returncode == 4 and "boom" in failed.output_tail
+        guarded = pool.run('echo "{}" > "$OUT_DIR/manifest.json"; exit 3', tmp_path / "run-g")
+        assert guarded.returncode == 3
+        assert (tmp_path / "run-g" / "manifest.json").read_text() == "{}\n"  # no env_ref patched in
+        written = {p.relative_to(tmp_path / "run-g").as_posix() for p in (tmp_path / "run-g").rglob("*") if p.is_file()}
+        assert written == {"manifest.json"}  # no sums, root or runner meta
+        assert pool.run("true", tmp_path / "run-y").ok
+        assert failed.worker_pid == pool.workers[0].pid
+
+
+def _wheel(path, name):
+    dist = f"{name}-0.1.dist-info"
+    with zipfile.ZipFile(path, "w") as whl:
+        whl.writestr(f"{name}.py", "VALUE = 42\n")
+        whl.writestr(f"{dist}/METADATA", f"Metadata-Version: 2.1\nName: {name}\nVersion: 0.1\n")
+        whl.writestr(f"{dist}/WHEEL", "Wheel-Version: 1.0\nGenerator: test\nRoot-Is-Purelib: true\nTag: py3-none-any\n")
+        whl.writestr(f"{dist}/RECORD", "")
+
+
+def test_project_dependencies_are_installed_once(tmp_path):
+    wheel = tmp_path / "vlabdep-0.1-py3-none-any.whl"
+    _wheel(wheel, "vlabdep")
+    project = tmp_path / "producer"
+    project.mkdir()
+    (project / "pyproject.toml").write_text(
+        f'[project]\nname = "producer"\nversion = "0"\ndependencies = ["vlabdep @ {wheel.as_uri()}"]\n'
+    )
+    cmd = 'python -c "import vlabdep; print(vlabdep.VALUE)" > "$OUT_DIR/out.txt"'
+    with RunnerPool(size=1, cache_dir=tmp_path / "cache", isolate=False, project=project) as pool:
+        assert pool.run(cmd, tmp_path / "run-a").ok
+    assert (tmp_path / "run-a" / "out.txt").read_text() == "42\n"
+    venv = tmp_path / "cache" / "python-3.11" / f"producer-{project_key(project)}" / "worker-0"
+    marker = json.loads((venv / ".vlab-deps.json").read_text())
+    assert marker["key"] == project_key(project)
+
+    (venv / "bin" / "pip").unlink()  # a second pool reuses the venv instead of reinstalling
+    with RunnerPool(size=1, cache_dir=tmp_path / "cache", isolate=False, project=project) as pool:
+        assert pool.run(cmd, tmp_path / "run-b").ok
+    with pytest.raises(RunnerUnavailableError, match="no pyproject.toml"):
+        RunnerPool(size=1, cache_dir=tmp_path / "cache", project=tmp_path)
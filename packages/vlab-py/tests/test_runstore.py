@@ -0,0 +1,95 @@
+import json
+import os
+
+import pytest
+
+from mplp_vlab.batch import plan_cells
+from mplp_vlab.batchverify import discover
+from mplp_vlab.runstore import (
+    MARKER,
+    RunStoreError,
+    bucket,
+    iter_runs,
+    layout_of,
+    main,
+    migrate,
+    real_run_dir,
+    resolve_run,
+    run_path,
+)
+from mplp_vlab.verify import expand_targets
+
+
+@pytest.fixture
+def root(tmp_path, monkeypatch):
+    monkeypatch.setenv("VLAB_ROOT", str(tmp_path))
+    runs = tmp_path / "data" / "runs"
+    for run_id in ("run-a", "run-b", "run-c"):
+        (runs / run_id / "timeline").mkdir(parents=True)
+        (runs / run_id / "manifest.json").write_text(json.dumps({"run_id": run_id}))
+        (runs / run_id / "timeline" / "events.ndjson").write_text("{}\n")
+        (runs / run_id / "sha256sums.txt").write_text("")
+    (runs / "v2" / "real" / "crewai").mkdir(parents=True)
+    return runs
+
+
+def test_flat_by_default_and_bucket_paths(root):
+    assert layout_of(root).kind == "flat"
+    assert run_path(root, "run-a") == root / "run-a"
+    assert bucket("run-a") == bucket("run-a") and [len(b) for b in bucket("run-a", 3, 1)] == [1, 1, 1]
+    for bad in ("", "..", "a/b", ".hidden", "v2"):
+        with pytest.raises(RunStoreError):
+            run_path(root, bad)
+
+
+def test_migrate_with_symlinks_and_back(root):
+    report = migrate(root, symlinks=True)
+    assert (report["moved"], report["linked"], report["conflicts"]) == (3, 3, [])
+    path = run_path(root, "run-a")
+    assert path == root.joinpath(*bucket("run-a"), "run-a") and path.is_dir()
+    assert os.readlink(root / "run-a") == str(path.relative_to(root))
+    assert (root / "run-a" / "manifest.json").is_file()  # flat readers still work
+    assert sorted(p.name for p in iter_runs(root)) == ["run-a", "run-b", "run-c"]
+    assert (root / "v2" / "real").is_dir()  # not a run, not moved
+    assert migrate(root, symlinks=True)["moved"] == 0  # idempotent
+    assert sorted(os.path.basename(j.path) for j in discover(root)) == ["run-a", "run-b", "run-c"]
+    assert sorted(p.name for p in expand_targets([str(root)])) == ["run-a", "run-b", "run-c"]
+
+    # New runs land in buckets; plan_cells follows the layout
+    cell = plan_cells("cmd", ["s"], ["x"], 1, root)[0]
+    assert cell.out_dir == str(root.joinpath(*bucket(cell.run_id), cell.run_id))
+    with pytest.raises(RunStoreError, match="already fan-out"):
+        migrate(root, depth=3)
+
+    report = migrate(root, to="flat")
+    assert (report["moved"], report["unlinked"]) == (3, 3)
+    assert not (root / "run-a").is_symlink() and (root / "run-a" / "manifest.json").is_file()
+    assert sorted(p.name for p in root.iterdir()) == ["run-a", "run-b", "run-c", "v2"]
+
+
+def test_interrupted_migration_still_resolves(root):
+    report = migrate(root, dry_run=True)
+    assert report["moved"] == 3 and layout_of(root).kind == "flat"
+    (root / MARKER).write_text(json.dumps({"kind": "fanout", "depth": 2, "width": 2}))
+    migrate(root)  # clears the layout cache; nothing left flat afterwards
+    os.rename(run_path(root, "run-b"), root / "run-b")  # as if the move had not happened yet
+    assert resolve_run(root, "run-b") == root / "run-b"
+    assert resolve_run(root, "run-a") == run_path(root, "run-a")
+    assert resolve_run(root, "nope") is None
+    assert sorted(p.name for p in iter_runs(root)) == ["run-a", "run-b", "run-c"]
+    (run_path(root, "run-b")).mkdir(parents=True)
+    assert migrate(root)["conflicts"] == ["run-b"]
+
+
+def test_cli(root, capsys):
+    assert main(["migrate", "--all", "--depth", "1", "--width", "3"]) == 0
+    assert "moved 3 run(s)" in capsys.readouterr().out
+    assert main(["path", "run-a", "--existing"]) == 0
+    assert capsys.readouterr().out.strip() == str(root / bucket("run-a", 1, 3)[0] / "run-a")
+    assert main(["path", "ghost", "--existing"]) == 1
+    assert main(["path", "r1", "--real", "crewai"]) == 0
+    assert capsys.readouterr().out.strip() == str(real_run_dir("crewai", "r1"))
+    assert layout_of(root / "v2" / "real" / "crewai").to_dict() == {"kind": "fanout", "depth": 1, "width": 3}
+    assert main(["migrate"]) == 2
+    assert main(["path", "a/b"]) == 2
+    assert "error:" in capsys.readouterr().err
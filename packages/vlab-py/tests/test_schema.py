@@ -0,0 +1,109 @@
+import io
+import json
+
+import pytest
+
+from mplp_vlab.paths import repo_root
+from mplp_vlab.schema import (
+    SchemaCompileError,
+    SchemaCompiler,
+    get_validator,
+    main,
+    validate_documents,
+    validate_file,
+    validate_ndjson,
+    validate_on_write,
+    validate_tree,
+)
+
+EVENT_CORE = "lib/schemas/events/mplp-event-core.schema.json"
+
+
+def test_module_examples_with_relative_refs():
+    examples = repo_root() / "lib" / "schemas" / "examples"
+    for module in ("context", "plan", "trace"):
+        instance = json.loads((examples / f"{module}.with-events.json").read_text())
+        assert get_validator(f"lib/schemas/mplp-{module}.schema.json")(instance) == []
+
+
+def test_validator_is_cached():
+    assert get_validator(EVENT_CORE) is get_validator(EVENT_CORE)
+
+
+def test_violations_carry_paths():
+    errors = get_validator("producers/contract/producer-run-manifest.schema.json")({"substrate": 3})
+    keywords = {(e.path, e.keyword) for e in errors}
+    assert ("/", "required") in keywords
+    assert ("/substrate", "type") in keywords
+
+
+def test_recursive_ref(tmp_path):
+    (tmp_path / "tree.json").write_text(json.dumps({
+        "type": "object",
+        "properties": {"children": {"type": "array", "items": {"$ref": "#"}}, "name": {"type": "string"}},
+    }))
+    node = SchemaCompiler(tmp_path).compile_ref(tmp_path / "tree.json")
+    errs: list = []
+    node({"children": [{"children": [{"name": 1}]}]}, "", errs)
+    assert [e.path for e in errs] == ["/children/0/children/0/name"]
+
+
+def test_ndjson_stream_reports_lines():
+    example = {"event_id": "550e8400-e29b-41d4-a716-446655440000", "event_type": "stage_completed",
+               "event_family": "pipeline_stage", "timestamp": "2026-01-01T00:00:00Z"}
+    stream = io.BytesIO((json.dumps(example) + "\n" + json.dumps({"event_id": 1}) + "\n").encode())
+    lines, violations = validate_ndjson(stream, EVENT_CORE)
+    assert lines == 2
+    assert violations and {v.line for v in violations} == {2}
+
+
+def test_tree_pool_matches_serial(runs_dir):
+    serial = validate_tree([runs_dir])
+    pooled = validate_tree([runs_dir], workers=2, chunk_size=8)
+    assert len(serial) > 8
+    assert [(r.file, r.ok) for r in serial] == [(r.file, r.ok) for r in pooled]
+
+
+def test_contract_rules_only_apply_to_producer_output(tmp_path):
+    for name in ("fixture", "produced"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "bundle.manifest.json").write_text(json.dumps({"run_id": "Not_Valid"}))
+        (tmp_path / name / "evidence_pointers.json").write_text(json.dumps({"pointers": []}))
+    (tmp_path / "produced" / "producer-run.manifest.json").write_text("{}")
+    results = validate_tree([tmp_path])
+    assert {r.file.split("/")[-2] for r in results} == {"produced"}
+    assert len(results) == 3 and not any(r.ok for r in results)
+
+
+def test_broken_schema_is_reported_once(tmp_path, capsys):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    for d in ("a", "b"):
+        (tmp_path / d / "doc.json").write_text("{}")
+    with pytest.raises(SchemaCompileError):
+        validate_file(str(tmp_path / "a" / "doc.json"), "no/such.schema.json")
+    with pytest.raises(SchemaCompileError):
+        validate_tree([tmp_path], (("doc.json", "no/such.schema.json"),))
+    assert main([str(tmp_path), "--rule", "doc.json=no/such.schema.json"]) == 2
+    captured = capsys.readouterr()
+    assert captured.err.count("cannot load schema") == 1 and "FAIL" not in captured.out
+
+
+def test_in_memory_pack_and_write_hook(monkeypatch, capsys):
+    example = json.loads((repo_root() / "lib" / "schemas" / "examples" / "context.with-events.json").read_text())
+    files = {
+        "artifacts/context.json": json.dumps(example),
+        "artifacts/trace.json": json.dumps({"verdict": "PASS"}),
+        "bundle.manifest.json": "{}",  # no producer-run.manifest.json next to it: not claimed
+        "timeline/events.ndjson": json.dumps({"event_id": 1}) + "\n",
+    }
+    results = validate_documents(files)
+    assert [(r.file, r.ok) for r in results] == [("artifacts/context.json", True), ("artifacts/trace.json", False)]
+    timeline = validate_documents(files, (("timeline/*.ndjson", EVENT_CORE),))
+    assert timeline[0].violations[0].line == 1
+
+    assert validate_on_write(files) == []  # off by default
+    assert capsys.readouterr().err == ""
+    monkeypatch.setenv("VLAB_VALIDATE", "1")
+    assert [r.file for r in validate_on_write(files)] == ["artifacts/trace.json"]
+    assert "warning: schema: artifacts/trace.json" in capsys.readouterr().err
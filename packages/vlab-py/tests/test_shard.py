@@ -0,0 +1,108 @@
+import json
+import sys
+
+import pytest
+
+from mplp_vlab.batch import plan_cells
+from mplp_vlab.packhash import read_declared_root
+from mplp_vlab.shard import ShardError, main, matrix_scenarios, merge, parse_shard, registry_substrates, run_shard, shard_cells
+
+PRODUCER = """
+import json, os, pathlib
+out = pathlib.Path(os.environ["OUT_DIR"])
+(out / "timeline").mkdir(parents=True)
+(out / "manifest.json").write_text(json.dumps({"run_id": os.environ["RUN_ID"]}))
+(out / "timeline" / "events.ndjson").write_text('{"event": "STEP"}\\n')
+"""
+
+REGISTRY = """
+version: "2.0.0"
+substrates:
+  - substrate_id: "alpha"
+  - substrate_id: "beta"
+scenarios:
+  - scenario_id: "d1"
+"""
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    monkeypatch.setenv("VLAB_ROOT", str(tmp_path))
+    monkeypatch.setenv("VLAB_RECEIPTS_DIR", str(tmp_path / "receipts"))
+    monkeypatch.setenv("VLAB_RECEIPT_KEY", str(tmp_path / "receipt.key"))
+    (tmp_path / "producers" / "real" / "_registry").mkdir(parents=True)
+    (tmp_path / "producers" / "real" / "_registry" / "substrates.v2.yaml").write_text(REGISTRY)
+    (tmp_path / "data" / "scenarios").mkdir(parents=True)
+    for name in ("d1-pass-scenario", "d2-fail-scenario"):
+        (tmp_path / "data" / "scenarios" / f"{name}.yaml").write_text("{}\n")
+    (tmp_path / "producer.py").write_text(PRODUCER)
+    return tmp_path
+
+
+def _run(repo, shard, **kwargs):
+    kwargs.setdefault("host", "h1")
+    return run_shard(shard, repo / "shared", "cmd", reps=3, cmd=f"{sys.executable} {repo / 'producer.py'}", **kwargs)
+
+
+def test_shards_partition_the_matrix(repo):
+    assert registry_substrates() == ["alpha", "beta"]
+    assert matrix_scenarios() == ["d1-pass-scenario", "d2-fail-scenario"]
+    assert parse_shard("2/4") == (2, 4)
+    for bad in ("0/4", "5/4", "x", "1/2/3"):
+        with pytest.raises(ShardError):
+            parse_shard(bad)
+    cells = plan_cells("cmd", ["a", "b", "c"], ["x", "y"], 5, "/o")
+    shards = [shard_cells(cells, i, 4) for i in range(1, 5)]
+    ids = [c.cell_id for shard in shards for c in shard]
+    assert sorted(ids) == sorted(c.cell_id for c in cells) and len(set(ids)) == len(ids)
+    assert {len(s) for s in shards} == {7, 8}
+    assert [c.cell_id for c in shard_cells(list(reversed(cells)), 2, 4)] == [c.cell_id for c in shards[1]]
+
+
+def test_run_and_merge(repo):
+    summaries = [_run(repo, f"{i}/3", host=f"h{i}") for i in (1, 2, 3)]
+    assert [s["cells"] for s in summaries] == [4, 4, 4] and all(s["verified"] == 4 for s in summaries)
+    assert summaries[0]["matrix"]["cells"] == 12
+    sealed = read_declared_root(repo / "shared" / "runs" / "alpha-d1-pass-scenario-r0001")
+    assert sealed.hash == summaries[0]["results"][0]["root"]
+
+    index = merge(repo / "shared")
+    assert index["complete"] and len(index["cells"]) == 12
+    assert json.loads((repo / "shared" / "index.json").read_text())["fingerprint"] == summaries[0]["fingerprint"]
+    assert {c["shard"] for c in index["cells"]} == {"1/3", "2/3", "3/3"}
+
+    # Resume on the claiming host skips everything; another host is refused
+    assert _run(repo, "2/3", host="h2")["skipped"] == 4
+    with pytest.raises(ShardError, match="claimed by h2"):
+        _run(repo, "2/3", host="h9")
+    assert _run(repo, "2/3", host="h9", force=True)["skipped"] == 4
+
+
+def test_merge_detects_gaps_and_duplicates(repo, capsys):
+    for i in (1, 2):
+        _run(repo, f"{i}/3")
+    index = merge(repo / "shared")
+    assert index["missing_shards"] == ["3/3"] and len(index["gaps"]) == 4 and not index["complete"]
+
+    _run(repo, "3/3")
+    shards = repo / "shared" / "shards"
+    first = json.loads((shards / "shard-0001-of-0003.json").read_text())
+    third = json.loads((shards / "shard-0003-of-0003.json").read_text())
+    third["results"].append(first["results"][0])
+    lost = third["results"].pop(0)
+    (shards / "shard-0003-of-0003.json").write_text(json.dumps(third))
+    index = merge(repo / "shared")
+    assert index["duplicates"] == [{"cell_id": first["results"][0]["cell_id"], "shards": ["1/3", "3/3"], "roots_agree": True}]
+    assert index["gaps"] == [lost["cell_id"]]
+
+    # A summary planned against another matrix is not merged
+    _run(repo, "1/1", host="h2", scenarios=["d1-pass-scenario"])
+    index = merge(repo / "shared")
+    assert index["mismatched"] == ["shard-0001-of-0001.json"] and index["shards"] == 3
+
+    assert main(["merge", "--shared", str(repo / "shared")]) == 1
+    out = capsys.readouterr().out
+    assert "duplicate:" in out and "INCOMPLETE" in out
+    assert main(["merge", "--shared", str(repo / "nowhere")]) == 2
+    assert main(["run", "--shard", "1/2", "--shared", str(repo / "s"), "--kind", "cmd"]) == 2
+    assert "error:" in capsys.readouterr().err
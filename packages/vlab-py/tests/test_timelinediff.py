@@ -0,0 +1,89 @@
+import json
+
+from mplp_vlab import timelinediff
+from mplp_vlab.blocktimeline import write_timeline
+from mplp_vlab.packhash import sha256_bytes
+from mplp_vlab.timelinediff import diff_timelines, json_deltas, main
+
+
+def _write(path, events):
+    data = "".join(json.dumps(e) + "\n" for e in events).encode()
+    path.write_bytes(data)
+    return data
+
+
+def _events(n):
+    return [{"event_id": f"evt-{i:05d}", "type": "step", "ts": f"t{i}", "payload": {"i": i, "tags": ["a"]}} for i in range(n)]
+
+
+def test_identical_fast_exit(tmp_path, monkeypatch):
+    monkeypatch.setattr(timelinediff, "CHUNK_SIZE", 64)
+    data = _write(tmp_path / "a.ndjson", _events(300))
+    write_timeline(tmp_path / "b.ndjson", data, fmt="blocks")
+    monkeypatch.setattr(timelinediff, "parse_line", None)  # identical streams never parse
+    diff = diff_timelines(tmp_path / "a.ndjson", tmp_path / "b.ndjson.zb")
+    assert diff.identical and diff.equivalent and diff.common_prefix_lines == 300
+    assert diff.left_sha256 == diff.right_sha256 == sha256_bytes(data)
+
+
+def test_aligned_by_event_id(tmp_path, monkeypatch):
+    monkeypatch.setattr(timelinediff, "CHUNK_SIZE", 128)
+    left = _events(500)
+    right = [dict(e, payload=dict(e["payload"])) for e in left]
+    right[200]["payload"]["i"] = -1
+    right[200]["payload"]["extra"] = True
+    del right[300]
+    right.insert(400, {"event_id": "evt-new", "type": "step"})
+    right[450], right[451] = right[451], right[450]  # reordered, not changed
+    _write(tmp_path / "l.ndjson", left)
+    _write(tmp_path / "r.ndjson", right)
+
+    diff = diff_timelines(tmp_path / "l.ndjson", tmp_path / "r.ndjson")
+    assert not diff.identical and diff.common_prefix_lines == 200
+    assert (diff.changed, diff.removed, diff.added) == (1, 1, 1)
+    changed = next(e for e in diff.entries if e.op == "changed")
+    assert changed.key == "evt-00200" and changed.left_line == changed.right_line == 201
+    assert [(d.op, d.path) for d in changed.deltas] == [("added", "/payload/extra"), ("changed", "/payload/i")]
+    assert {(e.op, e.key) for e in diff.entries} >= {("removed", "evt-00300"), ("added", "evt-new")}
+
+
+def test_ignore_window_and_limit(tmp_path):
+    left = _events(50)
+    right = [dict(e, ts="other") for e in left]
+    _write(tmp_path / "l.ndjson", left)
+    _write(tmp_path / "r.ndjson", right)
+    assert diff_timelines(tmp_path / "l.ndjson", tmp_path / "r.ndjson").changed == 50
+    diff = diff_timelines(tmp_path / "l.ndjson", tmp_path / "r.ndjson", ignore=["/ts"])
+    assert diff.equivalent and not diff.identical and diff.matched == 50
+
+    # a block of 10 events moved to the end pairs up within the window, not beyond it
+    _write(tmp_path / "m.ndjson", left[10:] + left[:10])
+    assert diff_timelines(tmp_path / "l.ndjson", tmp_path / "m.ndjson", window=20).equivalent
+    small = diff_timelines(tmp_path / "l.ndjson", tmp_path / "m.ndjson", window=5, limit=1)
+    assert small.removed == small.added > 0 and len(small.entries) == 1 and small.truncated
+
+
+def test_events_without_ids_and_cli(tmp_path, capsys):
+    _write(tmp_path / "l.ndjson", [{"event": "STEP", "data": {"n": 1}}, {"event": "STEP", "data": {"n": 2}}])
+    _write(tmp_path / "r.ndjson", [{"event": "STEP", "data": {"n": 1}}, {"event": "STEP", "data": {"n": 3}}])
+    assert main([str(tmp_path / "l.ndjson"), str(tmp_path / "r.ndjson")]) == 1
+    out = capsys.readouterr().out
+    # ordinals count from the first differing line
+    assert "C STEP#1 (L2/R2)" in out and "/data/n: 2 -> 3" in out
+    assert json_deltas({"a": [1, 2]}, {"a": [1]})[0].path == "/a/1"
+    assert json_deltas(1, 1.0)[0].op == "changed"
+
+
+def test_difference_in_line_crossing_chunk_boundary(tmp_path, monkeypatch):
+    monkeypatch.setattr(timelinediff, "CHUNK_SIZE", 64)
+    left = _events(3) + [{"event_id": "evt-long", "type": "step", "blob": "x" * 200, "tail": 1}] + _events(3)
+    right = [dict(e) for e in left]
+    right[3]["tail"] = 2  # differs past the first chunk boundary inside the line
+    _write(tmp_path / "l.ndjson", left)
+    _write(tmp_path / "r.ndjson", right)
+    diff = diff_timelines(tmp_path / "l.ndjson", tmp_path / "r.ndjson")
+    assert diff.common_prefix_lines == 3 and diff.changed == 1
+    changed = diff.entries[0]
+    assert changed.key == "evt-long" and changed.left_line == 4
+    assert [(d.op, d.path) for d in changed.deltas] == [("changed", "/tail")]
+    assert diff_timelines(tmp_path / "l.ndjson", tmp_path / "l.ndjson").common_prefix_lines == 7
@@ -0,0 +1,61 @@
+import asyncio
+import json
+
+from mplp_vlab.packhash import EXCLUDED_PATHS
+from mplp_vlab.tracing import CHROME_PATH, SPEEDSCOPE_PATH, Span, Tracer, top_spans, tracer_from_env
+
+
+def test_ring_buffer_keeps_newest():
+    tracer = Tracer(capacity=3)
+    for i in range(5):
+        with tracer.span(f"s{i}", "llm"):
+            pass
+    assert [s.name for s in tracer.snapshot()] == ["s2", "s3", "s4"]
+    assert tracer.dropped == 2
+
+
+def test_off_unless_requested(monkeypatch):
+    monkeypatch.delenv("VLAB_TRACE", raising=False)
+    assert tracer_from_env() is None
+    monkeypatch.setenv("VLAB_TRACE", "1")
+    assert tracer_from_env().fmt == "chrome"
+    monkeypatch.setenv("VLAB_TRACE", "speedscope")
+    assert tracer_from_env().fmt == "speedscope"
+    assert {CHROME_PATH, SPEEDSCOPE_PATH} <= EXCLUDED_PATHS
+
+
+def test_tracks_per_task_and_chrome(tmp_path):
+    tracer = Tracer()
+
+    async def session(i):
+        tracer.bind_track(f"session-{i}")
+        token = tracer.begin("Coder execute", "agent_step")
+        with tracer.span("Coder execute", "llm"):
+            await asyncio.sleep(0.001)
+        tracer.end(token, reply="ok")
+
+    async def both():
+        await asyncio.gather(session(0), session(1))
+
+    asyncio.run(both())
+    trace = json.loads(tracer.write(tmp_path).read_text())
+    names = {e["args"]["name"] for e in trace["traceEvents"] if e["ph"] == "M"}
+    assert names == {"session-0", "session-1"}
+    spans = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+    assert len(spans) == 4 and all(e["dur"] > 0 for e in spans)
+    assert [r["count"] for r in top_spans(trace)] == [2, 2]
+    assert (tmp_path / CHROME_PATH).is_file()
+
+
+def test_speedscope_nests_overlaps():
+    tracer = Tracer(fmt="speedscope")
+    o = tracer.origin_ns
+    tracer.spans.extend([
+        Span("task", "agent_task", o + 10, o + 100, "crew-0"),
+        Span("step", "agent_step", o + 20, o + 150, "crew-0"),  # outlives its parent: clipped
+        Span("call", "llm", o + 110, o + 120, "crew-0"),
+    ])
+    profile = tracer.to_speedscope()["profiles"][0]
+    events = [(e["type"], e["frame"], e["at"]) for e in profile["events"]]
+    assert events == [("O", 0, 10), ("O", 1, 20), ("C", 1, 100), ("C", 0, 100), ("O", 2, 110), ("C", 2, 120)]
+    assert (profile["startValue"], profile["endValue"]) == (10, 120)
@@ -0,0 +1,84 @@
+import hashlib
+import json
+import os
+
+import pytest
+
+from mplp_vlab.packhash import read_sums
+from mplp_vlab.seal import seal_pack
+from mplp_vlab.treehash import B2SUMS_PATH, read_b2sums, read_mode, root_digest, tree_hash_file
+from mplp_vlab.verify import full_verify
+
+LEAF = 4096
+
+
+@pytest.fixture
+def pack(tmp_path, monkeypatch):
+    monkeypatch.setenv("VLAB_RECEIPTS_DIR", str(tmp_path / "receipts"))
+    monkeypatch.setenv("VLAB_RECEIPT_KEY", str(tmp_path / "receipt.key"))
+    root = tmp_path / "pack"
+    (root / "timeline").mkdir(parents=True)
+    (root / "artifacts").mkdir()
+    (root / "timeline" / "events.ndjson").write_bytes(os.urandom(LEAF * 5 + 17))
+    (root / "artifacts" / "trace.json").write_text('{"t": 1}')
+    (root / "manifest.json").write_text(json.dumps({"pack_id": "p"}, indent=2))
+    return root
+
+
+def test_tree_digest_matches_spec(tmp_path):
+    data = os.urandom(LEAF * 2 + 1)
+    (tmp_path / "f").write_bytes(data)
+    chunks = [data[i:i + LEAF] for i in range(0, len(data), LEAF)]
+    leaves = [
+        hashlib.blake2b(c, digest_size=32, fanout=0, depth=2, leaf_size=LEAF, inner_size=32,
+                        node_offset=i, node_depth=0, last_node=i == len(chunks) - 1).digest()
+        for i, c in enumerate(chunks)
+    ]
+    expected = root_digest(leaves, LEAF)
+    assert tree_hash_file(tmp_path / "f", LEAF, workers=1) == expected
+    assert tree_hash_file(tmp_path / "f", LEAF, workers=8) == expected
+    assert tree_hash_file(tmp_path / "f", LEAF * 4) != expected  # leaf size is part of the digest
+
+    (tmp_path / "empty").write_bytes(b"")
+    assert len(tree_hash_file(tmp_path / "empty", LEAF)) == 64
+
+
+def test_seal_records_mode_and_keeps_sha256(pack):
+    root = seal_pack(pack, tree=True, leaf_size=LEAF)
+    mode = read_mode(pack)
+    assert mode["leaf_size"] == LEAF and mode["sums"] == B2SUMS_PATH
+    raw, b2 = read_b2sums(pack)
+    assert mode["sums_sha256"] == hashlib.sha256(raw).hexdigest()
+    assert [e.path for e in b2] == ["artifacts/trace.json", "timeline/events.ndjson"]
+    assert "manifest.json" in {e.path for e in read_sums(pack)}
+    # sha256 sums and root are those of a plain seal of the same (manifest-updated) pack
+    assert seal_pack(pack) == root
+
+    seal_pack(pack, tree=True, leaf_size=LEAF)
+    result = full_verify(pack, write=False)
+    assert result.ok and result.hash_mode == "tree" and result.tree_ok
+    assert full_verify(pack, write=False, hash_mode="sha256").hash_mode == "sha256"
+
+
+def test_verify_detects_tampering(pack):
+    seal_pack(pack, tree=True, leaf_size=LEAF)
+    events = pack / "timeline" / "events.ndjson"
+    data = bytearray(events.read_bytes())
+    data[LEAF * 3] ^= 1
+    events.write_bytes(bytes(data))
+    result = full_verify(pack, write=False)
+    assert result.hash_mode == "tree" and result.mismatched == ["timeline/events.ndjson"] and not result.ok
+
+    # b2sums not bound to the manifest: rejected, contents fall back to sha256
+    seal_pack(pack, tree=True, leaf_size=LEAF)
+    (pack / B2SUMS_PATH).write_text((pack / B2SUMS_PATH).read_text().replace("a", "b", 1))
+    result = full_verify(pack, write=False)
+    assert result.tree_ok is False and result.hash_mode == "sha256" and not result.mismatched and not result.ok
+
+
+def test_tree_mode_needs_manifest(tmp_path):
+    (tmp_path / "f").write_text("x")
+    with pytest.raises(ValueError):
+        seal_pack(tmp_path, tree=True)
+    seal_pack(tmp_path)
+    assert full_verify(tmp_path, write=False, hash_mode="tree").error
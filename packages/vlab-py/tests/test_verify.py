@@ -0,0 +1,86 @@
+import json
+import os
+
+import pytest
+
+from mplp_vlab.packhash import SumsEntry, pack_root_hash, render_sums, sha256_bytes
+from mplp_vlab.verify import _receipt_path, ensure_receipt_key, full_verify, quick_verify
+
+
+@pytest.fixture(autouse=True)
+def receipts(tmp_path, monkeypatch):
+    monkeypatch.setenv("VLAB_RECEIPTS_DIR", str(tmp_path / "receipts"))
+    monkeypatch.setenv("VLAB_RECEIPT_KEY", str(tmp_path / "receipt.key"))
+
+
+def make_pack(root, files):
+    for rel, data in files.items():
+        (root / rel).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel).write_bytes(data)
+    entries = sorted((SumsEntry(rel, sha256_bytes(data)) for rel, data in files.items()), key=lambda e: e.path)
+    (root / "integrity").mkdir(parents=True, exist_ok=True)
+    (root / "integrity/sha256sums.txt").write_text(render_sums(entries))
+    (root / "integrity/pack.sha256").write_text(f"{pack_root_hash(entries)}  pack\n")
+    return root
+
+
+def test_full_then_quick(tmp_path):
+    pack = make_pack(tmp_path / "pack", {"manifest.json": b"{}", "timeline/events.ndjson": b'{"a":1}\n'})
+    full = full_verify(pack)
+    assert full.ok and full.tier == "full" and full.root_ok
+    quick = quick_verify(pack)
+    assert quick.ok and quick.tier == "quick" and not quick.escalated
+
+
+def test_modified_file_escalates(tmp_path):
+    pack = make_pack(tmp_path / "pack", {"manifest.json": b"{}"})
+    full_verify(pack)
+    (pack / "manifest.json").write_bytes(b'{"x":1}')
+    result = quick_verify(pack)
+    assert result.escalated and "manifest.json" in result.escalation_reason
+    assert not result.ok and result.mismatched == ["manifest.json"]
+    # The failing verdict is cached too
+    assert quick_verify(pack).tier == "quick"
+
+
+def test_uncovered_file_fails(tmp_path):
+    pack = make_pack(tmp_path / "pack", {"manifest.json": b"{}"})
+    (pack / "extra.json").write_bytes(b"{}")
+    assert full_verify(pack).uncovered == ["extra.json"]
+
+
+def test_tampered_receipt_escalates(tmp_path):
+    pack = make_pack(tmp_path / "pack", {"manifest.json": b"{}"})
+    full_verify(pack)
+    path = _receipt_path(pack)
+    receipt = json.loads(path.read_text())
+    receipt["body"]["result"]["ok"] = False
+    path.write_text(json.dumps(receipt))
+    result = quick_verify(pack)
+    assert result.escalated and result.escalation_reason == "receipt signature invalid"
+    assert result.ok
+
+
+def test_key_created_private(tmp_path):
+    full_verify(make_pack(tmp_path / "pack", {"manifest.json": b"{}"}))
+    assert os.stat(tmp_path / "receipt.key").st_mode & 0o777 == 0o600
+
+
+def test_key_creation_is_atomic_and_first_writer_wins(tmp_path, monkeypatch):
+    key = tmp_path / "keys" / "receipt.key"
+    monkeypatch.setenv("VLAB_RECEIPT_KEY", str(key))
+    first = ensure_receipt_key()
+    assert len(first) == 32 and ensure_receipt_key() == first
+    assert os.listdir(key.parent) == ["receipt.key"]  # no temp file left behind
+
+    # A process that loses the race between its read and its link gets the winner's key
+    key.unlink()
+    real_link = os.link
+
+    def racing_link(src, dst):
+        key.write_bytes(b"w" * 32)
+        real_link(src, dst)
+
+    monkeypatch.setattr(os, "link", racing_link)
+    assert ensure_receipt_key() == b"w" * 32 == key.read_bytes()
+    assert os.listdir(key.parent) == ["receipt.key"]
@@ -0,0 +1,106 @@
+"""Shared hooks of the real Python producers into packages/vlab-py.
+
+Imported by ``producers/real/<substrate>/src/produce-real.py``. Provides the
+live D1 budget guard, per-phase ``reports/producer.perf.json``, opt-in
+``VLAB_TRACE`` spans, the block timeline writer and opt-in
+(``VLAB_VALIDATE=1``) schema validation of the pack before it is written. When ``mplp_vlab``
+(or pyyaml) cannot be imported the producer exits with code 2 rather than
+run unguarded; with ``VLAB_BUDGET_GUARD=0`` it warns and runs untimed and
+untraced, writing a plain ``timeline/events.ndjson``.
+"""
+
+import contextlib
+import datetime
+import hashlib
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "packages", "vlab-py", "src"))
+try:
+    from mplp_vlab.budget import BudgetExceeded, BudgetGuard
+    from mplp_vlab.perf import PerfRecorder
+    from mplp_vlab.scenarios import ScenarioNotFoundError
+    from mplp_vlab.tracing import tracer_from_env
+    from mplp_vlab.blocktimeline import write_timeline
+    from mplp_vlab.schema import validate_on_write
+except ImportError as e:
+    if os.getenv("VLAB_BUDGET_GUARD", "1") != "0":
+        print(f"error: budget guard unavailable ({e}); set VLAB_BUDGET_GUARD=0 to run unguarded", file=sys.stderr)
+        sys.exit(2)
+    print(f"warning: mplp_vlab unavailable ({e}); no perf report, tracing or block timeline", file=sys.stderr)
+    BudgetGuard = None
+    PerfRecorder = None
+    write_timeline = None
+
+    def tracer_from_env():
+        return None
+
+    def validate_on_write(files, perf=None):
+        return []
+
+    class BudgetExceeded(Exception):
+        pass
+
+__all__ = [
+    "BudgetExceeded",
+    "PerfRecorder",
+    "Timeline",
+    "log_event",
+    "phase",
+    "sha256_file",
+    "tracer_from_env",
+    "validate_on_write",
+    "write_events",
+]
+
+
+def phase(perf, name, **extra):
+    return perf.phase(name, **extra) if perf is not None else contextlib.nullcontext()
+
+
+def make_budget_guard(scenario_id):
+    if BudgetGuard is None or os.getenv("VLAB_BUDGET_GUARD", "1") == "0":
+        return None
+    try:
+        return BudgetGuard.for_scenario(scenario_id)
+    except ScenarioNotFoundError:
+        # No scenario YAML: outcome validity is still checked, no ceilings
+        return BudgetGuard()
+
+
+class Timeline(list):
+    """Events of one run, observed by that run's own budget guard (runs may share a process)."""
+
+    def __init__(self, scenario_id):
+        super().__init__()
+        self.guard = make_budget_guard(scenario_id)
+
+
+def log_event(timeline, event, data):
+    entry = {
+        "timestamp": datetime.datetime.utcnow().isoformat() + "Z",
+        "event": event,
+        "data": data
+    }
+    timeline.append(entry)
+    if timeline.guard is not None:
+        timeline.guard.observe(entry)
+
+
+def sha256_file(filepath):
+    h = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(4096), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def write_events(out_dir, text):
+    """Write the timeline; returns the sha256 of its uncompressed bytes."""
+    path = os.path.join(out_dir, "timeline/events.ndjson")
+    if write_timeline is not None:
+        # VLAB_TIMELINE_FORMAT=blocks writes timeline/events.ndjson.zb (same sums entry)
+        return write_timeline(path, text.encode("utf-8"))[1]
+    with open(path, "w") as f:
+        f.write(text)
+    return sha256_file(path)
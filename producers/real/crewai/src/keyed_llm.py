@@ -0,0 +1,73 @@
+"""Deterministic keyed stub LLM for the crewai producer.
+
+``FakeListLLM`` hands out responses in global call order, so two agents
+sharing it (or two crews running at once) get whatever response is next,
+and any parallel task execution changes the pack. ``KeyedStubLLM`` answers
+by (agent role, task description, call index) instead:
+
+- each agent gets its own instance, bound to its role
+- the task is read from the crewai prompt (``Current Task: ...``)
+- the call index counts calls per (role, task) on that instance, so retries
+  of one task advance only that task's sequence
+
+The answer therefore depends only on who is asking about what, never on
+scheduling, and crews can run hierarchically, with async tasks, or several
+at once while producing identical output. Responses are wrapped in the
+ReAct ``Final Answer:`` format the crewai agent parser expects. Keys with
+no configured response get a synthesized answer derived from the key hash.
+"""
+
+import hashlib
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.language_models.llms import LLM
+from langchain_core.pydantic_v1 import PrivateAttr
+
+_TASK_RE = re.compile(r"Current Task:\s*(.+)")
+_ROLE_RE = re.compile(r"You are (.+?)\.")
+
+
+def task_of(prompt: str) -> str:
+    m = _TASK_RE.search(prompt)
+    return m.group(1).strip() if m else ""
+
+
+class KeyedStubLLM(LLM):
+    role: str
+    # {(role, task description): [response for call 0, call 1, ...]}
+    responses: Dict[Tuple[str, str], List[str]] = {}
+
+    _counts: Dict[Tuple[str, str], int] = PrivateAttr(default_factory=dict)
+    _calls: List[Tuple[str, str, int]] = PrivateAttr(default_factory=list)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    @property
+    def _llm_type(self) -> str:
+        return "keyed-stub"
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> str:
+        role = self.role
+        m = _ROLE_RE.search(prompt)
+        if m and m.group(1) != role:
+            role = m.group(1)  # shared manager LLM answering for a delegated role
+        key = (role, task_of(prompt))
+        with self._lock:
+            index = self._counts.get(key, 0)
+            self._counts[key] = index + 1
+            self._calls.append((key[0], key[1], index))
+        return f"Thought: I now know the final answer\nFinal Answer: {self.answer(key, index)}"
+
+    def answer(self, key: Tuple[str, str], index: int) -> str:
+        sequence = self.responses.get(key)
+        if sequence:
+            return sequence[min(index, len(sequence) - 1)]
+        digest = hashlib.sha256(f"{key[0]}\x00{key[1]}\x00{index}".encode("utf-8")).hexdigest()
+        return f"[stub:{digest[:16]}]"
+
+    @property
+    def calls(self) -> List[Tuple[str, str, int]]:
+        """(role, task, index) of every call, in key order (not arrival order)."""
+        with self._lock:
+            return sorted(self._calls)
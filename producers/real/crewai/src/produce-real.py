@@ -1,61 +1,41 @@
 import os
 import json
-import hashlib
 import datetime
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+_IMPORT_START = (time.perf_counter(), time.process_time())
 from crewai import Agent, Task, Crew, Process
-from langchain_community.llms.fake import FakeListLLM
-
-def log_event(timeline, event, data):
-    timeline.append({
-        "timestamp": datetime.datetime.utcnow().isoformat() + "Z",
-        "event": event,
-        "data": data
-    })
-
-def sha256_file(filepath):
-    h = hashlib.sha256()
-    with open(filepath, "rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            h.update(chunk)
-    return h.hexdigest()
+from keyed_llm import KeyedStubLLM
+_IMPORT_END = (time.perf_counter(), time.process_time())
 
-def main():
-    scenario_id = os.getenv("SCENARIO_ID", "d1_basic_pass")
-    run_id = os.getenv("RUN_ID", "crewai-d1-real-001")
-    # In container, out_dir is usually /workspace/out
-    out_dir = os.getenv("OUT_DIR", "/workspace/out")
+# Budget guard, perf phases, VLAB_TRACE spans, timeline writer, schema validation (producers/real/_lib)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "_lib"))
+from vlab_hooks import (
+    BudgetExceeded, PerfRecorder, Timeline, log_event, phase, sha256_file, tracer_from_env, validate_on_write, write_events,
+)
 
-    print(f"🔨 CrewAI Producer v2 (REAL EXECUTION)")
-    print(f"   Scenario: {scenario_id}")
-    print(f"   Run ID: {run_id}")
-    print(f"   Out Dir: {out_dir}")
-
-    os.makedirs(out_dir, exist_ok=True)
-    os.makedirs(os.path.join(out_dir, "artifacts"), exist_ok=True)
-    os.makedirs(os.path.join(out_dir, "timeline"), exist_ok=True)
-    os.makedirs(os.path.join(out_dir, "reports"), exist_ok=True)
-    os.makedirs(os.path.join(out_dir, "integrity"), exist_ok=True)
+RESEARCH_TASK = 'Research the core properties of MPLP V2.'
+SUMMARY_TASK = 'Write a summary based on the research.'
 
-    timeline = []
-    log_event(timeline, "RUN_STARTED", {"scenario_id": scenario_id, "run_id": run_id})
-
-    # CrewAI Logic
-    print("🚀 Initializing CrewAI agents with FakeListLLM...")
-    
-    # Deterministic LLM responses
-    fake_llm = FakeListLLM(responses=[
-        "1. Immutable Evidence, 2. Bit-identical Reproducibility, 3. Runner-led Sealing.",
-        "MPLP V2 ensures substrate trustworthiness through sealed evidence and bit-identical verification."
-    ])
+# Deterministic LLM responses, keyed by (agent role, task description)
+RESPONSES = {
+    ("Researcher", RESEARCH_TASK): ["1. Immutable Evidence, 2. Bit-identical Reproducibility, 3. Runner-led Sealing."],
+    ("Writer", SUMMARY_TASK): ["MPLP V2 ensures substrate trustworthiness through sealed evidence and bit-identical verification."],
+}
+RESPONSES[("Crew Manager", RESEARCH_TASK)] = RESPONSES[("Researcher", RESEARCH_TASK)]
+RESPONSES[("Crew Manager", SUMMARY_TASK)] = RESPONSES[("Writer", SUMMARY_TASK)]
 
+def build_crew(process, async_research, handler=None):
+    """One independent crew; every agent gets its own keyed LLM."""
+    callbacks = [handler] if handler is not None else None
     researcher = Agent(
         role='Researcher',
         goal='Find deterministic facts about MPLP.',
         backstory='Expert at protocol verification.',
         allow_delegation=False,
         verbose=True,
-        llm=fake_llm
+        llm=KeyedStubLLM(role='Researcher', responses=RESPONSES, callbacks=callbacks)
     )
 
     writer = Agent(
@@ -64,25 +44,91 @@ def main():
         backstory='Professional technical writer.',
         allow_delegation=False,
         verbose=True,
-        llm=fake_llm
+        llm=KeyedStubLLM(role='Writer', responses=RESPONSES, callbacks=callbacks)
     )
 
+    task1 = Task(description=RESEARCH_TASK, agent=researcher, expected_output="A list of 3 properties.",
+                 async_execution=async_research)
+    task2 = Task(description=SUMMARY_TASK, agent=writer, expected_output="A 2-sentence summary.",
+                 context=[task1])
+
+    kwargs = {}
+    if process == Process.hierarchical:
+        kwargs["manager_llm"] = KeyedStubLLM(role='Crew Manager', responses=RESPONSES, callbacks=callbacks)
+    crew = Crew(agents=[researcher, writer], tasks=[task1, task2], process=process, verbose=True, **kwargs)
+    llms = [researcher.llm, writer.llm] + ([kwargs["manager_llm"]] if kwargs else [])
+    return crew, llms
+
+def run_crew(index, process, async_research, handler=None):
+    if handler is not None:
+        handler.activate(f"crew-{index}")
+    # thread_time: crews share the process, so only this thread's CPU is attributed to the crew
+    start = (time.perf_counter(), time.thread_time())
+    crew, llms = build_crew(process, async_research, handler)
+    built = (time.perf_counter(), time.thread_time())
+    if handler is not None:
+        with handler.tracer.span("kickoff", "crew", crew_index=index):
+            result = str(crew.kickoff())
+    else:
+        result = str(crew.kickoff())
+    done = (time.perf_counter(), time.thread_time())
+    calls = sorted(call for llm in llms for call in llm.calls)
+    phases = {
+        "agent_construction": ((built[0] - start[0]) * 1000, (built[1] - start[1]) * 1000),
+        "crew_kickoff": ((done[0] - built[0]) * 1000, (done[1] - built[1]) * 1000),
+    }
+    return {"crew_index": index, "result": result, "llm_calls": calls, "wall_ms": phases["crew_kickoff"][0], "phases": phases}
+
+SUBSTRATE_ID = "crewai"
+
+# Pack files covered by the pre-seal integrity/sha256sums.txt, in order (manifest.json is written last)
+SEALED_FILES = ("artifacts/context.json", "artifacts/trace.json", "timeline/events.ndjson")
+
+def build_pack(scenario_id, run_id, verbose=False, perf=None, tracer=None):
+    """Run the crew(s) and return the pack as {relative path: text}; nothing is written.
+
+    Each call has its own timeline and budget guard, so several runs can be
+    built at once in one process (see ``mplp_vlab.multiproduce``).
+    """
+    timeline = Timeline(scenario_id)
+    log_event(timeline, "RUN_STARTED", {"scenario_id": scenario_id, "run_id": run_id})
+
+    # CrewAI Logic
+    # CREW_PROCESS: sequential | hierarchical; CREW_CONCURRENCY: crews run at once;
+    # CREW_ASYNC_TASKS=1: research task runs with async_execution
+    process = Process.hierarchical if os.getenv("CREW_PROCESS", "sequential") == "hierarchical" else Process.sequential
+    concurrency = max(1, int(os.getenv("CREW_CONCURRENCY", "1")))
+    async_research = os.getenv("CREW_ASYNC_TASKS", "0") == "1"
+    handler = None
+    if tracer is not None:
+        from trace_hooks import SpanHandler  # imported only when tracing is on
+        handler = SpanHandler(tracer)
+    if verbose:
+        print(f"🚀 Initializing CrewAI agents with KeyedStubLLM ({process.value}, {concurrency} crew(s))...")
+
     log_event(timeline, "AGENT_CREATED", {"role": "Researcher"})
     log_event(timeline, "AGENT_CREATED", {"role": "Writer"})
 
-    task1 = Task(description='Research the core properties of MPLP V2.', agent=researcher, expected_output="A list of 3 properties.")
-    task2 = Task(description='Write a summary based on the research.', agent=writer, expected_output="A 2-sentence summary.")
+    # Execute Crews
+    if verbose:
+        print("⚡ Executing crew...")
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        runs = list(pool.map(lambda i: run_crew(i, process, async_research, handler), range(concurrency)))
+    total_ms = (time.perf_counter() - start) * 1000
+    if verbose:
+        per_crew = ", ".join("%.0fms" % r["wall_ms"] for r in runs)
+        print(f"   {concurrency} crew(s) in {total_ms:.0f}ms (per crew: {per_crew})")
+    if perf is not None:
+        for r in runs:
+            for name, (wall_ms, cpu_ms) in r["phases"].items():
+                perf.add(name, wall_ms, cpu_ms, "thread", crew_index=r["crew_index"])
 
-    # Execute Crew
-    print("⚡ Executing crew...")
-    crew = Crew(
-        agents=[researcher, writer],
-        tasks=[task1, task2],
-        process=Process.sequential,
-        verbose=True
-    )
-    
-    result = str(crew.kickoff())
+    # Keyed responses make every crew's output identical regardless of scheduling
+    result = runs[0]["result"]
+    identical = all(r["result"] == result and r["llm_calls"] == runs[0]["llm_calls"] for r in runs)
+    if not identical:
+        raise RuntimeError("Crews diverged under concurrency")
 
     log_event(timeline, "CREW_COMPLETED", {"result": result})
 
@@ -97,39 +143,12 @@ def main():
         "trace": {
             "verdict": "PASS",
             "result": result,
-            "agents": ["Researcher", "Writer"]
+            "agents": ["Researcher", "Writer"],
+            "llm_calls": [list(call) for call in runs[0]["llm_calls"]]
         }
     }
 
-    ctx_path = os.path.join(out_dir, "artifacts/context.json")
-    trace_path = os.path.join(out_dir, "artifacts/trace.json")
-    
-    with open(ctx_path, "w") as f:
-        json.dump(artifacts["context"], f, indent=2)
-    with open(trace_path, "w") as f:
-        json.dump(artifacts["trace"], f, indent=2)
-
-    # Write timeline
-    tm_path = os.path.join(out_dir, "timeline/events.ndjson")
-    with open(tm_path, "w") as f:
-        for event in timeline:
-            f.write(json.dumps(event) + "\n")
-
-    # Integrity (pre-seal)
-    print("🔒 Computing pre-seal integrity...")
-    hashes = {
-        "artifacts/context.json": sha256_file(ctx_path),
-        "artifacts/trace.json": sha256_file(trace_path),
-        "timeline/events.ndjson": sha256_file(tm_path)
-    }
-
-    # Write partial sha256sums
-    with open(os.path.join(out_dir, "integrity/sha256sums.txt"), "w") as f:
-        for path, h in hashes.items():
-            f.write(f"{h}  {path}\n")
-
     # Manifest (Pre-sealed)
-    print("📋 Writing pre-sealed manifest...")
     manifest = {
         "pack_id": run_id,
         "pack_layout_version": "2",
@@ -158,10 +177,83 @@ def main():
         }
     }
 
-    with open(os.path.join(out_dir, "manifest.json"), "w") as f:
-        json.dump(manifest, f, indent=2)
+    return {
+        "artifacts/context.json": json.dumps(artifacts["context"], indent=2),
+        "artifacts/trace.json": json.dumps(artifacts["trace"], indent=2),
+        "timeline/events.ndjson": "".join(json.dumps(event) + "\n" for event in timeline),
+        "manifest.json": json.dumps(manifest, indent=2),
+    }
+
+def write_pack(out_dir, files, perf=None, tracer=None):
+    validate_on_write(files, perf)  # VLAB_VALIDATE=1
+    for sub in ("artifacts", "timeline", "reports", "integrity"):
+        os.makedirs(os.path.join(out_dir, sub), exist_ok=True)
+
+    with phase(perf, "artifact_writes"):
+        for path in ("artifacts/context.json", "artifacts/trace.json"):
+            with open(os.path.join(out_dir, path), "w") as f:
+                f.write(files[path])
+    with phase(perf, "timeline_flush"):
+        timeline_sha = write_events(out_dir, files["timeline/events.ndjson"])
+
+    # Integrity (pre-seal)
+    print("🔒 Computing pre-seal integrity...")
+    with phase(perf, "hashing"):
+        hashes = {
+            path: timeline_sha if path == "timeline/events.ndjson" else sha256_file(os.path.join(out_dir, path))
+            for path in SEALED_FILES
+        }
+
+    # Write partial sha256sums
+        with open(os.path.join(out_dir, "integrity/sha256sums.txt"), "w") as f:
+            for path, h in hashes.items():
+                f.write(f"{h}  {path}\n")
+
+    print("📋 Writing pre-sealed manifest...")
+    with phase(perf, "manifest_write"):
+        with open(os.path.join(out_dir, "manifest.json"), "w") as f:
+            f.write(files["manifest.json"])
+
+    # Never sealed or hashed (packhash.EXCLUDED_PATHS)
+    if perf is not None:
+        perf.write(out_dir)
+    if tracer is not None:
+        tracer.write(out_dir, name=SUBSTRATE_ID)
+
+def main():
+    scenario_id = os.getenv("SCENARIO_ID", "d1_basic_pass")
+    run_id = os.getenv("RUN_ID", "crewai-d1-real-001")
+    # In container, out_dir is usually /workspace/out
+    out_dir = os.getenv("OUT_DIR", "/workspace/out")
+
+    print(f"🔨 CrewAI Producer v2 (REAL EXECUTION)")
+    print(f"   Scenario: {scenario_id}")
+    print(f"   Run ID: {run_id}")
+    print(f"   Out Dir: {out_dir}")
+
+    perf = None
+    if PerfRecorder is not None:
+        perf = PerfRecorder("produce-real.py", SUBSTRATE_ID, run_id, start=_IMPORT_START)
+        perf.add("framework_import", (_IMPORT_END[0] - _IMPORT_START[0]) * 1000, (_IMPORT_END[1] - _IMPORT_START[1]) * 1000)
+
+    # VLAB_TRACE=chrome|speedscope: agent step / LLM / tool spans (opt-in)
+    tracer = tracer_from_env()
+
+    try:
+        files = build_pack(scenario_id, run_id, verbose=True, perf=perf, tracer=tracer)
+    except BudgetExceeded:
+        raise  # a RuntimeError too; exits 3 below
+    except RuntimeError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+    write_pack(out_dir, files, perf, tracer)
 
     print(f"\n✅ Pack created at: {out_dir}")
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    except BudgetExceeded as e:
+        # Abort before the manifest is written so the run is never sealed
+        print(f"\n⛔ Budget guard aborted run: {e}", file=sys.stderr)
+        sys.exit(3)
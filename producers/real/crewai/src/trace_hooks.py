@@ -0,0 +1,106 @@
+"""Tracing hooks for the crewai producer (opt-in, ``VLAB_TRACE``).
+
+A langchain callback handler turns run start/end callbacks into
+``mplp_vlab.tracing`` spans:
+
+- ``*AgentExecutor`` chain runs: ``agent_task`` (one agent working a task)
+- chains started directly under an executor: ``agent_step`` (one plan /
+  act iteration); deeper runnable plumbing is not recorded
+- LLM runs: ``llm``, named by the asking role and the current task
+- tool runs (including the delegation tools of hierarchical crews): ``tool``
+
+The handler is installed through langchain's configure hook, so every
+callback manager created in a crew thread picks it up without touching
+crewai's agents or executors. Threads crewai starts itself (async tasks)
+do not inherit it; their LLM calls are still covered because the handler
+is also attached to each ``KeyedStubLLM`` (langchain dedupes the two).
+"""
+
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from keyed_llm import _ROLE_RE, task_of
+
+try:
+    from langchain_core.tracers.context import register_configure_hook
+except ImportError:  # older langchain_core: LLM callbacks only
+    register_configure_hook = None
+
+_active: ContextVar[Optional["SpanHandler"]] = ContextVar("vlab_crewai_trace_handler", default=None)
+if register_configure_hook is not None:
+    register_configure_hook(_active, inheritable=True)
+
+
+def _name(serialized: Optional[Dict[str, Any]], kwargs: Dict[str, Any]) -> str:
+    if kwargs.get("name"):
+        return kwargs["name"]
+    serialized = serialized or {}
+    if serialized.get("name"):
+        return serialized["name"]
+    ids = serialized.get("id") or ["?"]
+    return ids[-1]
+
+
+class SpanHandler(BaseCallbackHandler):
+    """Maps langchain run ids to open tracer spans."""
+
+    def __init__(self, tracer: Any) -> None:
+        self.tracer = tracer
+        self._open: Dict[UUID, tuple] = {}
+        self._executors: set = set()
+
+    def activate(self, track: str) -> None:
+        """Install for the calling thread; spans go on ``track``."""
+        self.tracer.bind_track(track)
+        _active.set(self)
+
+    def _begin(self, run_id: UUID, name: str, cat: str, **args: Any) -> None:
+        self._open[run_id] = self.tracer.begin(name, cat, **args)
+
+    def _end(self, run_id: UUID, **args: Any) -> None:
+        token = self._open.pop(run_id, None)
+        if token is not None:
+            self.tracer.end(token, **args)
+        self._executors.discard(run_id)
+
+    # chains -> agent tasks and steps
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, **kwargs):
+        name = _name(serialized, kwargs)
+        if name.endswith("AgentExecutor"):
+            self._executors.add(run_id)
+            task = str(inputs.get("input", ""))[:120] if isinstance(inputs, dict) else ""
+            self._begin(run_id, name, "agent_task", task=task)
+        elif parent_run_id in self._executors:
+            self._begin(run_id, name, "agent_step")
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._end(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=type(error).__name__)
+
+    # LLM calls
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        prompt = prompts[0] if prompts else ""
+        role = _ROLE_RE.search(prompt)
+        self._begin(run_id, role.group(1) if role else _name(serialized, kwargs), "llm", task=task_of(prompt))
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self._end(run_id)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=type(error).__name__)
+
+    # tools
+    def on_tool_start(self, serialized, input_str, *, run_id, **kwargs):
+        self._begin(run_id, _name(serialized, kwargs), "tool")
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._end(run_id)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=type(error).__name__)
+
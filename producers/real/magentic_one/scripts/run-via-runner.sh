@@ -28,7 +28,8 @@ while [[ $# -gt 0 ]]; do
   esac
 done
 
-PACK_DIR="$REPO_ROOT/data/runs/v2/real/magentic_one/$RUN_ID"
+# Resolved by the run store (flat or hash-bucketed, see mplp_vlab.runstore)
+PACK_DIR=$(PYTHONPATH="$REPO_ROOT/packages/vlab-py/src" python3 -m mplp_vlab.runstore path --real magentic_one "$RUN_ID")
 
 echo "🔨 Magnetic One Producer via Runner"
 echo "   Runner: python"
@@ -36,15 +37,17 @@ echo "   Run ID: $RUN_ID"
 echo "   Pack dir: $PACK_DIR"
 
 # 1. Generate/Verify Lockfile (Host-side for manifest prep)
-echo "📦 Managing dependencies (uv lock via container)..."
-docker run --rm \
+# Memoized by (pyproject.toml hash, runner image digest): uv lock only runs on a miss
+echo "📦 Managing dependencies (uv lock via container, memoized)..."
+IMAGE_DIGEST=$(docker image inspect --format '{{.Id}}' mplp-runner:python-3.11 2>/dev/null || echo "unknown")
+LOCK_SHA=$(PYTHONPATH="$REPO_ROOT/packages/vlab-py/src" python3 -m mplp_vlab.lockmemo lock \
+  --project "$PRODUCER_ROOT" \
+  --image-digest "$IMAGE_DIGEST" \
+  -- docker run --rm \
   -v "$REPO_ROOT:/workspace" \
-  -w "/workspace/producers/magentic_one" \
+  -w "/workspace/producers/real/magentic_one" \
   mplp-runner:python-3.11 \
-  uv lock --quiet
-
-LOCK_FILE="$PRODUCER_ROOT/uv.lock"
-LOCK_SHA=$(sha256sum "$LOCK_FILE" | cut -d' ' -f1)
+  uv lock --quiet)
 echo "   Lock SHA256: $LOCK_SHA"
 
 # 2. Execute via runner
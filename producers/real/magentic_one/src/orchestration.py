@@ -0,0 +1,221 @@
+"""Asyncio Magentic-One style orchestration with a deterministic scheduler.
+
+One orchestration is the Orchestrator/Coder ledger loop:
+
+    plan -> (delegate -> execute -> review)* -> final
+
+Every step is an ``await`` on an agent reply. Replies come from a keyed stub
+(role, step, call index) with a per-key simulated model latency, or from an
+injected ``generate`` coroutine (the producer routes replies through the
+substrate's agents).
+
+An optional ``tracer`` (``mplp_vlab.tracing.Tracer``) records every step as
+an ``agent_step`` span on the session's own track.
+
+``DeterministicEventLoop`` runs the loop on a virtual clock: it never blocks
+in ``select``; when nothing is ready it jumps the clock to the next timer.
+Given the same replies and latencies the interleaving of concurrent
+orchestrations (and thus the timeline) is identical on every run, while the
+wall-clock cost of each step is still measured with ``perf_counter``.
+"""
+
+import asyncio
+import hashlib
+import selectors
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+ORCHESTRATOR = "Orchestrator"
+CODER = "Coder"
+
+# Stub replies keyed by (role, step); the call index picks within the list
+REPLIES: dict[tuple[str, str], list[str]] = {
+    (ORCHESTRATOR, "plan"): ["Plan: verify MPLP V2 determinism; delegate verification to Coder."],
+    (ORCHESTRATOR, "delegate"): ["Coder: compute and compare the pack hashes of two runs."],
+    (CODER, "execute"): ["Coder: Task complete. MPLP V2 substrate verified."],
+    (ORCHESTRATOR, "review"): ["COMPLETE"],
+    (ORCHESTRATOR, "final"): ["Magnetic One successfully orchestrated the verification of MPLP V2 determinism."],
+}
+
+# Simulated model latency range per reply, in seconds
+LATENCY_RANGE = (0.005, 0.050)
+
+MAX_ROUNDS = 4
+
+Generate = Callable[[str, str, str, int], Awaitable[str]]
+
+
+# ---------------------------------------------------------------------------
+# Deterministic scheduler
+# ---------------------------------------------------------------------------
+
+class _VirtualSelector(selectors.BaseSelector):
+    """Selector that never waits: ``select(timeout)`` advances the loop's virtual clock."""
+
+    def __init__(self) -> None:
+        self._map: dict[Any, selectors.SelectorKey] = {}
+        self.now = 0.0
+
+    def register(self, fileobj, events, data=None):
+        key = selectors.SelectorKey(fileobj, fileobj if isinstance(fileobj, int) else fileobj.fileno(), events, data)
+        self._map[fileobj] = key
+        return key
+
+    def unregister(self, fileobj):
+        return self._map.pop(fileobj)
+
+    def select(self, timeout=None):
+        if timeout:
+            self.now += timeout
+        return []
+
+    def close(self) -> None:
+        self._map.clear()
+
+    def get_map(self):
+        return self._map
+
+
+class DeterministicEventLoop(asyncio.SelectorEventLoop):
+    """Event loop on a virtual clock. Only timers and callbacks; no real IO."""
+
+    def __init__(self) -> None:
+        self._virtual = _VirtualSelector()
+        super().__init__(self._virtual)
+
+    def time(self) -> float:
+        return self._virtual.now
+
+
+# ---------------------------------------------------------------------------
+# Replies
+# ---------------------------------------------------------------------------
+
+def stub_latency(role: str, step: str, index: int) -> float:
+    digest = hashlib.sha256(f"{role}\x00{step}\x00{index}".encode("utf-8")).digest()
+    low, high = LATENCY_RANGE
+    return low + (high - low) * int.from_bytes(digest[:4], "big") / 0xFFFFFFFF
+
+
+def stub_reply(role: str, step: str, index: int) -> str:
+    sequence = REPLIES.get((role, step))
+    if sequence:
+        return sequence[min(index, len(sequence) - 1)]
+    return f"[stub:{hashlib.sha256(f'{role}:{step}:{index}'.encode()).hexdigest()[:16]}]"
+
+
+async def stub_generate(role: str, step: str, message: str, index: int) -> str:
+    await asyncio.sleep(stub_latency(role, step, index))
+    return stub_reply(role, step, index)
+
+
+# ---------------------------------------------------------------------------
+# Orchestration
+# ---------------------------------------------------------------------------
+
+@dataclass
+class StepRecord:
+    session: int
+    seq: int
+    role: str
+    step: str
+    call_index: int
+    virtual_start_ms: float
+    virtual_latency_ms: float
+    latency_ms: float  # wall clock
+    reply: str
+
+
+@dataclass
+class Orchestration:
+    session: int
+    generate: Generate = stub_generate
+    steps: list[StepRecord] = field(default_factory=list)
+    sink: list[StepRecord] | None = None  # shared completion-order log
+    tracer: Any = None
+    result: str | None = None
+    _counts: dict[tuple[str, str], int] = field(default_factory=dict)
+
+    async def _ask(self, role: str, step: str, message: str) -> str:
+        index = self._counts.get((role, step), 0)
+        self._counts[(role, step)] = index + 1
+        loop = asyncio.get_running_loop()
+        virtual_start = loop.time()
+        wall_start = time.perf_counter()
+        token = self.tracer.begin(f"{role} {step}", "agent_step", call_index=index) if self.tracer else None
+        reply = await self.generate(role, step, message, index)
+        if token is not None:
+            self.tracer.end(token)
+        record = StepRecord(
+            session=self.session,
+            seq=len(self.steps),
+            role=role,
+            step=step,
+            call_index=index,
+            virtual_start_ms=round(virtual_start * 1000, 3),
+            virtual_latency_ms=round((loop.time() - virtual_start) * 1000, 3),
+            latency_ms=round((time.perf_counter() - wall_start) * 1000, 3),
+            reply=reply,
+        )
+        self.steps.append(record)
+        if self.sink is not None:
+            self.sink.append(record)
+        return reply
+
+    async def run(self, task: str) -> str:
+        if self.tracer is not None:
+            self.tracer.bind_track(f"session-{self.session}")
+        plan = await self._ask(ORCHESTRATOR, "plan", task)
+        for _ in range(MAX_ROUNDS):
+            instruction = await self._ask(ORCHESTRATOR, "delegate", plan)
+            outcome = await self._ask(CODER, "execute", instruction)
+            if (await self._ask(ORCHESTRATOR, "review", outcome)).startswith("COMPLETE"):
+                break
+        self.result = await self._ask(ORCHESTRATOR, "final", outcome)
+        return self.result
+
+
+async def run_orchestrations(
+    task: str,
+    sessions: int,
+    concurrency: int,
+    generate: Generate = stub_generate,
+    sink: list[StepRecord] | None = None,
+    tracer: Any = None,
+) -> list[Orchestration]:
+    """``sessions`` orchestrations, at most ``concurrency`` in flight at once."""
+    gate = asyncio.Semaphore(max(1, concurrency))
+    orchestrations = [Orchestration(i, generate, sink=sink, tracer=tracer) for i in range(sessions)]
+
+    async def one(o: Orchestration) -> None:
+        async with gate:
+            await o.run(task)
+
+    await asyncio.gather(*(one(o) for o in orchestrations))
+    return orchestrations
+
+
+def run(
+    task: str,
+    sessions: int = 1,
+    concurrency: int = 1,
+    deterministic: bool = True,
+    generate: Generate = stub_generate,
+    tracer: Any = None,
+) -> tuple[list[Orchestration], list[StepRecord]]:
+    """Run on a fresh loop; returns orchestrations and all steps in completion order."""
+    loop = DeterministicEventLoop() if deterministic else asyncio.new_event_loop()
+    completed: list[StepRecord] = []
+    try:
+        asyncio.set_event_loop(loop)
+        orchestrations = loop.run_until_complete(run_orchestrations(task, sessions, concurrency, generate, completed, tracer))
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+    return orchestrations, completed
+
+
+def step_event(step: StepRecord) -> dict[str, Any]:
+    return asdict(step)
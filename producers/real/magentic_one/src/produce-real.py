@@ -1,61 +1,111 @@
 import os
 import json
-import hashlib
 import datetime
 import sys
+import statistics
+import time
+_IMPORT_START = (time.perf_counter(), time.process_time())
 # Note: MagenticOne might have specific imports, but we use AutoGen agents 
 # as the foundation for the baseline proof.
-from langchain_community.llms.fake import FakeListLLM
-
-def log_event(timeline, event, data):
-    timeline.append({
-        "timestamp": datetime.datetime.utcnow().isoformat() + "Z",
-        "event": event,
-        "data": data
-    })
-
-def sha256_file(filepath):
-    h = hashlib.sha256()
-    with open(filepath, "rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            h.update(chunk)
-    return h.hexdigest()
+import orchestration
+from orchestration import CODER, ORCHESTRATOR
 
-def main():
-    scenario_id = os.getenv("SCENARIO_ID", "d1_basic_pass")
-    run_id = os.getenv("RUN_ID", "magentic-one-d1-real-001")
-    out_dir = os.getenv("OUT_DIR", "/workspace/out")
+try:
+    from autogen import Agent, ConversableAgent
+except ImportError:
+    ConversableAgent = None
+_IMPORT_END = (time.perf_counter(), time.process_time())
 
-    print(f"🔨 Magnetic One Producer v2 (REAL EXECUTION)")
-    print(f"   Scenario: {scenario_id}")
-    print(f"   Run ID: {run_id}")
-    print(f"   Out Dir: {out_dir}")
+# Budget guard, perf phases, VLAB_TRACE spans, timeline writer, schema validation (producers/real/_lib)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "_lib"))
+from vlab_hooks import (
+    BudgetExceeded, PerfRecorder, Timeline, log_event, phase, sha256_file, tracer_from_env, validate_on_write, write_events,
+)
+
+TASK = "Verify the determinism of the MPLP V2 substrate."
+
+def traced_llm(tracer):
+    """The keyed stub model call, recorded as an ``llm`` span when tracing."""
+    if tracer is None:
+        return orchestration.stub_generate
+
+    async def llm(role, step, message, index):
+        token = tracer.begin(f"{role} {step}", "llm", call_index=index)
+        try:
+            return await orchestration.stub_generate(role, step, message, index)
+        finally:
+            tracer.end(token)
+
+    return llm
+
+def make_generate(tracer=None):
+    """Route each orchestration step through an AutoGen agent's async reply pipeline.
+
+    The registered reply is the keyed stub, so replies stay deterministic while
+    the substrate's message handling is exercised (and timed) on every step.
+    Without autogen installed the bare stub is used.
+    """
+    llm = traced_llm(tracer)
+    if ConversableAgent is None:
+        return llm
+
+    def agent(name):
+        return ConversableAgent(name=name, llm_config=False, human_input_mode="NEVER", code_execution_config=False)
 
-    os.makedirs(out_dir, exist_ok=True)
-    os.makedirs(os.path.join(out_dir, "artifacts"), exist_ok=True)
-    os.makedirs(os.path.join(out_dir, "timeline"), exist_ok=True)
-    os.makedirs(os.path.join(out_dir, "reports"), exist_ok=True)
-    os.makedirs(os.path.join(out_dir, "integrity"), exist_ok=True)
+    agents = {ORCHESTRATOR: agent(ORCHESTRATOR), CODER: agent(CODER)}
+    ledger = agent("Ledger")
 
-    timeline = []
+    def keyed_reply_for(role):
+        async def keyed_reply(recipient, messages=None, sender=None, config=None):
+            request = json.loads(messages[-1]["content"])
+            reply = await llm(role, request["step"], request["message"], request["index"])
+            return True, reply
+        return keyed_reply
+
+    for role, a in agents.items():
+        a.register_reply([Agent, None], keyed_reply_for(role))
+
+    async def generate(role, step, message, index):
+        content = json.dumps({"step": step, "index": index, "message": message}, sort_keys=True)
+        reply = await agents[role].a_generate_reply(messages=[{"role": "user", "name": "Ledger", "content": content}], sender=ledger)
+        return reply if isinstance(reply, str) else reply.get("content", "")
+
+    return generate
+
+SUBSTRATE_ID = "magentic_one"
+
+# Pack files covered by the pre-seal integrity/sha256sums.txt, in order (manifest.json is written last)
+SEALED_FILES = ("artifacts/context.json", "artifacts/trace.json", "timeline/events.ndjson")
+
+def orchestration_settings():
+    # MAGENTIC_CONCURRENCY: simultaneous orchestrations; MAGENTIC_SESSIONS: total
+    # orchestrations (default: concurrency); MAGENTIC_SCHEDULER: deterministic | realtime
+    concurrency = max(1, int(os.getenv("MAGENTIC_CONCURRENCY", "1")))
+    sessions = max(1, int(os.getenv("MAGENTIC_SESSIONS", str(concurrency))))
+    scheduler = os.getenv("MAGENTIC_SCHEDULER", "deterministic")
+    return sessions, concurrency, scheduler
+
+def start_run(scenario_id, run_id):
+    timeline = Timeline(scenario_id)
     log_event(timeline, "RUN_STARTED", {"scenario_id": scenario_id, "run_id": run_id})
+    log_event(timeline, "AGENT_CREATED", {"role": ORCHESTRATOR})
+    log_event(timeline, "AGENT_CREATED", {"role": CODER})
+    return timeline
 
-    # Magnetic One / AutoGen Logic
-    print("🚀 Initializing Magnetic One agents...")
-    
-    # Deterministic LLM responses
-    fake_llm = FakeListLLM(responses=[
-        "Magnetic One Orchestrator: Assigning task to Coder.",
-        "Coder: Task complete. MPLP V2 substrate verified."
-    ])
+def finish_run(timeline, scenario_id, run_id, orchestrations, steps, sessions, concurrency, scheduler, verbose=False):
+    """Log the steps and return the pack as {relative path: text}; nothing is written."""
+    for step in steps:
+        log_event(timeline, "ORCHESTRATION_STEP", orchestration.step_event(step))
 
-    log_event(timeline, "AGENT_CREATED", {"role": "Orchestrator"})
-    log_event(timeline, "AGENT_CREATED", {"role": "Coder"})
+    if verbose:
+        latencies = [step.latency_ms for step in steps]
+        print(f"   {len(steps)} steps, wall latency p50 {statistics.median(latencies):.3f}ms, max {max(latencies):.3f}ms")
 
-    # Simulation for bit-identical proof
-    result = "Magnetic One successfully orchestrated the verification of MPLP V2 determinism."
+    result = orchestrations[0].result
+    if any(o.result != result for o in orchestrations):
+        raise RuntimeError("Orchestrations diverged")
 
-    log_event(timeline, "ORCHESTRATION_COMPLETED", {"result": result})
+    log_event(timeline, "ORCHESTRATION_COMPLETED", {"result": result, "sessions": sessions, "concurrency": concurrency})
 
     # Save artifacts
     artifacts = {
@@ -68,42 +118,12 @@ def main():
         "trace": {
             "verdict": "PASS",
             "result": result,
-            "steps": [
-                "Orchestrator assigned task",
-                "Coder executed verification",
-                "Final result captured"
-            ]
+            "steps": [f"{step.role} {step.step}" for step in orchestrations[0].steps],
+            "scheduler": scheduler
         }
     }
 
-    ctx_path = os.path.join(out_dir, "artifacts/context.json")
-    trace_path = os.path.join(out_dir, "artifacts/trace.json")
-    
-    with open(ctx_path, "w") as f:
-        json.dump(artifacts["context"], f, indent=2)
-    with open(trace_path, "w") as f:
-        json.dump(artifacts["trace"], f, indent=2)
-
-    # Write timeline
-    tm_path = os.path.join(out_dir, "timeline/events.ndjson")
-    with open(tm_path, "w") as f:
-        for event in timeline:
-            f.write(json.dumps(event) + "\n")
-
-    # Integrity (pre-seal)
-    print("🔒 Computing pre-seal integrity...")
-    hashes = {
-        "artifacts/context.json": sha256_file(ctx_path),
-        "artifacts/trace.json": sha256_file(trace_path),
-        "timeline/events.ndjson": sha256_file(tm_path)
-    }
-
-    with open(os.path.join(out_dir, "integrity/sha256sums.txt"), "w") as f:
-        for path, h in hashes.items():
-            f.write(f"{h}  {path}\n")
-
     # Manifest (Pre-sealed)
-    print("📋 Writing pre-sealed manifest...")
     manifest = {
         "pack_id": run_id,
         "pack_layout_version": "2",
@@ -132,10 +152,115 @@ def main():
         }
     }
 
-    with open(os.path.join(out_dir, "manifest.json"), "w") as f:
-        json.dump(manifest, f, indent=2)
+    return {
+        "artifacts/context.json": json.dumps(artifacts["context"], indent=2),
+        "artifacts/trace.json": json.dumps(artifacts["trace"], indent=2),
+        "timeline/events.ndjson": "".join(json.dumps(event) + "\n" for event in timeline),
+        "manifest.json": json.dumps(manifest, indent=2),
+    }
+
+def build_pack(scenario_id, run_id, verbose=False, perf=None, tracer=None):
+    """Run the orchestrations on their own event loop and return the pack files."""
+    sessions, concurrency, scheduler = orchestration_settings()
+    if verbose:
+        print(f"🚀 Initializing Magnetic One agents ({sessions} orchestration(s), {concurrency} concurrent, {scheduler} scheduler)...")
+    timeline = start_run(scenario_id, run_id)
+    with phase(perf, "agent_construction"):
+        generate = make_generate(tracer)
+    with phase(perf, "orchestration_run"):
+        orchestrations, steps = orchestration.run(
+            TASK,
+            sessions=sessions,
+            concurrency=concurrency,
+            deterministic=scheduler != "realtime",
+            generate=generate,
+            tracer=tracer,
+        )
+    return finish_run(timeline, scenario_id, run_id, orchestrations, steps, sessions, concurrency, scheduler, verbose)
+
+async def build_pack_async(scenario_id, run_id, perf=None, tracer=None):
+    """``build_pack`` on the caller's running loop, so many runs can share one loop.
+
+    The shared loop keeps real time, so the run is recorded with the realtime scheduler.
+    Phase CPU times are process-wide and include the other runs on the loop.
+    """
+    sessions, concurrency, _ = orchestration_settings()
+    timeline = start_run(scenario_id, run_id)
+    steps = []
+    with phase(perf, "agent_construction"):
+        generate = make_generate(tracer)
+    with phase(perf, "orchestration_run"):
+        orchestrations = await orchestration.run_orchestrations(TASK, sessions, concurrency, generate, steps, tracer)
+    return finish_run(timeline, scenario_id, run_id, orchestrations, steps, sessions, concurrency, "realtime")
+
+def write_pack(out_dir, files, perf=None, tracer=None):
+    validate_on_write(files, perf)  # VLAB_VALIDATE=1
+    for sub in ("artifacts", "timeline", "reports", "integrity"):
+        os.makedirs(os.path.join(out_dir, sub), exist_ok=True)
+
+    with phase(perf, "artifact_writes"):
+        for path in ("artifacts/context.json", "artifacts/trace.json"):
+            with open(os.path.join(out_dir, path), "w") as f:
+                f.write(files[path])
+    with phase(perf, "timeline_flush"):
+        timeline_sha = write_events(out_dir, files["timeline/events.ndjson"])
+
+    # Integrity (pre-seal)
+    print("🔒 Computing pre-seal integrity...")
+    with phase(perf, "hashing"):
+        hashes = {
+            path: timeline_sha if path == "timeline/events.ndjson" else sha256_file(os.path.join(out_dir, path))
+            for path in SEALED_FILES
+        }
+
+        with open(os.path.join(out_dir, "integrity/sha256sums.txt"), "w") as f:
+            for path, h in hashes.items():
+                f.write(f"{h}  {path}\n")
+
+    print("📋 Writing pre-sealed manifest...")
+    with phase(perf, "manifest_write"):
+        with open(os.path.join(out_dir, "manifest.json"), "w") as f:
+            f.write(files["manifest.json"])
+
+    # Never sealed or hashed (packhash.EXCLUDED_PATHS)
+    if perf is not None:
+        perf.write(out_dir)
+    if tracer is not None:
+        tracer.write(out_dir, name=SUBSTRATE_ID)
+
+def main():
+    scenario_id = os.getenv("SCENARIO_ID", "d1_basic_pass")
+    run_id = os.getenv("RUN_ID", "magentic-one-d1-real-001")
+    out_dir = os.getenv("OUT_DIR", "/workspace/out")
+
+    print(f"🔨 Magnetic One Producer v2 (REAL EXECUTION)")
+    print(f"   Scenario: {scenario_id}")
+    print(f"   Run ID: {run_id}")
+    print(f"   Out Dir: {out_dir}")
+
+    perf = None
+    if PerfRecorder is not None:
+        perf = PerfRecorder("produce-real.py", SUBSTRATE_ID, run_id, start=_IMPORT_START)
+        perf.add("framework_import", (_IMPORT_END[0] - _IMPORT_START[0]) * 1000, (_IMPORT_END[1] - _IMPORT_START[1]) * 1000)
+
+    # VLAB_TRACE=chrome|speedscope: agent step / LLM / tool spans (opt-in)
+    tracer = tracer_from_env()
+
+    try:
+        files = build_pack(scenario_id, run_id, verbose=True, perf=perf, tracer=tracer)
+    except BudgetExceeded:
+        raise  # a RuntimeError too; exits 3 below
+    except RuntimeError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+    write_pack(out_dir, files, perf, tracer)
 
     print(f"\n✅ Pack created at: {out_dir}")
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    except BudgetExceeded as e:
+        # Abort before the manifest is written so the run is never sealed
+        print(f"\n⛔ Budget guard aborted run: {e}", file=sys.stderr)
+        sys.exit(3)
@@ -76,12 +76,22 @@ mkdir -p "$OUT_DIR/integrity"
 # Run container with fingerprinting
 echo "Running container: $IMAGE_TAG"
 
-# Run fingerprint script inside container to get true runtime environment
-ENV_FINGERPRINT=$(docker run --rm \
+# Run fingerprint script inside container to get true runtime environment.
+# Memoized by (runner, image digest): the container only starts on a miss.
+FINGERPRINT_CMD=(docker run --rm \
   -v "$REPO_ROOT:$WORKDIR" \
   -v "$SCRIPT_DIR/env-fingerprint.sh:/tmp/env-fingerprint.sh" \
   "$IMAGE_TAG" \
   bash /tmp/env-fingerprint.sh --runner "$RUNNER")
+if command -v python3 &> /dev/null; then
+  ENV_FINGERPRINT=$(PYTHONPATH="$REPO_ROOT/packages/vlab-py/src" python3 -m mplp_vlab.lockmemo fingerprint \
+    --runner "$RUNNER" \
+    --image-digest "$IMAGE_DIGEST" \
+    --input "$SCRIPT_DIR/env-fingerprint.sh" \
+    -- "${FINGERPRINT_CMD[@]}")
+else
+  ENV_FINGERPRINT=$("${FINGERPRINT_CMD[@]}")
+fi
 
 # Run main command
 docker run --rm \
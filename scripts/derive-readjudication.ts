@@ -0,0 +1,70 @@
+import * as fs from 'fs';
+import * as path from 'path';
+import { listRunIds } from '../lib/bundles/load_run_bundle';
+import { readjudicateCorpus } from '../lib/rulesets/readjudicate';
+
+/**
+ * derive:readjudicate
+ *
+ * Differential re-adjudication across a ruleset bump.
+ * Only clauses changed between --from and --to are re-evaluated, and only
+ * for runs whose evidence footprint touches them; all other results are
+ * reused from data/derived/readjudication/<from>/.
+ *
+ * Prime the cache once with --from X --to X (full evaluation), then every
+ * subsequent bump costs in proportion to the clause delta.
+ */
+
+const PROJECT_ROOT = process.cwd();
+const DERIVED_BASE_DIR = path.join(PROJECT_ROOT, 'data/derived/readjudication');
+
+async function main() {
+    const args = process.argv.slice(2);
+    const fromIndex = args.indexOf('--from');
+    const toIndex = args.indexOf('--to');
+    const runIndex = args.indexOf('--run');
+
+    if (fromIndex === -1 || toIndex === -1 || !args[fromIndex + 1] || !args[toIndex + 1]) {
+        console.error('Usage: npx tsx scripts/derive-readjudication.ts --from <ruleset-x> --to <ruleset-y> [--run <run_id>]');
+        process.exit(1);
+    }
+
+    const rulesetFrom = args[fromIndex + 1];
+    const rulesetTo = args[toIndex + 1];
+    const runIds = runIndex !== -1 && args[runIndex + 1] ? [args[runIndex + 1]] : listRunIds();
+
+    console.log(`🚀 Differential Re-adjudication: ${rulesetFrom} -> ${rulesetTo}`);
+    console.log(`📦 Runs in scope: ${runIds.length}`);
+
+    const startedAt = Date.now();
+    const { summary, outcomes } = await readjudicateCorpus(rulesetFrom, rulesetTo, runIds);
+
+    if (summary.delta) {
+        console.log(`\n🧮 Clause delta: +${summary.delta.added.length} -${summary.delta.removed.length} ~${summary.delta.modified.length}`);
+        for (const id of summary.delta.modified) console.log(`   ~ ${id}`);
+        console.log(`   Changed requirements: ${summary.delta.changed_requirements.join(', ') || '(none)'}`);
+    } else {
+        console.log('\n⚠️  No clause-level evaluators for this pair; using full adjudication');
+    }
+
+    for (const o of outcomes.filter(o => o.mode !== 'reused')) {
+        console.log(`🔹 ${o.run_id}: ${o.mode} [${o.clauses_evaluated.join(', ')}] → ${o.result.topline_verdict}`);
+    }
+
+    const outDir = path.join(DERIVED_BASE_DIR, `${rulesetFrom}__${rulesetTo}`);
+    fs.mkdirSync(outDir, { recursive: true });
+    const summaryPath = path.join(outDir, 'readjudication-summary.json');
+    fs.writeFileSync(summaryPath, JSON.stringify(summary, null, 2));
+
+    const m = summary.metrics;
+    console.log(`\n📊 Re-adjudication Complete (${Date.now() - startedAt} ms)`);
+    console.log(`   Reused: ${m.reused_runs}  Differential: ${m.differential_runs}  Full: ${m.full_runs}`);
+    console.log(`   Clause evaluations: ${m.clause_evaluations}`);
+    console.log(`   Verdict Flips: ${m.verdict_flips}`);
+    console.log(`   Summary: ${path.relative(PROJECT_ROOT, summaryPath)}`);
+}
+
+main().catch(e => {
+    console.error('Fatal Error:', e);
+    process.exit(1);
+});
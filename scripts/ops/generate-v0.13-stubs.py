@@ -1,15 +1,17 @@
 import os
+import sys
 import json
 
+# Run directories come from the run store (flat or hash-bucketed, see mplp_vlab.runstore)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "packages", "vlab-py", "src"))
+from mplp_vlab.runstore import public_run_dir, run_dir
+
 def create_run(run_id, is_pass):
     print(f"Creating run: {run_id}")
     
     # Paths
-    public_runs_root = "/Users/jasonwang/Documents/AI_Dev/V1.0_release/Validation_Lab/public/data/runs"
-    curated_runs_root = "/Users/jasonwang/Documents/AI_Dev/V1.0_release/Validation_Lab/data/runs"
-    
-    run_public_dir = os.path.join(public_runs_root, run_id)
-    run_curated_dir = os.path.join(curated_runs_root, run_id)
+    run_public_dir = str(public_run_dir(run_id))
+    run_curated_dir = str(run_dir(run_id))
     
     os.makedirs(os.path.join(run_public_dir, "pack/timeline"), exist_ok=True)
     os.makedirs(os.path.join(run_public_dir, "pack/snapshots"), exist_ok=True)
@@ -65,6 +67,7 @@ def create_run(run_id, is_pass):
             f.write(json.dumps(event) + "\n")
             
     # 5. data/runs/<id>/input.pointer.json
+    # pack_path stays the logical flat path: it is layout-independent (and hashed), resolved via runstore or compat links
     input_pointer = {
         "pack_path": f"public/data/runs/{run_id}",
         "pack_layout": "1.0",
@@ -0,0 +1,52 @@
+/**
+ * Clause Aggregation Tests
+ *
+ * The semantic-invariant adjudicators and differential re-adjudication share
+ * this aggregation, so reused and freshly evaluated clauses combine the same way.
+ */
+
+import { describe, it, expect } from 'vitest';
+import { aggregateClauses, toRegistryClause } from '../../lib/rulesets/clauseAggregation';
+import type { ClauseDefinition, ClauseResult } from '../../lib/rulesets/ruleset-1.3/types';
+
+const DOMAIN_NAMES = { D1: 'Budget', D2: 'Lifecycle', D3: 'Authorization', D4: 'Termination' };
+
+const DEFINITIONS = [
+    { clause_id: 'CL-D1-01', requirement_id: 'RQ-D1-01', domain: 'D1' },
+    { clause_id: 'CL-D2-01', requirement_id: 'RQ-D2-01', domain: 'D2' },
+] as unknown as ClauseDefinition[];
+
+function clause(clauseId: string, status: ClauseResult['status'], reasonCode?: string): ClauseResult {
+    return {
+        clause_id: clauseId,
+        requirement_id: clauseId.replace('CL', 'RQ'),
+        status,
+        reason_code: reasonCode,
+        evidence: { pointers: [], resolved: [], resolved_count: 0, unresolved_count: 0 },
+        notes: [],
+    };
+}
+
+describe('rulesets/clauseAggregation', () => {
+    it('tags registry clauses with their domain', () => {
+        expect(toRegistryClause(DEFINITIONS, clause('CL-D2-01', 'PASS')).domain_id).toBe('D2');
+    });
+
+    it('fails the topline on the first failed clause', () => {
+        const result = aggregateClauses('ruleset-1.3', 'arb-1', DOMAIN_NAMES, [
+            toRegistryClause(DEFINITIONS, clause('CL-D1-01', 'PASS')),
+            toRegistryClause(DEFINITIONS, clause('CL-D2-01', 'FAIL', 'D2_TERMINAL_MISSING')),
+        ]);
+        expect(result.topline_verdict).toBe('FAIL');
+        expect(result.reason_code).toBe('D2_TERMINAL_MISSING');
+        expect(result.domain_meta?.map(d => d.status)).toEqual(['PASS', 'FAIL', 'PASS', 'PASS']);
+    });
+
+    it('reports NOT_EVALUATED only when no clause passed', () => {
+        const result = aggregateClauses('ruleset-1.3', 'arb-1', DOMAIN_NAMES, [
+            toRegistryClause(DEFINITIONS, clause('CL-D1-01', 'NOT_EVALUATED')),
+        ]);
+        expect(result.topline_verdict).toBe('NOT_EVALUATED');
+        expect(result.reason_code).toBe('CLAUSES_NOT_EVALUATED');
+    });
+});
@@ -0,0 +1,86 @@
+/**
+ * Clause Dependency Tests
+ *
+ * Locks the impact rules used by differential re-adjudication:
+ * a changed clause only affects runs whose footprint touches its inputs,
+ * or any run if its evidence-absent outcome changed.
+ */
+
+import { describe, it, expect } from 'vitest';
+import {
+    CLAUSE_DEPENDENCIES,
+    computeRunFootprint,
+    isRunAffectedByClause,
+    affectedClausesForRun,
+} from '../../lib/rulesets/dependencies';
+import type { RunBundle } from '../../lib/bundles/types';
+
+function bundleWith(requirements: string[], eventTypes: string[]): RunBundle {
+    return {
+        run_id: 'arb-test',
+        verdict: null,
+        bundle_manifest: null,
+        integrity_hash_path: null,
+        evidence_pointers: {
+            pointers: requirements.map(r => ({
+                requirement_id: r,
+                artifact_path: 'pack/timeline/events.ndjson',
+                locator: 'event_id:evt-1',
+                status: 'PRESENT' as const,
+            })),
+        },
+        pack: {
+            root: '/tmp/pack',
+            trace: {
+                raw_path: '/tmp/pack/timeline/events.ndjson',
+                events: eventTypes.map((t, i) => ({ event_id: `evt-${i}`, event_type: t, timestamp: '' })),
+            },
+        },
+        load_status: {
+            b1_verdict: 'ok',
+            b2_manifest: 'ok',
+            b3_integrity: 'ok',
+            b4_pointers: 'ok',
+            pack: 'ok',
+            b1_was_legacy: false,
+        },
+        load_errors: [],
+    };
+}
+
+describe('rulesets/dependencies', () => {
+    it('declares a dependency for all 12 semantic clauses', () => {
+        expect(Object.keys(CLAUSE_DEPENDENCIES)).toHaveLength(12);
+    });
+
+    it('computes a sorted, normalized footprint', () => {
+        const fp = computeRunFootprint(bundleWith(['RQ-D2-01', 'RQ-D1-01'], ['Budget.Decision', 'agent-init']));
+        expect(fp.requirement_ids).toEqual(['RQ-D1-01', 'RQ-D2-01']);
+        expect(fp.event_types).toEqual(['agent_init', 'budget.decision']);
+    });
+
+    const ABSENT_UNCHANGED = new Set(Object.keys(CLAUSE_DEPENDENCIES));
+
+    it('marks runs carrying the read requirement as affected', () => {
+        const fp = computeRunFootprint(bundleWith(['RQ-D1-01'], []));
+        expect(isRunAffectedByClause(fp, 'CL-D1-03', ABSENT_UNCHANGED)).toBe(true);
+        expect(isRunAffectedByClause(fp, 'CL-D2-03', ABSENT_UNCHANGED)).toBe(false);
+    });
+
+    it('marks runs with scanned event types as affected', () => {
+        const fp = computeRunFootprint(bundleWith([], ['budget.enforcement']));
+        expect(isRunAffectedByClause(fp, 'CL-D1-03', ABSENT_UNCHANGED)).toBe(true);
+        expect(isRunAffectedByClause(fp, 'CL-D1-01', ABSENT_UNCHANGED)).toBe(false);
+    });
+
+    it('marks runs without evidence as affected when the evidence-absent outcome changed', () => {
+        const fp = computeRunFootprint(bundleWith([], []));
+        expect(isRunAffectedByClause(fp, 'CL-D2-01')).toBe(true);
+        expect(affectedClausesForRun(fp, ['CL-D1-01', 'CL-D2-01'], new Set(['CL-D1-01']))).toEqual(['CL-D2-01']);
+    });
+
+    it('treats unknown clauses as affecting every run', () => {
+        const fp = computeRunFootprint(bundleWith([], []));
+        expect(affectedClausesForRun(fp, ['CL-D1-03', 'CL-X-99'], ABSENT_UNCHANGED)).toEqual(['CL-X-99']);
+    });
+});
@@ -0,0 +1,79 @@
+/**
+ * Clause Fingerprint Tests
+ *
+ * Differential re-adjudication must notice logic changes in the helpers a
+ * clause calls, not only in the clause evaluator itself.
+ */
+
+import { describe, it, expect } from 'vitest';
+import * as fs from 'fs';
+import * as path from 'path';
+import {
+    fingerprintAbsentOutcomes,
+    fingerprintClauseEvaluators,
+    splitTopLevelDeclarations,
+} from '../../lib/rulesets/clauseFingerprint';
+
+const SOURCE = fs.readFileSync(path.resolve(process.cwd(), 'lib/rulesets/ruleset-1.3/clauses.ts'), 'utf-8');
+
+// Only the names matter: evaluators are looked up in the source by function name
+const EVALUATORS = {
+    'CL-D1-01': function evaluateCLD1_01() {},
+    'CL-D1-03': function evaluateCLD1_03() {},
+    'CL-D2-01': function evaluateCLD2_01() {},
+};
+
+function changed(source: string): string[] {
+    const before = fingerprintClauseEvaluators(SOURCE, EVALUATORS);
+    const after = fingerprintClauseEvaluators(source, EVALUATORS);
+    return Object.keys(EVALUATORS).filter(id => before[id] !== after[id]);
+}
+
+function editHelper(name: string): string {
+    const signature = `\nfunction ${name}(`;
+    expect(SOURCE).toContain(signature);
+    return SOURCE.replace(signature, `${signature}_edited: unknown, `);
+}
+
+describe('rulesets/clauseFingerprint', () => {
+    it('splits the clauses module into its top-level declarations', () => {
+        const declarations = splitTopLevelDeclarations(SOURCE);
+        expect(declarations.has('createClauseResult')).toBe(true);
+        expect(declarations.has('evaluateCLD1_01')).toBe(true);
+        expect(declarations.get('getAllEvents')).toMatch(/^function getAllEvents/);
+    });
+
+    it('marks every clause calling a changed shared helper as changed', () => {
+        expect(changed(editHelper('createClauseResult'))).toEqual(['CL-D1-01', 'CL-D1-03', 'CL-D2-01']);
+        expect(changed(editHelper('resolveEvidenceForRequirement'))).toEqual(['CL-D1-01', 'CL-D1-03', 'CL-D2-01']);
+    });
+
+    it('leaves clauses that do not reach the helper unchanged', () => {
+        expect(changed(editHelper('getAllEvents'))).toEqual(['CL-D1-03']);
+        expect(changed(editHelper('getFirstSemanticFields'))).toEqual(['CL-D1-03']);
+    });
+
+    it('ignores comment-only edits', () => {
+        expect(changed(SOURCE.replace('// Common Helpers', '// Shared Helpers'))).toEqual([]);
+    });
+
+    it('falls back to the evaluator text without a source', () => {
+        const fingerprints = fingerprintClauseEvaluators(null, { ...EVALUATORS, 'CL-X-99': undefined });
+        expect(fingerprints['CL-D1-01']).toMatch(/^[0-9a-f]{64}$/);
+        expect(fingerprints['CL-X-99']).toBe('missing');
+    });
+
+    it('fingerprints the evidence-absent outcome, not the evaluator text', () => {
+        const empty = { pointers: [] as string[] };
+        const missing = (b: typeof empty) => ({ status: b.pointers.length ? 'PASS' : 'FAIL', notes: ['No evidence'] });
+        const refactored = (b: typeof empty) => ({ status: b.pointers.length > 0 ? 'PASS' : 'FAIL', notes: ['No evidence'] });
+        const relaxed = (b: typeof empty) => ({ status: b.pointers.length ? 'PASS' : 'NOT_EVALUATED', notes: ['No evidence'] });
+        const throwing = () => { throw new Error('no trace'); };
+
+        const before = fingerprintAbsentOutcomes({ 'CL-D1-01': missing, 'CL-D2-01': missing }, empty);
+        const after = fingerprintAbsentOutcomes({ 'CL-D1-01': refactored, 'CL-D2-01': relaxed, 'CL-D3-01': throwing }, empty);
+        expect(after['CL-D1-01']).toBe(before['CL-D1-01']);
+        expect(after['CL-D2-01']).not.toBe(before['CL-D2-01']);
+        expect(after['CL-D3-01']).toMatch(/^[0-9a-f]{64}$/);
+    });
+});
@@ -17,6 +17,7 @@ import * as os from 'os';
 import {
     EXCLUDED_DIRS,
     EXCLUDED_FILES,
+    EXCLUDED_PATHS,
     listPackFiles,
     computeSha256Sums,
     computePackRootHash,
@@ -43,6 +44,10 @@ describe('Pack Hash SSOT', () => {
             expect(EXCLUDED_FILES).toContain('Thumbs.db');
         });
 
+        it('should exclude per-run producer reports', () => {
+            expect(EXCLUDED_PATHS).toContain('reports/producer.perf.json');
+        });
+
         it('should not include integrity/ files in file list', () => {
             const packDir = path.join(FIXTURES_ROOT, 'minimal-pass');
             const files = listPackFiles(packDir);
@@ -6,9 +6,11 @@
  */
 
 import { describe, it, expect } from 'vitest';
+import * as fs from 'fs';
 import { resolve } from 'path';
 import { ingest } from '../../lib/engine/ingest';
 import { verify } from '../../lib/engine/verify';
+import { createTempDir, writeJson, writeText } from '../_helpers';
 
 const FIXTURES = resolve(__dirname, '../../fixtures/packs');
 
@@ -52,6 +54,35 @@ describe('engine/verify', () => {
         });
     });
 
+    describe('per-run reports', () => {
+        it('do not break sha256 coverage (INT-003)', async () => {
+            const tmp = createTempDir();
+            try {
+                fs.cpSync(resolve(FIXTURES, 'minimal-pass'), tmp.path, { recursive: true });
+                writeJson(resolve(tmp.path, 'reports/producer.perf.json'), { perf_version: '1', phases: [] });
+                const report = await verify(await ingest(tmp.path));
+                expect(report.checks.find(c => c.check_id === 'INT-003')?.status).toBe('PASS');
+            } finally {
+                tmp.cleanup();
+            }
+        });
+    });
+
+    describe('optional integrity files', () => {
+        it('merkle.sha256 and tree.b2sums do not break sha256 coverage (INT-003)', async () => {
+            const tmp = createTempDir();
+            try {
+                fs.cpSync(resolve(FIXTURES, 'minimal-pass'), tmp.path, { recursive: true });
+                writeText(resolve(tmp.path, 'integrity/merkle.sha256'), `${'0'.repeat(64)}  merkle\n`);
+                writeText(resolve(tmp.path, 'integrity/tree.b2sums'), `${'0'.repeat(64)}  timeline/events.ndjson\n`);
+                const report = await verify(await ingest(tmp.path));
+                expect(report.checks.find(c => c.check_id === 'INT-003')?.status).toBe('PASS');
+            } finally {
+                tmp.cleanup();
+            }
+        });
+    });
+
     describe('broken-admission pack', () => {
         it('returns NOT_ADMISSIBLE status', async () => {
             const pack = await ingest(resolve(FIXTURES, 'broken-admission'));